@@ -1,8 +1,11 @@
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 from dataclasses import dataclass, field
+import numpy as np
 import pandas as pd
 
+from core.incremental_aggregation import IncrementalAggregator, PartialAggregates
+
 @dataclass
 class SavedAggregation:
     """Represents a saved aggregation configuration and its resulting dataframe."""
@@ -14,6 +17,11 @@ class SavedAggregation:
     result_df: Optional[pd.DataFrame] = None
     created_at: datetime = field(default_factory=datetime.now)
     row_count: int = 0
+    # Not saved in projects: the partials of the last reapply and the data state it saw
+    partials: Optional[PartialAggregates] = field(default=None, repr=False)
+    source_marker: Any = field(default=None, repr=False)
+    # How the last reapply ran: "full", "incremental" or "unchanged"
+    last_refresh: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
         """Converts the aggregation metadata to a dictionary for serialization."""
@@ -50,10 +58,21 @@ class SavedAggregation:
         )
 
 class AggregationManager:
-    """Manages saved data aggregations, allowing storage, retrieval, and reapplication."""
+    """
+    Manages saved data aggregations, allowing storage, retrieval, and reapplication.
+
+    Reapplying keeps decomposable aggregations as partials (see IncrementalAggregator).
+    When the caller passes the operations applied to the data since the last reapply,
+    appends and row removals update the partials instead of recomputing the groupby.
+    """
+    # Operations that only remove rows and keep the index labels of the remaining rows
+    ROW_REMOVAL_OPERATIONS = frozenset({"filter", "filter_multiple", "remove_rows", "drop_duplicates", "drop_missing"})
+    # Operations that leave the rows and their values as they are
+    NEUTRAL_OPERATIONS = frozenset({"export_google_sheets"})
 
-    def __init__(self) -> None:
+    def __init__(self, aggregator: Optional[IncrementalAggregator] = None) -> None:
         self.saved_aggregations: Dict[str, SavedAggregation] = {}
+        self._aggregator = aggregator if aggregator is not None else IncrementalAggregator()
     
     def save_aggregation(self, name: str, description: str, group_by: List[str], agg_config: Dict[str, str], result_df: pd.DataFrame, date_grouping: Optional[Dict[str, str]] = None) -> SavedAggregation:
         """Saves a new aggregation configuration and its initial result."""
@@ -93,8 +112,53 @@ class AggregationManager:
         agg = self.saved_aggregations.get(name)
         return agg.result_df.copy() if agg and agg.result_df is not None else None
     
-    def reapply_aggregation(self, name: str, df: pd.DataFrame) -> pd.DataFrame:
-        """Reapplies an existing aggregation configuration to a new dataset."""
+    def _incremental_partials(self, agg: SavedAggregation, df: pd.DataFrame, operations: List[Dict[str, Any]]) -> Optional[PartialAggregates]:
+        """The partials of df from the partials of the last reapply, None when df needs a full pass"""
+        partials = agg.partials
+        kinds = {operation.get("type") for operation in operations} - self.NEUTRAL_OPERATIONS
+        if not self._aggregator.is_order_dependent(partials):
+            kinds.discard("sort")
+        if not kinds:
+            return partials
+        previous_rows = len(partials.source)
+        if kinds == {"concatenate"} and len(df) >= previous_rows:
+            # Appends add rows at the end, the first rows are the previous data
+            return self._aggregator.append(partials, df.iloc[previous_rows:], source=df)
+        if kinds <= self.ROW_REMOVAL_OPERATIONS and self._aggregator.supports_removal(partials):
+            kept = self._kept_rows(partials.source.index, df.index)
+            if kept is None:
+                return None
+            columns = list(partials.dtypes)
+            removed_rows = partials.source.iloc[np.flatnonzero(~kept)][columns]
+            return self._aggregator.remove(partials, removed_rows, source=df)
+        return None
+
+    @staticmethod
+    def _kept_rows(source_index: pd.Index, index: pd.Index) -> Optional[np.ndarray]:
+        """Mask of the source rows still in index, found by their labels, None when labels do not identify rows"""
+        if isinstance(source_index, pd.RangeIndex) and source_index.start == 0 and source_index.step == 1 and pd.api.types.is_integer_dtype(index.dtype):
+            positions = index.to_numpy()
+            if len(positions) and (positions.min() < 0 or positions.max() >= len(source_index)):
+                return None
+        elif source_index.is_unique:
+            positions = source_index.get_indexer(index)
+            if len(positions) and positions.min() < 0:
+                return None
+        else:
+            return None
+        kept = np.zeros(len(source_index), dtype=bool)
+        kept[positions] = True
+        # Repeated labels would hide removed rows
+        return kept if int(kept.sum()) == len(index) else None
+
+    def reapply_aggregation(self, name: str, df: pd.DataFrame, operations: Optional[List[Dict[str, Any]]] = None, marker: Any = None) -> pd.DataFrame:
+        """
+        Reapplies an existing aggregation configuration to a new dataset.\n
+        :param operations (List[Dict]): Operation log entries applied to the data since the last
+            reapply, None when unknown. Appends and row removals then update the partials.
+        :param marker (Any): Opaque token of the data state, stored as source_marker for the caller
+        :return (pd.DataFrame): The aggregation result
+        """
         agg = self.saved_aggregations.get(name)
 
         if not agg:
@@ -108,18 +172,58 @@ class AggregationManager:
         if missing_cols:
             raise KeyError(f"Cannot reapply aggregation. Missing grouping columns: {missing_cols}")
         
+        partials: Optional[PartialAggregates] = None
+        refresh = "full"
+        if agg.partials is not None and operations is not None:
+            try:
+                partials = self._incremental_partials(agg, df, operations)
+            except (KeyError, TypeError, ValueError):
+                # Changed schema, fall back to a full pass
+                partials = None
+            if partials is agg.partials:
+                refresh = "unchanged"
+            elif partials is not None:
+                refresh = "incremental"
+        if partials is None and self._aggregator.supports(df, agg.group_by, agg.agg_config, agg.date_grouping):
+            partials = self._aggregator.build(df, agg.group_by, agg.agg_config)
+        
         try:
-            # Apply standard pandas aggregation mapping
-            result = df.groupby(agg.group_by, dropna=False).agg(agg.agg_config).reset_index()
+            if refresh == "unchanged" and agg.result_df is not None:
+                result = agg.result_df.copy()
+            elif partials is not None:
+                result = self._aggregator.finalize(partials)
+            else:
+                # Apply standard pandas aggregation mapping
+                result = df.groupby(agg.group_by, dropna=False).agg(agg.agg_config).reset_index()
         except Exception as error:
             raise RuntimeError(f"Failed to apply Pandas aggregation: {str(error)}")
         
         # update the manager state
         agg.result_df = result.copy()
         agg.row_count = len(result)
+        agg.partials = partials
+        agg.source_marker = marker
+        agg.last_refresh = refresh
         
         return result
     
+    def refresh_aggregations(self, df: pd.DataFrame, operations_since: Callable[[Any], Optional[List[Dict[str, Any]]]], marker: Any) -> Dict[str, str]:
+        """
+        Reapply every saved aggregation to df\n
+        :param operations_since (Callable): Returns the operations applied since a marker, None when unknown
+        :param marker (Any): Marker of the current data state
+        :return (Dict[str, str]): How each aggregation was refreshed, or the error message prefixed with 'error: '
+        """
+        outcomes: Dict[str, str] = {}
+        for name, agg in self.saved_aggregations.items():
+            operations = operations_since(agg.source_marker) if agg.source_marker is not None else None
+            try:
+                self.reapply_aggregation(name, df, operations, marker)
+                outcomes[name] = agg.last_refresh
+            except (KeyError, ValueError, RuntimeError) as error:
+                outcomes[name] = f"error: {str(error)}"
+        return outcomes
+    
     def export_aggregation(self) -> Dict[str, Any]:
         """Exports all aggregations to a dictionary format for project file saving."""
         return {
@@ -0,0 +1,101 @@
+import threading
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional
+
+
+@dataclass
+class AggregationPreview:
+    """The first groups of an aggregation and whether they were computed from a sample"""
+    df: pd.DataFrame
+    is_approximate: bool
+    # Rows the groupby ran on, total_rows when the preview is exact
+    rows_used: int
+    total_rows: int
+
+
+class AggregationPreviewEngine:
+    """
+    Aggregation previews with a bounded cost
+
+    Frames up to max_rows rows are aggregated in full and the preview is exact. Larger
+    frames are aggregated on a uniform random sample of max_rows rows, kept in their
+    original order, so a preview costs the same at 30M rows as at max_rows. sum, count
+    and size are scaled by rows / sample rows to estimate the totals, mean, median,
+    std and var are the sample estimates, and min, max, first, last and nunique are
+    those of the sampled rows. Groups too rare to be sampled are missing from an
+    approximate preview. Asking for every group (limit None) always aggregates all rows.
+
+    A groupby cannot be interrupted, is_cancelled is checked between the sampling and
+    aggregation steps and a cancelled preview raises InterruptedError.
+    """
+    SCALED_FUNCTIONS: frozenset = frozenset({"sum", "count", "size"})
+
+    def __init__(self, max_rows: int = 200_000, seed: int = 0) -> None:
+        self.max_rows = max_rows
+        self.seed = seed
+        # Sample positions only depend on the row count, the last ones are reused
+        # while the options of a preview change
+        self._positions: Optional[tuple[int, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    def sample_positions(self, row_count: int) -> np.ndarray:
+        """Sorted positions of the sampled rows, the same for the same row count"""
+        with self._lock:
+            if self._positions is not None and self._positions[0] == row_count:
+                return self._positions[1]
+        rng = np.random.default_rng(self.seed)
+        positions = np.sort(rng.choice(row_count, size=min(self.max_rows, row_count), replace=False)).astype(np.int64)
+        with self._lock:
+            self._positions = (row_count, positions)
+        return positions
+
+    @staticmethod
+    def _check_cancelled(is_cancelled: Optional[Callable[[], bool]]) -> None:
+        if is_cancelled is not None and is_cancelled():
+            raise InterruptedError("Aggregation preview cancelled")
+
+    def _scale(self, result: pd.DataFrame, agg_config: Dict[Hashable, str], factor: float) -> pd.DataFrame:
+        for column, func in agg_config.items():
+            if func not in self.SCALED_FUNCTIONS or column not in result.columns:
+                continue
+            values = result[column]
+            if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+                continue
+            scaled = values * factor
+            if pd.api.types.is_integer_dtype(values):
+                scaled = scaled.round().astype(values.dtype)
+            result[column] = scaled
+        return result
+
+    def preview(
+        self,
+        df: pd.DataFrame,
+        groupers: List[object],
+        agg_config: Dict[Hashable, str],
+        limit: Optional[int] = 5,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> AggregationPreview:
+        """
+        The first limit groups of df.groupby(groupers).agg(agg_config).reset_index()\n
+        :param groupers (List[object]): Column names or pd.Grouper objects
+        :param limit (Optional[int]): Number of groups to return, None for the exact result of all rows
+        :param is_cancelled (Callable[[], bool]): Polled between steps
+        :return (AggregationPreview): The groups, marked approximate when a sample was used
+        """
+        total_rows = len(df)
+        self._check_cancelled(is_cancelled)
+        if limit is None or total_rows <= self.max_rows:
+            result = df.groupby(groupers).agg(agg_config).reset_index()
+            self._check_cancelled(is_cancelled)
+            return AggregationPreview(result.head(limit), False, total_rows, total_rows)
+
+        columns = [grouper.key if isinstance(grouper, pd.Grouper) else grouper for grouper in groupers]
+        columns += [column for column in agg_config if column not in columns]
+        sample = df[columns].take(self.sample_positions(total_rows))
+        self._check_cancelled(is_cancelled)
+        result = sample.groupby(groupers).agg(agg_config).reset_index()
+        self._check_cancelled(is_cancelled)
+        result = self._scale(result.head(limit).copy(), agg_config, total_rows / len(sample))
+        return AggregationPreview(result, True, len(sample), total_rows)
@@ -4,6 +4,8 @@ from datetime import datetime
 from pathlib import Path
 import pandas as pd
 
+from core.data_handler import DataHandler
+
 class CodeExporter:
     """
     Generates a complete, runnable Python script by inspecting
@@ -169,6 +171,8 @@ class CodeExporter:
     def _generate_data_ops(self, data_operations: List[Dict[str, Any]]) -> str:
         """Generates the data processing function."""
         lines = ["", "def process_data(df):", "    \"\"\"Apply data operations.\"\"\""]
+        # A fused macro replay is logged as one entry holding its steps
+        data_operations = DataHandler._flatten_macro_operations(data_operations or [])
         if not data_operations:
             lines.extend([
                 "    print('No data operations to apply.')",
@@ -216,7 +220,12 @@ class CodeExporter:
                         lines.append(f"    df_processed = df_processed[df_processed[{col}] {cond} filter_val]")
                 
                 elif op_type == "drop_duplicates":
-                    lines.append("    df_processed = df_processed.drop_duplicates()")
+                    subset = op.get('subset')
+                    keep = op.get('keep', 'first')
+                    if subset or keep != 'first':
+                        lines.append(f"    df_processed = df_processed.drop_duplicates(subset={self._clean_value(subset)}, keep={self._clean_value(keep)})")
+                    else:
+                        lines.append("    df_processed = df_processed.drop_duplicates()")
                 
                 elif op_type == "drop_missing":
                     lines.append("    df_processed = df_processed.dropna()")
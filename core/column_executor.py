@@ -0,0 +1,74 @@
+import os
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class ColumnExecutor:
+    """
+    Runs independent per-column work on a shared thread pool
+
+    The numpy and pyarrow kernels behind reductions, arithmetic, clip and fillna
+    release the GIL, so columns of a wide frame are transformed on several cores
+    at once. Columns are taken out of the frame on the calling thread and the
+    results are written back there too, the worker threads only ever see a Series.
+    Small jobs run serially, the pool overhead is not worth it below a few
+    million cells.
+    """
+    MIN_PARALLEL_CELLS: int = 1_000_000
+
+    def __init__(self, max_workers: Optional[int] = None, min_parallel_cells: Optional[int] = None) -> None:
+        self.max_workers = max_workers or min(32, os.cpu_count() or 1)
+        self.min_parallel_cells = self.MIN_PARALLEL_CELLS if min_parallel_cells is None else min_parallel_cells
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dps-column")
+            return self._pool
+
+    def should_parallelize(self, row_count: int, column_count: int) -> bool:
+        return (
+            self.max_workers > 1
+            and column_count > 1
+            and row_count * column_count >= self.min_parallel_cells
+        )
+
+    def map_columns(self, df: pd.DataFrame, columns: Iterable[Hashable], func: Callable[[pd.Series], Any]) -> Dict[Hashable, Any]:
+        """
+        Call func on every column of df\n
+        :param df (pd.DataFrame): The DataFrame to read from
+        :param columns (Iterable[Hashable]): Columns to process, each is passed to func as a Series
+        :param func (Callable[[pd.Series], Any]): Work for one column, it must not touch df
+        :return (Dict[Hashable, Any]): {column: func result}, in the order of columns
+        """
+        columns: List[Hashable] = list(dict.fromkeys(columns))
+        series_list = [df[column] for column in columns]
+        if not self.should_parallelize(len(df), len(columns)):
+            results = [func(series) for series in series_list]
+        else:
+            # Executor.map re-raises the first failing column in column order
+            results = list(self._get_pool().map(func, series_list))
+        return dict(zip(columns, results))
+
+    def apply(self, df: pd.DataFrame, columns: Iterable[Hashable], func: Callable[[pd.Series], Optional[Any]]) -> pd.DataFrame:
+        """
+        Replace columns of df with the results of func, a None result leaves the column unchanged\n
+        :param df (pd.DataFrame): The DataFrame to change
+        :param columns (Iterable[Hashable]): Columns to transform
+        :param func (Callable[[pd.Series], Optional[Any]]): Transformation for one column
+        :return (pd.DataFrame): df with the transformed columns
+        """
+        for column, values in self.map_columns(df, columns, func).items():
+            if values is not None:
+                df[column] = values
+        return df
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,165 @@
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@dataclass
+class ColumnPromotion:
+    """A column whose type changes to hold the rows of both frames"""
+    column: Hashable
+    current_type: str
+    new_type: str
+    unified_type: str
+    # True when the existing rows of the column are cast, which copies the column
+    copies_current: bool
+
+
+class ConcatEngine:
+    """
+    Row appends of Arrow backed frames as chunked arrays
+
+    Arrow arrays are immutable, so the appended column is a chunked array holding the
+    chunks of the current column followed by the chunks of the new rows, and no
+    existing buffer is copied. Appending a file costs its own conversion plus the
+    casts the schemas need. Chunks are kept as they are, kernels that need contiguous
+    memory combine them when they convert a column to numpy.
+
+    Schemas are unified by column name with explicit rules instead of falling back to
+    object columns:
+    - a column missing on one side is filled with nulls of the other side's type
+    - integers of one signedness widen, mixed signedness becomes int64 (float64 with uint64)
+    - booleans join integers as the integer type, integers join floats as float64
+    - string and large_string keep the current column's type (every chunk has its own
+      offsets), dictionaries decode to their values
+    - timestamps take the finer unit and dates join timestamps as timestamps
+    - any other pair becomes large_string, so values keep their text instead of a type
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        return pa is not None
+
+    @staticmethod
+    def is_arrow_backed(df: pd.DataFrame) -> bool:
+        return len(df.columns) > 0 and all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+
+    @classmethod
+    def _arrow_column(cls, series: pd.Series) -> "pa.ChunkedArray":
+        if isinstance(series.dtype, pd.ArrowDtype):
+            return series.array._pa_array
+        return pa.chunked_array([pa.array(series, from_pandas=True)])
+
+    @staticmethod
+    def _unit_rank(unit: str) -> int:
+        return ("s", "ms", "us", "ns").index(unit)
+
+    @classmethod
+    def promote(cls, left: "pa.DataType", right: "pa.DataType") -> "pa.DataType":
+        """The type holding values of both types, left being the current column, by the rules in the class docstring"""
+        types = pa.types
+        if left == right:
+            return left
+        if types.is_dictionary(left):
+            left = left.value_type
+        if types.is_dictionary(right):
+            right = right.value_type
+        if left == right:
+            return left
+        if types.is_null(left):
+            return right
+        if types.is_null(right):
+            return left
+        if types.is_boolean(left) and (types.is_integer(right) or types.is_floating(right)):
+            return right
+        if types.is_boolean(right) and (types.is_integer(left) or types.is_floating(left)):
+            return left
+        if types.is_integer(left) and types.is_integer(right):
+            if types.is_signed_integer(left) == types.is_signed_integer(right):
+                return left if left.bit_width >= right.bit_width else right
+            unsigned = right if types.is_signed_integer(left) else left
+            return pa.float64() if unsigned.bit_width == 64 else pa.int64()
+        if (types.is_integer(left) or types.is_floating(left)) and (types.is_integer(right) or types.is_floating(right)):
+            if types.is_floating(left) and types.is_floating(right):
+                return left if left.bit_width >= right.bit_width else right
+            return pa.float64()
+        if (types.is_string(left) or types.is_large_string(left)) and (types.is_string(right) or types.is_large_string(right)):
+            return left
+        if types.is_timestamp(left) and types.is_timestamp(right) and left.tz == right.tz:
+            return left if cls._unit_rank(left.unit) >= cls._unit_rank(right.unit) else right
+        if types.is_timestamp(left) and types.is_date(right):
+            return left
+        if types.is_date(left) and types.is_timestamp(right):
+            return right
+        return pa.large_string()
+
+    @classmethod
+    def _arrow_columns(cls, df: pd.DataFrame) -> Dict[Hashable, "pa.ChunkedArray"]:
+        if not df.columns.is_unique:
+            raise ValueError("Column names must be unique to append the data")
+        return {column: cls._arrow_column(df[column]) for column in df.columns}
+
+    @classmethod
+    def schema_changes(cls, df: pd.DataFrame, other_df: pd.DataFrame) -> List[ColumnPromotion]:
+        """Columns present on both sides whose types differ, with the unified type"""
+        changes: List[ColumnPromotion] = []
+        for column in df.columns:
+            if column not in other_df.columns:
+                continue
+            current = cls._arrow_column(df[column]).type
+            new = cls._arrow_column(other_df[column]).type
+            if current == new:
+                continue
+            unified = cls.promote(current, new)
+            changes.append(ColumnPromotion(column, str(current), str(new), str(unified), unified != current))
+        return changes
+
+    @staticmethod
+    def _cast(values: "pa.ChunkedArray", target: "pa.DataType") -> List["pa.Array"]:
+        if values.type == target:
+            return list(values.chunks)
+        if pa.types.is_dictionary(values.type):
+            values = values.cast(values.type.value_type)
+            if values.type == target:
+                return list(values.chunks)
+        return list(values.cast(target).chunks)
+
+    @classmethod
+    def concat(cls, df: pd.DataFrame, other_df: pd.DataFrame, ignore_index: bool = True) -> pd.DataFrame:
+        """
+        Append the rows of other_df to the Arrow backed df\n
+        :param df (pd.DataFrame): The current data, every column Arrow backed
+        :param other_df (pd.DataFrame): The rows to append, converted column by column if needed
+        :param ignore_index (bool): Number the rows 0..n-1 instead of appending the indexes
+        :return (pd.DataFrame): Arrow backed frame with the columns of df, then the new columns of other_df
+        """
+        current = cls._arrow_columns(df)
+        new = cls._arrow_columns(other_df)
+        current_rows, new_rows = len(df), len(other_df)
+
+        columns: Dict[Hashable, pd.api.extensions.ExtensionArray] = {}
+        for column in list(current) + [column for column in new if column not in current]:
+            current_values: Optional[pa.ChunkedArray] = current.get(column)
+            new_values: Optional[pa.ChunkedArray] = new.get(column)
+            if current_values is None:
+                target = new_values.type
+                chunks = [pa.nulls(current_rows, target)] + cls._cast(new_values, target)
+            elif new_values is None:
+                target = current_values.type
+                chunks = cls._cast(current_values, target) + [pa.nulls(new_rows, target)]
+            else:
+                target = cls.promote(current_values.type, new_values.type)
+                chunks = cls._cast(current_values, target) + cls._cast(new_values, target)
+            columns[column] = pd.arrays.ArrowExtensionArray(pa.chunked_array([chunk for chunk in chunks if len(chunk)], type=target))
+
+        if ignore_index:
+            index = pd.RangeIndex(current_rows + new_rows)
+        else:
+            index = df.index.append(other_df.index)
+        result = pd.DataFrame(columns, index=index, copy=False)
+        result.attrs = dict(df.attrs)
+        return result
@@ -0,0 +1,197 @@
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence
+
+
+class CorrelationEngine:
+    """
+    Shared Pearson/Spearman correlation service
+
+    Columns are converted once into a centered float32 matrix and all correlations
+    come out of BLAS matrix products. Missing values are handled pairwise like
+    DataFrame.corr: with a validity mask M, the pairwise counts, sums and sums of
+    squares are the products M'M, X'M and (X*X)'M. Spearman correlations are
+    Pearson correlations of the column ranks (ranked per column, so with missing
+    values they can differ slightly from pandas, which re-ranks every pair). Results are cached per data version
+    and column set, and top_pairs walks the matrix in column blocks so wide frames
+    never need the full matrix at once.
+    """
+    METHODS: tuple[str, ...] = ("pearson", "spearman")
+    BLOCK_COLUMNS: int = 256
+
+    def __init__(self, max_cache_entries: int = 8, dtype: "np.dtype | str" = np.float32) -> None:
+        self.max_cache_entries = max_cache_entries
+        self.dtype = np.dtype(dtype)
+        # (frame id, rows, data version, method, columns) -> correlation matrix
+        self._cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    # Input preparation
+    @staticmethod
+    def numeric_columns(df: pd.DataFrame) -> List[Hashable]:
+        return [
+            column for column, dtype in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+        ]
+
+    def _resolve_columns(self, df: pd.DataFrame, columns: Optional[Sequence[Hashable]]) -> List[Hashable]:
+        if columns is None:
+            return self.numeric_columns(df)
+        resolved = list(dict.fromkeys(columns))
+        for column in resolved:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found")
+            dtype = df[column].dtype
+            if not (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)):
+                raise ValueError(f"Column '{column}' must be numeric to compute correlations")
+        return resolved
+
+    def _prepare(self, df: pd.DataFrame, columns: List[Hashable], method: str) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Centered values with zeros for missing entries, and the validity mask (None without missing values)"""
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported correlation method: {method}")
+        frame = df[columns]
+        if method == "spearman":
+            frame = frame.rank(method="average")
+        values = frame.to_numpy(dtype="float64", na_value=np.nan)
+        valid = ~np.isnan(values)
+        with np.errstate(invalid="ignore"):
+            means = np.nanmean(values, axis=0) if values.size else np.zeros(values.shape[1])
+        # Centering in float64 first keeps the float32 products accurate
+        centered = np.where(valid, values - means, 0.0).astype(self.dtype)
+        mask = None if valid.all() else valid.astype(self.dtype)
+        return centered, mask
+
+    # Correlation kernels
+    @staticmethod
+    def _block(centered: np.ndarray, mask: Optional[np.ndarray], left: slice, right: slice) -> np.ndarray:
+        """Correlations between the column ranges left and right"""
+        x = centered[:, left]
+        y = centered[:, right]
+        if mask is None:
+            products = (x.T @ y).astype("float64")
+            norms_x = np.sqrt(np.einsum("ij,ij->j", x, x, dtype="float64"))
+            norms_y = np.sqrt(np.einsum("ij,ij->j", y, y, dtype="float64"))
+            counts = np.full(products.shape, centered.shape[0], dtype="float64")
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = products / np.outer(norms_x, norms_y)
+        else:
+            mask_x = mask[:, left]
+            mask_y = mask[:, right]
+            counts = (mask_x.T @ mask_y).astype("float64")
+            sum_x = (x.T @ mask_y).astype("float64")
+            sum_y = (mask_x.T @ y).astype("float64")
+            sum_xx = ((x * x).T @ mask_y).astype("float64")
+            sum_yy = (mask_x.T @ (y * y)).astype("float64")
+            sum_xy = (x.T @ y).astype("float64")
+            with np.errstate(invalid="ignore", divide="ignore"):
+                covariance = sum_xy - sum_x * sum_y / counts
+                variance_x = sum_xx - sum_x * sum_x / counts
+                variance_y = sum_yy - sum_y * sum_y / counts
+                result = covariance / np.sqrt(variance_x * variance_y)
+        result[counts < 2] = np.nan
+        return np.clip(result, -1.0, 1.0)
+
+    # Public API
+    def matrix(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[Sequence[Hashable]] = None,
+        method: str = "pearson",
+        version: Optional[Hashable] = None,
+    ) -> pd.DataFrame:
+        """
+        Correlation matrix of df\n
+        :param df (pd.DataFrame): The data
+        :param columns (Optional[Sequence[Hashable]]): Numeric columns to correlate, all numeric columns by default
+        :param method (str): 'pearson' or 'spearman'
+        :param version (Optional[Hashable]): Data version of df, results are cached per version and column set
+        :return (pd.DataFrame): Square correlation matrix, NaN where a pair has fewer than two complete rows
+        """
+        resolved = self._resolve_columns(df, columns)
+        key = (id(df), len(df), version, method, tuple(resolved))
+        if version is not None:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    return cached
+
+        centered, mask = self._prepare(df, resolved, method)
+        everything = slice(0, len(resolved))
+        values = self._block(centered, mask, everything, everything)
+        np.fill_diagonal(values, np.where(np.isnan(np.diag(values)), np.nan, 1.0))
+        result = pd.DataFrame(values, index=pd.Index(resolved), columns=pd.Index(resolved))
+
+        if version is not None:
+            with self._lock:
+                for stale_key in [cached_key for cached_key in self._cache if cached_key[2] != version]:
+                    del self._cache[stale_key]
+                self._cache[key] = result
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+        return result
+
+    def top_pairs(
+        self,
+        df: pd.DataFrame,
+        k: int = 10,
+        columns: Optional[Sequence[Hashable]] = None,
+        method: str = "pearson",
+        version: Optional[Hashable] = None,
+    ) -> pd.DataFrame:
+        """
+        The k column pairs with the strongest absolute correlation\n
+        :param df (pd.DataFrame): The data
+        :param k (int): Number of pairs to return
+        :param columns (Optional[Sequence[Hashable]]): Numeric columns to consider, all numeric columns by default
+        :param method (str): 'pearson' or 'spearman'
+        :param version (Optional[Hashable]): Data version of df, a cached matrix for it is reused
+        :return (pd.DataFrame): Columns 'column_a', 'column_b' and 'correlation', strongest first
+        """
+        resolved = self._resolve_columns(df, columns)
+        cached = None
+        if version is not None:
+            with self._lock:
+                cached = self._cache.get((id(df), len(df), version, method, tuple(resolved)))
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_cols = np.empty(0, dtype=np.int64)
+        best_values = np.empty(0, dtype="float64")
+        column_count = len(resolved)
+        prepared = None
+        for block_start in range(0, column_count, self.BLOCK_COLUMNS):
+            block = slice(block_start, min(block_start + self.BLOCK_COLUMNS, column_count))
+            # Only pairs (i, j) with j > i, the upper triangle
+            right = slice(block_start, column_count)
+            if cached is not None:
+                values = cached.to_numpy()[block, right]
+            else:
+                if prepared is None:
+                    prepared = self._prepare(df, resolved, method)
+                values = self._block(prepared[0], prepared[1], block, right)
+            rows, cols = np.nonzero(np.triu(np.ones(values.shape, dtype=bool), k=1) & ~np.isnan(values))
+            candidates = values[rows, cols]
+            if len(candidates) > k:
+                keep = np.argpartition(-np.abs(candidates), k)[:k]
+                rows, cols, candidates = rows[keep], cols[keep], candidates[keep]
+            best_rows = np.concatenate([best_rows, rows + block_start])
+            best_cols = np.concatenate([best_cols, cols + block_start])
+            best_values = np.concatenate([best_values, candidates])
+            if len(best_values) > k:
+                keep = np.argpartition(-np.abs(best_values), k)[:k]
+                best_rows, best_cols, best_values = best_rows[keep], best_cols[keep], best_values[keep]
+
+        order = np.argsort(-np.abs(best_values), kind="stable")
+        labels = np.asarray(resolved, dtype=object)
+        return pd.DataFrame({
+            "column_a": labels[best_rows[order]] if column_count else [],
+            "column_b": labels[best_cols[order]] if column_count else [],
+            "correlation": best_values[order],
+        })
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
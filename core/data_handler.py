@@ -1,12 +1,29 @@
 import atexit
+import weakref
 import pandas as pd
 from pathlib import Path
 from typing import Any, Dict, Optional, Union, Callable, List
 import numpy as np
 
+from core.aggregation_preview import AggregationPreview, AggregationPreviewEngine
+from core.column_executor import ColumnExecutor
+from core.correlation_engine import CorrelationEngine
 from core.data_io_manager import DataIOManager
 from core.data_mutator import DataMutator, DataOperation, FillMethod, StatisticalTest
+from core.datetime_engine import DatetimeEngine
+from core.duplicate_engine import DuplicateEngine
+from core.filter_engine import FilterEngine
 from core.history_manager import HistoryManager
+from core.join_engine import JoinEngine, JoinPlan
+from core.macro_sql_compiler import MacroSQLCompiler
+from core.memory_estimator import MemoryEstimator
+from core.quantile_engine import QuantileEngine
+from core.sample_engine import SampleEngine, SampleReplay, SampleSession
+from core.sort_engine import SortEngine, SortKey
+from core.sql_engine import SQLEngine
+from core.tempfilehandling.cleanup_temp_files import cleanup_temp_csv_files
+from core.virtual_columns import VirtualColumnEngine
+from core.workspace import DatasetMemory, Workspace, WorkspaceDataset
 
 class DataHandler:
     """
@@ -16,14 +33,81 @@ class DataHandler:
     
     def __init__(self) -> None:
         self._io = DataIOManager()
-        self._mutator = DataMutator()
-        self._history = HistoryManager()
+        self._filter_engine = FilterEngine()
+        self._virtual = VirtualColumnEngine()
+        self._column_executor = ColumnExecutor()
+        self._datetime_engine = DatetimeEngine()
+        self._quantile_engine = QuantileEngine()
+        self._duplicate_engine = DuplicateEngine()
+        self._join_engine = JoinEngine()
+        self._preview_engine = AggregationPreviewEngine()
+        self._mutator = DataMutator(
+            filter_engine=self._filter_engine,
+            virtual_columns=self._virtual,
+            column_executor=self._column_executor,
+            datetime_engine=self._datetime_engine,
+            quantile_engine=self._quantile_engine,
+            duplicate_engine=self._duplicate_engine,
+            join_engine=self._join_engine,
+            preview_engine=self._preview_engine,
+        )
+        self._memory = MemoryEstimator()
+        self._correlation = CorrelationEngine()
+        self._sort_engine = SortEngine()
+        # Created on the first SQL query, it holds a DuckDB connection
+        self._sql: Optional[SQLEngine] = None
+        self._history = HistoryManager(memory_estimator=self._memory)
+        # Set while the app works on a sample, holds the full data and its history
+        self._sample_session: Optional[SampleSession] = None
+        # Open datasets by name, the active one is df/original_df and the current history
+        self._workspace = Workspace(memory_estimator=self._memory)
+        self._active_dataset: Optional[str] = None
         
+        # Bumped on every assignment of df, which includes every applied operation
+        self._data_version: int = 0
         self.df: Optional[pd.DataFrame] = None
         self.original_df: Optional[pd.DataFrame] = None
         
         atexit.register(self.cleanup_temp_files)
     
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        return self._df
+    
+    @df.setter
+    def df(self, value: Optional[pd.DataFrame]) -> None:
+        self._df = value
+        self._data_version += 1
+    
+    @property
+    def filter_engine(self) -> FilterEngine:
+        """Shared filter mask engine, so subsets and plot filters reuse the cached masks"""
+        return self._filter_engine
+    
+    @property
+    def correlation_engine(self) -> CorrelationEngine:
+        """Shared correlation service, so the statistics panel and plots reuse cached matrices"""
+        return self._correlation
+    
+    @property
+    def sql_engine(self) -> SQLEngine:
+        """Shared DuckDB connection of the SQL console, with the current data as the view 'data'"""
+        if self._sql is None:
+            self._sql = SQLEngine()
+        return self._sql
+
+    @property
+    def data_version(self) -> int:
+        return self._data_version
+    
+    @property
+    def is_sample_mode(self) -> bool:
+        return self._sample_session is not None
+
+    @property
+    def sample_session(self) -> Optional[SampleSession]:
+        return self._sample_session
+
     @property
     def file_path(self) -> Optional[Path]:
         return self._io.file_path
@@ -107,15 +191,21 @@ class DataHandler:
     
     def cleanup_temp_files(self) -> None:
         self._io.cleanup_temp_files()
+        for name in self._workspace.names():
+            entry = self._workspace.get(name)
+            if entry.source_state.get("is_temp_file"):
+                cleanup_temp_csv_files(entry.source_state.get("temp_csv_path"))
     
     def read_file(self, filepath: str) -> pd.DataFrame:
         return self._io.read_file(filepath)
     
     def import_file(self, filepath: str) -> pd.DataFrame:
         df = self._io.import_file(filepath)
+        self._sample_session = None
         self.df = df
         self.original_df = df.copy()
         self._reset_history()
+        self._name_active_dataset(Path(filepath).stem, f"File: {Path(filepath).name}")
         return self.df
     
     def import_google_sheets(self, sheet_id: str, sheet_name: str, delimiter: str = ",", decimal: str = ".", thousands: str = None, gid: str = None) -> pd.DataFrame:
@@ -127,16 +217,20 @@ class DataHandler:
             thousands=thousands,
             gid=gid
         )
+        self._sample_session = None
         self.df = df
         self.original_df = df.copy()
         self._reset_history()
+        self._name_active_dataset(sheet_name or "Google Sheet", f"Google Sheet: {sheet_name or gid}")
         return self.df
     
     def import_from_database(self, connection_string: str, query: str) -> pd.DataFrame:
         df, _ = self._io.import_from_database(connection_string, query)
+        self._sample_session = None
         self.df = df
         self.original_df = df.copy()
         self._reset_history()
+        self._name_active_dataset("Query", "Database query")
         return self.df
     
     def refresh_google_sheets(self) -> pd.DataFrame:
@@ -160,6 +254,7 @@ class DataHandler:
             else:
                 data = np.full((rows, len(column_names)), fill_value)
             
+            self._sample_session = None
             self.df = pd.DataFrame(data, index=range(rows), columns=column_names)
             self.original_df = self.df.copy()
             
@@ -170,15 +265,16 @@ class DataHandler:
             self._io.last_db_connection_string = None
             self._io.last_db_query = None
             self._reset_history()
+            self._name_active_dataset("Untitled", "Empty dataset")
             return self.df
         except Exception as CreateEmptyDataframeError:
             raise Exception(f"Error creating DataFrame: {str(CreateEmptyDataframeError)}")
     
     def export_data(self, filepath: str, format: str = "csv", include_index: bool = False) -> None:
-        self._io.export_data(self.df, filepath, format=format, include_index=include_index)
+        self._io.export_data(self.materialize_virtual_columns(), filepath, format=format, include_index=include_index)
     
     def export_google_sheets(self, credentials_path: str, sheet_id: str, sheet_name: str = "Sheet1") -> bool:
-        result = self._io.export_google_sheets(self.df, credentials_path, sheet_id, sheet_name)
+        result = self._io.export_google_sheets(self.materialize_virtual_columns(), credentials_path, sheet_id, sheet_name)
         self._history.operation_log.append({
             "type": "export_google_sheets",
             "sheet_id": sheet_id,
@@ -206,7 +302,7 @@ class DataHandler:
             "dtypes": self.df.dtypes.to_dict(),
             "missing_values": self.df.isnull().sum().to_dict(),
             "statistics": self.df.describe().to_dict(),
-            "memory_usage": self.df.memory_usage(deep=True).to_dict(),
+            "memory_usage": self._memory.frame_usage(self.df),
         }
     
     def _save_state(self) -> None:
@@ -252,15 +348,145 @@ class DataHandler:
     def get_history_info(self) -> Dict[str, Any]:
         return self._history.get_history_info()
 
+    def operation_marker(self) -> tuple:
+        """
+        Token of the current data state for operations_since: the original data it
+        descends from and the last operation log entry
+        """
+        log = self._history.operation_log
+        original_ref = weakref.ref(self.original_df) if self.original_df is not None else None
+        return (original_ref, len(log), log[-1] if log else None)
+
+    def operations_since(self, marker: tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        The operations applied after the state of operation_marker, in order.
+        None when that state is no longer in the history (undone, reset, other data)
+        """
+        original_ref, length, last_entry = marker
+        current_original = original_ref() if original_ref is not None else None
+        if current_original is not self.original_df:
+            return None
+        log = self._history.operation_log
+        if len(log) < length or (length and log[length - 1] is not last_entry):
+            return None
+        return list(log[length:])
+
     def export_pipeline_macro(self, filepath: str) -> None:
         self._history.export_pipeline_macro(filepath)
     
-    def apply_pipeline_macro(self, macro_source: "str | list") -> None:
+    @staticmethod
+    def _flatten_macro_operations(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Expand nested pipeline_macro entries (recorded by fused replays) into their operations"""
+        flat_operations: List[Dict[str, Any]] = []
+        for op in operations:
+            if op.get("type") == "pipeline_macro":
+                flat_operations.extend(DataHandler._flatten_macro_operations(op.get("operations", [])))
+            else:
+                flat_operations.append(op)
+        return flat_operations
+
+    def apply_pipeline_macro(self, macro_source: "str | list", fused: bool = True, engine: str = "pandas") -> None:
+        """
+        Replay a recorded macro against the current data.
+        In fused mode the whole macro runs against one working frame and is recorded
+        as a single history entry, otherwise every step is applied and recorded separately.
+        Fused macros can run on the "duckdb" engine, which compiles supported steps into
+        one SQL query and only falls back to pandas for the remaining steps.
+        Either way a failing step rolls the data back to its pre-macro state.
+        """
         if self.df is None:
             raise ValueError("No data loaded to apply")
 
-        operations = self._history.load_pipeline_macro(macro_source)
+        operations = self._flatten_macro_operations(self._history.load_pipeline_macro(macro_source))
+        if fused:
+            self._apply_pipeline_macro_fused(operations, engine=engine)
+        else:
+            self._apply_pipeline_macro_stepwise(operations)
+
+    def _run_macro_operation(self, df: pd.DataFrame, op_type: str, kwargs: Dict[str, Any], sort_state: Optional[tuple]) -> tuple[pd.DataFrame, Optional[tuple]]:
+        """Apply a single macro operation to df through the mutator without touching history"""
+        if op_type == "filter":
+            df = self._mutator.filter_data(df, column=kwargs.get("column"), condition=kwargs.get("condition"), value=kwargs.get("value"))
+        elif op_type == "filter_multiple":
+            df = self._mutator.filter_data(df, advanced_filters=kwargs.get("filters"))
+        elif op_type == "sort":
+            df, sort_state = self._mutator.sort_data(df, kwargs.get("column"), kwargs.get("ascending", True), sort_state, keys=kwargs.get("keys"))
+        elif op_type == "computed_column":
+            df = self._mutator.create_computed_column(df, kwargs.get("new_column"), kwargs.get("expression"), virtual=kwargs.get("virtual", False))
+        elif op_type == "aggregate":
+            df = self._mutator.aggregate_data(df, kwargs.get("group_by", []), kwargs.get("agg_config", {}), kwargs.get("date_grouping", {}))
+            sort_state = None
+        elif op_type == "melt":
+            df = self._mutator.melt_data(
+                df,
+                kwargs.get("id_vars", []),
+                kwargs.get("value_vars", []),
+                kwargs.get("var_name", "variable"),
+                kwargs.get("value_name", "value"),
+            )
+            sort_state = None
+        elif op_type == "pivot":
+            df = self._mutator.pivot_data(df, kwargs.get("index", []), kwargs.get("columns", ""), kwargs.get("values", []), kwargs.get("aggfunc", "mean"))
+            sort_state = None
+        elif op_type == "sql_query":
+            df = VirtualColumnEngine.clear_definitions(SQLEngine.query_frame(self._virtual.materialize(df), kwargs.get("sql")))
+            sort_state = None
+        elif op_type == "bin_column":
+            df = self._mutator.bin_column(df, kwargs.get("column"), kwargs.get("new_column"), kwargs.get("method"), kwargs.get("bins"), kwargs.get("labels"), rank_error=kwargs.get("rank_error"))
+        elif op_type == "update_cell":
+            df = self._mutator.update_cell(df, kwargs.get("row"), kwargs.get("col"), kwargs.get("value"))
+        elif op_type == "paste_block":
+            if kwargs.get("rows") is not None:
+                # Pasted into a sorted view, the target rows are listed explicitly
+                df, _ = self._mutator.paste_block(df, 0, kwargs.get("col"), kwargs.get("values", []), row_positions=kwargs.get("rows"))
+            else:
+                df, _ = self._mutator.paste_block(df, kwargs.get("row"), kwargs.get("col"), kwargs.get("values", []))
+        else:
+            df, sort_state = self._mutator.clean_data(df, op_type, sort_state, **kwargs)
+        return df, sort_state
+
+    def _apply_pipeline_macro_fused(self, operations: List[Dict[str, Any]], engine: str = "pandas") -> None:
+        """
+        Run the macro against a single working copy of the data.
+        Only one snapshot (the untouched pre-macro frame) and one log entry are recorded,
+        and nothing is committed unless every step succeeds.
+        """
+        working_df = self.df.copy()
+        sort_state = self._history.sort_state
+        executed_operations = [
+            op for op in operations
+            if op.get("type", "unknown") not in ["unknown", "merge", "concatenate", "export_google_sheets"]
+        ]
+        current_op_type = "Unknown"
+
+        def run_operation(df: pd.DataFrame, op_type: str, kwargs: Dict[str, Any], state: Optional[tuple]) -> tuple[pd.DataFrame, Optional[tuple]]:
+            nonlocal current_op_type
+            current_op_type = op_type
+            return self._run_macro_operation(df, op_type, kwargs, state)
+
+        try:
+            if engine == "duckdb" and executed_operations:
+                working_df, sort_state = MacroSQLCompiler().run(working_df, executed_operations, run_operation, sort_state)
+            else:
+                for op in executed_operations:
+                    kwargs = {k: v for k, v in op.items() if k != "type"}
+                    working_df, sort_state = run_operation(working_df, op.get("type"), kwargs, sort_state)
+        except Exception as e:
+            raise Exception(
+                f"Macro execution aborted. Data rolled back to original state.\n"
+                f"Reason: Failed on operation '{current_op_type}' -> {str(e)}"
+            )
+
+        if not executed_operations:
+            return
+
+        # The pre-macro frame is never mutated again, so it becomes the snapshot as is
+        self._history.save_state(self.df, copy=False)
+        self._history.sort_state = sort_state
+        self._apply_changes(working_df, {"type": "pipeline_macro", "operations": executed_operations})
 
+    def _apply_pipeline_macro_stepwise(self, operations: List[Dict[str, Any]]) -> None:
+        """Replay each operation through the public API, one history entry per step"""
         df_backup = self.df.copy()
         log_backup = self._history.operation_log.copy()
         redo_backup = self._history.redo_stack.copy()
@@ -286,11 +512,13 @@ class DataHandler:
                     self.sort_data(
                         column=kwargs.get("column"),
                         ascending=kwargs.get("ascending", True),
+                        keys=kwargs.get("keys"),
                     )
                 elif current_op_type == "computed_column":
                     self.create_computed_column(
                         new_column_name=kwargs.get("new_column"),
                         expression=kwargs.get("expression"),
+                        virtual=kwargs.get("virtual", False),
                     )
                 elif current_op_type == "aggregate":
                     self.aggregate_data(
@@ -312,6 +540,8 @@ class DataHandler:
                         values=kwargs.get("values", []),
                         aggfunc=kwargs.get("aggfunc", "mean"),
                     )
+                elif current_op_type == "sql_query":
+                    self.apply_sql_query(sql=kwargs.get("sql"))
                 elif current_op_type == "bin_column":
                     self.bin_column(
                         column=kwargs.get("column"),
@@ -319,6 +549,7 @@ class DataHandler:
                         method=kwargs.get("method"),
                         bins=kwargs.get("bins"),
                         labels=kwargs.get("labels"),
+                        rank_error=kwargs.get("rank_error"),
                     )
                 elif current_op_type == "update_cell":
                     self.update_cell(
@@ -326,6 +557,21 @@ class DataHandler:
                         column_index=kwargs.get("col"),
                         value=kwargs.get("value"),
                     )
+                elif current_op_type == "paste_block":
+                    if kwargs.get("rows") is not None:
+                        # Pasted into a sorted view, the target rows are listed explicitly
+                        self.paste_block(
+                            start_row=0,
+                            start_column=kwargs.get("col"),
+                            block=kwargs.get("values", []),
+                            row_order=np.asarray(kwargs.get("rows"), dtype=np.int64),
+                        )
+                    else:
+                        self.paste_block(
+                            start_row=kwargs.get("row"),
+                            start_column=kwargs.get("col"),
+                            block=kwargs.get("values", []),
+                        )
                 elif current_op_type in ["merge", "concatenate", "export_google_sheets"]:
                     continue
                 else:
@@ -340,11 +586,396 @@ class DataHandler:
                 f"Reason: Failed on operation '{current_op_type}' -> {str(e)}"
             )
     
+    def enable_sample_mode(self, fraction: float = 0.01, stratify_by: Optional[List[str]] = None, seed: int = 0) -> pd.DataFrame:
+        """
+        Continue on a reproducible sample of the data, see SampleEngine.
+        The full data, its original state and its history are set aside: operations,
+        previews and plots run on the sample with a history of their own until the
+        sample is applied to the full data or discarded.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        if self._sample_session is not None:
+            raise ValueError("Sample mode is already active")
+        sample_df = SampleEngine.sample(self.df, fraction, stratify_by, seed)
+        self._sample_session = SampleSession(
+            full_df=self.df,
+            original_df=self.original_df,
+            history_state=self._history.suspend(),
+            fraction=float(fraction),
+            stratify_by=list(stratify_by or []),
+            seed=seed,
+        )
+        self.original_df = sample_df.copy()
+        self.df = sample_df
+        return self.df
+
+    def disable_sample_mode(self) -> pd.DataFrame:
+        """Discard the sample and its operations and return to the full data as it was"""
+        if self._sample_session is None:
+            raise ValueError("Sample mode is not active")
+        session = self._sample_session
+        self._sample_session = None
+        self._history.resume(session.history_state)
+        self.original_df = session.original_df
+        self.df = session.full_df
+        return self.df
+
+    def replay_sample_on_full(
+        self,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> SampleReplay:
+        """
+        Run the operations recorded on the sample against a copy of the full data.
+        Nothing is committed, so this can run in a worker thread, see commit_sample_replay.
+        Cell edits, pastes, merges and appends only applied to the sample and are skipped.
+        Raises InterruptedError when is_cancelled returns True between two operations.
+        """
+        if self._sample_session is None:
+            raise ValueError("Sample mode is not active")
+        session = self._sample_session
+        source_log = self._history.operation_log.copy()
+        operations, skipped_operations = SampleEngine.split_replayable(self._flatten_macro_operations(source_log))
+        working_df = session.full_df.copy()
+        sort_state = session.history_state["sort_state"]
+
+        for index, op in enumerate(operations):
+            if is_cancelled is not None and is_cancelled():
+                raise InterruptedError("Replay on the full dataset was cancelled")
+            op_type = op.get("type")
+            if progress_callback is not None:
+                progress_callback(index, len(operations), op_type)
+            kwargs = {k: v for k, v in op.items() if k != "type"}
+            try:
+                working_df, sort_state = self._run_macro_operation(working_df, op_type, kwargs, sort_state)
+            except Exception as e:
+                raise Exception(
+                    f"Replay on the full dataset aborted, the full data is unchanged.\n"
+                    f"Reason: Failed on operation '{op_type}' -> {str(e)}"
+                )
+        if progress_callback is not None:
+            progress_callback(len(operations), len(operations), "")
+        return SampleReplay(working_df, sort_state, operations, skipped_operations, source_log)
+
+    def commit_sample_replay(self, replay: SampleReplay) -> pd.DataFrame:
+        """
+        Leave sample mode with the replayed full data.
+        The full data's history is restored and the replay is added to it as one
+        pipeline_macro entry, so a single undo returns to the full data before sampling.
+        """
+        if self._sample_session is None:
+            raise ValueError("Sample mode is not active")
+        current_log = self._history.operation_log
+        if len(current_log) != len(replay.source_log) or any(a is not b for a, b in zip(current_log, replay.source_log)):
+            raise ValueError("The sample was changed while the replay was running, apply it again")
+
+        session = self._sample_session
+        self._sample_session = None
+        self._history.resume(session.history_state)
+        self.original_df = session.original_df
+        if not replay.operations:
+            self.df = session.full_df
+            return self.df
+
+        # The full frame was only copied by the replay, so it becomes the snapshot as is
+        self._history.save_state(session.full_df, copy=False)
+        self._history.sort_state = replay.sort_state
+        return self._apply_changes(replay.df, {"type": "pipeline_macro", "operations": replay.operations})
+
+    def apply_sample_to_full(
+        self,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> SampleReplay:
+        """Replay the sample's operations on the full data and commit the result"""
+        replay = self.replay_sample_on_full(progress_callback, is_cancelled)
+        self.commit_sample_replay(replay)
+        return replay
+
+    @property
+    def active_dataset(self) -> Optional[str]:
+        """Name of the workspace dataset held in df, None when no data is loaded"""
+        self._ensure_active_dataset()
+        return self._active_dataset
+
+    def _ensure_active_dataset(self) -> None:
+        # Data assigned to df directly (projects, tests) becomes a dataset on first use
+        if self._active_dataset is None and self.df is not None:
+            self._name_active_dataset("Dataset")
+
+    def _name_active_dataset(self, name: str, description: str = "") -> None:
+        """Register freshly loaded data as the active dataset, renaming it when one is active"""
+        if self._active_dataset is None:
+            self._active_dataset = self._workspace.add(
+                WorkspaceDataset(self._workspace.unique_name(name), description=description)
+            ).name
+            return
+        new_name = self._workspace.unique_name(name, exclude=self._active_dataset)
+        self._workspace.rename(self._active_dataset, new_name)
+        self._active_dataset = new_name
+        entry = self._workspace.get(new_name)
+        entry.parent, entry.description = None, description
+
+    def _stash_active_dataset(self) -> None:
+        """Move the active data, its history and its source into its workspace entry"""
+        if self._sample_session is not None:
+            raise ValueError("Apply or discard the sample before changing the active dataset")
+        if self._active_dataset is None:
+            return
+        entry = self._workspace.get(self._active_dataset)
+        entry.df, entry.original_df = self.df, self.original_df
+        entry.history_state = self._history.suspend()
+        entry.source_state = self._io.get_source_state()
+
+    def _activate_dataset(self, name: str) -> pd.DataFrame:
+        entry = self._workspace.get(name)
+        if entry.history_state is not None:
+            self._history.resume(entry.history_state)
+        else:
+            self._reset_history()
+        self._io.set_source_state(entry.source_state)
+        self.original_df = entry.original_df
+        self._active_dataset = name
+        self.df = entry.df
+        entry.df, entry.original_df, entry.history_state, entry.source_state = None, None, None, {}
+        return self.df
+
+    def dataset_names(self) -> List[str]:
+        self._ensure_active_dataset()
+        return self._workspace.names()
+
+    def dataset_info(self, name: str) -> WorkspaceDataset:
+        """The workspace entry of a dataset, its frames are None for the active dataset"""
+        self._ensure_active_dataset()
+        return self._workspace.get(name)
+
+    def dataset_frame(self, name: str) -> Optional[pd.DataFrame]:
+        """The data of an open dataset without activating it"""
+        self._ensure_active_dataset()
+        if name == self._active_dataset:
+            return self.df
+        return self._workspace.get(name).df
+
+    def add_dataset(self, name: str, df: pd.DataFrame, parent: Optional[str] = None, description: str = "", activate: bool = False) -> str:
+        """
+        Open df as another dataset next to the current one.
+        Arrow backed columns share their buffers with df, NumPy columns are copied so
+        in place cell edits of one dataset never show up in another (see Workspace).
+
+        :param name (str): Requested name, made unique with a (2), (3)... suffix
+        :param df (pd.DataFrame): The data, e.g. a subset, an aggregation or a join result
+        :param parent (str): Name of the dataset df was derived from
+        :param activate (bool): Make the new dataset the active one
+        :return (str): The name the dataset was opened under
+        """
+        if df is None:
+            raise ValueError("No data to open as a dataset")
+        self._ensure_active_dataset()
+        if parent is not None:
+            self._workspace.get(parent)
+        shared_df = df.copy()
+        dataset = self._workspace.add(
+            WorkspaceDataset(
+                self._workspace.unique_name(name),
+                df=shared_df,
+                original_df=shared_df.copy(),
+                parent=parent,
+                description=description,
+            )
+        )
+        if activate:
+            self.switch_dataset(dataset.name)
+        return dataset.name
+
+    def duplicate_dataset(self, name: str, new_name: Optional[str] = None, columns: Optional[List[Any]] = None, activate: bool = False) -> str:
+        """Open a copy of a dataset, or of some of its columns, that references its Arrow buffers"""
+        source_df = self.dataset_frame(name)
+        if source_df is None:
+            raise ValueError(f"The dataset '{name}' has no data")
+        if columns:
+            missing = [column for column in columns if column not in source_df.columns]
+            if missing:
+                raise ValueError(f"Columns not found in '{name}': {missing}")
+            # Virtual columns can reference columns that are left out
+            source_df = VirtualColumnEngine.set_definitions(source_df[list(columns)], {})
+        description = f"Columns of {name}" if columns else f"Copy of {name}"
+        return self.add_dataset(new_name or f"{name} copy", source_df, parent=name, description=description, activate=activate)
+
+    def open_dataset(self, filepath: str) -> pd.DataFrame:
+        """Import a file as a new dataset and make it active, keeping the open ones"""
+        self._ensure_active_dataset()
+        previous = self._active_dataset
+        self._stash_active_dataset()
+        self._active_dataset = None
+        # The stashed dataset keeps its temporary file, the import must not delete it
+        self._io.set_source_state({})
+        try:
+            return self.import_file(filepath)
+        except Exception:
+            if previous is not None:
+                self._activate_dataset(previous)
+            raise
+
+    def switch_dataset(self, name: str) -> pd.DataFrame:
+        """Make another open dataset the active one, each dataset keeps its own undo history"""
+        self._ensure_active_dataset()
+        self._workspace.get(name)
+        if name == self._active_dataset:
+            return self.df
+        self._stash_active_dataset()
+        return self._activate_dataset(name)
+
+    def rename_dataset(self, name: str, new_name: str) -> str:
+        self._ensure_active_dataset()
+        new_name = str(new_name).strip()
+        self._workspace.rename(name, new_name)
+        if self._active_dataset == name:
+            self._active_dataset = new_name
+        return new_name
+
+    def close_dataset(self, name: str) -> Optional[str]:
+        """
+        Close a dataset and free the buffers no other dataset references.
+        Closing the active dataset activates its neighbour, returns the new active name
+        """
+        self._ensure_active_dataset()
+        entry = self._workspace.get(name)
+        if name != self._active_dataset:
+            self._workspace.remove(name)
+            if entry.source_state.get("is_temp_file"):
+                cleanup_temp_csv_files(entry.source_state.get("temp_csv_path"))
+            return self._active_dataset
+        if self._sample_session is not None:
+            raise ValueError("Apply or discard the sample before closing the active dataset")
+
+        position = self._workspace.names().index(name)
+        self._workspace.remove(name)
+        self._io.cleanup_temp_files()
+        self._active_dataset = None
+        remaining = self._workspace.names()
+        if remaining:
+            self._activate_dataset(remaining[max(0, position - 1)])
+            return self._active_dataset
+        self._reset_history()
+        self._io.set_source_state({})
+        self.original_df = None
+        self.df = None
+        return None
+
+    def clear_workspace(self) -> None:
+        """Close every dataset except the active one"""
+        for name in self._workspace.names():
+            if name != self._active_dataset:
+                self.close_dataset(name)
+        if self.df is None and self._active_dataset is not None:
+            self._workspace.remove(self._active_dataset)
+            self._active_dataset = None
+
+    def dataset_memory(self) -> Dict[str, DatasetMemory]:
+        """Memory of every open dataset with the bytes it shares with the others, see Workspace.memory_usage"""
+        names = self.dataset_names()
+        frames = {name: self.dataset_frame(name) for name in names}
+        history_bytes = {}
+        for name in names:
+            if name == self._active_dataset:
+                history_bytes[name] = self._history.current_memory_bytes
+            else:
+                state = self._workspace.get(name).history_state
+                history_bytes[name] = state["current_memory_bytes"] if state else 0
+        return self._workspace.memory_usage(frames, history_bytes)
+
     def run_statistical_test(self, test_type: "Union[StatisticalTest, str]", col1: str, col2: str) -> Dict[str, Any]:
         return self._mutator.run_statistical_test(self.df, test_type, col1, col2)
     
-    def detect_outliers(self, method: str, columns: List[str], **kwargs) -> List[int]:
-        return self._mutator.detect_outliers(self.df, method, columns, **kwargs)
+    def correlation_matrix(self, columns: Optional[List[str]] = None, method: str = "pearson") -> pd.DataFrame:
+        if self.df is None:
+            raise ValueError("No data loaded")
+        return self._correlation.matrix(self.df, columns, method=method, version=self._data_version)
+    
+    def top_correlations(self, k: int = 10, columns: Optional[List[str]] = None, method: str = "pearson") -> pd.DataFrame:
+        if self.df is None:
+            raise ValueError("No data loaded")
+        return self._correlation.top_pairs(self.df, k, columns, method=method, version=self._data_version)
+    
+    def detect_outliers(self, method: str, columns: List[str], is_cancelled: Optional[Callable[[], bool]] = None, **kwargs) -> np.ndarray:
+        return self._mutator.detect_outliers(self.df, method, columns, is_cancelled=is_cancelled, **kwargs)
+
+    def _apply_outliers(self, action: DataOperation, mask: Optional[np.ndarray], method: str, columns: List[str], settings: Dict[str, Any], **kwargs) -> pd.DataFrame:
+        if self.df is None:
+            raise ValueError("No data loaded")
+        outliers = {"method": method, "columns": list(columns), **settings}
+        if mask is None:
+            mask = self.detect_outliers(method, columns, **settings)
+        # The detected mask is applied, the log holds the settings so a replay, e.g. of a
+        # sample's operations on the full data, detects the outliers of the data it runs on
+        # A shallow copy keeps self.df unchanged until the step succeeded and is snapshotted
+        changed_df, new_sort_state = self._mutator.clean_data(self.df.copy(deep=False), action, self._history.sort_state, mask=mask, **kwargs)
+        self._save_state()
+        return self._apply_changes(changed_df, {"type": action.value, **kwargs, "outliers": outliers}, new_sort_state=new_sort_state)
+
+    def remove_outliers(self, method: str, columns: List[str], mask: Optional[np.ndarray] = None, **settings) -> pd.DataFrame:
+        """
+        Remove the rows detect_outliers(method, columns, **settings) marks, with one history entry.
+        mask is the result of that detection when it was already run, e.g. by the outlier dialog.
+        """
+        return self._apply_outliers(DataOperation.REMOVE_ROWS, mask, method, columns, settings)
+
+    def flag_outliers(self, new_column_name: str, method: str, columns: List[str], mask: Optional[np.ndarray] = None, **settings) -> pd.DataFrame:
+        """Add a boolean column marking the rows detect_outliers(method, columns, **settings) finds, see remove_outliers"""
+        return self._apply_outliers(DataOperation.FLAG_OUTLIERS, mask, method, columns, settings, new_column_name=new_column_name)
+
+    def remove_rows(self, positions: "List[int] | np.ndarray") -> pd.DataFrame:
+        """
+        Remove the rows at positions, e.g. a table multi-selection, with one history entry.
+        Rows are logged by their row ids (index labels) when those are unique, so replaying
+        the log removes the same records even after earlier rows were removed or reordered.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        row_mask = np.zeros(len(self.df), dtype=bool)
+        row_mask[np.asarray(positions, dtype=np.int64)] = True
+        if self.df.index.is_unique:
+            return self.clean_data(DataOperation.REMOVE_ROWS, rows=self.df.index[row_mask].tolist())
+        # Repeated labels do not identify a row, the positions of the removed rows are logged instead
+        return self.clean_data(DataOperation.REMOVE_ROWS, positions=np.flatnonzero(row_mask).tolist())
+
+    def duplicate_summary(self, subset: Optional[List[Any]] = None, keep: Union[str, bool] = "first", examples: int = 10) -> Dict[str, Any]:
+        """
+        Duplicate counts and the largest duplicate groups for the key columns subset (all columns
+        by default). The row hashes are cached until the key columns change, so changing keep or
+        removing the duplicates afterwards does not hash the rows again
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        return self._duplicate_engine.summary(self.df, subset, keep, examples=examples)
+
+    def duplicate_mask(self, subset: Optional[List[Any]] = None, keep: Union[str, bool] = "first") -> np.ndarray:
+        """Positional mask of the rows remove_duplicates(subset, keep) would remove"""
+        if self.df is None:
+            raise ValueError("No data loaded")
+        return self._duplicate_engine.duplicate_mask(self.df, subset, keep)
+
+    def remove_duplicates(self, subset: Optional[List[Any]] = None, keep: Union[str, bool] = "first") -> pd.DataFrame:
+        """
+        Remove duplicate rows of the key columns subset with one history entry, keeping the
+        first, the last or (keep=False) none of the copies
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        kwargs = {"subset": list(subset) if subset else None, "keep": keep}
+        changed_df, new_sort_state = self._mutator.clean_data(self.df, DataOperation.DROP_DUPLICATES, self._history.sort_state, **kwargs)
+        # The removal takes the kept rows into a new frame, so the current frame becomes the snapshot as is
+        self._history.save_state(self.df, copy=changed_df is self.df)
+        return self._apply_changes(changed_df, {"type": DataOperation.DROP_DUPLICATES.value, **kwargs}, new_sort_state=new_sort_state)
+
+    def row_positions(self, row_ids: "List[Any] | np.ndarray") -> np.ndarray:
+        """Current positions of rows by row id (index label), -1 for rows that are gone"""
+        if self.df is None:
+            return np.full(len(row_ids), -1, dtype=np.int64)
+        if not self.df.index.is_unique:
+            raise ValueError("Row ids are not unique, rows cannot be located by id")
+        return self.df.index.get_indexer(pd.Index(row_ids))
 
     def _apply_changes(self, changed_df: pd.DataFrame, log_entry: Dict[str, Any], new_sort_state: Optional[tuple] = None) -> pd.DataFrame:
         self.df = changed_df
@@ -353,12 +984,53 @@ class DataHandler:
             self._history.sort_state = new_sort_state
         return self.df
     
+    def _invalidate_engines(self, series: pd.Series) -> None:
+        """Drop the cached results of a column whose values were changed in place"""
+        self._memory.invalidate(series)
+        self._filter_engine.invalidate(series)
+        self._datetime_engine.invalidate(series)
+        self._quantile_engine.invalidate(series)
+        self._duplicate_engine.invalidate(series)
+
     def update_cell(self, row_index: int, column_index: int, value: Any) -> None:
         if self.df is None:
             return
         self._save_state()
         changed_df = self._mutator.update_cell(self.df, row_index, column_index, value)
+        self._invalidate_engines(changed_df.iloc[:, column_index])
         self._apply_changes(changed_df, {"type": "update_cell", "row": row_index, "col": column_index, "value": value})
+
+    def paste_block(self, start_row: int, start_column: int, block: "str | List[List[Any]]", row_order: "Optional[np.ndarray]" = None) -> tuple[int, int]:
+        """
+        Paste a block of cells (clipboard text or parsed rows) with one history entry.
+        With the row_order of a sorted view, start_row is a row of the view.
+        Returns the (rows, columns) footprint that was written.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        if isinstance(block, str):
+            block = self._mutator.parse_clipboard_block(block)
+        if not block:
+            return 0, 0
+        # The paste writes into a copy, so a rejected block leaves no history entry and the
+        # current frame becomes the snapshot as is
+        changed_df, footprint = self._mutator.paste_block(self.df.copy(), start_row, start_column, block, row_positions=row_order)
+        self._history.save_state(self.df, copy=False)
+        rows_written, columns_written = footprint
+        for column_index in range(start_column, start_column + columns_written):
+            self._invalidate_engines(changed_df.iloc[:, column_index])
+        log_entry = {
+            "type": "paste_block",
+            "row": start_row,
+            "col": start_column,
+            "values": [row[:columns_written] for row in block[:rows_written]],
+        }
+        if row_order is not None:
+            rows = [int(position) for position in np.asarray(row_order)[start_row:start_row + rows_written]]
+            log_entry["row"] = rows[0]
+            log_entry["rows"] = rows
+        self._apply_changes(changed_df, log_entry)
+        return footprint
         
     def filter_data(self, column: str = None, condition: str = None, value: Any = None, advanced_filters: List[Dict] = None) -> pd.DataFrame:
         if self.df is None:
@@ -384,24 +1056,63 @@ class DataHandler:
             return self.filter_data(advanced_filters=filter_config.get("filters", []))
         return self.df
     
-    def sort_data(self, column: str, ascending: bool = True) -> pd.DataFrame:
+    def sort_data(self, column: str, ascending: bool = True, keys: Optional[List[SortKey]] = None) -> pd.DataFrame:
+        """Sort the data by column, or by (column, ascending) keys, most significant first, as logged by commit_view_sort"""
         if self.df is None:
             raise ValueError("No data loaded")
-        if self._history.sort_state == (column, ascending):
+        keys = [(key_column, bool(key_ascending)) for key_column, key_ascending in keys] if keys else None
+        if keys and len(keys) == 1:
+            column, ascending = keys[0]
+            keys = None
+        if not keys and self._history.sort_state == (column, ascending):
             return self.df
         try:
             self._save_state()
             changed_df, new_sort_state = self._mutator.sort_data(
-                self.df, column, ascending, self._history.sort_state
+                self.df, column, ascending, self._history.sort_state, keys=keys
             )
+            log_entry: Dict[str, Any] = {"type": "sort", "column": column, "ascending": ascending}
+            if keys:
+                log_entry["column"], log_entry["ascending"] = keys[0]
+                log_entry["keys"] = [list(key) for key in keys]
             return self._apply_changes(
                 changed_df,
-                {"type": "sort", "column": column, "ascending": ascending},
+                log_entry,
                 new_sort_state=new_sort_state,
             )
         except Exception as SortDataError:
             raise Exception(f"Error sorting data: {str(SortDataError)}")
     
+    def view_sort_permutation(self, keys: List[SortKey]) -> "np.ndarray":
+        """Row order for viewing the data sorted by keys, the data itself is not changed"""
+        if self.df is None:
+            raise ValueError("No data loaded")
+        return self._sort_engine.permutation(self.df, keys, version=self._data_version)
+    
+    def commit_view_sort(self, keys: List[SortKey], permutation: "Optional[np.ndarray]" = None) -> pd.DataFrame:
+        """
+        Reorder the data by a view sort as one history entry\n
+        :param keys (List[SortKey]): (column, ascending) pairs, most significant first
+        :param permutation (Optional[np.ndarray]): The row order shown by the view, looked up by keys when omitted
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        keys = [(column, bool(ascending)) for column, ascending in keys]
+        if not keys:
+            raise ValueError("At least one sort column is required")
+        if permutation is None:
+            permutation = self.view_sort_permutation(keys)
+        if len(permutation) != len(self.df):
+            raise ValueError("The view sort no longer matches the data")
+        try:
+            self._save_state()
+            log_entry: Dict[str, Any] = {"type": "sort", "column": keys[0][0], "ascending": keys[0][1]}
+            if len(keys) > 1:
+                log_entry["keys"] = [list(key) for key in keys]
+            return self._apply_changes(self.df.take(permutation), log_entry, new_sort_state=keys[0])
+        except Exception as SortDataError:
+            raise Exception(f"Error sorting data: {str(SortDataError)}")
+    
     def aggregate_data(self, group_by: List[str], agg_config: Dict[str, str], date_grouping: Dict[str, str]) -> pd.DataFrame:
         if self.df is None:
             raise ValueError("No data loaded")
@@ -419,11 +1130,70 @@ class DataHandler:
             new_sort_state=None,
         )
 
-    def preview_aggregation(self, group_by: List[str], agg_config: Dict[str, str], date_grouping: Dict[str, str] = None, limit: int = 5,) -> pd.DataFrame:
+    def preview_aggregation(
+        self,
+        group_by: List[str],
+        agg_config: Dict[str, str],
+        date_grouping: Dict[str, str] = None,
+        limit: Optional[int] = 5,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> AggregationPreview:
         return self._mutator.preview_aggregation(
-            self.df, group_by, agg_config, date_grouping, limit
+            self.df, group_by, agg_config, date_grouping, limit, is_cancelled=is_cancelled
+        )
+
+    def preview_resample(self, on: str, frequency: str, aggregations: Dict[str, List[str]], fill: str = "none", sample_rows: int = 100_000, limit: int = 20) -> pd.DataFrame:
+        return self._mutator.preview_resample(
+            self.df, on, frequency, aggregations, fill, sample_rows, limit
         )
     
+    def run_sql(
+        self,
+        sql: str,
+        tables: Optional[Dict[str, pd.DataFrame]] = None,
+        limit: Optional[int] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Run a SQL query over the current data (view 'data', virtual columns included)
+        and the given tables, e.g. {'subset_north': df}. Nothing is changed or logged.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        frames = {SQLEngine.DATA_VIEW: (self.materialize_virtual_columns(), self._data_version)}
+        for name, df in (tables or {}).items():
+            frames[name] = (df, None)
+        self.sql_engine.sync_views(frames)
+        arrow_backed = any(isinstance(dtype, pd.ArrowDtype) for dtype in self.df.dtypes)
+        return self.sql_engine.execute(sql, limit=limit, arrow_backed=arrow_backed, is_cancelled=is_cancelled, progress_callback=progress_callback)
+
+    def apply_sql_query(self, sql: str, tables: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+        """
+        Replace the data with the result of a SQL query, as one history entry.
+        Only the view 'data' can be read: the log records the query alone, and views of
+        subsets, aggregations or other datasets would not exist when it is replayed.
+        """
+        if tables:
+            raise ValueError(
+                f"Queries reading {', '.join(repr(name) for name in tables)} cannot be replayed from the history, "
+                "only queries on 'data' can replace the data"
+            )
+        return self.commit_sql_query(sql, self.run_sql(sql))
+
+    def commit_sql_query(self, sql: str, result_df: pd.DataFrame, data_version: Optional[int] = None) -> pd.DataFrame:
+        """
+        Replace the data with result_df, the result of run_sql(sql), as one history entry.
+        The query can run in a worker thread and be committed from the UI thread, data_version
+        is the data_version it ran on and a result of data that changed since is refused.
+        """
+        if data_version is not None and data_version != self._data_version:
+            raise ValueError("The data changed while the query was running, run it again")
+        changed_df = VirtualColumnEngine.clear_definitions(result_df)
+        self._save_state()
+        self._history.sort_state = None
+        return self._apply_changes(changed_df, {"type": "sql_query", "sql": sql}, new_sort_state=None)
+
     def melt_data(self, id_vars: List[str], value_vars: List[str], var_name: str, value_name: str,) -> pd.DataFrame:
         if self.df is None:
             raise ValueError("No data loaded")
@@ -453,6 +1223,15 @@ class DataHandler:
             new_sort_state=None,
         )
 
+    def plan_merge(self, right_df: pd.DataFrame, left_on: List[str], right_on: List[str]) -> JoinPlan:
+        """
+        Left only, matched and right only row counts of joining the data with right_df, from
+        key value counts instead of running the join (estimated for very large inputs)
+        """
+        if self.df is None:
+            raise ValueError("No active data to merge with.")
+        return self._join_engine.plan(self.df, right_df, left_on, right_on)
+
     def merge_data(self, right_df: pd.DataFrame, how: str, left_on: List[str], right_on: List[str], suffixes: tuple = ("_left", "_right"),) -> pd.DataFrame:
         if self.df is None:
             raise ValueError("No active data to merge with.")
@@ -475,34 +1254,61 @@ class DataHandler:
             new_sort_state=None,
         )
 
-    def create_computed_column(self, new_column_name: str, expression: str) -> pd.DataFrame:
+    def create_computed_column(self, new_column_name: str, expression: str, virtual: bool = False) -> pd.DataFrame:
         if self.df is None:
             raise ValueError("No data loaded")
         self._save_state()
-        changed_df = self._mutator.create_computed_column(self.df, new_column_name, expression)
-        return self._apply_changes(
-            changed_df,
-            {"type": "computed_column", "new_column": new_column_name, "expression": expression},
-        )
+        changed_df = self._mutator.create_computed_column(self.df, new_column_name, expression, virtual=virtual)
+        log_entry = {"type": "computed_column", "new_column": new_column_name, "expression": expression}
+        if virtual:
+            log_entry["virtual"] = True
+        return self._apply_changes(changed_df, log_entry)
+
+    @property
+    def virtual_columns(self) -> Dict[str, str]:
+        """The {name: expression} virtual computed columns of the current data"""
+        return VirtualColumnEngine.get_definitions(self.df)
 
-    def bin_column(self, column: str, new_column_name: str, method: str, bins: Any, labels: List[str] = None, right_inclusive: bool = True, drop_original: bool = False) -> pd.DataFrame:
+    def evaluate_virtual_column(self, name: str, start: Optional[int] = None, stop: Optional[int] = None) -> pd.Series:
+        """Evaluate (a row range of) a virtual column of the current data, cached per data version"""
+        if self.df is None:
+            raise ValueError("No data loaded")
+        return self._virtual.evaluate(self.df, name, start, stop, version=self._data_version)
+
+    def materialize_virtual_columns(self, df: Optional[pd.DataFrame] = None, names: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Return df (the current data by default) with virtual columns added as real columns,
+        for consumers such as plots and exports that need the values
+        """
+        if df is None:
+            df = self.df
+        if df is None:
+            return None
+        if df is self.df:
+            return self._virtual.materialize(df, names, version=self._data_version)
+        # Frames derived from the data (subsets, filtered copies) may not carry the definitions
+        if not VirtualColumnEngine.get_definitions(df) and self.virtual_columns:
+            df = VirtualColumnEngine.set_definitions(df.copy(deep=False), self.virtual_columns)
+        return self._virtual.materialize(df, names)
+
+    def bin_column(self, column: str, new_column_name: str, method: str, bins: Any, labels: List[str] = None, right_inclusive: bool = True, drop_original: bool = False, rank_error: Optional[float] = None) -> pd.DataFrame:
         if self.df is None:
             raise ValueError("No data loaded")
         self._save_state()
         changed_df = self._mutator.bin_column(
-            self.df, column, new_column_name, method, bins, labels, right_inclusive, drop_original
-        )
-        return self._apply_changes(
-            changed_df,
-            {
-                "type": "bin_column",
-                "column": column,
-                "new_column": new_column_name,
-                "method": method,
-                "bins": bins,
-                "labels": labels,
-            },
+            self.df, column, new_column_name, method, bins, labels, right_inclusive, drop_original, rank_error
         )
+        log_entry = {
+            "type": "bin_column",
+            "column": column,
+            "new_column": new_column_name,
+            "method": method,
+            "bins": bins,
+            "labels": labels,
+        }
+        if method == "approx_qcut":
+            log_entry["rank_error"] = rank_error
+        return self._apply_changes(changed_df, log_entry)
 
     def clean_data(self, action: "DataOperation | str", **kwargs) -> pd.DataFrame:
         """Dispatch a cleaning/mutation action via the DataMutator registry."""
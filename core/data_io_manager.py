@@ -22,6 +22,20 @@ class DataIOManager:
     Also handles all file source information
     """
     
+    SOURCE_FIELDS = (
+        "file_path",
+        "temp_csv_path",
+        "is_temp_file",
+        "last_gsheet_id",
+        "last_gsheet_name",
+        "last_gsheet_delimiter",
+        "last_gsheet_decimal",
+        "last_gsheet_thousands",
+        "last_gsheet_gid",
+        "last_db_connection_string",
+        "last_db_query",
+    )
+    
     def __init__(self) -> None:
         self.file_path: Optional[Path] = None
         self.temp_csv_path: Optional[Path] = None
@@ -492,6 +506,15 @@ class DataIOManager:
             "last_db_query": self.last_db_query,
         }
     
+    def get_source_state(self) -> Dict[str, Any]:
+        """The import source attributes, set aside while another workspace dataset is active"""
+        return {name: getattr(self, name) for name in self.SOURCE_FIELDS}
+    
+    def set_source_state(self, state: Dict[str, Any]) -> None:
+        """Restore attributes from get_source_state, missing ones are reset"""
+        for name in self.SOURCE_FIELDS:
+            setattr(self, name, state.get(name, False if name == "is_temp_file" else None))
+    
     def get_google_sheets_refresh_params(self) -> Dict[str, Any]:
         """Returns the cached Google Sheets params needed for refreshing data"""
         return {
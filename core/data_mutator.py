@@ -1,9 +1,23 @@
 import keyword
 import pandas as pd
 import numpy as np
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from enum import Enum
 
+from core.aggregation_preview import AggregationPreview, AggregationPreviewEngine
+from core.column_executor import ColumnExecutor
+from core.concat_engine import ConcatEngine
+from core.datetime_engine import DatetimeEngine
+from core.duplicate_engine import DuplicateEngine
+from core.filter_engine import FilterEngine
+from core.join_engine import JoinEngine
+from core.quantile_engine import QuantileEngine
+from core.resample_engine import ResampleEngine
+from core.rolling_engine import RollingEngine
+from core.sort_engine import SortEngine, SortKey
+from core.string_kernels import StringKernels
+from core.virtual_columns import VirtualColumnEngine
+
 try:
     from scipy import stats
     from sklearn.ensemble import IsolationForest
@@ -38,6 +52,7 @@ class DataOperation(str, Enum):
     ROLLING_WINDOW = "rolling_window"
     SHIFT_DATA = "shift_data"
     PERCENTAGE_CHANGE = "percentage_change"
+    RESAMPLE = "resample"
 
 class FillMethod(str, Enum):
     MEAN = "mean"
@@ -64,7 +79,25 @@ class DataMutator:
         "Week": "W",
         "Day": "D",
     }
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        filter_engine: Optional[FilterEngine] = None,
+        virtual_columns: Optional[VirtualColumnEngine] = None,
+        column_executor: Optional[ColumnExecutor] = None,
+        datetime_engine: Optional[DatetimeEngine] = None,
+        quantile_engine: Optional[QuantileEngine] = None,
+        duplicate_engine: Optional[DuplicateEngine] = None,
+        join_engine: Optional[JoinEngine] = None,
+        preview_engine: Optional[AggregationPreviewEngine] = None,
+    ) -> None:
+        self.filter_engine = filter_engine or FilterEngine()
+        self.virtual_columns = virtual_columns or VirtualColumnEngine()
+        self.column_executor = column_executor or ColumnExecutor()
+        self.datetime_engine = datetime_engine or DatetimeEngine()
+        self.quantile_engine = quantile_engine or QuantileEngine()
+        self.duplicate_engine = duplicate_engine or DuplicateEngine()
+        self.join_engine = join_engine or JoinEngine()
+        self.preview_engine = preview_engine or AggregationPreviewEngine()
         self._operation_registry: Dict[DataOperation, Any] = {
             DataOperation.DROP_DUPLICATES: self._drop_duplicates,
             DataOperation.DROP_MISSING: self._drop_missing,
@@ -86,7 +119,8 @@ class DataMutator:
             DataOperation.DROP_EMPTY_COLUMNS: self._drop_empty_columns,
             DataOperation.ROLLING_WINDOW: self._apply_rolling_window,
             DataOperation.SHIFT_DATA: self._apply_shift,
-            DataOperation.PERCENTAGE_CHANGE: self._apply_pct_change
+            DataOperation.PERCENTAGE_CHANGE: self._apply_pct_change,
+            DataOperation.RESAMPLE: self._resample,
         }
     
     def clean_data(self, df: pd.DataFrame, action: "DataOperation | str", sort_state: Optional[tuple], **kwargs) -> tuple[pd.DataFrame, Optional[tuple]]:
@@ -159,7 +193,98 @@ class DataMutator:
             return df
         except Exception as UpdateCellError:
             raise Exception(f"Error updating cell: {str(UpdateCellError)}")
-    
+
+    @staticmethod
+    def parse_clipboard_block(text: str) -> List[List[str]]:
+        """
+        Parse a tab separated clipboard block (as copied from a spreadsheet) into rows of cells\n
+        :param text (str): The raw clipboard text
+        :return (List[List[str]]): Rectangular block of cell strings, short rows padded with ""
+        """
+        if not text:
+            return []
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        # Spreadsheets terminate the last row with a newline
+        if lines and lines[-1] == "":
+            lines.pop()
+        block = [line.split("\t") for line in lines]
+        width = max((len(row) for row in block), default=0)
+        return [row + [""] * (width - len(row)) for row in block]
+
+    def _coerce_paste_column(self, series: pd.Series, values: pd.Series, column_name: Any) -> pd.Series:
+        """Coerce a column of pasted cell strings into the dtype of the target column in one pass"""
+        column_datatype = series.dtype
+        is_empty = values.isna() | (values.astype(str).str.strip() == "")
+
+        if pd.api.types.is_bool_dtype(column_datatype):
+            return values.astype(str).str.strip().str.lower().isin(("true", "1", "t", "yes", "y"))
+
+        if pd.api.types.is_numeric_dtype(column_datatype):
+            numeric = pd.to_numeric(values.where(~is_empty), errors="coerce")
+            invalid = numeric.isna() & ~is_empty
+            if invalid.any():
+                bad_value = values[invalid].iloc[0]
+                kind = "integer" if pd.api.types.is_integer_dtype(column_datatype) else "float"
+                raise ValueError(f"Value: '{bad_value}' is not a valid {kind} for column '{column_name}'")
+            if pd.api.types.is_integer_dtype(column_datatype):
+                numeric = np.trunc(numeric)
+                if numeric.isna().any() and isinstance(column_datatype, np.dtype):
+                    raise ValueError(f"Empty value is not a valid integer for column '{column_name}'")
+            return numeric.astype(column_datatype)
+
+        if pd.api.types.is_datetime64_any_dtype(column_datatype):
+            parsed = pd.to_datetime(values.where(~is_empty), errors="coerce")
+            invalid = parsed.isna() & ~is_empty
+            if invalid.any():
+                raise ValueError(f"Value: '{values[invalid].iloc[0]}' is not a valid datetime for column '{column_name}'")
+            column_tz = getattr(column_datatype, "tz", None)
+            if column_tz is not None and parsed.dt.tz is None:
+                parsed = parsed.dt.tz_localize(column_tz)
+            return parsed.astype(column_datatype)
+
+        return values
+
+    def paste_block(self, df: pd.DataFrame, start_row: int, start_column: int, block: List[List[Any]], row_positions: Optional[Any] = None) -> tuple[pd.DataFrame, tuple[int, int]]:
+        """
+        Write a rectangular block of pasted cells into the DataFrame, coercing each column once\n
+        :param df (pd.DataFrame): The DataFrame to change
+        :param start_row (int): Row position of the top-left cell
+        :param start_column (int): Column position of the top-left cell
+        :param block (List[List[Any]]): Rows of cell values, as returned by parse_clipboard_block
+        :param row_positions (Optional[Any]): Row order of a sorted view, start_row and the following
+            block rows are then rows of the view and are written to row_positions[row]
+        :return (tuple[pd.DataFrame, tuple[int, int]]): The changed DataFrame and the (rows, columns) actually written
+        """
+        if df is None:
+            raise ValueError("No data loaded")
+        if not block or not block[0]:
+            return df, (0, 0)
+        if not (0 <= start_row < len(df)) or not (0 <= start_column < len(df.columns)):
+            raise ValueError(f"Paste position ({start_row}, {start_column}) is outside the dataset")
+
+        # Clip the block to the frame; pasting never grows the dataset
+        row_count = min(len(block), len(df) - start_row)
+        column_count = min(len(block[0]), len(df.columns) - start_column)
+        block_df = pd.DataFrame([row[:column_count] for row in block[:row_count]], dtype=object)
+
+        try:
+            coerced_columns = []
+            for offset in range(column_count):
+                column_index = start_column + offset
+                column_name = df.columns[column_index]
+                coerced = self._coerce_paste_column(df.iloc[:, column_index], block_df[offset], column_name)
+                coerced_columns.append((column_index, coerced))
+
+            # Only write once every column has been validated so a bad cell leaves df untouched
+            row_slice = slice(start_row, start_row + row_count)
+            if row_positions is not None:
+                row_slice = np.asarray(row_positions)[row_slice]
+            for column_index, coerced in coerced_columns:
+                df.iloc[row_slice, column_index] = coerced.array
+            return df, (row_count, column_count)
+        except Exception as PasteBlockError:
+            raise Exception(f"Error pasting cells: {str(PasteBlockError)}")
+
     def filter_data(self, df: pd.DataFrame, column: str = None, condition: str = None, value: Any = None, advanced_filters: List[Dict] = None) -> pd.DataFrame:
         """
         Filter data based on a single condition or multiple filters\n
@@ -177,109 +302,54 @@ class DataMutator:
 
         try:
             if advanced_filters:
-                query_parts: List[str] = []
-                query_params: Dict[str, Any] = {}
-                for i, item in enumerate(advanced_filters):
-                    logic = item.get("operator", "")
-                    col = item["column"]
-                    cond = item["condition"]
-                    val = item["value"]
-
-                    if col not in df.columns:
-                        raise KeyError(f"Column '{col}' not found in DataFrame")
-
-                    if cond == "Is Null":
-                        clause = f"`{col}`.isna()"
-                    elif cond == "Is Not Null":
-                        clause = f"`{col}`.notna()"
-                    else:
-                        param_key = f"val_{i}"
-                        query_params[param_key] = val
-                        if cond == "contains":
-                            clause = (
-                                f"`{col}`.astype(str).str.contains"
-                                f"(@query_params['{param_key}'], na=False)"
-                            )
-                        else:
-                            clause = f"`{col}` {cond} @query_params['{param_key}']"
-
-                    if logic:
-                        query_parts.append(f" {logic.lower()} ")
-                    query_parts.append(clause)
-
-                full_query = "".join(query_parts)
-                if full_query:
-                    df = df.query(full_query, engine="python")
-                return df
+                mask = self.filter_engine.filters_mask(df, advanced_filters, logic="EXPRESSION")
+                return df[mask]
 
             if not column and not condition:
                 return df
 
-            if column not in df.columns:
-                raise KeyError(f"Column '{column}' not found in DataFrame")
-
-            col_dtype = df[column].dtype
-            try:
-                if pd.api.types.is_integer_dtype(col_dtype):
-                    value = int(value)
-                elif pd.api.types.is_float_dtype(col_dtype):
-                    value = float(value)
-                elif pd.api.types.is_object_dtype(col_dtype):
-                    value = str(value)
-            except (ValueError, TypeError):
-                pass
-
-            if condition == ">":
-                df = df[df[column] > value]
-            elif condition == "<":
-                df = df[df[column] < value]
-            elif condition == "==":
-                df = df[df[column] == value]
-            elif condition == "!=":
-                df = df[df[column] != value]
-            elif condition == ">=":
-                df = df[df[column] >= value]
-            elif condition == "<=":
-                df = df[df[column] <= value]
-            elif condition == "contains":
-                df = df[df[column].astype(str).str.contains(str(value), na=False)]
-            elif condition == "in":
-                if not isinstance(value, (list, tuple, set)):
-                    value = [value]
-                df = df[df[column].isin(value)]
-            else:
-                raise ValueError(f"Unknown filter condition: {condition}")
-
-            return df
+            mask = self.filter_engine.condition_mask(df, column, condition, value)
+            return df[mask]
 
         except Exception as FilterDataError:
             raise Exception(f"Error filtering data: {str(FilterDataError)}")
     
-    def sort_data(self, df: pd.DataFrame, column: str, ascending: bool = True, current_sort_state: Optional[tuple] = None) -> tuple[pd.DataFrame, tuple]:
+    def sort_data(self, df: pd.DataFrame, column: str, ascending: bool = True, current_sort_state: Optional[tuple] = None, keys: Optional[List[SortKey]] = None) -> tuple[pd.DataFrame, tuple]:
         """
-        Sort df by column\n
+        Sort df by column, stable and with missing values last\n
         :param df (pd.DataFrame): DataFrame to target
         :param column (str): Column to sort
         :param ascending (bool): Is Sort order ascending
         :param current_sort_state (Optional[tuple]): The current sort of the df
+        :param keys (Optional[List[SortKey]]): (column, ascending) pairs for a multi column sort, overrides column and ascending
         :return (tuple[pd.DataFrame, tuple]): sorted_df, new_sort_state
         """
         if df is None:
             raise ValueError("No data loaded")
 
-        if current_sort_state == (column, ascending):
+        keys = [(key_column, bool(key_ascending)) for key_column, key_ascending in keys] if keys else [(column, ascending)]
+        if len(keys) == 1 and current_sort_state == keys[0]:
             return df, current_sort_state
 
         try:
-            if column not in df.columns:
-                raise ValueError(f"Column '{column}' not found")
-
-            df = df.sort_values(by=column, ascending=ascending)
-            new_sort_state = (column, ascending)
+            df = df.take(SortEngine.argsort(df, keys))
+            # The primary key describes the order for later sorts
+            new_sort_state = keys[0]
             return df, new_sort_state
         except Exception as SortDataError:
             raise Exception(f"Error sorting data: {str(SortDataError)}")
     
+    def _aggregation_groupers(self, group_by: List[str], date_grouping: Optional[Dict[str, str]]) -> list:
+        """Group by columns, as pd.Grouper objects where a datetime frequency is chosen"""
+        groupers = []
+        for col in group_by:
+            pandas_freq = self.FrequencyMap.get(date_grouping[col]) if date_grouping and col in date_grouping else None
+            if pandas_freq:
+                groupers.append(pd.Grouper(key=col, freq=pandas_freq))
+            else:
+                groupers.append(col)
+        return groupers
+
     def aggregate_data(self, df: pd.DataFrame, group_by: List[str], agg_config: Dict[str, str], date_grouping: Dict[str, str]) -> pd.DataFrame:
         """
         Aggregate df with per column aggregation functions and optional datetime grouping
@@ -288,53 +358,51 @@ class DataMutator:
             raise ValueError("No data loaded")
 
         try:
-            groupers = []
-            for col in group_by:
-                if date_grouping and col in date_grouping:
-                    freq_name = date_grouping[col]
-                    pandas_freq = self.FrequencyMap.get(freq_name)
-                    if pandas_freq:
-                        groupers.append(pd.Grouper(key=col, freq=pandas_freq))
-                    else:
-                        groupers.append(col)
-                else:
-                    groupers.append(col)
-
+            groupers = self._aggregation_groupers(group_by, date_grouping)
             if not groupers:
                 raise ValueError("No valid grouping columns provided")
 
             df = df.groupby(groupers).agg(agg_config).reset_index()
-            return df
+            return VirtualColumnEngine.clear_definitions(df)
         except Exception as AggregateDataError:
             raise Exception(f"Error aggregating data: {str(AggregateDataError)}")
     
-    def preview_aggregation(self, df: pd.DataFrame, group_by: List[str], agg_config: Dict[str, str], date_grouping: Dict[str, str] = None, limit: int = 5) -> pd.DataFrame:
+    def preview_aggregation(
+        self,
+        df: pd.DataFrame,
+        group_by: List[str],
+        agg_config: Dict[str, str],
+        date_grouping: Dict[str, str] = None,
+        limit: Optional[int] = 5,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> AggregationPreview:
         """
-        Previews an aggregation without modifying the source DataFrame
+        Previews an aggregation without modifying the source DataFrame.
+        Large frames are previewed from a sample (see AggregationPreviewEngine), limit=None
+        gives the exact aggregation of every row.
         """
         if df is None:
-            return pd.DataFrame()
+            return AggregationPreview(pd.DataFrame(), False, 0, 0)
 
         try:
-            groupers = []
-            for col in group_by:
-                if date_grouping and col in date_grouping:
-                    pandas_freq = self.FrequencyMap.get(date_grouping[col])
-                    if pandas_freq:
-                        groupers.append(pd.Grouper(key=col, freq=pandas_freq))
-                    else:
-                        groupers.append(col)
-                else:
-                    groupers.append(col)
-
+            groupers = self._aggregation_groupers(group_by, date_grouping)
             if not groupers or not agg_config:
-                return pd.DataFrame()
+                return AggregationPreview(pd.DataFrame(), False, 0, len(df))
 
-            preview_df = df.groupby(groupers).agg(agg_config).reset_index()
-            return preview_df.head(limit)
+            return self.preview_engine.preview(df, groupers, agg_config, limit, is_cancelled=is_cancelled)
+        except InterruptedError:
+            raise
         except Exception as PreviewAggregationError:
             raise Exception(f"Preview Calculation failed: {str(PreviewAggregationError)}")
     
+    def preview_resample(self, df: pd.DataFrame, on: str, frequency: str, aggregations: Dict[str, List[str]], fill: str = "none", sample_rows: int = 100_000, limit: int = 20) -> pd.DataFrame:
+        """
+        Resample the first sample_rows rows only, a preview of the first bins of a large table
+        """
+        if df is None:
+            return pd.DataFrame()
+        return ResampleEngine.resample(df.head(sample_rows), on, frequency, aggregations, fill).head(limit)
+    
     # DATA TRANSFORMATIONS
     def melt_data(self, df: pd.DataFrame, id_vars: List[str], value_vars: List[str], var_name: str, value_name: str) -> pd.DataFrame:
         """Unpivoting a df from a wide to a long format"""
@@ -344,7 +412,7 @@ class DataMutator:
         try:
             v_vars = value_vars if value_vars else None
             df = pd.melt(df, id_vars=id_vars, value_vars=v_vars, var_name=var_name, value_name=value_name)
-            return df
+            return VirtualColumnEngine.clear_definitions(df)
         except Exception as MeltDataError:
             raise Exception(f"Error melting data: {str(MeltDataError)}")
     
@@ -358,7 +426,7 @@ class DataMutator:
             if isinstance(df.columns, pd.MultiIndex):
                 df.columns = [f"{str(col[0])}_{str(col[1])}" if len(col) > 1 and col[1] else str(col[0]) for col in df.columns]
             df.columns.name = None
-            return df
+            return VirtualColumnEngine.clear_definitions(df)
         except Exception as PivotError:
             raise Exception(f"Error pivoting data: {str(PivotError)}")
     
@@ -368,8 +436,8 @@ class DataMutator:
             raise ValueError("No active data to merge with.")
         
         try:
-            df = pd.merge(df, right_df, how=how, left_on=left_on, right_on=right_on, suffixes=suffixes)
-            return df
+            # Large joins run as a DuckDB hash join with the same result as pd.merge
+            return VirtualColumnEngine.clear_definitions(self.join_engine.merge(df, right_df, how, left_on, right_on, suffixes))
         except Exception as MergeDataError:
             raise Exception(f"Merge operation failed: {str(MergeDataError)}")
     
@@ -379,21 +447,39 @@ class DataMutator:
             raise ValueError("No active data to append to")
 
         try:
-            df = pd.concat([df, other_df], ignore_index=ignore_index)
-            return df
+            if ConcatEngine.is_available() and ConcatEngine.is_arrow_backed(df):
+                try:
+                    # Chunked Arrow append, the current columns are not copied
+                    return ConcatEngine.concat(df, other_df, ignore_index=ignore_index)
+                except (ValueError, TypeError, NotImplementedError):
+                    # Columns Arrow cannot hold or cast, e.g. mixed objects or nested types
+                    pass
+            result = pd.concat([df, other_df], ignore_index=ignore_index)
+            # Virtual column definitions stay with the appended data
+            result.attrs = dict(df.attrs)
+            return result
         except Exception as ConcatenateDataError:
             raise Exception(f"Concatenate operation failed: {str(ConcatenateDataError)}")
     
-    def create_computed_column(self, df: pd.DataFrame, new_column_name: str, expression: str) -> pd.DataFrame:
-        """Add a column whose values are derived from a pandas eval expression"""
+    def create_computed_column(self, df: pd.DataFrame, new_column_name: str, expression: str, virtual: bool = False) -> pd.DataFrame:
+        """
+        Add a column whose values are derived from a pandas eval expression.
+        A virtual column only stores the validated expression and is evaluated on demand.
+        """
         if df is None:
             raise ValueError("No data loaded")
         try:
+            if virtual:
+                self.virtual_columns.validate(df, new_column_name, expression)
+                definitions = VirtualColumnEngine.get_definitions(df)
+                definitions[str(new_column_name).strip()] = str(expression).strip()
+                return VirtualColumnEngine.set_definitions(df, definitions)
+
             if not new_column_name or not str(new_column_name).strip():
                 raise ValueError("New column name cannot be empty")
 
             clean_name = str(new_column_name).strip()
-            if clean_name in df.columns:
+            if clean_name in df.columns or clean_name in VirtualColumnEngine.get_definitions(df):
                 raise ValueError(f"Column '{clean_name}' already exists")
             if keyword.iskeyword(clean_name):
                 raise ValueError(
@@ -402,23 +488,28 @@ class DataMutator:
             if "`" in clean_name:
                 raise ValueError("Column names cannot contain backticks (`)")
 
-            df[new_column_name] = df.eval(expression)
+            if VirtualColumnEngine.get_definitions(df):
+                # The expression may read virtual columns, which df.eval cannot see
+                df[new_column_name] = self.virtual_columns.evaluate_expression(df, expression).array
+            else:
+                df[new_column_name] = df.eval(expression)
             return df
         except Exception as ComputedColumnError:
             raise Exception(
                 f"Error computing and creating new column: {str(ComputedColumnError)}"
             )
     
-    def bin_column(self, df: pd.DataFrame, column: str, new_column_name: str, method: str, bins: Any, labels: List[str] = None, right_inclusive: bool = True, drop_original: bool = False) -> pd.DataFrame:
+    def bin_column(self, df: pd.DataFrame, column: str, new_column_name: str, method: str, bins: Any, labels: List[str] = None, right_inclusive: bool = True, drop_original: bool = False, rank_error: Optional[float] = None) -> pd.DataFrame:
         """
         Bin a continuous variable into categorical buckets\n
         :param df (pd.DataFrame): The DataFrame to change
         :param column (str): The Target numerical column
-        :param method (str): 'cut' for value-based, 'qcut' for quantile-based
+        :param method (str): 'cut' for value-based, 'qcut' for quantile-based, 'approx_qcut' for quantiles of a sample
         :param bins (Any): Number of bins or explicit bin edges
         :param labels (List[str]): Optional labels for the bins
         :param right_inclusive (bool): Whether intervals are closed on the right
         :param drop_original (bool): Whether to drop the tartget column after binning
+        :param rank_error (Optional[float]): Allowed quantile rank error of 'approx_qcut', a fraction of the rows
         :return (pd.DataFrame):
         """
         if df is None:
@@ -429,8 +520,13 @@ class DataMutator:
             raise TypeError(f"Column '{column}' must be numeric for binning")
         
         try:
-            if method == "qcut":
-                df[new_column_name] = pd.qcut(df[column], q=bins, labels=labels, duplicates="drop")
+            if method in ("qcut", "approx_qcut"):
+                if method == "approx_qcut" and rank_error is None:
+                    rank_error = self.quantile_engine.DEFAULT_RANK_ERROR
+                # Edges come from the cached sorted summary of the column, so only the
+                # first binning of a column sorts and changing the bin count is cheap
+                edges = self.quantile_engine.edges(df[column], bins, rank_error if method == "approx_qcut" else None)
+                df[new_column_name] = self.quantile_engine.assign(df[column], edges, labels)
             else:
                 df[new_column_name] = pd.cut(df[column], bins=bins, labels=labels, include_lowest=True, right=right_inclusive)
             
@@ -526,58 +622,74 @@ class DataMutator:
             "interpretation": interpretation,
         }
     
-    def detect_outliers(self, df: pd.DataFrame, method: str, columns: List[str], **kwargs) -> List[int]:
+    OUTLIER_CHUNK_ROWS: int = 1_000_000
+    ISOLATION_FOREST_SAMPLE_ROWS: int = 100_000
+
+    def detect_outliers(
+        self,
+        df: pd.DataFrame,
+        method: str,
+        columns: List[str],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        **kwargs,
+    ) -> np.ndarray:
         """
-        Detect outlier row indices in the *df*\n
+        Detect outlier rows in the *df*\n
         :param df (pd.DataFrame): DataFrame to analyse
         :param method (str): 'z_score', 'iqr', 'isolation_forest'
         :param columns (List[str]): Numeric column names
-        :param **kwargs: Threshold, multuplier contamination 
-        :return List[int]: Sorted list of row indices identified as outliers
+        :param is_cancelled (Optional[Callable[[], bool]]): Polled between row chunks, raises InterruptedError when it returns True
+        :param **kwargs: threshold, multiplier, contamination, and for isolation_forest
+            sample_size (rows the forest is fit on), n_jobs, chunk_size and random_state
+        :return np.ndarray: Boolean mask aligned to the row positions of df, True for outliers
         """
         if df is None:
-            return []
-
-        numeric_df = df.select_dtypes(include=[np.number])
-        if numeric_df.empty:
+            return np.zeros(0, dtype=bool)
+
+        numeric_columns = [
+            column for column in dict.fromkeys(columns)
+            if column in df.columns and pd.api.types.is_numeric_dtype(df[column].dtype)
+            and not pd.api.types.is_bool_dtype(df[column].dtype)
+        ]
+        if df.select_dtypes(include=[np.number]).empty:
             raise ValueError("No numeric data is available to do outlier detection.")
 
-        outlier_indices = set()
-
-        if method == "z_score":
-            threshold = kwargs.get("threshold", 3.0)
-            if not stats:
-                raise ImportError(
-                    "Scipy is not installed. Scipy is required to perform Z-score analysis"
-                )
-            for column in columns:
-                if column in numeric_df.columns:
-                    col_data = df[column]
-                    if isinstance(col_data, pd.DataFrame):
-                        col_data = col_data.iloc[:, 0]
-                    col_data = col_data.dropna()
-                    if col_data.empty:
-                        continue
-                    z_scores = np.abs(stats.zscore(col_data.to_numpy()))
-                    outliers = col_data.index[z_scores > threshold]
-                    outlier_indices.update(outliers)
-
-        elif method == "iqr":
-            multiplier = kwargs.get("multiplier", 1.5)
-            for column in columns:
-                if column in numeric_df.columns:
-                    col_data = df[column]
-                    if isinstance(col_data, pd.DataFrame):
-                        col_data = col_data.iloc[:, 0]
-                    Q1 = col_data.quantile(0.25)
-                    Q3 = col_data.quantile(0.75)
-                    IQR = Q3 - Q1
-                    lower_bound = Q1 - multiplier * IQR
-                    upper_bound = Q3 + multiplier * IQR
-                    outliers = col_data[
-                        (col_data < lower_bound) | (col_data > upper_bound)
-                    ].index.tolist()
-                    outlier_indices.update(outliers)
+        outlier_mask = np.zeros(len(df), dtype=bool)
+        if not numeric_columns or df.empty:
+            return outlier_mask
+        chunk_size = max(1, int(kwargs.get("chunk_size") or self.OUTLIER_CHUNK_ROWS))
+
+        def check_cancelled() -> None:
+            if is_cancelled is not None and is_cancelled():
+                raise InterruptedError("Outlier detection cancelled")
+
+        if method in ("z_score", "iqr"):
+            # One (rows x columns) float matrix, statistics are computed for all columns at once
+            values = df[numeric_columns].to_numpy(dtype="float64", na_value=np.nan)
+            check_cancelled()
+            with np.errstate(invalid="ignore"):
+                if method == "z_score":
+                    threshold = kwargs.get("threshold", 3.0)
+                    center = np.nanmean(values, axis=0)
+                    # Population standard deviation, like scipy.stats.zscore
+                    std = np.nanstd(values, axis=0)
+                    lower_bound = center - threshold * std
+                    upper_bound = center + threshold * std
+                    # Constant columns have no outliers
+                    lower_bound[std == 0] = -np.inf
+                    upper_bound[std == 0] = np.inf
+                else:
+                    multiplier = kwargs.get("multiplier", 1.5)
+                    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                    iqr = q3 - q1
+                    lower_bound = q1 - multiplier * iqr
+                    upper_bound = q3 + multiplier * iqr
+
+            for start in range(0, len(values), chunk_size):
+                check_cancelled()
+                chunk = values[start:start + chunk_size]
+                # Comparisons with NaN are False, so missing values are never outliers
+                outlier_mask[start:start + chunk_size] = ((chunk < lower_bound) | (chunk > upper_bound)).any(axis=1)
 
         elif method == "isolation_forest":
             contamination = kwargs.get("contamination", 0.1)
@@ -586,17 +698,59 @@ class DataMutator:
                     "SciKit-learn not installed. "
                     "SciKit-learn is required to perform an Isolation Forest Analysis"
                 )
-            data_to_fit = df[columns].select_dtypes(include=[np.number]).fillna(0)
-            if not data_to_fit.empty:
-                clf = IsolationForest(contamination=contamination, random_state=42)
-                preds = clf.fit_predict(data_to_fit)
-                outliers = data_to_fit.index[preds == -1].tolist()
-                outlier_indices.update(outliers)
+            sample_size = int(kwargs.get("sample_size") or self.ISOLATION_FOREST_SAMPLE_ROWS)
+            random_state = kwargs.get("random_state", 42)
+            data_to_fit = df[numeric_columns]
+
+            # The forest only sees a subsample, the contamination threshold is taken from its scores
+            if len(data_to_fit) > sample_size:
+                sample_positions = np.sort(
+                    np.random.default_rng(random_state).choice(len(data_to_fit), size=sample_size, replace=False)
+                )
+                fit_data = data_to_fit.iloc[sample_positions]
+            else:
+                fit_data = data_to_fit
+            clf = IsolationForest(
+                contamination=contamination,
+                random_state=random_state,
+                n_jobs=kwargs.get("n_jobs", -1),
+            )
+            clf.fit(fit_data.fillna(0).to_numpy(dtype="float64"))
 
-        return sorted(list(outlier_indices))
+            for start in range(0, len(data_to_fit), chunk_size):
+                check_cancelled()
+                chunk = data_to_fit.iloc[start:start + chunk_size].fillna(0).to_numpy(dtype="float64")
+                outlier_mask[start:start + chunk_size] = clf.decision_function(chunk) < 0
+        else:
+            raise ValueError(f"Unsupported outlier detection method: {method}")
+
+        return outlier_mask
+
+    @staticmethod
+    def _row_mask(df: pd.DataFrame, mask: Any) -> np.ndarray:
+        """Validate a positional boolean row mask, as returned by detect_outliers"""
+        row_mask = np.asarray(mask, dtype=bool)
+        if row_mask.shape != (len(df),):
+            raise ValueError(f"Row mask has {row_mask.size} entries but the dataset has {len(df)} rows")
+        return row_mask
+
+    @staticmethod
+    def _position_mask(df: pd.DataFrame, positions: Any) -> np.ndarray:
+        """Boolean row mask of a list of row positions, as logged by DataHandler.remove_rows"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if positions.size and (positions.min() < 0 or positions.max() >= len(df)):
+            raise ValueError(f"Row positions are outside the dataset of {len(df)} rows")
+        row_mask = np.zeros(len(df), dtype=bool)
+        row_mask[positions] = True
+        return row_mask
 
     def _drop_duplicates(self, df: pd.DataFrame, sort_state, **kwargs):
-        return df.drop_duplicates(), sort_state
+        # subset=None compares all columns, keep is 'first', 'last' or False to drop every copy
+        duplicate_mask = self.duplicate_engine.duplicate_mask(df, kwargs.get("subset"), kwargs.get("keep", "first"))
+        if duplicate_mask.any():
+            # One take keeps the index labels, the row ids, as drop_duplicates does
+            df = df.take(np.flatnonzero(~duplicate_mask))
+        return df, sort_state
 
     def _drop_missing(self, df: pd.DataFrame, sort_state, **kwargs):
         return df.dropna(), sort_state
@@ -618,60 +772,77 @@ class DataMutator:
             target_cols = [column]
 
         if group_by and group_by in df.columns:
-            for col in target_cols:
-                if col == group_by:
-                    continue
-                if method in [FillMethod.MEAN, FillMethod.MEDIAN] and not pd.api.types.is_numeric_dtype(df[col]):
-                    continue
-                if method == FillMethod.MEAN:
-                    df[col] = df[col].fillna(df.groupby(group_by)[col].transform("mean"))
-                elif method == FillMethod.MEDIAN:
-                    df[col] = df[col].fillna(df.groupby(group_by)[col].transform("median"))
-                elif method == FillMethod.MODE:
-                    df[col] = df.groupby(group_by)[col].transform(
-                        lambda x: x.fillna(x.mode().iloc[0] if not x.mode().empty else x)
-                    )
-                elif method == FillMethod.FFILL:
-                    df[col] = df.groupby(group_by)[col].ffill()
-                elif method == FillMethod.BFILL:
-                    df[col] = df.groupby(group_by)[col].bfill()
+            target_cols = [col for col in target_cols if col != group_by]
+            if method in [FillMethod.MEAN, FillMethod.MEDIAN]:
+                target_cols = [col for col in target_cols if pd.api.types.is_numeric_dtype(df[col])]
+            if not target_cols:
+                return df, sort_state
+
+            # One grouped pass over all target columns instead of one per column
+            grouped = df.groupby(group_by, observed=True, sort=False)[target_cols]
+            if method in [FillMethod.MEAN, FillMethod.MEDIAN]:
+                df[target_cols] = df[target_cols].fillna(grouped.transform(method.value))
+            elif method == FillMethod.MODE:
+                group_keys = df[group_by]
+                df = self.column_executor.apply(
+                    df, target_cols,
+                    lambda series: series.fillna(group_keys.map(self._grouped_mode(group_keys, series))),
+                )
+            elif method in [FillMethod.FFILL, FillMethod.BFILL]:
+                # fillna keeps rows whose group key is missing untouched
+                filled = grouped.ffill() if method == FillMethod.FFILL else grouped.bfill()
+                df[target_cols] = df[target_cols].fillna(filled)
         else:
             if method == FillMethod.STATIC_VALUE:
-                for col in target_cols:
+                def fill_static(series: pd.Series) -> pd.Series:
                     val_to_use = fill_value
-                    if pd.api.types.is_numeric_dtype(df[col]) and isinstance(fill_value, str):
+                    if pd.api.types.is_numeric_dtype(series) and isinstance(fill_value, str):
                         try:
                             val_to_use = float(fill_value) if "." in fill_value else int(fill_value)
                         except ValueError:
                             pass
-                    df[col] = df[col].fillna(val_to_use)
-            elif method in [FillMethod.MEAN, FillMethod.MEDIAN, FillMethod.MODE]:
-                for col in target_cols:
-                    if method in [FillMethod.MEAN, FillMethod.MEDIAN] and not pd.api.types.is_numeric_dtype(df[col]):
-                        continue
-                    if method == FillMethod.MEAN:
-                        fill_val = df[col].mean()
-                    elif method == FillMethod.MEDIAN:
-                        fill_val = df[col].median()
-                    else:
-                        modes = df[col].mode()
-                        fill_val = modes[0] if not modes.empty else None
-                    if fill_val is not None:
-                        df[col] = df[col].fillna(fill_val)
+                    return series.fillna(val_to_use)
+
+                df = self.column_executor.apply(df, target_cols, fill_static)
+            elif method in [FillMethod.MEAN, FillMethod.MEDIAN]:
+                numeric_cols = [col for col in target_cols if pd.api.types.is_numeric_dtype(df[col])]
+                if numeric_cols:
+                    stats_values = df[numeric_cols].mean() if method == FillMethod.MEAN else df[numeric_cols].median()
+                    df[numeric_cols] = df[numeric_cols].fillna(stats_values.dropna().to_dict())
+            elif method == FillMethod.MODE:
+                def fill_mode(series: pd.Series) -> Optional[pd.Series]:
+                    modes = series.mode()
+                    return series.fillna(modes[0]) if not modes.empty else None
+
+                df = self.column_executor.apply(df, target_cols, fill_mode)
             elif method in [FillMethod.FFILL, FillMethod.BFILL]:
-                for col in target_cols:
-                    df[col] = df[col].fillna(method=method.value)
+                target_cols = list(target_cols)
+                df[target_cols] = df[target_cols].ffill() if method == FillMethod.FFILL else df[target_cols].bfill()
             elif method in [FillMethod.LINEAR, FillMethod.TIME]:
                 if method == FillMethod.TIME and not isinstance(df.index, pd.DatetimeIndex):
                     raise ValueError(
                         "Time interpolation requires the dataframe to be a DatetimeIndex"
                     )
-                for col in target_cols:
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        df[col] = df[col].interpolate(method=method.value)
+                numeric_cols = [col for col in target_cols if pd.api.types.is_numeric_dtype(df[col])]
+                df = self.column_executor.apply(
+                    df, numeric_cols, lambda series: series.interpolate(method=method.value)
+                )
 
         return df, sort_state
 
+    @staticmethod
+    def _grouped_mode(group_keys: pd.Series, values: pd.Series) -> pd.Series:
+        """
+        Most frequent value per group, ties resolve to the smallest value like Series.mode.
+        Counts (group, value) pairs in one groupby instead of calling mode for every group.
+        """
+        counts = values.groupby([group_keys, values], observed=True, sort=True).size()
+        if counts.empty:
+            return pd.Series(dtype=values.dtype)
+        best_pairs = counts.groupby(level=0, observed=True, sort=False).idxmax()
+        mode_values = pd.MultiIndex.from_tuples(best_pairs.to_numpy()).get_level_values(1)
+        return pd.Series(mode_values, index=best_pairs.index)
+
     def _drop_column(self, df: pd.DataFrame, sort_state, **kwargs):
         cols_to_drop = []
         if "columns" in kwargs:
@@ -680,6 +851,24 @@ class DataMutator:
         if "column" in kwargs:
             cols_to_drop.append(kwargs["column"])
         cols_to_drop = list(set(cols_to_drop))
+        return self._drop_columns(df, cols_to_drop, sort_state)
+
+    def _drop_columns(self, df: pd.DataFrame, cols_to_drop: List[Any], sort_state: Optional[tuple]) -> tuple[pd.DataFrame, Optional[tuple]]:
+        """Drop physical and virtual columns, refusing to break a virtual column that reads them"""
+        definitions = VirtualColumnEngine.get_definitions(df)
+        dependents = [name for name in self.virtual_columns.dependents(definitions, cols_to_drop) if name not in cols_to_drop]
+        if dependents:
+            raise ValueError(
+                f"Cannot drop {', '.join(repr(col) for col in cols_to_drop)}: used by the virtual column(s) "
+                f"{', '.join(repr(name) for name in dependents)}. Drop or materialize those first."
+            )
+        virtual_to_drop = [col for col in cols_to_drop if col in definitions and col not in df.columns]
+        if virtual_to_drop:
+            # Virtual columns only exist as a definition
+            cols_to_drop = [col for col in cols_to_drop if col not in virtual_to_drop]
+            df = VirtualColumnEngine.set_definitions(
+                df, {name: expression for name, expression in definitions.items() if name not in virtual_to_drop}
+            )
 
         if cols_to_drop:
             df = df.drop(columns=cols_to_drop)
@@ -706,8 +895,14 @@ class DataMutator:
             )
         if "`" in clean_new_name:
             raise ValueError("Column names cannot contain backticks (`)")
+        definitions = VirtualColumnEngine.get_definitions(df)
+        if clean_new_name in definitions:
+            raise ValueError(f"Column: '{clean_new_name}' already exists as a virtual column")
 
         df = df.rename(columns={old_name: new_name})
+        if definitions:
+            # Virtual columns reading the column follow the new name
+            df = VirtualColumnEngine.set_definitions(df, self.virtual_columns.rename_references(definitions, old_name, new_name))
         return df, sort_state
 
     def _change_data_type(self, df: pd.DataFrame, sort_state, **kwargs):
@@ -748,18 +943,24 @@ class DataMutator:
             ):
                 raise TypeError("Column does not support string operations")
 
+            transformed = StringKernels.transform(df[column], operation)
+            if transformed is not None:
+                df[column] = transformed
+                return df, sort_state
+
+            text = StringKernels.to_python(df[column])
             op_map = {
-                "lower": df[column].str.lower,
-                "upper": df[column].str.upper,
-                "title": df[column].str.title,
-                "capitalize": df[column].str.capitalize,
-                "strip": df[column].str.strip,
-                "lstrip": df[column].str.lstrip,
-                "rstrip": df[column].str.rstrip,
+                "lower": text.str.lower,
+                "upper": text.str.upper,
+                "title": text.str.title,
+                "capitalize": text.str.capitalize,
+                "strip": text.str.strip,
+                "lstrip": text.str.lstrip,
+                "rstrip": text.str.rstrip,
             }
             if operation not in op_map:
                 raise ValueError(f"Unsupported text operation: {operation}")
-            df[column] = op_map[operation]()
+            df[column] = StringKernels.from_python(op_map[operation](), df[column])
         except (AttributeError, TypeError):
             raise ValueError(
                 f"Column '{column}' is not a text column. "
@@ -779,6 +980,12 @@ class DataMutator:
             raise ValueError(f"Column '{column}' not found in the dataset")
 
         try:
+            split_columns = StringKernels.split(df[column], delimiter, new_columns)
+            if split_columns is not None:
+                for new_col_name, values in zip(new_columns, split_columns):
+                    df[new_col_name] = values
+                return df, sort_state
+
             split_df = df[column].astype(str).str.split(delimiter, expand=True)
             for index, new_col_name in enumerate(new_columns):
                 df[new_col_name] = split_df[index] if index < split_df.shape[1] else None
@@ -798,7 +1005,14 @@ class DataMutator:
             raise ValueError(f"Column '{column}' not found in the dataset")
 
         try:
-            df[column] = df[column].astype(str).str.replace(pattern, replacement, regex=True)
+            replaced = StringKernels.regex_replace(df[column], pattern, replacement)
+            if replaced is None:
+                # Python regex syntax or text RE2 does not handle like re, or a column that is not all text
+                text = StringKernels.to_python(df[column])
+                if not (pd.api.types.is_string_dtype(text.dtype) or pd.api.types.infer_dtype(text, skipna=True) == "string"):
+                    text = text.astype(str)
+                replaced = StringKernels.from_python(text.str.replace(pattern, replacement, regex=True), df[column])
+            df[column] = replaced
         except Exception as RegexError:
             raise ValueError(
                 f"Error applying regex replacement to '{column}': {str(RegexError)}"
@@ -806,10 +1020,40 @@ class DataMutator:
 
         return df, sort_state
 
+    def _outlier_mask(self, df: pd.DataFrame, outliers: Dict[str, Any]) -> np.ndarray:
+        """Detect outliers from logged settings, {'method': ..., 'columns': [...], 'threshold': ...}"""
+        settings = dict(outliers)
+        method = settings.pop("method", None)
+        columns = settings.pop("columns", None)
+        if not method or not columns:
+            raise ValueError("Method and columns are required to detect outliers")
+        return self.detect_outliers(df, method, columns, **settings)
+
     def _remove_rows(self, df: pd.DataFrame, sort_state, **kwargs):
-        rows_to_remove = kwargs.get("rows")
-        if rows_to_remove:
-            df = df.drop(index=rows_to_remove).reset_index(drop=True)
+        mask = kwargs.get("mask")
+        if kwargs.get("outliers") is not None:
+            # Outlier removals are logged by their settings and detected on the data they run on
+            row_mask = self._outlier_mask(df, kwargs["outliers"])
+        elif mask is not None:
+            row_mask = self._row_mask(df, mask)
+        elif kwargs.get("positions") is not None:
+            row_mask = self._position_mask(df, kwargs["positions"])
+        else:
+            rows_to_remove = kwargs.get("rows")
+            if not rows_to_remove:
+                return df, sort_state
+            # rows are index labels, the row ids that stay with a row through removals,
+            # filters and sorts. A range index maps ids to positions arithmetically, any
+            # other index is probed once against a hash set of the removed ids
+            if isinstance(df.index, pd.RangeIndex):
+                positions = df.index.get_indexer(rows_to_remove)
+                row_mask = np.zeros(len(df), dtype=bool)
+                row_mask[positions[positions >= 0]] = True
+            else:
+                row_mask = df.index.isin(rows_to_remove)
+        if row_mask.any():
+            # A single positional take, the index is kept so row ids stay valid
+            df = df.take(np.flatnonzero(~row_mask))
         return df, sort_state
 
     def _clip_outliers(self, df: pd.DataFrame, sort_state, **kwargs):
@@ -823,28 +1067,29 @@ class DataMutator:
             threshold = kwargs.get("threshold", 3.0)
             if not stats:
                 raise ImportError("Scipy is not installed. Scipy is required for Z-Score")
-            for col in columns:
-                if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
-                    col_data = df[col].dropna()
-                    if col_data.empty:
-                        continue
-                    mean = col_data.mean()
-                    std = col_data.std()
-                    df[col] = df[col].clip(lower=mean - threshold * std, upper=mean + threshold * std)
+
+            def clip_column(series: pd.Series) -> Optional[pd.Series]:
+                col_data = series.dropna()
+                if col_data.empty:
+                    return None
+                mean = col_data.mean()
+                std = col_data.std()
+                return series.clip(lower=mean - threshold * std, upper=mean + threshold * std)
 
         elif method == "iqr":
             multiplier = kwargs.get("multiplier", 1.5)
-            for col in columns:
-                if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
-                    IQR = Q3 - Q1
-                    df[col] = df[col].clip(
-                        lower=Q1 - multiplier * IQR, upper=Q3 + multiplier * IQR
-                    )
+
+            def clip_column(series: pd.Series) -> Optional[pd.Series]:
+                Q1 = series.quantile(0.25)
+                Q3 = series.quantile(0.75)
+                IQR = Q3 - Q1
+                return series.clip(lower=Q1 - multiplier * IQR, upper=Q3 + multiplier * IQR)
+
         else:
             raise ValueError(f"Clipping is not supported for method: {method}")
 
+        numeric_cols = [col for col in columns if col in df.columns and pd.api.types.is_numeric_dtype(df[col])]
+        df = self.column_executor.apply(df, numeric_cols, clip_column)
         return df, sort_state
 
     def _duplicate_column(self, df: pd.DataFrame, sort_state, **kwargs):
@@ -862,68 +1107,63 @@ class DataMutator:
         if not columns:
             raise ValueError("No columns specified for normalization")
 
+        if method not in ("min_max", "standard", "quantile"):
+            raise ValueError(f"Unsupported normalization method: {method}")
         for col in columns:
             if col not in df.columns:
                 raise ValueError(f"Column '{col}' not found.")
             if not pd.api.types.is_numeric_dtype(df[col]):
                 raise TypeError(f"Column '{col}' must be numeric to perform normalization")
 
-            col_data = df[col]
+        def normalize_column(col_data: pd.Series) -> Optional[pd.Series]:
             if method == "min_max":
                 min_val = col_data.min()
                 max_val = col_data.max()
                 if max_val != min_val:
-                    df[col] = (col_data - min_val) / (max_val - min_val)
+                    return (col_data - min_val) / (max_val - min_val)
             elif method == "standard":
                 mean_val = col_data.mean()
                 std_val = col_data.std()
                 if std_val != 0:
-                    df[col] = (col_data - mean_val) / std_val
-            elif method == "quantile":
+                    return (col_data - mean_val) / std_val
+            else:
                 median_val = col_data.median()
                 q75 = col_data.quantile(0.75)
                 q25 = col_data.quantile(0.25)
                 iqr = q75 - q25
                 if iqr != 0:
-                    df[col] = (col_data - median_val) / iqr
-            else:
-                raise ValueError(f"Unsupported normalization method: {method}")
+                    return (col_data - median_val) / iqr
+            return None
 
+        # Columns are independent, wide frames are normalized on several cores
+        df = self.column_executor.apply(df, columns, normalize_column)
         return df, sort_state
 
     def _extract_date_component(self, df: pd.DataFrame, sort_state, **kwargs):
         column: str = kwargs.get("column")
-        component = kwargs.get("component")
+        components: List[str] = list(kwargs.get("components") or [])
+        if kwargs.get("component") and kwargs.get("component") not in components:
+            components.insert(0, kwargs.get("component"))
 
-        if not column or not component:
+        if not column or not components:
             raise ValueError("Column and datetime component are required.")
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found")
+        unsupported = [component for component in components if component not in self.datetime_engine.COMPONENTS]
+        if unsupported:
+            raise ValueError(f"Unsupported date component: {unsupported[0]}")
 
-        if not pd.api.types.is_datetime64_any_dtype(df[column]):
-            try:
-                df[column] = pd.to_datetime(df[column], errors="coerce")
-                if df[column].isna().all():
-                    raise ValueError(f"Column '{column}' could not be converted to datetime")
-            except Exception as error:
-                raise ValueError(
-                    f"Column '{column}' cannot be converted to datetime: {str(error)}"
-                )
+        try:
+            # Parsed once per source column and cached, the source column keeps its values
+            parsed = self.datetime_engine.parse(df[column])
+        except Exception as error:
+            raise ValueError(f"Column '{column}' cannot be converted to datetime: {str(error)}")
+        if parsed.isna().all():
+            raise ValueError(f"Column '{column}' could not be converted to datetime")
 
-        safe_component = component.replace(" ", "_")
-        new_col_name = f"{column}_{safe_component}"
-        component_map = {
-            "Year": lambda s: s.dt.year.astype("Int64"),
-            "Month": lambda s: s.dt.month.astype("Int64"),
-            "Month Name": lambda s: s.dt.month_name(),
-            "Day": lambda s: s.dt.day.astype("Int64"),
-            "Day of Week": lambda s: s.dt.day_name(),
-            "Quarter": lambda s: s.dt.quarter.astype("Int64"),
-            "Hour": lambda s: s.dt.hour.astype("Int64"),
-        }
-        if component not in component_map:
-            raise ValueError(f"Unsupported date component: {component}")
-        df[new_col_name] = component_map[component](df[column])
+        for component, values in self.datetime_engine.extract(parsed, components).items():
+            safe_component = component.replace(" ", "_")
+            df[f"{column}_{safe_component}"] = values.set_axis(df.index)
 
         return df, sort_state
 
@@ -935,16 +1175,16 @@ class DataMutator:
         if not col_start or not col_end:
             raise ValueError("Start and End columns are required")
 
+        parsed_columns: Dict[str, pd.Series] = {}
         for col in [col_start, col_end]:
             if col not in df.columns:
                 raise ValueError(f"Column '{col}' not found")
-            if not pd.api.types.is_datetime64_any_dtype(df[col]):
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    raise ValueError(f"Column '{col}' must be a datetime column")
+            try:
+                parsed_columns[col] = self.datetime_engine.parse(df[col])
+            except Exception:
+                raise ValueError(f"Column '{col}' must be a datetime column")
 
-        diff_series = df[col_end] - df[col_start]
+        diff_series = parsed_columns[col_end] - parsed_columns[col_start]
         raw_col = f"Diff_{unit}_{col_end}_vs_{col_start}"
         new_col = "".join(c if c.isalnum() or c == "_" else "" for c in raw_col)
 
@@ -970,6 +1210,14 @@ class DataMutator:
         if new_column_name in df.columns:
             raise ValueError(f"Column name '{new_column_name}' already exists")
 
+        if kwargs.get("outliers") is not None:
+            df[new_column_name] = self._outlier_mask(df, kwargs["outliers"])
+            return df, sort_state
+        mask = kwargs.get("mask")
+        if mask is not None:
+            df[new_column_name] = self._row_mask(df, mask)
+            return df, sort_state
+
         df[new_column_name] = False
         if rows:
             mask = df.index.isin(rows)
@@ -1002,12 +1250,28 @@ class DataMutator:
     def _drop_empty_columns(self, df: pd.DataFrame, sort_state: Optional[tuple], **kwargs) -> tuple[pd.DataFrame, Optional[tuple]]:
         """Removes columns where all values are missing"""
         cols_to_drop: list[str] = df.columns[df.isna().all()].tolist()
-        if cols_to_drop:
-            df = df.drop(columns=cols_to_drop)
-            if sort_state and sort_state[0] in cols_to_drop:
-                sort_state = None
-        return df, sort_state
+        return self._drop_columns(df, cols_to_drop, sort_state)
     
+    def _resample(self, df: pd.DataFrame, sort_state: Optional[tuple], **kwargs) -> tuple[pd.DataFrame, Optional[tuple]]:
+        """Reduces df to one row per time bin of a datetime column
+
+        Args:
+            df (pd.DataFrame): Input dataframe
+            sort_state (Optional[tuple]): Current sort state
+
+        Returns:
+            tuple[pd.DataFrame, Optional[tuple]]: The bins, sorted by their start time
+        """
+        on: str = kwargs.get("on")
+        frequency: str = kwargs.get("frequency", "1min")
+        aggregations: Dict[str, List[str]] = kwargs.get("aggregations") or {}
+        fill: str = kwargs.get("fill", "none")
+
+        if not on:
+            raise ValueError("A datetime column is required to resample")
+        resampled = ResampleEngine.resample(df, on, frequency, aggregations, fill)
+        return VirtualColumnEngine.clear_definitions(resampled), (on, True)
+
     def _apply_rolling_window(self, df: pd.DataFrame, sort_state: Optional[tuple], **kwargs) -> tuple[pd.DataFrame, Optional[tuple]]:
         """Applies a rolling window operations to a numeric column
 
@@ -1019,39 +1283,31 @@ class DataMutator:
             tuple[pd.DataFrame, Optional[tuple]]: New dataframe, Sort state if changed
         """
         column: str = kwargs.get("column")
-        window: int = kwargs.get("window", 3)
-        operation: str = kwargs.get("operation", "mean")
+        window: "int | str" = kwargs.get("window", 3)
+        operations: List[str] = list(kwargs.get("operations") or [kwargs.get("operation", "mean")])
         new_column: str = kwargs.get("new_column")
         center: bool = kwargs.get("center", False)
         min_periods: Optional[int] = kwargs.get("min_periods", None)
+        group_by: Optional[List[str]] = kwargs.get("group_by") or None
+        on: Optional[str] = kwargs.get("on") or None
         
         if not column or column not in df.columns:
             raise ValueError(f"Column '{column}' not found")
         if not pd.api.types.is_numeric_dtype(df[column]):
             raise TypeError(f"Column '{column}' must be a numeric column to perform rolling window operation")
         
-        if not new_column:
-            new_column = f"{column}_rolling_{window}_{operation}"
-        
-        if new_column in df.columns and new_column != column:
-            raise ValueError(f"Column '{column}' already exists")
-        
-        rolling_obj = df[column].rolling(window=window, center=center, min_periods=min_periods)
+        new_columns = RollingEngine.output_names(column, window, operations, new_column)
+        for name in new_columns:
+            if name in df.columns and name != column:
+                raise ValueError(f"Column '{name}' already exists")
         
-        if operation == "mean":
-            df[new_column] = rolling_obj.mean()
-        elif operation == "sum":
-            df[new_column] = rolling_obj.sum()
-        elif operation == "min":
-            df[new_column] = rolling_obj.min()
-        elif operation == "max":
-            df[new_column] = rolling_obj.max()
-        elif operation == "std":
-            df[new_column] = rolling_obj.std()
-        elif operation == "median":
-            df[new_column] = rolling_obj.median()
-        else:
-            raise ValueError(f"Unsupported rolling operation: {operation}")
+        # Every statistic shares one set of group and time aware window bounds
+        results = RollingEngine.compute(
+            df, column, window, operations,
+            group_by=group_by, on=on, center=center, min_periods=min_periods,
+        )
+        for name, operation in zip(new_columns, operations):
+            df[name] = results[operation]
         
         return df, sort_state
 
@@ -1069,6 +1325,7 @@ class DataMutator:
         periods: int = kwargs.get("periods", 1)
         fill_value: Any = kwargs.get("fill_value", None)
         new_column: Optional[str] = kwargs.get("new_column")
+        group_by: Optional[List[str]] = kwargs.get("group_by") or None
         
         if not column or column not in df.columns:
             raise ValueError(f"Column '{column}' not found")
@@ -1079,7 +1336,11 @@ class DataMutator:
         if new_column in df.columns and new_column != column:
             raise ValueError(f"Column '{new_column}' already exists")
 
-        df[new_column] = df[column].shift(periods=periods, fill_value=fill_value)
+        if group_by:
+            # Values never move across group boundaries
+            df[new_column] = df.groupby(group_by, sort=False, dropna=False)[column].shift(periods=periods, fill_value=fill_value)
+        else:
+            df[new_column] = df[column].shift(periods=periods, fill_value=fill_value)
 
         return df, sort_state
     
@@ -1097,6 +1358,7 @@ class DataMutator:
         periods: int = kwargs.get("periods", 1)
         fill_method: str = kwargs.get("fill_method", "pad")
         new_column: Optional[str] = kwargs.get("new_column")
+        group_by: Optional[List[str]] = kwargs.get("group_by") or None
 
         if not column or column not in df.columns:
             raise ValueError(f"Column '{column}' not found")
@@ -1109,6 +1371,14 @@ class DataMutator:
         if new_column in df.columns and new_column != column:
             raise ValueError(f"Column '{new_column}' already exists")
 
+        if group_by:
+            # Fill and compare only within each group, the first rows of a group have no prior value
+            grouped = df.groupby(group_by, sort=False, dropna=False)[column]
+            filled = grouped.ffill() if fill_method in ['pad', 'ffill'] else grouped.bfill() if fill_method in ['backfill', 'bfill'] else df[column]
+            previous = filled.groupby([df[key] for key in group_by], sort=False, dropna=False).shift(periods=periods)
+            df[new_column] = filled / previous - 1
+            return df, sort_state
+
         try:
             df[new_column] = df[column].pct_change(periods=periods, fill_method=fill_method)
         except TypeError:
@@ -0,0 +1,224 @@
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+class DatetimeEngine:
+    """
+    Parses date columns once and extracts date parts in a single pass
+
+    Text columns are parsed to datetime64 the first time an operation needs them
+    (ISO text in Arrow columns through a pyarrow cast, everything else through
+    pd.to_datetime) and the parsed values are cached per source column, the same
+    column identity the FilterEngine uses. Extracting several parts or computing
+    several differences from the same text column therefore parses it only once,
+    and the source column itself is left unchanged.
+
+    Date parts are computed together from the integer day and time-of-day values
+    with civil calendar arithmetic instead of one .dt accessor call per part.
+    """
+    COMPONENTS: tuple[str, ...] = ("Year", "Month", "Month Name", "Day", "Day of Week", "Week", "Quarter", "Hour")
+    MONTH_NAMES: tuple[str, ...] = (
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December",
+    )
+    DAY_NAMES: tuple[str, ...] = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+    _UNITS_PER_SECOND = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+
+    def __init__(self, max_cache_bytes: int = 512 * 1024 * 1024) -> None:
+        self.max_cache_bytes = max_cache_bytes
+        # column token -> (weak reference to the values owner, parsed series)
+        self._cache: "OrderedDict[tuple, tuple[weakref.ref, pd.Series]]" = OrderedDict()
+        self._cache_bytes: int = 0
+        self._lock = threading.RLock()
+
+    # Cache handling
+    @staticmethod
+    def _values_owner(series: pd.Series) -> object:
+        values = series.array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            owner = values._ndarray
+            while isinstance(owner.base, np.ndarray):
+                owner = owner.base
+            return owner
+        if pa is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+            return values._pa_array
+        return values
+
+    def _get_column_token(self, series: pd.Series) -> tuple[tuple, object]:
+        values = series.array
+        address = values._ndarray.__array_interface__["data"][0] if isinstance(values, pd.arrays.NumpyExtensionArray) else 0
+        owner = self._values_owner(series)
+        return (id(owner), address, len(values)), owner
+
+    def _evict(self, token: tuple) -> None:
+        with self._lock:
+            entry = self._cache.pop(token, None)
+            if entry is not None:
+                self._cache_bytes -= entry[1].memory_usage(index=False)
+
+    def _get_cached(self, token: tuple, owner: object) -> Optional[pd.Series]:
+        with self._lock:
+            entry = self._cache.get(token)
+            if entry is None:
+                return None
+            if entry[0]() is not owner:
+                # The id was reused by a different array
+                self._evict(token)
+                return None
+            self._cache.move_to_end(token)
+            return entry[1]
+
+    def _store(self, token: tuple, owner: object, parsed: pd.Series) -> None:
+        size = parsed.memory_usage(index=False)
+        if size > self.max_cache_bytes:
+            return
+        try:
+            reference = weakref.ref(owner, lambda _ref, stale=token: self._evict(stale))
+        except TypeError:
+            return
+        with self._lock:
+            self._evict(token)
+            self._cache[token] = (reference, parsed)
+            self._cache_bytes += size
+            while self._cache_bytes > self.max_cache_bytes:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.memory_usage(index=False)
+
+    def invalidate(self, series: pd.Series) -> None:
+        """Drop the parsed values of a column whose values were edited in place"""
+        token, _ = self._get_column_token(series)
+        self._evict(token)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    # Parsing
+    @staticmethod
+    def _parse_uncached(series: pd.Series) -> pd.Series:
+        dtype = series.dtype
+        if isinstance(dtype, pd.ArrowDtype):
+            array = series.array._pa_array
+            if pa.types.is_timestamp(array.type) or pa.types.is_date(array.type):
+                return series.astype(dtype.pyarrow_dtype.to_pandas_dtype() if pa.types.is_timestamp(array.type) else "datetime64[ns]")
+            if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+                try:
+                    # ISO 8601 text parses in the Arrow kernel without Python objects
+                    parsed = pc.cast(array, pa.timestamp("ns"))
+                    return pd.Series(parsed.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    pass
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return series
+        return pd.to_datetime(series, errors="coerce")
+
+    def parse(self, series: pd.Series) -> pd.Series:
+        """
+        series as datetime64 values, unparsable values become NaT\n
+        :param series (pd.Series): A datetime or date text column
+        :return (pd.Series): The parsed values, cached while the column is unchanged
+        """
+        if (isinstance(series.dtype, np.dtype) and series.dtype.kind == "M") or isinstance(series.dtype, pd.DatetimeTZDtype):
+            return series
+        token, owner = self._get_column_token(series)
+        cached = self._get_cached(token, owner)
+        if cached is not None:
+            return cached
+        parsed = self._parse_uncached(series)
+        self._store(token, owner, parsed)
+        return parsed
+
+    # Date parts
+    @staticmethod
+    def _civil_from_days(days: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Year, month and day of days since 1970-01-01 in the proleptic Gregorian calendar"""
+        shifted = days + 719468
+        era = np.floor_divide(shifted, 146097)
+        day_of_era = shifted - era * 146097
+        year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+        day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+        month_index = (5 * day_of_year + 2) // 153
+        day = day_of_year - (153 * month_index + 2) // 5 + 1
+        month = np.where(month_index < 10, month_index + 3, month_index - 9)
+        year = year_of_era + era * 400 + (month <= 2)
+        return year, month, day
+
+    @staticmethod
+    def _days_from_january_first(year: np.ndarray) -> np.ndarray:
+        """Days since 1970-01-01 of January 1st of year"""
+        previous = year - 1
+        era = np.floor_divide(previous, 400)
+        year_of_era = previous - era * 400
+        day_of_era = 365 * year_of_era + year_of_era // 4 - year_of_era // 100 + 306
+        return era * 146097 + day_of_era - 719468
+
+    @classmethod
+    def extract(cls, parsed: pd.Series, components: Sequence[str]) -> Dict[str, pd.Series]:
+        """
+        Date parts of parsed datetime values, all computed in one pass\n
+        :param parsed (pd.Series): datetime64 values, time zone aware values use their local time
+        :param components (Sequence[str]): Names from COMPONENTS
+        :return (Dict[str, pd.Series]): {component: values}, nullable integers or names, missing where parsed is NaT
+        """
+        unknown = [component for component in components if component not in cls.COMPONENTS]
+        if unknown:
+            raise ValueError(f"Unsupported date component: {unknown[0]}")
+        if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+            parsed = parsed.dt.tz_localize(None)
+        values = parsed.to_numpy()
+        missing = np.isnat(values)
+        unit, count = np.datetime_data(values.dtype)
+        units_per_day = 86400 * cls._UNITS_PER_SECOND[unit] // count
+        ticks = values.view(np.int64)
+        days = np.floor_divide(ticks, units_per_day)
+
+        needs_civil = any(component in ("Year", "Month", "Month Name", "Day", "Quarter", "Week") for component in components)
+        year, month, day = cls._civil_from_days(days) if needs_civil else (None, None, None)
+        weekday = np.remainder(days + 3, 7)
+
+        def nullable(result: np.ndarray) -> pd.Series:
+            return pd.Series(pd.arrays.IntegerArray(result.astype(np.int64), missing.copy()), index=parsed.index)
+
+        def names(lookup: tuple[str, ...], positions: np.ndarray) -> pd.Series:
+            result = np.asarray(lookup, dtype=object)[np.where(missing, 0, positions)]
+            result[missing] = np.nan
+            return pd.Series(result, index=parsed.index, dtype=object)
+
+        results: Dict[str, pd.Series] = {}
+        for component in components:
+            if component == "Year":
+                results[component] = nullable(year)
+            elif component == "Month":
+                results[component] = nullable(month)
+            elif component == "Month Name":
+                results[component] = names(cls.MONTH_NAMES, month - 1)
+            elif component == "Day":
+                results[component] = nullable(day)
+            elif component == "Day of Week":
+                results[component] = names(cls.DAY_NAMES, weekday)
+            elif component == "Quarter":
+                results[component] = nullable((month - 1) // 3 + 1)
+            elif component == "Hour":
+                results[component] = nullable(np.remainder(ticks, units_per_day) // (units_per_day // 24))
+            elif component == "Week":
+                # ISO week, the week belongs to the year its Thursday falls in
+                thursday = days - weekday + 3
+                thursday_year, _, _ = cls._civil_from_days(thursday)
+                results[component] = nullable((thursday - cls._days_from_january_first(thursday_year)) // 7 + 1)
+        return results
+
+    def components(self, series: pd.Series, components: Sequence[str]) -> Dict[str, pd.Series]:
+        """Parse series (cached) and extract the requested date parts"""
+        return self.extract(self.parse(series), list(dict.fromkeys(components)))
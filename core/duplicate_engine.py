@@ -0,0 +1,261 @@
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Union
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@dataclass
+class DuplicateGroups:
+    """Rows grouped by equal key values, groups numbered in order of first appearance"""
+    codes: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+    sizes: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.first.nbytes + self.last.nbytes + self.sizes.nbytes
+
+
+class DuplicateEngine:
+    """
+    Duplicate row detection from cached row hashes
+
+    The key columns are hashed once per row with the vectorized pandas row hash and
+    the hashes are factorized into groups. Every group is checked against its first
+    row so a hash collision can never merge distinct rows (the exact pandas grouping
+    is used if one occurs). The groups are cached per set of source columns, the same
+    column identity the FilterEngine and QuantileEngine use, so switching between
+    keeping the first, the last or no copy only reads the cached groups.
+    """
+    KEEP_OPTIONS: tuple = ("first", "last", False)
+
+    def __init__(self, max_cache_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_cache_bytes = max_cache_bytes
+        # tuple of column tokens -> (weak references to the values owners, groups)
+        self._cache: "OrderedDict[tuple, tuple[List[weakref.ref], DuplicateGroups]]" = OrderedDict()
+        self._cache_bytes: int = 0
+        self._lock = threading.RLock()
+
+    # Cache handling
+    @staticmethod
+    def _values_owner(series: pd.Series) -> object:
+        values = series.array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            owner = values._ndarray
+            while isinstance(owner.base, np.ndarray):
+                owner = owner.base
+            return owner
+        if pa is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+            return values._pa_array
+        return values
+
+    def _get_column_token(self, series: pd.Series) -> tuple[tuple, object]:
+        values = series.array
+        address = values._ndarray.__array_interface__["data"][0] if isinstance(values, pd.arrays.NumpyExtensionArray) else 0
+        owner = self._values_owner(series)
+        return (id(owner), address, len(values)), owner
+
+    def _evict(self, key: tuple) -> None:
+        with self._lock:
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._cache_bytes -= entry[1].nbytes
+
+    def _evict_column(self, token: tuple) -> None:
+        with self._lock:
+            for key in [key for key in self._cache if token in key]:
+                self._evict(key)
+
+    def _get_cached(self, key: tuple, owners: List[object]) -> Optional[DuplicateGroups]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if any(reference() is not owner for reference, owner in zip(entry[0], owners)):
+                # An id was reused by a different array
+                self._evict(key)
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key: tuple, owners: List[object], groups: DuplicateGroups) -> None:
+        if groups.nbytes > self.max_cache_bytes:
+            return
+        try:
+            references = [weakref.ref(owner, lambda _ref, stale=token: self._evict_column(stale)) for token, owner in zip(key, owners)]
+        except TypeError:
+            return
+        with self._lock:
+            self._evict(key)
+            self._cache[key] = (references, groups)
+            self._cache_bytes += groups.nbytes
+            while self._cache_bytes > self.max_cache_bytes:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+
+    def invalidate(self, series: pd.Series) -> None:
+        """Drop the groups involving a column whose values were edited in place"""
+        token, _ = self._get_column_token(series)
+        self._evict_column(token)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    # Grouping
+    @staticmethod
+    def _validate_subset(df: pd.DataFrame, subset: Optional[Sequence[Hashable]]) -> List[Hashable]:
+        if not subset:
+            return list(df.columns)
+        missing = [column for column in subset if column not in df.columns]
+        if missing:
+            raise ValueError(f"Column '{missing[0]}' not found")
+        return list(dict.fromkeys(subset))
+
+    @staticmethod
+    def _group_bounds(codes: np.ndarray, group_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        positions = np.arange(len(codes), dtype=np.int64)
+        first = np.empty(group_count, dtype=np.int64)
+        last = np.empty(group_count, dtype=np.int64)
+        # With repeated indices the last assignment wins, reversed it keeps the first row
+        first[codes[::-1]] = positions[::-1]
+        last[codes] = positions
+        return first, last, np.bincount(codes, minlength=group_count)
+
+    @staticmethod
+    def _matches_first_row(keys: pd.DataFrame, codes: np.ndarray, first: np.ndarray) -> bool:
+        """True when every row has the same key values as the first row of its group"""
+        representatives = first[codes]
+        candidates = np.flatnonzero(representatives != np.arange(len(codes)))
+        if len(candidates) == 0:
+            return True
+        expected_positions = representatives[candidates]
+        for column in range(keys.shape[1]):
+            values = keys.iloc[:, column].to_numpy()
+            actual, expected = values[candidates], values[expected_positions]
+            # With several key columns df.duplicated gives every missing value (NaN, None, pd.NA)
+            # the same code, so they are equal here. pd.NA cannot be compared, so only present
+            # values are compared. A single object column is grouped by _object_codes instead
+            actual_missing, expected_missing = pd.isna(actual), pd.isna(expected)
+            if not np.array_equal(actual_missing, expected_missing):
+                return False
+            present = ~actual_missing
+            if not np.asarray(actual[present] == expected[present], dtype=bool).all():
+                return False
+        return True
+
+    @staticmethod
+    def _object_codes(values: np.ndarray) -> tuple[np.ndarray, int]:
+        """
+        Group codes of a single object key column, compared like Series.duplicated does: present
+        values by equality, missing values only equal the same object (None, pd.NA, pd.NaT),
+        except Python float NaNs, which are all equal
+        """
+        codes, uniques = pd.factorize(values)
+        codes = codes.astype(np.int64, copy=False)
+        missing = np.flatnonzero(codes < 0)
+        if len(missing) == 0:
+            return codes, len(uniques)
+        missing_keys = np.fromiter((-1 if type(value) is float else id(value) for value in values[missing]), dtype=np.int64, count=len(missing))
+        missing_codes, missing_uniques = pd.factorize(missing_keys)
+        codes[missing] = missing_codes + len(uniques)
+        return codes, len(uniques) + len(missing_uniques)
+
+    @staticmethod
+    def _hashable_keys(keys: pd.DataFrame) -> pd.DataFrame:
+        """keys with -0.0 turned into 0.0, the row hash tells them apart but they are equal"""
+        float_positions = [position for position in range(keys.shape[1]) if pd.api.types.is_float_dtype(keys.iloc[:, position].dtype)]
+        if not float_positions:
+            return keys
+        normalized = keys.copy(deep=False)
+        for position in float_positions:
+            normalized.isetitem(position, keys.iloc[:, position] + 0.0)
+        return normalized
+
+    def groups(self, df: pd.DataFrame, subset: Optional[Sequence[Hashable]] = None) -> DuplicateGroups:
+        """
+        Rows of df grouped by the values of the key columns\n
+        :param df (pd.DataFrame): The data
+        :param subset (Optional[Sequence[Hashable]]): Key columns, all columns by default
+        :return (DuplicateGroups): Cached while the key columns are unchanged
+        """
+        columns = self._validate_subset(df, subset)
+        tokens, owners = zip(*(self._get_column_token(df[column]) for column in columns)) if columns else ((), ())
+        key = tuple(tokens)
+        cached = self._get_cached(key, list(owners))
+        if cached is not None:
+            return cached
+
+        keys = df[columns]
+        # Codes of the exact values need no check against hash collisions
+        exact = True
+        if len(df) == 0:
+            codes = np.empty(0, dtype=np.int64)
+            group_count = 0
+        elif len(columns) == 1 and pd.api.types.is_object_dtype(keys.iloc[:, 0].dtype):
+            codes, group_count = self._object_codes(keys.iloc[:, 0].to_numpy())
+        else:
+            exact = False
+            hashes = pd.util.hash_pandas_object(self._hashable_keys(keys), index=False).to_numpy()
+            codes, uniques = pd.factorize(hashes)
+            group_count = len(uniques)
+        codes = codes.astype(np.int64, copy=False)
+        first, last, sizes = self._group_bounds(codes, group_count)
+        if not exact and not self._matches_first_row(keys, codes, first):
+            # A hash collision, group by the exact values instead
+            codes = keys.groupby(columns, sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+            first, last, sizes = self._group_bounds(codes, int(codes.max()) + 1 if len(codes) else 0)
+        groups = DuplicateGroups(codes, first, last, sizes)
+        self._store(key, list(owners), groups)
+        return groups
+
+    @classmethod
+    def _validate_keep(cls, keep: Union[str, bool]) -> Union[str, bool]:
+        if keep not in cls.KEEP_OPTIONS:
+            raise ValueError(f"Unsupported keep option: {keep}, use 'first', 'last' or False")
+        return keep
+
+    def duplicate_mask(self, df: pd.DataFrame, subset: Optional[Sequence[Hashable]] = None, keep: Union[str, bool] = "first") -> np.ndarray:
+        """Boolean mask of the rows df.duplicated(subset, keep) marks as duplicates"""
+        keep = self._validate_keep(keep)
+        groups = self.groups(df, subset)
+        if keep is False:
+            return groups.sizes[groups.codes] > 1
+        kept = groups.first if keep == "first" else groups.last
+        return kept[groups.codes] != np.arange(len(groups.codes))
+
+    def summary(self, df: pd.DataFrame, subset: Optional[Sequence[Hashable]] = None, keep: Union[str, bool] = "first", examples: int = 10) -> Dict[str, Any]:
+        """
+        Duplicate counts and the largest duplicate groups\n
+        :param df (pd.DataFrame): The data
+        :param subset (Optional[Sequence[Hashable]]): Key columns, all columns by default
+        :param keep (Union[str, bool]): Which copy survives, 'first', 'last' or False for none
+        :param examples (int): Number of example groups
+        :return (Dict[str, Any]): rows, duplicate_rows (rows removed with keep), duplicate_groups,
+            rows_in_duplicate_groups and examples (key values of the largest groups with a 'Count' column)
+        """
+        columns = self._validate_subset(df, subset)
+        groups = self.groups(df, columns)
+        mask = self.duplicate_mask(df, columns, keep)
+        repeated = np.flatnonzero(groups.sizes > 1)
+        # Largest groups first, ties in order of first appearance
+        largest = repeated[np.argsort(-groups.sizes[repeated], kind="stable")[:examples]]
+        example_rows = df[columns].take(groups.first[largest]).reset_index(drop=True)
+        example_rows["Count"] = groups.sizes[largest]
+        return {
+            "rows": len(df),
+            "duplicate_rows": int(np.count_nonzero(mask)),
+            "duplicate_groups": int(len(repeated)),
+            "rows_in_duplicate_groups": int(groups.sizes[repeated].sum()),
+            "examples": example_rows,
+        }
@@ -0,0 +1,386 @@
+import ast
+import re
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+class FilterEngine:
+    """
+    Compiles filter conditions into vectorized boolean masks
+
+    Every filter in the application (the data filters, subsets and the plot quick
+    filter) is evaluated here. A single condition becomes one boolean numpy mask,
+    computed with pyarrow.compute for Arrow backed columns, numexpr for large
+    numeric columns (when installed) and pandas otherwise. Masks are cached per
+    condition and column version, so re-applying a subset or editing one
+    condition of a filter only recomputes what changed. Conditions are combined
+    with bitwise mask algebra.
+
+    Missing values never match a condition, except for '!=' where they count as
+    not equal.
+    """
+    CONDITIONS = (">", "<", ">=", "<=", "==", "!=", "contains", "in", "Is Null", "Is Not Null")
+    NUMEXPR_MIN_ROWS: int = 100_000
+
+    _ARROW_COMPARISONS = {
+        ">": "greater",
+        "<": "less",
+        ">=": "greater_equal",
+        "<=": "less_equal",
+        "==": "equal",
+        "!=": "not_equal",
+    }
+    _AST_COMPARISONS = {
+        ast.Gt: ">",
+        ast.Lt: "<",
+        ast.GtE: ">=",
+        ast.LtE: "<=",
+        ast.Eq: "==",
+        ast.NotEq: "!=",
+    }
+    _MIRRORED_COMPARISONS = {">": "<", "<": ">", ">=": "<=", "<=": ">=", "==": "==", "!=": "!="}
+
+    def __init__(self, max_cache_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_cache_bytes = max_cache_bytes
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._cache_bytes: int = 0
+        # Masks are requested from background workers as well as the GUI thread
+        self._lock = threading.RLock()
+        self._owner_refs: Dict[tuple, weakref.ref] = {}
+
+    # Cache handling
+    def _get_column_token(self, series: pd.Series) -> Optional[tuple]:
+        """
+        Identify a column version by the object owning its values plus offset and length,
+        so repeated frame/column accessors map to the same cache entries
+        """
+        values = series.array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            owner = values._ndarray
+            address = owner.__array_interface__["data"][0]
+            while isinstance(owner.base, np.ndarray):
+                owner = owner.base
+        elif pa is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+            owner = values._pa_array
+            address = 0
+        else:
+            owner = values
+            address = 0
+
+        token = (id(owner), address, len(values))
+        existing_ref = self._owner_refs.get(token)
+        if existing_ref is not None and existing_ref() is owner:
+            return token
+        try:
+            self._owner_refs[token] = weakref.ref(owner, lambda _ref, stale=token: self._evict_token(stale))
+        except TypeError:
+            return None
+        # The id may have been reused by a different array
+        self._evict_token(token, drop_ref=False)
+        return token
+
+    def _evict_token(self, token: tuple, drop_ref: bool = True) -> None:
+        with self._lock:
+            if drop_ref:
+                self._owner_refs.pop(token, None)
+            for key in [key for key in self._cache if key[0] == token]:
+                self._cache_bytes -= self._cache.pop(key).nbytes
+
+    def _get_cached_mask(self, key: Optional[tuple]) -> Optional[np.ndarray]:
+        if key is None:
+            return None
+        with self._lock:
+            mask = self._cache.get(key)
+            if mask is not None:
+                self._cache.move_to_end(key)
+            return mask
+
+    def _store_mask(self, key: Optional[tuple], mask: np.ndarray) -> None:
+        if key is None or mask.nbytes > self.max_cache_bytes:
+            return
+        mask.setflags(write=False)
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = mask
+            self._cache_bytes += mask.nbytes
+            while self._cache_bytes > self.max_cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+
+    @staticmethod
+    def _get_value_key(value: Any) -> Hashable:
+        if isinstance(value, (list, tuple, set)):
+            return (type(value).__name__, tuple(FilterEngine._get_value_key(item) for item in value))
+        return (type(value).__name__, repr(value))
+
+    def invalidate(self, series: pd.Series) -> None:
+        """Drop cached masks of a column whose values were edited in place"""
+        token = self._get_column_token(series)
+        if token is not None:
+            self._evict_token(token, drop_ref=False)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    # Single conditions
+    @staticmethod
+    def _coerce_value(series: pd.Series, value: Any) -> Any:
+        """Convert a filter value (often typed text from a dialog) to the column dtype"""
+        if value is None or isinstance(value, (list, tuple, set)):
+            return value
+        dtype = series.dtype
+        try:
+            if pd.api.types.is_bool_dtype(dtype):
+                if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+                    return value.strip().lower() == "true"
+                return value
+            if pd.api.types.is_integer_dtype(dtype):
+                try:
+                    return int(value)
+                except ValueError:
+                    return float(value)
+            if pd.api.types.is_float_dtype(dtype):
+                return float(value)
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                timestamp = pd.Timestamp(value)
+                timezone = getattr(dtype, "tz", None) or getattr(getattr(dtype, "pyarrow_dtype", None), "tz", None)
+                if timezone is not None and timestamp.tzinfo is None:
+                    timestamp = timestamp.tz_localize(timezone)
+                return timestamp
+            if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+                return str(value)
+        except (TypeError, ValueError):
+            pass
+        return value
+
+    def _arrow_mask(self, values: "pd.arrays.ArrowExtensionArray", condition: str, value: Any) -> np.ndarray:
+        array = values._pa_array
+        if condition in self._ARROW_COMPARISONS:
+            scalar = pa.scalar(value.to_pydatetime() if isinstance(value, pd.Timestamp) else value, type=array.type)
+            result = getattr(pc, self._ARROW_COMPARISONS[condition])(array, scalar)
+            result = pc.fill_null(result, condition == "!=")
+        elif condition == "contains":
+            text = array if pa.types.is_string(array.type) or pa.types.is_large_string(array.type) else pc.cast(array, pa.string())
+            result = pc.fill_null(pc.match_substring_regex(text, str(value)), False)
+        elif condition == "in":
+            items = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            result = pc.is_in(array, value_set=pa.array(items, type=array.type))
+        else:
+            raise ValueError(f"Unknown filter condition: {condition}")
+        return result.to_numpy(zero_copy_only=False).astype(bool, copy=False)
+
+    def _numeric_mask(self, values: np.ndarray, condition: str, value: Any) -> np.ndarray:
+        if numexpr is not None and len(values) >= self.NUMEXPR_MIN_ROWS:
+            return numexpr.evaluate(f"column {condition} threshold", local_dict={"column": values, "threshold": value})
+        return {
+            ">": np.greater,
+            "<": np.less,
+            ">=": np.greater_equal,
+            "<=": np.less_equal,
+            "==": np.equal,
+            "!=": np.not_equal,
+        }[condition](values, value)
+
+    def _pandas_mask(self, series: pd.Series, condition: str, value: Any) -> pd.Series:
+        if condition == ">": return series > value
+        if condition == "<": return series < value
+        if condition == ">=": return series >= value
+        if condition == "<=": return series <= value
+        if condition == "==": return series == value
+        if condition == "!=": return (series != value) | series.isna()
+        if condition == "contains": return series.astype(str).str.contains(str(value), na=False)
+        if condition == "in": return series.isin(list(value) if isinstance(value, (list, tuple, set)) else [value])
+        raise ValueError(f"Unknown filter condition: {condition}")
+
+    def _compute_mask(self, series: pd.Series, condition: str, value: Any) -> np.ndarray:
+        if condition == "Is Null":
+            return series.isna().to_numpy(dtype=bool)
+        if condition == "Is Not Null":
+            return series.notna().to_numpy(dtype=bool)
+
+        values = series.array
+        if pc is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+            try:
+                return self._arrow_mask(values, condition, value)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError, TypeError, ValueError):
+                # Mixed types that Arrow refuses to compare, let pandas decide
+                pass
+        elif (
+            condition in self._ARROW_COMPARISONS
+            and isinstance(values, pd.arrays.NumpyExtensionArray)
+            and values.dtype.kind in "iuf"
+            and isinstance(value, (int, float, np.number))
+            and not isinstance(value, bool)
+        ):
+            return self._numeric_mask(values._ndarray, condition, value)
+
+        mask = self._pandas_mask(series, condition, value)
+        return mask.to_numpy(dtype=bool, na_value=False) if isinstance(mask, pd.Series) else np.asarray(mask, dtype=bool)
+
+    def condition_mask(self, df: pd.DataFrame, column: Any, condition: str, value: Any = None, coerce: bool = True, strict: bool = True) -> np.ndarray:
+        """
+        Boolean mask for a single filter condition\n
+        :param df (pd.DataFrame): The data to evaluate
+        :param column (Any): Column name
+        :param condition (str): One of CONDITIONS
+        :param value (Any): Value to compare against
+        :param coerce (bool): Convert the value to the column dtype first
+        :param strict (bool): Raise on unknown columns instead of matching no rows
+        :return (np.ndarray): Boolean mask aligned with the rows of df
+        """
+        if column not in df.columns:
+            if strict:
+                raise KeyError(f"Column '{column}' not found in DataFrame")
+            return np.zeros(len(df), dtype=bool)
+        if condition not in self.CONDITIONS:
+            raise ValueError(f"Unknown filter condition: {condition}")
+
+        series = df[column]
+        if not isinstance(series, pd.Series):
+            raise ValueError(f"Column name '{column}' is not unique")
+        if coerce:
+            value = self._coerce_value(series, value)
+
+        token = self._get_column_token(series)
+        key = (token, condition, self._get_value_key(value)) if token is not None else None
+        mask = self._get_cached_mask(key)
+        if mask is None:
+            mask = self._compute_mask(series, condition, value)
+            self._store_mask(key, mask)
+        return mask
+
+    # Combined filters
+    def filters_mask(self, df: pd.DataFrame, filters: List[Dict[str, Any]], logic: str = "EXPRESSION", strict: bool = True) -> np.ndarray:
+        """
+        Combine filter definitions ({'column', 'condition', 'value', 'operator'}) into one mask\n
+        :param logic (str): 'AND' / 'OR' combine every filter with that operator, 'COMPLEX' applies
+            each filter's operator from left to right and 'EXPRESSION' uses each filter's operator
+            with the usual precedence (AND binds tighter than OR)
+        :return (np.ndarray): Boolean mask aligned with the rows of df
+        """
+        if not filters:
+            return np.ones(len(df), dtype=bool)
+
+        masks = [
+            self.condition_mask(df, item["column"], item["condition"], item.get("value"), strict=strict)
+            for item in filters
+        ]
+        logic = (logic or "AND").upper()
+        if logic == "AND":
+            return np.logical_and.reduce(masks)
+        if logic == "OR":
+            return np.logical_or.reduce(masks)
+
+        operators = [str(item.get("operator") or "AND").upper() for item in filters[1:]]
+        if logic == "COMPLEX":
+            result = masks[0].copy()
+            for operator, mask in zip(operators, masks[1:]):
+                if operator == "AND":
+                    result &= mask
+                elif operator == "OR":
+                    result |= mask
+            return result
+
+        # Sum of products: each OR starts a new group of AND-ed masks
+        result = np.zeros(len(df), dtype=bool)
+        group = masks[0].copy()
+        for operator, mask in zip(operators, masks[1:]):
+            if operator == "OR":
+                result |= group
+                group = mask.copy()
+            else:
+                group &= mask
+        result |= group
+        return result
+
+    def apply_filters(self, df: pd.DataFrame, filters: List[Dict[str, Any]], logic: str = "EXPRESSION", strict: bool = True) -> pd.DataFrame:
+        """Return the rows of df matching the combined filters"""
+        if not filters:
+            return df.copy()
+        return df[self.filters_mask(df, filters, logic, strict=strict)]
+
+    # Query expressions
+    def expression_mask(self, df: pd.DataFrame, expression: str) -> np.ndarray:
+        """
+        Boolean mask for a pandas query style expression such as "`Sales` > 10 and Region == 'North'".
+        Comparisons, 'in' / 'not in', and/or/not (or &, |, ~) are compiled to cached condition masks,
+        anything else is evaluated by DataFrame.eval.
+        """
+        placeholders: Dict[str, str] = {}
+
+        def replace_backticks(match: re.Match) -> str:
+            placeholder = f"__dps_column_{len(placeholders)}"
+            placeholders[placeholder] = match.group(1)
+            return placeholder
+
+        try:
+            tree = ast.parse(re.sub(r"`([^`]+)`", replace_backticks, expression.strip()), mode="eval")
+            return self._compile_node(df, tree.body, placeholders)
+        except (SyntaxError, NotImplementedError):
+            result = df.eval(expression)
+            if not isinstance(result, pd.Series) or not pd.api.types.is_bool_dtype(result.dtype):
+                raise ValueError(f"The filter '{expression}' does not evaluate to True/False per row")
+            return result.to_numpy(dtype=bool, na_value=False)
+
+    def _literal(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            if isinstance(node.operand.value, (int, float)) and not isinstance(node.operand.value, bool):
+                return -node.operand.value
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return [self._literal(item) for item in node.elts]
+        raise NotImplementedError
+
+    def _compile_node(self, df: pd.DataFrame, node: ast.AST, placeholders: Dict[str, str]) -> np.ndarray:
+        if isinstance(node, ast.BoolOp):
+            masks = [self._compile_node(df, value, placeholders) for value in node.values]
+            reducer = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return reducer.reduce(masks)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+            left = self._compile_node(df, node.left, placeholders)
+            right = self._compile_node(df, node.right, placeholders)
+            return left & right if isinstance(node.op, ast.BitAnd) else left | right
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            return ~self._compile_node(df, node.operand, placeholders)
+        if isinstance(node, ast.Compare) and len(node.ops) == 1:
+            left, operator, right = node.left, node.ops[0], node.comparators[0]
+            if isinstance(right, ast.Name) and not isinstance(left, ast.Name):
+                # 10 < `Sales` reads as `Sales` > 10
+                left, right = right, left
+                condition = self._AST_COMPARISONS.get(type(operator))
+                condition = self._MIRRORED_COMPARISONS.get(condition) if condition else None
+            elif isinstance(operator, (ast.In, ast.NotIn)):
+                condition = "in"
+            else:
+                condition = self._AST_COMPARISONS.get(type(operator))
+            if condition is None or not isinstance(left, ast.Name):
+                raise NotImplementedError
+            column = placeholders.get(left.id, left.id)
+            if column not in df.columns:
+                raise NotImplementedError
+            value = self._literal(right)
+            if condition == "in" and not isinstance(value, list):
+                raise NotImplementedError
+            mask = self.condition_mask(df, column, condition, value, coerce=False)
+            return ~mask if isinstance(operator, ast.NotIn) else mask
+        raise NotImplementedError
@@ -1,14 +1,25 @@
 import pandas as pd
+import numpy as np
 import json
 from typing import Optional, Dict, Any, List, Callable, Union
 from pathlib import Path
 
+from core.memory_estimator import MemoryEstimator
+
+def operation_json_default(value: Any) -> Any:
+    """json.dump fallback for numpy values in operation logs, e.g. boolean row masks"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 class HistoryManager:
     """
     Manages data states such as undo/redo, memory enforcements, and operation logging
     """
-    def __init__(self) -> None:
+    def __init__(self, memory_estimator: Optional[MemoryEstimator] = None) -> None:
+        self.memory_estimator = memory_estimator if memory_estimator is not None else MemoryEstimator()
         self.undo_stack: List[tuple[pd.DataFrame, list, Optional[tuple[str, bool]]]] = []
         self.redo_stack: List[tuple[pd.DataFrame, list, Optional[tuple[str, bool]]]] = []
         self.max_history_memory_bytes: int = 1024 * 1024 * 1024
@@ -18,10 +29,8 @@ class HistoryManager:
         self.sort_state: Optional[tuple[str, bool]] = None
     
     def _get_dataframe_memory_bytes(self, dataframe: pd.DataFrame) -> int:
-        """Calculate shallow memory footprint of a DataFrame in bytes."""
-        if dataframe is None or dataframe.empty:
-            return 0
-        return dataframe.memory_usage(deep=False).sum()
+        """Calculate the deep memory footprint of a DataFrame in bytes, including string/object data."""
+        return self.memory_estimator.frame_bytes(dataframe)
     
     def _notify_memory_usage(self) -> None:
         """Compute total history memory and fire the registered callback."""
@@ -55,12 +64,16 @@ class HistoryManager:
 
         self._notify_memory_usage()
     
-    def save_state(self, dataframe: pd.DataFrame) -> None:
-        """Push a deep copy of *df* onto the undo stack and clear the redo stack."""
+    def save_state(self, dataframe: pd.DataFrame, copy: bool = True) -> None:
+        """
+        Push a deep copy of *df* onto the undo stack and clear the redo stack.
+        Pass copy=False when the caller hands over a frame it will no longer mutate.
+        """
         if dataframe is not None:
             state_memory = self._get_dataframe_memory_bytes(dataframe)
             
-            self.undo_stack.append((dataframe.copy(), self.operation_log.copy(), self.sort_state))
+            snapshot = dataframe.copy() if copy else dataframe
+            self.undo_stack.append((snapshot, self.operation_log.copy(), self.sort_state))
             self.current_memory_bytes += state_memory
             
             for state in self.redo_stack:
@@ -148,7 +161,33 @@ class HistoryManager:
         self.sort_state = None
         self.current_memory_bytes = 0
         self._notify_memory_usage()
-        
+
+    def suspend(self) -> Dict[str, Any]:
+        """Hand over the stacks, log and sort state and start an empty history, see resume"""
+        state = {
+            "undo_stack": self.undo_stack,
+            "redo_stack": self.redo_stack,
+            "operation_log": self.operation_log,
+            "sort_state": self.sort_state,
+            "current_memory_bytes": self.current_memory_bytes,
+        }
+        self.undo_stack = []
+        self.redo_stack = []
+        self.operation_log = []
+        self.sort_state = None
+        self.current_memory_bytes = 0
+        self._notify_memory_usage()
+        return state
+
+    def resume(self, state: Dict[str, Any]) -> None:
+        """Restore a history handed over by suspend, discarding the current one"""
+        self.undo_stack = state["undo_stack"]
+        self.redo_stack = state["redo_stack"]
+        self.operation_log = state["operation_log"]
+        self.sort_state = state["sort_state"]
+        self.current_memory_bytes = state["current_memory_bytes"]
+        self._notify_memory_usage()
+
     def get_history_info(self) -> Dict[str, Any]:
         """
         Return the full operation log merged with any redo operations that
@@ -178,7 +217,7 @@ class HistoryManager:
         
         target_path = Path(filepath)
         with target_path.open("w", encoding="utf-8") as macro_file:
-            json.dump(self.operation_log, macro_file, indent=4)
+            json.dump(self.operation_log, macro_file, indent=4, default=operation_json_default)
     
     def load_pipeline_macro(self, macro_source: Union[str, Path, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """
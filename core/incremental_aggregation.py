@@ -0,0 +1,148 @@
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+
+@dataclass
+class PartialAggregates:
+    """
+    Decomposable state of a groupby aggregation: one row per group holding the group
+    columns, the group's row count and the partial values each function needs
+    """
+    group_by: List[Hashable]
+    agg_config: Dict[Hashable, str]
+    table: pd.DataFrame
+    # dtypes of the group and aggregated columns of the data the state was built from
+    dtypes: Dict[Hashable, object]
+    # The frame the state describes, needed to look up the values of removed rows
+    source: Optional[pd.DataFrame] = None
+
+
+class IncrementalAggregator:
+    """
+    Groupby aggregations maintained from row deltas instead of recomputed
+
+    sum, count, mean (as sum and count), size, min, max, first and last are kept as
+    per group partials. Appended rows are aggregated on their own and merged into the
+    partials, which costs the new rows plus the number of groups instead of the whole
+    frame. Removed rows are subtracted for sum, count, mean and size, a group that
+    loses all of its rows disappears. min, max, first and last cannot be undone from
+    their partials, aggregations using them are recomputed after removals.
+
+    Results match df.groupby(group_by, dropna=False).agg(agg_config).reset_index()
+    up to floating point summation order.
+    """
+    ROWS: str = "__rows"
+    PARTS: Dict[str, tuple] = {
+        "sum": ("sum",),
+        "count": ("count",),
+        "mean": ("sum", "count"),
+        "size": (),
+        "min": ("min",),
+        "max": ("max",),
+        "first": ("first",),
+        "last": ("last",),
+    }
+    # How two partials of the same group combine
+    MERGE: Dict[str, str] = {"sum": "sum", "count": "sum", "min": "min", "max": "max", "first": "first", "last": "last"}
+    REMOVABLE: frozenset = frozenset({"sum", "count", "mean", "size"})
+    ORDER_DEPENDENT: frozenset = frozenset({"first", "last"})
+
+    def supports(self, df: pd.DataFrame, group_by: List[Hashable], agg_config: Dict[Hashable, str], date_grouping: Optional[Dict[str, str]] = None) -> bool:
+        """True when every function is decomposable and the groups are plain column values"""
+        if date_grouping or not group_by or not agg_config:
+            return False
+        if any(not isinstance(func, str) or func not in self.PARTS for func in agg_config.values()):
+            return False
+        if any(column in group_by for column in agg_config):
+            return False
+        columns = list(group_by) + list(agg_config)
+        if any(column not in df.columns for column in columns) or not df.columns.is_unique:
+            return False
+        # Categorical keys also produce groups for unobserved categories
+        return not any(isinstance(df[column].dtype, pd.CategoricalDtype) for column in group_by)
+
+    def supports_removal(self, partials: PartialAggregates) -> bool:
+        return all(func in self.REMOVABLE for func in partials.agg_config.values())
+
+    def is_order_dependent(self, partials: PartialAggregates) -> bool:
+        return any(func in self.ORDER_DEPENDENT for func in partials.agg_config.values())
+
+    @staticmethod
+    def _part_name(position: int, part: str) -> str:
+        return f"__partial_{position}_{part}"
+
+    def _partial_table(self, df: pd.DataFrame, group_by: List[Hashable], agg_config: Dict[Hashable, str]) -> pd.DataFrame:
+        named = {self.ROWS: (group_by[0], "size")}
+        for position, (column, func) in enumerate(agg_config.items()):
+            for part in self.PARTS[func]:
+                named[self._part_name(position, part)] = (column, part)
+        return df.groupby(group_by, dropna=False, sort=False).agg(**named).reset_index()
+
+    def _merge_tables(self, partials: PartialAggregates, tables: List[pd.DataFrame]) -> pd.DataFrame:
+        reductions = {self.ROWS: "sum"}
+        for position, func in enumerate(partials.agg_config.values()):
+            for part in self.PARTS[func]:
+                reductions[self._part_name(position, part)] = self.MERGE[part]
+        stacked = pd.concat(tables, ignore_index=True)
+        return stacked.groupby(partials.group_by, dropna=False, sort=False).agg(reductions).reset_index()
+
+    def build(self, df: pd.DataFrame, group_by: List[Hashable], agg_config: Dict[Hashable, str]) -> PartialAggregates:
+        """Aggregate df once into partials, the full cost of the aggregation"""
+        columns = list(group_by) + list(agg_config)
+        return PartialAggregates(
+            group_by=list(group_by),
+            agg_config=dict(agg_config),
+            table=self._partial_table(df, list(group_by), agg_config),
+            dtypes={column: df[column].dtype for column in columns},
+            source=df,
+        )
+
+    def _check_schema(self, partials: PartialAggregates, df: pd.DataFrame) -> None:
+        for column, dtype in partials.dtypes.items():
+            if column not in df.columns:
+                raise KeyError(f"Column '{column}' is missing")
+            if df[column].dtype != dtype:
+                raise TypeError(f"Column '{column}' changed type from {dtype} to {df[column].dtype}")
+
+    def append(self, partials: PartialAggregates, new_rows: pd.DataFrame, source: Optional[pd.DataFrame] = None) -> PartialAggregates:
+        """
+        Merge rows appended after the data of partials\n
+        :param new_rows (pd.DataFrame): Only the appended rows, in their order
+        :param source (pd.DataFrame): The data including the new rows, kept for later removals
+        :return (PartialAggregates): New state, partials itself is unchanged
+        """
+        self._check_schema(partials, new_rows)
+        if len(new_rows) == 0:
+            table = partials.table
+        else:
+            table = self._merge_tables(partials, [partials.table, self._partial_table(new_rows, partials.group_by, partials.agg_config)])
+        return PartialAggregates(partials.group_by, partials.agg_config, table, partials.dtypes, source)
+
+    def remove(self, partials: PartialAggregates, removed_rows: pd.DataFrame, source: Optional[pd.DataFrame] = None) -> PartialAggregates:
+        """Subtract removed rows, only for sum, count, mean and size (see supports_removal)"""
+        if not self.supports_removal(partials):
+            raise ValueError("min, max, first and last cannot be updated for removed rows")
+        self._check_schema(partials, removed_rows)
+        if len(removed_rows) == 0:
+            return PartialAggregates(partials.group_by, partials.agg_config, partials.table, partials.dtypes, source)
+        removed = self._partial_table(removed_rows, partials.group_by, partials.agg_config)
+        value_columns = [column for column in removed.columns if column not in partials.group_by]
+        removed[value_columns] = -removed[value_columns]
+        table = self._merge_tables(partials, [partials.table, removed])
+        table = table[table[self.ROWS] > 0].reset_index(drop=True)
+        return PartialAggregates(partials.group_by, partials.agg_config, table, partials.dtypes, source)
+
+    def finalize(self, partials: PartialAggregates) -> pd.DataFrame:
+        """The aggregation result of the partials, sorted by the group columns like groupby"""
+        table = partials.table.sort_values(partials.group_by, na_position="last", kind="stable").reset_index(drop=True)
+        result = table[partials.group_by].copy()
+        for position, (column, func) in enumerate(partials.agg_config.items()):
+            if func == "size":
+                result[column] = table[self.ROWS]
+            elif func == "mean":
+                counts = table[self._part_name(position, "count")]
+                result[column] = (table[self._part_name(position, "sum")] / counts.where(counts > 0)).where(counts > 0)
+            else:
+                result[column] = table[self._part_name(position, func)]
+        return result
@@ -0,0 +1,319 @@
+import math
+import os
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Sequence
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@dataclass
+class JoinPlan:
+    """Estimated cardinalities of a join on given keys, for every join type"""
+    left_rows: int
+    right_rows: int
+    # Left rows without a matching right key and the reverse
+    left_only: int
+    right_only: int
+    # Matched row pairs, the size of the inner join
+    matched: int
+    # Key values that occur more than once on both sides
+    many_to_many_keys: int
+    is_exact: bool
+
+    def result_rows(self, how: str) -> int:
+        if how == "inner":
+            return self.matched
+        if how == "left":
+            return self.matched + self.left_only
+        if how == "right":
+            return self.matched + self.right_only
+        if how == "outer":
+            return self.matched + self.left_only + self.right_only
+        raise ValueError(f"Unsupported join type: {how}")
+
+    def warning(self, how: str, blowup_factor: float = 2.0) -> str:
+        """A warning for joins that multiply rows through many-to-many keys, empty otherwise"""
+        if self.many_to_many_keys == 0:
+            return ""
+        result_rows = self.result_rows(how)
+        if result_rows <= blowup_factor * max(self.left_rows, self.right_rows, 1):
+            return ""
+        prefix = "" if self.is_exact else "about "
+        return (
+            f"{prefix}{self.many_to_many_keys:,} key values repeat on both sides, the join produces "
+            f"{prefix}{result_rows:,} rows from {self.left_rows:,} and {self.right_rows:,} rows."
+        )
+
+
+class JoinEngine:
+    """
+    Join planning from key value counts and large joins on DuckDB
+
+    plan() counts every key value on both sides instead of running the join. Up to
+    EXACT_MAX_ROWS rows the keys are factorized jointly with pandas, which matches the
+    equality pd.merge uses (missing keys match each other), and the counts are exact.
+    Larger inputs are estimated on DuckDB from a hash sample of the key values: a key is
+    kept on both sides when its hash falls in the same 1/m slice, so matches stay matches
+    and the sampled counts scale back by m. Keys heavy enough to dominate the join make
+    the estimate noisier, the plan reports it as inexact.
+
+    merge() runs joins with at least duckdb_min_rows input rows as a DuckDB parallel hash
+    join when more than one thread is available (on one core pd.merge is faster). The result follows pd.merge: the same column names and suffixes, one column
+    for keys with the same name on both sides, and the same row order. Inputs the SQL
+    path cannot represent exactly fall back to pd.merge.
+    """
+    EXACT_MAX_ROWS: int = 2_000_000
+    HOW_TO_SQL = {"inner": "INNER", "left": "LEFT", "right": "RIGHT", "outer": "FULL OUTER"}
+    LEFT_ROW: str = "__dps_left_row"
+    RIGHT_ROW: str = "__dps_right_row"
+
+    def __init__(self, exact_max_rows: Optional[int] = None, duckdb_min_rows: int = 1_000_000, threads: Optional[int] = None) -> None:
+        self.exact_max_rows = exact_max_rows or self.EXACT_MAX_ROWS
+        self.duckdb_min_rows = duckdb_min_rows
+        self.threads = threads or os.cpu_count() or 1
+
+    @staticmethod
+    def is_available() -> bool:
+        return duckdb is not None and pa is not None
+
+    @staticmethod
+    def _validate_keys(left: pd.DataFrame, right: pd.DataFrame, left_on: Sequence[Hashable], right_on: Sequence[Hashable]) -> None:
+        if not left_on or len(left_on) != len(right_on):
+            raise ValueError("Select the same number of join keys on both sides")
+        for frame, keys in ((left, left_on), (right, right_on)):
+            for key in keys:
+                if key not in frame.columns:
+                    raise ValueError(f"Column '{key}' not found")
+
+    def _connect(self) -> "duckdb.DuckDBPyConnection":
+        connection = duckdb.connect(":memory:")
+        connection.execute(f"SET threads TO {int(self.threads)}")
+        return connection
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        return '"' + str(name).replace('"', '""') + '"'
+
+    # Planning
+    def plan(self, left: pd.DataFrame, right: pd.DataFrame, left_on: Sequence[Hashable], right_on: Sequence[Hashable]) -> JoinPlan:
+        """
+        Cardinalities of joining left and right on the key columns\n
+        :param left (pd.DataFrame): The current data
+        :param right (pd.DataFrame): The data to join
+        :param left_on (Sequence[Hashable]): Key columns of left
+        :param right_on (Sequence[Hashable]): Key columns of right, paired with left_on
+        :return (JoinPlan): Exact counts for moderate inputs, a hash sample estimate for larger ones
+        """
+        self._validate_keys(left, right, left_on, right_on)
+        if len(left) + len(right) > self.exact_max_rows and self.is_available():
+            try:
+                return self._sketch_plan(left, right, list(left_on), list(right_on))
+            except (duckdb.Error, pa.ArrowException, ValueError, TypeError):
+                # Keys DuckDB cannot compare or hash alike on both sides, count them exactly
+                pass
+        return self._exact_plan(left, right, list(left_on), list(right_on))
+
+    def _exact_plan(self, left: pd.DataFrame, right: pd.DataFrame, left_on: List[Hashable], right_on: List[Hashable]) -> JoinPlan:
+        left_rows, right_rows = len(left), len(right)
+        codes = np.zeros(left_rows + right_rows, dtype=np.int64)
+        for left_key, right_key in zip(left_on, right_on):
+            # One joint factorization per key pair, so equal values share a code on both sides
+            values = pd.concat([left[left_key].reset_index(drop=True), right[right_key].reset_index(drop=True)], ignore_index=True)
+            key_codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            codes, _ = pd.factorize(codes * len(uniques) + key_codes)
+        group_count = int(codes.max()) + 1 if len(codes) else 0
+        left_counts = np.bincount(codes[:left_rows], minlength=group_count)
+        right_counts = np.bincount(codes[left_rows:], minlength=group_count)
+        return JoinPlan(
+            left_rows=left_rows,
+            right_rows=right_rows,
+            left_only=int(left_counts[right_counts == 0].sum()),
+            right_only=int(right_counts[left_counts == 0].sum()),
+            matched=int(np.dot(left_counts, right_counts)),
+            many_to_many_keys=int(np.count_nonzero((left_counts > 1) & (right_counts > 1))),
+            is_exact=True,
+        )
+
+    @staticmethod
+    def _key_table(df: pd.DataFrame, keys: List[Hashable]) -> "pa.Table":
+        return pa.Table.from_pandas(df[keys].set_axis([f"k{position}" for position in range(len(keys))], axis=1), preserve_index=False)
+
+    def _sketch_plan(self, left: pd.DataFrame, right: pd.DataFrame, left_on: List[Hashable], right_on: List[Hashable]) -> JoinPlan:
+        left_table = self._key_table(left, left_on)
+        right_table = self._key_table(right, right_on)
+        key_expressions = []
+        for position, (left_field, right_field) in enumerate(zip(left_table.schema, right_table.schema)):
+            if left_field.type == right_field.type:
+                key_expressions.append(f"k{position}")
+            elif pa.types.is_integer(left_field.type) or pa.types.is_floating(left_field.type):
+                if not (pa.types.is_integer(right_field.type) or pa.types.is_floating(right_field.type)):
+                    raise ValueError("Join keys of different types")
+                # Mixed numeric keys are compared and hashed as doubles, as pandas compares them
+                key_expressions.append(f"CAST(k{position} AS DOUBLE)")
+            else:
+                raise ValueError("Join keys of different types")
+
+        modulus = max(1, math.ceil((len(left) + len(right)) / self.exact_max_rows))
+        keys = ", ".join(f"{expression} AS k{position}" for position, expression in enumerate(key_expressions))
+        hashed = f"hash({', '.join(key_expressions)}) % {modulus} = 0"
+        condition = " AND ".join(f"lc.k{position} IS NOT DISTINCT FROM rc.k{position}" for position in range(len(key_expressions)))
+        sql = f"""
+            WITH lc AS (SELECT {keys}, count(*) AS c FROM left_keys WHERE {hashed} GROUP BY ALL),
+                 rc AS (SELECT {keys}, count(*) AS c FROM right_keys WHERE {hashed} GROUP BY ALL)
+            SELECT
+                coalesce(sum(CASE WHEN rc.c IS NULL THEN lc.c END), 0),
+                coalesce(sum(CASE WHEN lc.c IS NULL THEN rc.c END), 0),
+                coalesce(sum(lc.c * rc.c), 0),
+                count(*) FILTER (WHERE lc.c > 1 AND rc.c > 1)
+            FROM lc FULL OUTER JOIN rc ON {condition}
+        """
+        connection = self._connect()
+        try:
+            connection.register("left_keys", left_table)
+            connection.register("right_keys", right_table)
+            left_only, right_only, matched, many_to_many_keys = connection.execute(sql).fetchone()
+        finally:
+            connection.close()
+        return JoinPlan(
+            left_rows=len(left),
+            right_rows=len(right),
+            left_only=int(left_only) * modulus,
+            right_only=int(right_only) * modulus,
+            matched=int(matched) * modulus,
+            many_to_many_keys=int(many_to_many_keys) * modulus,
+            is_exact=modulus == 1,
+        )
+
+    # Execution
+    def merge(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        how: str,
+        left_on: Sequence[Hashable],
+        right_on: Sequence[Hashable],
+        suffixes: tuple = ("_left", "_right"),
+    ) -> pd.DataFrame:
+        """pd.merge(left, right, how, left_on=left_on, right_on=right_on, suffixes=suffixes), on DuckDB for large inputs"""
+        if len(left) + len(right) >= self.duckdb_min_rows and self.threads > 1 and self.is_available():
+            sql_parts = self._sql_join_parts(left, right, how, list(left_on), list(right_on), tuple(suffixes))
+            if sql_parts is not None:
+                try:
+                    return self._duckdb_merge(left, right, sql_parts)
+                except (duckdb.Error, pa.ArrowException):
+                    pass
+        return pd.merge(left, right, how=how, left_on=list(left_on), right_on=list(right_on), suffixes=suffixes)
+
+    @staticmethod
+    def _is_sql_safe(dtype) -> bool:
+        if isinstance(dtype, pd.ArrowDtype):
+            return True
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            return False
+        return dtype.kind in "biufMO" and not (dtype.kind == "M" and getattr(dtype, "tz", None) is not None)
+
+    def _sql_join_parts(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        how: str,
+        left_on: List[Hashable],
+        right_on: List[Hashable],
+        suffixes: tuple,
+    ) -> Optional[tuple[List[str], List[tuple[str, Optional[str]]], str, str]]:
+        """(select list, (column, side) pairs, join clause, order by) reproducing pd.merge, None if only pandas can run the join"""
+        if how not in self.HOW_TO_SQL or not left_on or len(left_on) != len(right_on):
+            return None
+        for frame in (left, right):
+            if not frame.columns.is_unique or not all(isinstance(column, str) for column in frame.columns):
+                return None
+            if self.LEFT_ROW in frame.columns or self.RIGHT_ROW in frame.columns:
+                return None
+            if not all(self._is_sql_safe(dtype) for dtype in frame.dtypes):
+                return None
+        if any(left[left_key].dtype != right[right_key].dtype for left_key, right_key in zip(left_on, right_on)):
+            return None
+
+        # Keys with the same name on both sides become one column, as in pd.merge
+        shared_keys = {left_key for left_key, right_key in zip(left_on, right_on) if left_key == right_key}
+        overlap = (set(left.columns) & set(right.columns)) - shared_keys
+        if overlap & (set(left_on) | set(right_on)):
+            return None
+        left_suffix, right_suffix = suffixes
+        if overlap and not (left_suffix or right_suffix):
+            return None
+
+        select: List[str] = []
+        # Output column -> the side it comes from, None for merged keys
+        sides: List[tuple[str, Optional[str]]] = []
+        for column in left.columns:
+            if column in shared_keys:
+                expression = f"coalesce(l.{self._quote(column)}, r.{self._quote(column)})"
+                name, side = column, None
+            else:
+                expression = f"l.{self._quote(column)}"
+                name, side = (f"{column}{left_suffix}" if column in overlap else column), "left"
+            select.append(f"{expression} AS {self._quote(name)}")
+            sides.append((name, side))
+        for column in right.columns:
+            if column in shared_keys:
+                continue
+            name = f"{column}{right_suffix}" if column in overlap else column
+            select.append(f"r.{self._quote(column)} AS {self._quote(name)}")
+            sides.append((name, "right"))
+        if len({name for name, _ in sides}) != len(sides):
+            return None
+
+        condition = " AND ".join(
+            f"l.{self._quote(left_key)} IS NOT DISTINCT FROM r.{self._quote(right_key)}"
+            for left_key, right_key in zip(left_on, right_on)
+        )
+        left_row, right_row = f"l.{self.LEFT_ROW}", f"r.{self.RIGHT_ROW}"
+        if how in ("inner", "left"):
+            order = [left_row, f"{right_row} NULLS LAST"]
+        elif how == "right":
+            order = [right_row, f"{left_row} NULLS LAST"]
+        else:
+            # Outer joins sort by the key values with missing keys last, like pd.merge
+            order = [
+                f"coalesce(l.{self._quote(left_key)}, r.{self._quote(right_key)}) ASC NULLS LAST"
+                for left_key, right_key in zip(left_on, right_on)
+            ] + [f"{left_row} NULLS LAST", f"{right_row} NULLS LAST"]
+        select += [left_row, right_row]
+        join = f"{self.HOW_TO_SQL[how]} JOIN right_rows r ON {condition}"
+        return select, sides, join, ", ".join(order)
+
+    def _duckdb_merge(self, left: pd.DataFrame, right: pd.DataFrame, sql_parts: tuple) -> pd.DataFrame:
+        select, sides, join, order = sql_parts
+        # Row numbers are appended on the Arrow side, the frames themselves are not copied
+        left_table = pa.Table.from_pandas(left, preserve_index=False)
+        left_table = left_table.append_column(self.LEFT_ROW, pa.array(np.arange(len(left), dtype=np.int64)))
+        right_table = pa.Table.from_pandas(right, preserve_index=False)
+        right_table = right_table.append_column(self.RIGHT_ROW, pa.array(np.arange(len(right), dtype=np.int64)))
+        connection = self._connect()
+        try:
+            connection.register("left_rows", left_table)
+            connection.register("right_rows", right_table)
+            result = connection.execute(f"SELECT {', '.join(select)} FROM left_rows l {join} ORDER BY {order}").arrow()
+        finally:
+            connection.close()
+        if any(isinstance(dtype, pd.ArrowDtype) for dtype in list(left.dtypes) + list(right.dtypes)):
+            merged = result.to_pandas(types_mapper=pd.ArrowDtype)
+            return merged.drop(columns=[self.LEFT_ROW, self.RIGHT_ROW])
+        merged = result.to_pandas()
+        unmatched = {"left": merged.pop(self.LEFT_ROW).isna().to_numpy(), "right": merged.pop(self.RIGHT_ROW).isna().to_numpy()}
+        for name, side in sides:
+            # pd.merge fills the object columns of unmatched rows with NaN, Arrow with None
+            if side is not None and merged[name].dtype == object and unmatched[side].any():
+                merged.loc[unmatched[side], name] = np.nan
+        return merged
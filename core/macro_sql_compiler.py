@@ -0,0 +1,503 @@
+import ast
+import keyword
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from core.virtual_columns import VirtualColumnEngine
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+class UnsupportedMacroOperation(ValueError):
+    """Raised when a macro operation has no SQL equivalent and must run through pandas"""
+
+
+class MacroSQLCompiler:
+    """
+    Compiles pipeline macro operations into a single DuckDB relation
+
+    Consecutive SQL-compatible steps are chained as lazy DuckDB relations, so each
+    run of steps is optimised and executed as one multithreaded query plan.
+    Steps without a faithful SQL translation are executed through the pandas
+    fallback, after which compilation resumes on the intermediate result.
+
+    Frames are scanned with their row positions as a hidden column, so the result keeps
+    the index labels (row ids) pandas would keep. Aggregate, melt and sql_query steps
+    number their rows afresh, as pandas does with a new RangeIndex.
+    """
+    SUPPORTED_OPERATIONS = {
+        "filter",
+        "filter_multiple",
+        "drop_column",
+        "rename_column",
+        "computed_column",
+        "fill_missing",
+        "drop_missing",
+        "sort",
+        "aggregate",
+        "melt",
+        "sql_query",
+    }
+    # Carries the position of each row in the scanned frame through the plan
+    ROW_POSITION_COLUMN = "__dps_row_position"
+    AGGREGATE_FUNCTIONS: Dict[str, str] = {
+        # pandas sums a group of only missing values to 0
+        "sum": "coalesce(sum({column}), 0)",
+        "mean": "avg({column})",
+        "median": "median({column})",
+        "min": "min({column})",
+        "max": "max({column})",
+        "count": "count({column})",
+        "std": "stddev_samp({column})",
+        "var": "var_samp({column})",
+        "nunique": "count(DISTINCT {column})",
+    }
+    COMPARISON_OPERATORS: Dict[str, str] = {
+        ">": ">",
+        "<": "<",
+        ">=": ">=",
+        "<=": "<=",
+        "==": "=",
+        # pandas keeps missing values for '!=', plain SQL '<>' would drop them
+        "!=": "IS DISTINCT FROM",
+    }
+    EXPRESSION_OPERATORS: Dict[type, str] = {
+        ast.Add: "+",
+        ast.Sub: "-",
+        ast.Mult: "*",
+        ast.Div: "/",
+    }
+    INTEGER_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "HUGEINT")
+    FLOAT_TYPES = ("FLOAT", "DOUBLE", "REAL")
+
+    def __init__(self) -> None:
+        if duckdb is None:
+            raise ImportError("DuckDB is required to compile pipeline macros to SQL")
+        self.last_compiled_sql: List[str] = []
+        self._step_count = 0
+
+    # SQL rendering helpers
+    @staticmethod
+    def _quote(identifier: Any) -> str:
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    @staticmethod
+    def _literal(value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, int):
+            return str(value)
+        if isinstance(value, float):
+            if value != value:
+                return "CAST('NaN' AS DOUBLE)"
+            return repr(value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def _column_types(self, relation: "duckdb.DuckDBPyRelation") -> Dict[str, str]:
+        return {
+            column: str(column_type).upper()
+            for column, column_type in zip(relation.columns, relation.types)
+            if column != self.ROW_POSITION_COLUMN
+        }
+
+    def _coerce_literal(self, value: Any, column_type: str) -> str:
+        """Render a filter value the same way DataMutator.filter_data coerces it to the column dtype"""
+        try:
+            if column_type.startswith(self.INTEGER_TYPES):
+                return self._literal(int(value))
+            if column_type.startswith(self.FLOAT_TYPES) or column_type.startswith("DECIMAL"):
+                return self._literal(float(value))
+            if column_type == "BOOLEAN" and isinstance(value, bool):
+                return self._literal(value)
+            if column_type.startswith(("TIMESTAMP", "DATE")):
+                return f"CAST({self._literal(str(value))} AS {column_type})"
+            if column_type == "VARCHAR":
+                return self._literal(str(value))
+        except (TypeError, ValueError):
+            pass
+        raise UnsupportedMacroOperation(f"Cannot compare a {column_type} column with {value!r} in SQL")
+
+    def _compile_condition(self, column: str, condition: str, value: Any, column_types: Dict[str, str]) -> str:
+        if column not in column_types:
+            raise UnsupportedMacroOperation(f"Column '{column}' not found")
+        quoted = self._quote(column)
+        column_type = column_types[column]
+
+        if condition == "Is Null":
+            return f"({quoted} IS NULL)"
+        if condition == "Is Not Null":
+            return f"({quoted} IS NOT NULL)"
+        if condition in self.COMPARISON_OPERATORS:
+            return f"({quoted} {self.COMPARISON_OPERATORS[condition]} {self._coerce_literal(value, column_type)})"
+        if condition == "in":
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if not values:
+                return "FALSE"
+            rendered = ", ".join(self._coerce_literal(item, column_type) for item in values)
+            return f"({quoted} IN ({rendered}))"
+        if condition == "contains":
+            return f"COALESCE(regexp_matches(CAST({quoted} AS VARCHAR), {self._literal(str(value))}), FALSE)"
+        raise UnsupportedMacroOperation(f"Unknown filter condition: {condition}")
+
+    def _compile_expression(self, expression: str, column_types: Dict[str, str]) -> str:
+        """Translate an arithmetic pandas eval expression into SQL"""
+        placeholders: Dict[str, str] = {}
+
+        def replace_backticks(match: re.Match) -> str:
+            placeholder = f"__dps_column_{len(placeholders)}"
+            placeholders[placeholder] = match.group(1)
+            return placeholder
+
+        source = re.sub(r"`([^`]+)`", replace_backticks, str(expression))
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError:
+            raise UnsupportedMacroOperation(f"Cannot parse expression: {expression}")
+
+        def render(node: ast.AST) -> str:
+            if isinstance(node, ast.BinOp):
+                left, right = render(node.left), render(node.right)
+                # % and ** have no SQL operator with the pandas semantics: SQL % truncates
+                # towards zero and power() turns integer powers into doubles
+                operator = self.EXPRESSION_OPERATORS.get(type(node.op))
+                if operator is None:
+                    raise UnsupportedMacroOperation(f"Unsupported operator in expression: {expression}")
+                return f"({left} {operator} {right})"
+            if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+                sign = "-" if isinstance(node.op, ast.USub) else "+"
+                return f"({sign}{render(node.operand)})"
+            if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+                return self._literal(node.value)
+            if isinstance(node, ast.Name):
+                column = placeholders.get(node.id, node.id)
+                if column not in column_types:
+                    raise UnsupportedMacroOperation(f"Unknown column in expression: {column}")
+                return self._quote(column)
+            raise UnsupportedMacroOperation(f"Unsupported expression: {expression}")
+
+        return render(tree.body)
+
+    # Step compilers. Each returns the new SQL over the virtual table 't'
+    def _compile_filter(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        clause = self._compile_condition(kwargs.get("column"), kwargs.get("condition"), kwargs.get("value"), column_types)
+        return f"SELECT * FROM t WHERE {clause}"
+
+    def _compile_filter_multiple(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        parts: List[str] = []
+        for item in kwargs.get("filters") or []:
+            logic = str(item.get("operator", "")).upper()
+            if parts:
+                if logic not in ("AND", "OR"):
+                    raise UnsupportedMacroOperation(f"Unsupported filter logic: {logic}")
+                parts.append(logic)
+            parts.append(self._compile_condition(item["column"], item["condition"], item["value"], column_types))
+        if not parts:
+            return "SELECT * FROM t"
+        return f"SELECT * FROM t WHERE {' '.join(parts)}"
+
+    def _compile_drop_column(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        columns = []
+        if "columns" in kwargs:
+            value = kwargs["columns"]
+            columns.extend(value if isinstance(value, list) else [value])
+        if "column" in kwargs:
+            columns.append(kwargs["column"])
+        columns = list(dict.fromkeys(columns))
+        if not columns:
+            return "SELECT * FROM t"
+        missing = [column for column in columns if column not in column_types]
+        if missing:
+            raise UnsupportedMacroOperation(f"Columns not found: {missing}")
+        return f"SELECT * EXCLUDE ({', '.join(self._quote(column) for column in columns)}) FROM t"
+
+    def _compile_rename_column(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        old_name = kwargs.get("old_name")
+        new_name = str(kwargs.get("new_name") or "").strip()
+        if old_name not in column_types or not new_name or keyword.iskeyword(new_name) or "`" in new_name:
+            raise UnsupportedMacroOperation("Invalid rename, validated by pandas")
+        if new_name != old_name and new_name in column_types:
+            raise UnsupportedMacroOperation("Rename target already exists, validated by pandas")
+        projection = [
+            f"{self._quote(column)} AS {self._quote(kwargs.get('new_name'))}" if column == old_name else self._quote(column)
+            for column in column_types
+        ]
+        # The star keeps the hidden row positions
+        excluded = ", ".join(self._quote(column) for column in column_types)
+        return f"SELECT {', '.join(projection)}, * EXCLUDE ({excluded}) FROM t"
+
+    def _compile_computed_column(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        if kwargs.get("virtual"):
+            raise UnsupportedMacroOperation("Virtual columns are stored as definitions on the frame")
+        new_column = kwargs.get("new_column")
+        clean_name = str(new_column or "").strip()
+        if not clean_name or clean_name in column_types or keyword.iskeyword(clean_name) or "`" in clean_name:
+            raise UnsupportedMacroOperation("Invalid computed column name, validated by pandas")
+        expression = self._compile_expression(kwargs.get("expression", ""), column_types)
+        return f"SELECT *, {expression} AS {self._quote(new_column)} FROM t"
+
+    def _compile_fill_missing(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        if kwargs.get("method") != "static_value" or kwargs.get("group_by"):
+            raise UnsupportedMacroOperation("Only constant fills are compiled to SQL")
+        column = kwargs.get("column", "All Columns")
+        target_columns = list(column_types) if column in ("All Columns", None) else [column]
+        fill_value = kwargs.get("value")
+        replacements = []
+        for target in target_columns:
+            if target not in column_types:
+                raise UnsupportedMacroOperation(f"Column '{target}' not found")
+            column_type = column_types[target]
+            value = fill_value
+            if isinstance(value, str) and column_type.startswith(self.INTEGER_TYPES + self.FLOAT_TYPES):
+                try:
+                    value = float(value) if "." in value else int(value)
+                except ValueError:
+                    raise UnsupportedMacroOperation("Fill value changes the column dtype")
+            if isinstance(value, float) and column_type.startswith(self.INTEGER_TYPES):
+                raise UnsupportedMacroOperation("Fill value changes the column dtype")
+            if isinstance(value, str) and column_type != "VARCHAR":
+                raise UnsupportedMacroOperation("Fill value changes the column dtype")
+            replacements.append(
+                f"COALESCE({self._quote(target)}, CAST({self._literal(value)} AS {column_type})) AS {self._quote(target)}"
+            )
+        return f"SELECT * REPLACE ({', '.join(replacements)}) FROM t"
+
+    def _compile_drop_missing(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        if not column_types:
+            return "SELECT * FROM t"
+        clause = " AND ".join(f"{self._quote(column)} IS NOT NULL" for column in column_types)
+        return f"SELECT * FROM t WHERE {clause}"
+
+    def _compile_aggregate(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        group_by: List[str] = kwargs.get("group_by") or []
+        agg_config: Dict[str, Any] = kwargs.get("agg_config") or {}
+        if not group_by or not agg_config or kwargs.get("date_grouping"):
+            raise UnsupportedMacroOperation("Only plain column groupings are compiled to SQL")
+        if set(group_by) & set(agg_config):
+            raise UnsupportedMacroOperation("Aggregated column overlaps the grouping columns")
+
+        projection = [self._quote(column) for column in group_by]
+        for column, function in agg_config.items():
+            if column not in column_types or not isinstance(function, str) or function not in self.AGGREGATE_FUNCTIONS:
+                raise UnsupportedMacroOperation(f"Aggregation '{function}' on '{column}' is not compiled to SQL")
+            expression = self.AGGREGATE_FUNCTIONS[function].format(column=self._quote(column))
+            if function == "sum" and column_types[column].startswith(self.INTEGER_TYPES):
+                # DuckDB widens integer sums to HUGEINT, pandas keeps int64
+                expression = f"CAST({expression} AS BIGINT)"
+            projection.append(f"{expression} AS {self._quote(column)}")
+
+        missing = [column for column in group_by if column not in column_types]
+        if missing:
+            raise UnsupportedMacroOperation(f"Grouping columns not found: {missing}")
+        keys = ", ".join(self._quote(column) for column in group_by)
+        # pandas drops groups with missing keys and sorts by the keys
+        not_null = " AND ".join(f"{self._quote(column)} IS NOT NULL" for column in group_by)
+        return f"SELECT {', '.join(projection)} FROM t WHERE {not_null} GROUP BY {keys} ORDER BY {keys}"
+
+    def _compile_melt(self, kwargs: Dict[str, Any], column_types: Dict[str, str], order_clause: Optional[str]) -> str:
+        id_vars: List[str] = kwargs.get("id_vars") or []
+        value_vars: List[str] = kwargs.get("value_vars") or [column for column in column_types if column not in id_vars]
+        var_name = kwargs.get("var_name", "variable")
+        value_name = kwargs.get("value_name", "value")
+        if not value_vars or any(column not in column_types for column in list(id_vars) + list(value_vars)):
+            raise UnsupportedMacroOperation("Melt columns not found")
+        if var_name in column_types or value_name in column_types or var_name == value_name:
+            raise UnsupportedMacroOperation("Melt output names collide with existing columns")
+
+        value_types = {column_types[column] for column in value_vars}
+        if len(value_types) == 1:
+            value_type = value_types.pop()
+        elif all(column_type.startswith(self.INTEGER_TYPES + self.FLOAT_TYPES) for column_type in value_types):
+            value_type = "DOUBLE"
+        else:
+            raise UnsupportedMacroOperation("Melting mixed column types produces object columns in pandas")
+
+        id_projection = "".join(f"{self._quote(column)}, " for column in id_vars)
+        row_number = f"row_number() OVER (ORDER BY {order_clause})" if order_clause else "row_number() OVER ()"
+        selects = [
+            f"SELECT {id_projection}{self._literal(str(column))} AS {self._quote(var_name)}, "
+            f"CAST({self._quote(column)} AS {value_type}) AS {self._quote(value_name)}, "
+            f"{position} AS __dps_var_position, __dps_row FROM numbered"
+            for position, column in enumerate(value_vars)
+        ]
+        return (
+            f"WITH numbered AS (SELECT *, {row_number} AS __dps_row FROM t) "
+            f"SELECT * EXCLUDE (__dps_var_position, __dps_row) FROM ({' UNION ALL '.join(selects)}) "
+            f"ORDER BY __dps_var_position, __dps_row"
+        )
+
+    def _compile_sql_query(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        sql = str(kwargs.get("sql") or "").strip().rstrip(";").strip()
+        if not sql:
+            raise UnsupportedMacroOperation("Empty SQL query")
+        # Logged queries read the view 'data', which is the previous step without the row positions
+        data_view = f"data AS (SELECT {', '.join(self._quote(column) for column in column_types)} FROM t)"
+        if sql[:5].upper() == "WITH ":
+            return f"WITH {data_view}, {sql[5:]}"
+        return f"WITH {data_view} {sql}"
+
+    def _compile_sort(self, kwargs: Dict[str, Any], column_types: Dict[str, str]) -> str:
+        keys = kwargs.get("keys") or [(kwargs.get("column"), kwargs.get("ascending", True))]
+        order_terms = []
+        for column, ascending in keys:
+            if column not in column_types:
+                raise UnsupportedMacroOperation(f"Column '{column}' not found")
+            direction = "ASC" if ascending else "DESC"
+            # pandas places missing values last for both directions
+            order_terms.append(f"{self._quote(column)} {direction} NULLS LAST")
+        return ", ".join(order_terms)
+
+    # Execution
+    def _chain(self, relation: "duckdb.DuckDBPyRelation", sql: str) -> "duckdb.DuckDBPyRelation":
+        """Stack a compiled statement on top of relation, exposing the input as the CTE 't'"""
+        self._step_count += 1
+        # Every step needs its own view name, reusing one would bind the view recursively
+        view_name = f"__dps_step_{self._step_count}"
+        source_cte = f"WITH t AS (SELECT * FROM {view_name})"
+        if sql.startswith("WITH "):
+            sql = f"{source_cte}, {sql[len('WITH '):]}"
+        else:
+            sql = f"{source_cte} {sql}"
+        return relation.query(view_name, sql)
+
+    def _open_frame(self, connection: "duckdb.DuckDBPyConnection", df: pd.DataFrame) -> "duckdb.DuckDBPyRelation":
+        """Scan df with its row positions, DuckDB does not read the index"""
+        frame = df.copy(deep=False)
+        frame[self.ROW_POSITION_COLUMN] = np.arange(len(df), dtype=np.int64)
+        return connection.from_df(frame)
+
+    def _open_source(self, connection: "duckdb.DuckDBPyConnection", source: Union[pd.DataFrame, str, Path]) -> "duckdb.DuckDBPyRelation":
+        if isinstance(source, pd.DataFrame):
+            return self._open_frame(connection, source)
+        path = Path(source)
+        extension = path.suffix.lower()
+        if extension == ".parquet":
+            return connection.read_parquet(path.as_posix())
+        if extension == ".csv":
+            return connection.sql(f"SELECT * FROM read_csv_auto({self._literal(path.as_posix())}, ignore_errors=true)")
+        if extension == ".txt":
+            return connection.sql(f"SELECT * FROM read_csv_auto({self._literal(path.as_posix())}, delim='\\t', ignore_errors=true)")
+        raise UnsupportedMacroOperation(f"DuckDB cannot read {extension} files directly")
+
+    def _materialize(
+        self,
+        relation: "duckdb.DuckDBPyRelation",
+        order_clause: Optional[str],
+        arrow_backed: bool,
+        attrs: Dict[str, Any],
+        row_index: Optional[pd.Index],
+    ) -> pd.DataFrame:
+        """Run the plan, restoring the labels of row_index from the row positions when they survived"""
+        if order_clause:
+            relation = self._chain(relation, f"SELECT * FROM t ORDER BY {order_clause}")
+        self.last_compiled_sql.append(relation.sql_query())
+        if arrow_backed:
+            result = relation.arrow().to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            result = relation.df()
+        if self.ROW_POSITION_COLUMN in result.columns:
+            positions = result.pop(self.ROW_POSITION_COLUMN).to_numpy(dtype=np.int64)
+            result.index = row_index.take(positions)
+        # Frame metadata such as virtual column definitions does not pass through SQL
+        result.attrs = dict(attrs)
+        return result
+
+    def run(
+        self,
+        source: Union[pd.DataFrame, str, Path],
+        operations: List[Dict[str, Any]],
+        fallback: Callable[[pd.DataFrame, str, Dict[str, Any], Optional[tuple]], tuple[pd.DataFrame, Optional[tuple]]],
+        sort_state: Optional[tuple] = None,
+    ) -> tuple[pd.DataFrame, Optional[tuple]]:
+        """
+        Execute a macro with DuckDB, falling back to pandas for unsupported steps\n
+        :param source (DataFrame | str | Path): The current frame, or a csv/txt/parquet file scanned directly
+        :param operations (List[Dict]): Macro operations as produced by load_pipeline_macro
+        :param fallback (Callable): Runs one operation in pandas, (df, op_type, kwargs, sort_state) -> (df, sort_state)
+        :param sort_state (Optional[tuple]): The current sort state
+        :return (tuple[pd.DataFrame, Optional[tuple]]): Resulting frame and sort state. Frames keep their index
+            labels, file sources are read with a fresh RangeIndex
+        """
+        self.last_compiled_sql = []
+        arrow_backed = not isinstance(source, pd.DataFrame) or any(isinstance(dtype, pd.ArrowDtype) for dtype in source.dtypes)
+        connection = duckdb.connect()
+        try:
+            relation = self._open_source(connection, source)
+            current_df: Optional[pd.DataFrame] = source if isinstance(source, pd.DataFrame) else None
+            attrs: Dict[str, Any] = current_df.attrs if current_df is not None else {}
+            # The index the row positions of the relation point into
+            row_index: Optional[pd.Index] = current_df.index if current_df is not None else None
+            order_clause: Optional[str] = None
+            segment_length = 0
+
+            for op in operations:
+                op_type = op.get("type", "unknown")
+                kwargs = {k: v for k, v in op.items() if k != "type"}
+
+                if relation is None:
+                    relation = self._open_frame(connection, current_df)
+                    row_index = current_df.index
+                    segment_length = 0
+
+                try:
+                    if op_type not in self.SUPPORTED_OPERATIONS:
+                        raise UnsupportedMacroOperation(f"'{op_type}' has no SQL translation")
+                    if op_type in ("drop_column", "rename_column") and VirtualColumnEngine.ATTRS_KEY in attrs:
+                        raise UnsupportedMacroOperation("Virtual column definitions are updated by pandas")
+                    column_types = self._column_types(relation)
+                    if op_type == "sort":
+                        requested_state = (kwargs.get("column"), kwargs.get("ascending", True))
+                        if sort_state != requested_state or kwargs.get("keys"):
+                            # Deferred to a single ORDER BY, sorting is only needed once
+                            order_clause = self._compile_sort(kwargs, column_types)
+                            sort_state = requested_state
+                            segment_length += 1
+                        continue
+                    if order_clause and op_type in ("drop_column", "rename_column", "sql_query"):
+                        # The pending sort key may not survive this step, order the rows now
+                        relation = self._chain(relation, f"SELECT * FROM t ORDER BY {order_clause}")
+                        order_clause = None
+                    if op_type == "melt":
+                        sql = self._compile_melt(kwargs, column_types, order_clause)
+                    else:
+                        sql = getattr(self, f"_compile_{op_type}")(kwargs, column_types)
+                    # Validate the statement (binder errors) before adding it to the plan
+                    next_relation = self._chain(relation, sql)
+                    next_relation.columns
+                except (UnsupportedMacroOperation, duckdb.Error):
+                    # Materialize the compiled segment and run this step in pandas
+                    if segment_length or current_df is None:
+                        # current_df is None only for file sources that were never materialized
+                        current_df = self._materialize(relation, order_clause, arrow_backed, attrs, row_index)
+                    order_clause = None
+                    relation = None
+                    current_df, sort_state = fallback(current_df, op_type, kwargs, sort_state)
+                    attrs = current_df.attrs
+                    continue
+
+                relation = next_relation
+                segment_length += 1
+                if op_type in ("aggregate", "melt", "sql_query"):
+                    order_clause = None
+                    sort_state = None
+                    # The virtual columns read columns that no longer exist
+                    attrs = {key: value for key, value in attrs.items() if key != VirtualColumnEngine.ATTRS_KEY}
+                    # The reshaped rows get a fresh RangeIndex, scanned again with those positions
+                    # so later steps keep the labels pandas would
+                    current_df = self._materialize(relation, None, arrow_backed, attrs, row_index)
+                    relation = None
+                elif op_type == "drop_column" and sort_state and sort_state[0] not in relation.columns:
+                    sort_state = None
+
+            if relation is not None and (segment_length or current_df is None):
+                current_df = self._materialize(relation, order_clause, arrow_backed, attrs, row_index)
+            return current_df, sort_state
+        finally:
+            connection.close()
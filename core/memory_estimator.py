@@ -0,0 +1,137 @@
+import sys
+import weakref
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+class MemoryEstimator:
+    """
+    Cheap and accurate memory accounting for DataFrames
+
+    Fixed width columns are measured exactly from their buffers, Arrow backed
+    columns from their Arrow buffer sizes and object columns are estimated from
+    a sample of their values. Sampled estimates are cached per column buffer so
+    repeated measurements of the same data (history snapshots, the info panel)
+    are free until the column is replaced.
+    """
+    POINTER_BYTES: int = np.dtype(object).itemsize
+
+    def __init__(self, sample_size: int = 1000) -> None:
+        self.sample_size = sample_size
+        # (id(owning array), data address, length) -> (weakref to owning array, estimated bytes)
+        self._column_cache: Dict[tuple[int, int, int], tuple[weakref.ref, int]] = {}
+
+    def _get_column_buffer(self, series: pd.Series) -> Any:
+        """Return the array holding the column values"""
+        values = series.array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            return values._ndarray
+        return values
+
+    def _get_cache_key(self, buffer: np.ndarray) -> tuple[tuple[int, int, int], np.ndarray]:
+        """
+        Key a column by the array that owns its memory plus its offset and length.
+        Columns of a consolidated block are fresh views on every access, so the
+        owning array is what identifies a column version.
+        """
+        owner = buffer
+        while isinstance(owner.base, np.ndarray):
+            owner = owner.base
+        return (id(owner), buffer.__array_interface__["data"][0], len(buffer)), owner
+
+    def _get_cached_bytes(self, buffer: np.ndarray) -> Optional[int]:
+        key, owner = self._get_cache_key(buffer)
+        entry = self._column_cache.get(key)
+        if entry is None:
+            return None
+        owner_ref, size_bytes = entry
+        if owner_ref() is not owner:
+            # The id was reused by a different array
+            del self._column_cache[key]
+            return None
+        return size_bytes
+
+    def _store_cached_bytes(self, buffer: np.ndarray, size_bytes: int) -> None:
+        key, owner = self._get_cache_key(buffer)
+        try:
+            owner_ref = weakref.ref(owner, lambda _ref, cache_key=key: self._column_cache.pop(cache_key, None))
+        except TypeError:
+            # Not weak referenceable, skip caching rather than risk stale entries
+            return
+        self._column_cache[key] = (owner_ref, size_bytes)
+
+    def _estimate_object_bytes(self, values: np.ndarray) -> int:
+        """Estimate the deep size of an object array from an evenly spaced sample of its values"""
+        length = len(values)
+        if length == 0:
+            return 0
+        if length <= self.sample_size:
+            sample = values
+        else:
+            positions = np.linspace(0, length - 1, num=self.sample_size, dtype=np.int64)
+            sample = values[positions]
+        mean_value_bytes = sum(sys.getsizeof(value) for value in sample) / len(sample)
+        return int(length * (self.POINTER_BYTES + mean_value_bytes))
+
+    def column_bytes(self, series: pd.Series) -> int:
+        """Return the (estimated) deep memory footprint of a single column in bytes"""
+        buffer = self._get_column_buffer(series)
+        dtype = series.dtype
+
+        if pa is not None and isinstance(buffer, pd.arrays.ArrowExtensionArray):
+            # Zero-copy access to the Arrow buffers, nbytes is exact
+            try:
+                return int(buffer.__arrow_array__().nbytes)
+            except Exception:
+                pass
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes_bytes = series.cat.codes.to_numpy().nbytes
+            return int(codes_bytes + self.column_bytes(pd.Series(series.cat.categories)))
+
+        if isinstance(buffer, np.ndarray) and buffer.dtype != object:
+            return int(buffer.nbytes)
+
+        if not isinstance(buffer, np.ndarray):
+            # Other extension arrays (nullable masked arrays, geometry, ...)
+            try:
+                return int(buffer.nbytes)
+            except Exception:
+                return int(series.memory_usage(index=False, deep=True))
+
+        cached = self._get_cached_bytes(buffer)
+        if cached is not None:
+            return cached
+        size_bytes = self._estimate_object_bytes(buffer)
+        self._store_cached_bytes(buffer, size_bytes)
+        return size_bytes
+
+    def frame_usage(self, dataframe: Optional[pd.DataFrame]) -> Dict[Any, int]:
+        """Per column memory usage with an 'Index' entry, shaped like DataFrame.memory_usage()"""
+        if dataframe is None:
+            return {}
+        usage: Dict[Any, int] = {"Index": int(dataframe.index.memory_usage())}
+        for position, column in enumerate(dataframe.columns):
+            usage[column] = self.column_bytes(dataframe.iloc[:, position])
+        return usage
+
+    def frame_bytes(self, dataframe: Optional[pd.DataFrame]) -> int:
+        """Total memory footprint of a DataFrame in bytes"""
+        if dataframe is None or dataframe.empty:
+            return 0
+        return int(sum(self.frame_usage(dataframe).values()))
+
+    def invalidate(self, series: pd.Series) -> None:
+        """Drop the cached estimate for a column whose values were edited in place"""
+        buffer = self._get_column_buffer(series)
+        if isinstance(buffer, np.ndarray):
+            self._column_cache.pop(self._get_cache_key(buffer)[0], None)
+
+    def clear(self) -> None:
+        self._column_cache.clear()
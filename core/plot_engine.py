@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 import matplotlib.dates as mdates
 import matplotlib.ticker as ticker
 
+from core.correlation_engine import CorrelationEngine
 from core.regression_analyser import RegressionMetrics
 if TYPE_CHECKING:
     from ui.plot_tab import PlotTab
@@ -109,7 +110,8 @@ class PlotEngine:
         "GeoSpatial": "Visualizes geospatial data using GeoPandas. Requires a GeoDataFrame (imported from .shp, .geojson, etc.). The 'X Column' can be used to select a column for choropleth coloring (values determine color)."
     }
 
-    def __init__(self):
+    def __init__(self, correlation_engine: Optional[CorrelationEngine] = None):
+        self.correlation_engine = correlation_engine or CorrelationEngine()
         self.current_figure: Optional[Figure] = None
         self.current_ax = None
         self.axes_flat = []
@@ -735,7 +737,7 @@ class PlotEngine:
             numeric_df = df.select_dtypes(include=[np.number])
             if numeric_df.empty:
                 raise ValueError("No numeric columns available")
-            sns.heatmap(numeric_df.corr(), annot=True, ax=self.current_ax, cbar=False, picker=True, **kwargs)
+            sns.heatmap(self.correlation_engine.matrix(numeric_df), annot=True, ax=self.current_ax, cbar=False, picker=True, **kwargs)
         
         if self.current_ax.collections:
             cb = self.current_figure.colorbar(self.current_ax.collections[0], ax=self.current_ax, **cbar_kws)
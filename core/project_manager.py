@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import pandas as pd
 from resources.version import APPLICATION_VERSION, PROJECT_EXTENSION, DATA_EXTENSION
+from core.history_manager import operation_json_default
 import zipfile
 import json
 import sqlite3
@@ -72,7 +73,7 @@ class ProjectManager:
             zip_package.writestr("plot_config.json", plot_config_data)
             
             # archive operation logs as json files
-            operations_log_data: str = json.dumps(save_data.get("operations", []))
+            operations_log_data: str = json.dumps(save_data.get("operations", []), default=operation_json_default)
             zip_package.writestr("operations_log.json", operations_log_data)
             
             # create the metadata file as a SQLITE database
@@ -0,0 +1,196 @@
+import math
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Optional, Sequence, Union
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+class QuantileEngine:
+    """
+    Quantile bin edges from a cached sorted summary of a column
+
+    The first quantile binning of a column sorts its values once (exact mode) or a
+    uniform random sample of them (approximate mode) and caches the sorted values per
+    source column, the same column identity the FilterEngine and DatetimeEngine use.
+    Changing the number of bins afterwards only interpolates new edges from the cached
+    summary, and rows are assigned to bins with one searchsorted over the edges.
+
+    The sample size of the approximate mode follows the Dvoretzky-Kiefer-Wolfowitz
+    bound: with n = ln(2 / failure_probability) / (2 * rank_error^2) samples every
+    edge is within rank_error (as a fraction of the rows) of the exact quantile, with
+    probability 1 - failure_probability. Columns smaller than n are summarised exactly.
+    The lowest and highest edges are always the exact minimum and maximum, so every
+    value falls in a bin.
+    """
+    DEFAULT_RANK_ERROR: float = 0.002
+    FAILURE_PROBABILITY: float = 0.001
+
+    def __init__(self, max_cache_bytes: int = 256 * 1024 * 1024, seed: int = 0) -> None:
+        self.max_cache_bytes = max_cache_bytes
+        self.seed = seed
+        # (column token, rank error) -> (weak reference to the values owner, sorted summary)
+        self._cache: "OrderedDict[tuple, tuple[weakref.ref, np.ndarray]]" = OrderedDict()
+        self._cache_bytes: int = 0
+        self._lock = threading.RLock()
+
+    # Cache handling
+    @staticmethod
+    def _values_owner(series: pd.Series) -> object:
+        values = series.array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            owner = values._ndarray
+            while isinstance(owner.base, np.ndarray):
+                owner = owner.base
+            return owner
+        if pa is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+            return values._pa_array
+        return values
+
+    def _get_column_token(self, series: pd.Series) -> tuple[tuple, object]:
+        values = series.array
+        address = values._ndarray.__array_interface__["data"][0] if isinstance(values, pd.arrays.NumpyExtensionArray) else 0
+        owner = self._values_owner(series)
+        return (id(owner), address, len(values)), owner
+
+    def _evict(self, key: tuple) -> None:
+        with self._lock:
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._cache_bytes -= entry[1].nbytes
+
+    def _evict_column(self, token: tuple) -> None:
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == token]:
+                self._evict(key)
+
+    def _get_cached(self, key: tuple, owner: object) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0]() is not owner:
+                # The id was reused by a different array
+                self._evict(key)
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key: tuple, owner: object, summary: np.ndarray) -> None:
+        if summary.nbytes > self.max_cache_bytes:
+            return
+        try:
+            reference = weakref.ref(owner, lambda _ref, stale=key[0]: self._evict_column(stale))
+        except TypeError:
+            return
+        with self._lock:
+            self._evict(key)
+            self._cache[key] = (reference, summary)
+            self._cache_bytes += summary.nbytes
+            while self._cache_bytes > self.max_cache_bytes:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.nbytes
+
+    def invalidate(self, series: pd.Series) -> None:
+        """Drop the summaries of a column whose values were edited in place"""
+        token, _ = self._get_column_token(series)
+        self._evict_column(token)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    # Summaries
+    @classmethod
+    def sample_size(cls, rank_error: float) -> int:
+        """Samples needed so every quantile is within rank_error of the exact one"""
+        if not 0 < rank_error < 0.5:
+            raise ValueError("The quantile rank error must be between 0 and 0.5")
+        return math.ceil(math.log(2 / cls.FAILURE_PROBABILITY) / (2 * rank_error ** 2))
+
+    def _summarise(self, series: pd.Series, rank_error: Optional[float]) -> np.ndarray:
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            raise ValueError(f"Column '{series.name}' has no values to bin")
+        if rank_error is not None:
+            size = self.sample_size(rank_error)
+            if size < len(values):
+                minimum, maximum = values.min(), values.max()
+                rng = np.random.default_rng(self.seed)
+                values = values[rng.integers(0, len(values), size=size)]
+                # The exact extremes keep every value of the column inside the outer edges
+                values = np.concatenate(([minimum], values, [maximum]))
+        return np.sort(values)
+
+    def sorted_summary(self, series: pd.Series, rank_error: Optional[float] = None) -> np.ndarray:
+        """
+        Sorted non-missing values of series, or a sorted sample of them\n
+        :param series (pd.Series): A numeric column
+        :param rank_error (Optional[float]): Allowed quantile rank error, None summarises every value
+        :return (np.ndarray): Sorted float64 values, cached while the column is unchanged
+        """
+        token, owner = self._get_column_token(series)
+        key = (token, rank_error)
+        cached = self._get_cached(key, owner)
+        if cached is not None:
+            return cached
+        summary = self._summarise(series, rank_error)
+        self._store(key, owner, summary)
+        return summary
+
+    def edges(self, series: pd.Series, bins: Union[int, Sequence[float]], rank_error: Optional[float] = None) -> np.ndarray:
+        """
+        Distinct quantile bin edges of series\n
+        :param series (pd.Series): A numeric column
+        :param bins (Union[int, Sequence[float]]): Number of equal frequency bins, or quantiles from 0 to 1
+        :param rank_error (Optional[float]): Allowed quantile rank error, None for exact quantiles
+        :return (np.ndarray): Increasing edges from the minimum to the maximum of series
+        """
+        if isinstance(bins, (int, np.integer)):
+            if bins < 1:
+                raise ValueError("The number of bins must be at least 1")
+            quantiles = np.linspace(0, 1, int(bins) + 1)
+        else:
+            quantiles = np.asarray(bins, dtype="float64")
+        if np.any((quantiles < 0) | (quantiles > 1)):
+            raise ValueError("Quantiles must be between 0 and 1")
+        summary = self.sorted_summary(series, rank_error)
+        # The linear interpolation pd.qcut gets from np.percentile, read straight from the
+        # sorted summary instead of partitioning it again. The round trip through percent
+        # keeps the edges bit for bit equal to pd.qcut
+        quantiles = quantiles * 100 / 100
+        count = len(summary)
+        virtual = (count - 1) * quantiles
+        previous = np.floor(virtual)
+        gamma = virtual - previous
+        lower = summary[np.clip(previous.astype(np.int64), 0, count - 1)]
+        upper = summary[np.clip(previous.astype(np.int64) + 1, 0, count - 1)]
+        difference = upper - lower
+        values = lower + difference * gamma
+        values = np.where(gamma >= 0.5, upper - difference * (1 - gamma), values)
+        return np.unique(values)
+
+    @staticmethod
+    def assign(series: pd.Series, edges: np.ndarray, labels: Optional[Sequence[str]] = None) -> pd.Series:
+        """
+        Bins of series for right-closed edges with the lowest edge included, as pd.cut\n
+        :param series (pd.Series): A numeric column
+        :param edges (np.ndarray): Increasing bin edges
+        :param labels (Optional[Sequence[str]]): One label per bin, interval categories by default
+        :return (pd.Series): Categorical bins, missing outside the edges
+        """
+        # Categories formatted exactly as pd.cut formats them for these edges
+        dtype = pd.cut(edges, bins=edges, labels=labels, include_lowest=True).dtype
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        codes = np.searchsorted(edges, values, side="left") - 1
+        codes[values == edges[0]] = 0
+        codes[codes >= len(edges) - 1] = -1
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=series.index, name=series.name)
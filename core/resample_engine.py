@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, List, Sequence
+
+
+class ResampleEngine:
+    """
+    Time series resampling into regular time bins
+
+    Rows are reduced per time bin of a datetime column with sum, mean, OHLC, first,
+    last, count, min and max. When the time column is already sorted and the
+    frequency is a fixed span (seconds, minutes, hours, days) the bins are found with
+    integer arithmetic on the timestamps and every aggregate is a single reduceat pass
+    over the bin boundaries, without sorting or grouping. Calendar frequencies
+    (weeks, months, quarters, years) and unsorted or time zone aware columns go
+    through pandas resample, which gives the same bins.
+
+    Bins without rows are kept by default, like pandas resample, and can be dropped,
+    forward filled, zero filled or interpolated.
+    """
+    AGGREGATIONS: tuple[str, ...] = ("sum", "mean", "ohlc", "first", "last", "count", "min", "max")
+    FILL_METHODS: tuple[str, ...] = ("none", "drop", "ffill", "zero", "interpolate")
+    OHLC_PARTS: tuple[str, ...] = ("open", "high", "low", "close")
+    # Aggregates that stay 0 for empty bins instead of becoming missing
+    _ADDITIVE: tuple[str, ...] = ("sum", "count")
+
+    @staticmethod
+    def parse_frequency(frequency: str) -> pd.DateOffset:
+        """A pandas offset alias such as '1min', '15s', 'h', 'D', 'W' or 'MS'"""
+        try:
+            offset = pd.tseries.frequencies.to_offset(str(frequency).strip())
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid frequency '{frequency}', use an offset like '1min', 'h' or 'D'")
+        if isinstance(offset, pd.offsets.Tick) and offset.nanos <= 0:
+            raise ValueError("The resample frequency must be positive")
+        return offset
+
+    @staticmethod
+    def output_names(column: Hashable, aggregation: str) -> List[str]:
+        if aggregation == "ohlc":
+            return [f"{column}_{part}" for part in ResampleEngine.OHLC_PARTS]
+        return [f"{column}_{aggregation}"]
+
+    @classmethod
+    def _validate(cls, df: pd.DataFrame, on: Hashable, aggregations: Dict[Hashable, Sequence[str]], fill: str) -> Dict[Hashable, List[str]]:
+        if on not in df.columns:
+            raise ValueError(f"Time column '{on}' not found")
+        if not pd.api.types.is_datetime64_any_dtype(df[on]):
+            raise TypeError(f"Column '{on}' must be a datetime column to resample")
+        if fill not in cls.FILL_METHODS:
+            raise ValueError(f"Unsupported gap fill method: {fill}")
+        if not aggregations:
+            raise ValueError("Select at least one column to aggregate")
+        validated: Dict[Hashable, List[str]] = {}
+        for column, column_aggregations in aggregations.items():
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found")
+            column_aggregations = [column_aggregations] if isinstance(column_aggregations, str) else list(dict.fromkeys(column_aggregations))
+            unknown = [aggregation for aggregation in column_aggregations if aggregation not in cls.AGGREGATIONS]
+            if not column_aggregations or unknown:
+                raise ValueError(f"Unsupported resample aggregation: {unknown[0] if unknown else None}")
+            needs_numbers = [aggregation for aggregation in column_aggregations if aggregation not in ("first", "last", "count")]
+            if needs_numbers and not pd.api.types.is_numeric_dtype(df[column]):
+                raise TypeError(f"Column '{column}' must be numeric for {needs_numbers[0]}")
+            validated[column] = column_aggregations
+        return validated
+
+    @staticmethod
+    def _first_valid(bin_ids: np.ndarray, valid: np.ndarray, starts: np.ndarray, bin_count: int, last: bool = False) -> np.ndarray:
+        """Row position of the first (or last) non-missing value of every bin, -1 for none"""
+        result = np.full(bin_count, -1, dtype=np.int64)
+        if valid.all():
+            # Without missing values these are the bin boundaries themselves
+            positions = np.r_[starts[1:], len(valid)] - 1 if last else starts
+            result[bin_ids[starts]] = positions
+            return result
+        positions = np.flatnonzero(valid)
+        if len(positions):
+            valid_bins = bin_ids[positions]
+            # Bins are non-decreasing, so a bin's values are one run of valid_bins
+            changes = valid_bins[1:] != valid_bins[:-1]
+            edges = np.flatnonzero(np.r_[changes, True]) if last else np.flatnonzero(np.r_[True, changes])
+            result[valid_bins[edges]] = positions[edges]
+        return result
+
+    @staticmethod
+    def _spread(reduced: np.ndarray, occupied: np.ndarray, bin_count: int) -> np.ndarray:
+        """Per bin values from the values of the occupied bins, empty bins make the result float with NaN"""
+        if len(occupied) == bin_count:
+            return reduced
+        spread = np.full(bin_count, np.nan)
+        spread[occupied] = reduced
+        return spread
+
+    @staticmethod
+    def _pick(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """values at row positions, NaN where a bin has no value (-1)"""
+        picked = values[np.maximum(positions, 0)]
+        if (positions >= 0).all():
+            return picked
+        return np.where(positions >= 0, picked, np.nan)
+
+    @classmethod
+    def _sorted_fixed(cls, df: pd.DataFrame, on: Hashable, offset: pd.offsets.Tick, aggregations: Dict[Hashable, List[str]]) -> pd.DataFrame:
+        """One pass over sorted timestamps with a fixed span frequency"""
+        times = df[on].to_numpy().astype("datetime64[ns]").view(np.int64)
+        step = offset.nanos
+        # Bins start at midnight of the first day, the default origin of pandas resample
+        day = 86400 * 10**9
+        origin = times[0] - times[0] % day
+        first_bin = (times[0] - origin) // step
+        bin_ids = (times - origin) // step - first_bin
+        bin_count = int(bin_ids[-1]) + 1
+        starts = np.flatnonzero(np.r_[True, bin_ids[1:] != bin_ids[:-1]])
+        occupied = bin_ids[starts]
+        row_counts = np.zeros(bin_count, dtype=np.int64)
+        row_counts[occupied] = np.diff(np.r_[starts, len(times)])
+        labels = pd.DatetimeIndex((origin + (first_bin + np.arange(bin_count)) * step).astype("datetime64[ns]"))
+
+        columns: Dict[str, "np.ndarray | pd.Series"] = {}
+        for column, column_aggregations in aggregations.items():
+            series = df[column]
+            # Integer and boolean columns have no missing values and are reduced in their own
+            # dtype, so results keep it like pandas resample and large sums stay exact
+            exact = isinstance(series.dtype, np.dtype) and series.dtype.kind in "iub"
+            if exact:
+                values = series.to_numpy()
+            else:
+                values = series.to_numpy(dtype="float64", na_value=np.nan) if pd.api.types.is_numeric_dtype(series) else None
+            valid = series.notna().to_numpy()
+            sums = counts = None
+            for aggregation in column_aggregations:
+                if aggregation in ("sum", "mean") and sums is None:
+                    if exact:
+                        wide = values.astype(np.uint64 if values.dtype.kind == "u" else np.int64)
+                        sums = np.zeros(bin_count, dtype=wide.dtype)
+                        sums[occupied] = np.add.reduceat(wide, starts)
+                    else:
+                        sums = np.zeros(bin_count)
+                        sums[occupied] = np.add.reduceat(np.where(valid, values, 0.0), starts)
+                if aggregation in ("count", "mean") and counts is None:
+                    counts = np.zeros(bin_count, dtype=np.int64)
+                    counts[occupied] = np.add.reduceat(valid.astype(np.int64), starts)
+                if aggregation == "sum":
+                    # pandas sums booleans as int64 and keeps any other integer dtype
+                    columns[f"{column}_sum"] = sums.astype(np.int64 if values.dtype.kind == "b" else values.dtype) if exact else sums
+                elif aggregation == "count":
+                    columns[f"{column}_count"] = counts
+                elif aggregation == "mean":
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        columns[f"{column}_mean"] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+                elif aggregation in ("min", "max", "ohlc"):
+                    extremes = {}
+                    for name, reducer in (("min", np.fmin), ("max", np.fmax)):
+                        if aggregation in (name, "ohlc"):
+                            # fmin/fmax skip missing values, a bin of only missing values stays NaN
+                            extremes[name] = cls._spread(reducer.reduceat(values, starts), occupied, bin_count)
+                    if aggregation == "ohlc":
+                        first = cls._first_valid(bin_ids, valid, starts, bin_count)
+                        last = cls._first_valid(bin_ids, valid, starts, bin_count, last=True)
+                        columns[f"{column}_open"] = cls._pick(values, first)
+                        columns[f"{column}_high"] = extremes["max"]
+                        columns[f"{column}_low"] = extremes["min"]
+                        columns[f"{column}_close"] = cls._pick(values, last)
+                    else:
+                        columns[f"{column}_{aggregation}"] = extremes[aggregation]
+                else:
+                    positions = cls._first_valid(bin_ids, valid, starts, bin_count, last=aggregation == "last")
+                    if exact:
+                        columns[f"{column}_{aggregation}"] = cls._pick(values, positions)
+                        continue
+                    # Picked from the column itself so text and datetime values keep their type
+                    picked = series.iloc[np.maximum(positions, 0)].set_axis(labels)
+                    columns[f"{column}_{aggregation}"] = picked.where(positions >= 0)
+        result = pd.DataFrame(columns, index=labels)
+        result["__rows__"] = row_counts
+        return result
+
+    @classmethod
+    def _pandas(cls, df: pd.DataFrame, on: Hashable, offset: pd.DateOffset, aggregations: Dict[Hashable, List[str]]) -> pd.DataFrame:
+        """Calendar frequencies and unsorted or time zone aware columns"""
+        resampler = df.set_index(on).resample(offset)
+        frames = []
+        for column, column_aggregations in aggregations.items():
+            for aggregation in column_aggregations:
+                reduced = getattr(resampler[column], aggregation)()
+                if aggregation == "ohlc":
+                    reduced.columns = cls.output_names(column, "ohlc")
+                    frames.append(reduced)
+                else:
+                    frames.append(reduced.rename(f"{column}_{aggregation}"))
+        result = pd.concat(frames, axis=1)
+        result["__rows__"] = resampler.size().to_numpy()
+        return result
+
+    @classmethod
+    def _fill_gaps(cls, result: pd.DataFrame, aggregations: Dict[Hashable, List[str]], fill: str) -> pd.DataFrame:
+        empty = result["__rows__"].to_numpy() == 0
+        result = result.drop(columns="__rows__")
+        if fill == "none" or not empty.any():
+            return result
+        if fill == "drop":
+            return result[~empty]
+        for column, column_aggregations in aggregations.items():
+            for aggregation in column_aggregations:
+                if aggregation in cls._ADDITIVE:
+                    continue
+                names = cls.output_names(column, aggregation)
+                if fill == "zero":
+                    for name in names:
+                        result[name] = result[name].fillna(0)
+                elif fill == "ffill" and aggregation == "ohlc":
+                    # An empty bar repeats the previous close as open, high, low and close
+                    close = result[names[-1]].ffill()
+                    result[names[-1]] = close
+                    for name in names[:-1]:
+                        result[name] = result[name].where(~empty, close)
+                elif fill == "ffill":
+                    for name in names:
+                        result[name] = result[name].ffill()
+                elif fill == "interpolate" and pd.api.types.is_numeric_dtype(result[names[0]]):
+                    for name in names:
+                        result[name] = result[name].interpolate(method="linear", limit_area="inside")
+        return result
+
+    @classmethod
+    def resample(
+        cls,
+        df: pd.DataFrame,
+        on: Hashable,
+        frequency: str,
+        aggregations: Dict[Hashable, Sequence[str]],
+        fill: str = "none",
+    ) -> pd.DataFrame:
+        """
+        Reduce df to one row per time bin\n
+        :param df (pd.DataFrame): The data
+        :param on (Hashable): Datetime column defining the bins, rows with a missing time are ignored
+        :param frequency (str): Bin width as a pandas offset alias, e.g. '1min', 'h', 'D' or 'MS'
+        :param aggregations (Dict[Hashable, Sequence[str]]): {column: names from AGGREGATIONS}
+        :param fill (str): Empty bins, one of FILL_METHODS
+        :return (pd.DataFrame): The bin start in column on followed by '{column}_{aggregation}' columns
+        """
+        aggregations = cls._validate(df, on, aggregations, fill)
+        offset = cls.parse_frequency(frequency)
+        if df[on].isna().any():
+            df = df[df[on].notna()]
+        if df.empty:
+            raise ValueError("No rows with a time value to resample")
+        times = df[on]
+        is_sorted = times.is_monotonic_increasing
+        if isinstance(offset, pd.offsets.Tick) and is_sorted and not isinstance(times.dtype, pd.DatetimeTZDtype):
+            result = cls._sorted_fixed(df, on, offset, aggregations)
+        else:
+            result = cls._pandas(df, on, offset, aggregations)
+        result = cls._fill_gaps(result, aggregations, fill)
+        result.index.name = on
+        return result.reset_index()
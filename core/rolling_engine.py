@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+from typing import Dict, Hashable, List, Optional, Sequence, Union
+
+
+class _WindowBoundsIndexer(BaseIndexer):
+    """Hands precomputed window bounds to pandas rolling"""
+
+    def get_window_bounds(self, num_values: int = 0, min_periods: Optional[int] = None, center: Optional[bool] = None, closed: Optional[str] = None, step: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        return self.start, self.end
+
+
+class RollingEngine:
+    """
+    Rolling window statistics with group boundaries and time based windows
+
+    Windows are described by start/end bounds computed once with numpy: a window
+    never crosses into another group (so entities do not have to be split and
+    processed one by one), and a time window like '7D' covers the rows whose time
+    is within the offset of the current row. All requested statistics are then
+    computed over the same bounds by the pandas rolling kernels, which are online
+    algorithms (Kahan summation, Welford variance, monotonic deques for min/max).
+
+    Rows are processed in (group, time) order without reordering the frame, results
+    are written back to the original row positions.
+    """
+    STATISTICS: tuple[str, ...] = ("mean", "sum", "min", "max", "std", "median")
+
+    @staticmethod
+    def parse_window(window: Union[int, str]) -> Union[int, pd.Timedelta]:
+        """An integer row count or a time offset such as '7D' or '12h'"""
+        if isinstance(window, (int, np.integer)):
+            if window < 1:
+                raise ValueError("Window size must be at least 1")
+            return int(window)
+        text = str(window).strip()
+        if text.isdigit():
+            return RollingEngine.parse_window(int(text))
+        try:
+            offset = pd.Timedelta(pd.tseries.frequencies.to_offset(text))
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid window '{window}', use a row count or a time offset like '7D'")
+        if offset <= pd.Timedelta(0):
+            raise ValueError("Time windows must be positive")
+        return offset
+
+    @staticmethod
+    def _group_codes(df: pd.DataFrame, group_by: Sequence[Hashable]) -> np.ndarray:
+        for column in group_by:
+            if column not in df.columns:
+                raise ValueError(f"Group column '{column}' not found")
+        # Missing keys form their own group instead of being dropped
+        return df.groupby(list(group_by), sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+
+    @staticmethod
+    def _time_values(df: pd.DataFrame, on: Hashable) -> np.ndarray:
+        if on not in df.columns:
+            raise ValueError(f"Time column '{on}' not found")
+        times = df[on]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            raise TypeError(f"Column '{on}' must be a datetime column for time based windows")
+        if times.isna().any():
+            raise ValueError(f"Time column '{on}' must not contain missing values")
+        if isinstance(times.dtype, pd.DatetimeTZDtype):
+            times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+        return times.to_numpy().astype("datetime64[ns]").view(np.int64)
+
+    @classmethod
+    def window_bounds(
+        cls,
+        codes: np.ndarray,
+        window: Union[int, pd.Timedelta],
+        times: Optional[np.ndarray] = None,
+        center: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Window start/end positions for rows already ordered by group code (and time)\n
+        :param codes (np.ndarray): Non-decreasing group codes
+        :param window (Union[int, pd.Timedelta]): Row count or time offset
+        :param times (Optional[np.ndarray]): int64 nanoseconds, non-decreasing within each group, required for time windows
+        :param center (bool): Center fixed windows on the row instead of ending at it
+        :return (tuple[np.ndarray, np.ndarray]): int64 start and exclusive end positions
+        """
+        row_count = len(codes)
+        positions = np.arange(row_count, dtype=np.int64)
+        group_start = np.searchsorted(codes, codes, side="left").astype(np.int64)
+        group_end = np.searchsorted(codes, codes, side="right").astype(np.int64)
+
+        if isinstance(window, pd.Timedelta):
+            if times is None:
+                raise ValueError("A time column is required for time based windows")
+            if center:
+                raise ValueError("Centered windows are only supported for row count windows")
+            # Rows with time in (t - window, t]. Times are replaced by their rank among the
+            # distinct times so (group, rank) packs into one searchable int64 key
+            distinct_times = np.unique(times)
+            ranks = np.searchsorted(distinct_times, times, side="left")
+            lower_ranks = np.searchsorted(distinct_times, times - window.value, side="right")
+            stride = len(distinct_times) + 1
+            keys = codes * stride + ranks
+            start = np.searchsorted(keys, codes * stride + lower_ranks, side="left").astype(np.int64)
+            end = positions + 1
+        else:
+            offset = (window - 1) // 2 if center else 0
+            end = np.minimum(positions + 1 + offset, group_end)
+            start = np.maximum(positions + 1 + offset - window, group_start)
+        return start, np.maximum(end, start)
+
+    @classmethod
+    def compute(
+        cls,
+        df: pd.DataFrame,
+        column: Hashable,
+        window: Union[int, str],
+        statistics: Sequence[str],
+        group_by: Optional[Sequence[Hashable]] = None,
+        on: Optional[Hashable] = None,
+        center: bool = False,
+        min_periods: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rolling statistics of one numeric column\n
+        :param df (pd.DataFrame): The data
+        :param column (Hashable): Numeric column to aggregate
+        :param window (Union[int, str]): Row count, or a time offset like '7D' (requires on)
+        :param statistics (Sequence[str]): Names from STATISTICS, all computed over the same windows
+        :param group_by (Optional[Sequence[Hashable]]): Columns partitioning the rows, windows stay inside a group
+        :param on (Optional[Hashable]): Datetime column ordering the rows of time windows
+        :param center (bool): Center row count windows on the row
+        :param min_periods (Optional[int]): Observations needed for a value, the window size (rows) or 1 (time) by default
+        :return (Dict[str, np.ndarray]): {statistic: float64 values in the original row order}
+        """
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found")
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            raise TypeError(f"Column '{column}' must be a numeric column to perform rolling window operation")
+        statistics = list(dict.fromkeys(statistics))
+        unknown = [statistic for statistic in statistics if statistic not in cls.STATISTICS]
+        if not statistics or unknown:
+            raise ValueError(f"Unsupported rolling operation: {unknown[0] if unknown else None}")
+        window = cls.parse_window(window)
+        is_time_window = isinstance(window, pd.Timedelta)
+        if is_time_window and on is None:
+            raise ValueError("Time based windows like '7D' need a datetime column to order the rows")
+        if min_periods is None:
+            min_periods = 1 if is_time_window else window
+
+        row_count = len(df)
+        codes = cls._group_codes(df, group_by) if group_by else np.zeros(row_count, dtype=np.int64)
+        times = cls._time_values(df, on) if on is not None else None
+
+        # Rows in (group, time) order, skipped when the frame is already in that order
+        if times is not None:
+            order = np.lexsort((times, codes))
+        else:
+            order = np.argsort(codes, kind="stable")
+        is_ordered = bool(np.array_equal(order, np.arange(row_count)))
+        codes = codes if is_ordered else codes[order]
+        if times is not None and not is_ordered:
+            times = times[order]
+
+        values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+        values = values if is_ordered else values[order]
+        start, end = cls.window_bounds(codes, window, times, center)
+        rolling = pd.Series(values).rolling(_WindowBoundsIndexer(start=start, end=end), min_periods=min_periods)
+
+        results: Dict[str, np.ndarray] = {}
+        for statistic in statistics:
+            ordered_result = getattr(rolling, statistic)().to_numpy()
+            if is_ordered:
+                results[statistic] = ordered_result
+            else:
+                result = np.empty(row_count, dtype="float64")
+                result[order] = ordered_result
+                results[statistic] = result
+        return results
+
+    @staticmethod
+    def output_names(column: Hashable, window: Union[int, str], statistics: Sequence[str], new_column: Optional[str] = None) -> List[str]:
+        """Result column names, new_column names a single statistic or prefixes several"""
+        if new_column and len(statistics) == 1:
+            return [new_column]
+        prefix = new_column or f"{column}_rolling_{window}"
+        return [f"{prefix}_{statistic}" for statistic in statistics]
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+
+@dataclass
+class SampleSession:
+    """The full data and its history, set aside while the app works on a sample"""
+    full_df: pd.DataFrame
+    original_df: Optional[pd.DataFrame]
+    history_state: Dict[str, Any]
+    fraction: float
+    stratify_by: List[Hashable] = field(default_factory=list)
+    seed: int = 0
+
+
+@dataclass
+class SampleReplay:
+    """The operations of a sample session replayed against the full data"""
+    df: pd.DataFrame
+    sort_state: Optional[tuple]
+    operations: List[Dict[str, Any]]
+    skipped_operations: List[Dict[str, Any]]
+    # The sample's operation log the replay was built from
+    source_log: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class SampleEngine:
+    """
+    Reproducible row samples for designing a pipeline on a fraction of the data
+
+    A random sample draws round(fraction * rows) rows without replacement. A stratified
+    sample draws ceil(fraction * group rows) rows from every group of the stratify
+    columns, so rare groups keep at least one row. Either way the rows keep their
+    original order and index labels, which act as row ids when removals made on the
+    sample are replayed against the full data. The same seed gives the same sample.
+    """
+    # Operations recorded against sample rows or another dataset, they cannot be replayed
+    SAMPLE_ONLY_OPERATIONS: tuple[str, ...] = ("update_cell", "paste_block", "merge", "concatenate", "export_google_sheets")
+
+    @staticmethod
+    def _validate_fraction(fraction: float) -> float:
+        fraction = float(fraction)
+        if not 0 < fraction <= 1:
+            raise ValueError("The sample fraction must be greater than 0 and at most 1")
+        return fraction
+
+    @classmethod
+    def sample_positions(
+        cls,
+        df: pd.DataFrame,
+        fraction: float,
+        stratify_by: Optional[Sequence[Hashable]] = None,
+        seed: int = 0,
+    ) -> np.ndarray:
+        """
+        Sorted row positions of a sample\n
+        :param df (pd.DataFrame): The data
+        :param fraction (float): Share of the rows to keep, e.g. 0.01
+        :param stratify_by (Optional[Sequence[Hashable]]): Columns whose groups are sampled separately
+        :param seed (int): Random seed, the same seed gives the same rows
+        :return (np.ndarray): int64 positions in increasing order
+        """
+        fraction = cls._validate_fraction(fraction)
+        row_count = len(df)
+        if row_count == 0:
+            return np.empty(0, dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        if not stratify_by:
+            size = max(1, round(fraction * row_count))
+            return np.sort(rng.choice(row_count, size=size, replace=False)).astype(np.int64)
+
+        for column in stratify_by:
+            if column not in df.columns:
+                raise ValueError(f"Stratify column '{column}' not found")
+        # Missing keys form their own stratum
+        codes = df.groupby(list(stratify_by), sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+        group_sizes = np.bincount(codes)
+        # Ordering each group by a random key and keeping its first rows samples it without
+        # replacement. Group code plus a key in [0, 1) sorts by group, then key, in one argsort
+        order = np.argsort(codes + rng.random(row_count))
+        group_starts = np.r_[0, np.cumsum(group_sizes)[:-1]]
+        ranks = np.arange(row_count) - group_starts[codes[order]]
+        quotas = np.ceil(fraction * group_sizes - 1e-9).astype(np.int64)
+        return np.sort(order[ranks < quotas[codes[order]]]).astype(np.int64)
+
+    @classmethod
+    def sample(
+        cls,
+        df: pd.DataFrame,
+        fraction: float,
+        stratify_by: Optional[Sequence[Hashable]] = None,
+        seed: int = 0,
+    ) -> pd.DataFrame:
+        """The sampled rows of df with their index labels"""
+        return df.take(cls.sample_positions(df, fraction, stratify_by, seed))
+
+    @classmethod
+    def split_replayable(cls, operations: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(operations to replay on the full data, operations that only applied to the sample)"""
+        replayable: List[Dict[str, Any]] = []
+        skipped: List[Dict[str, Any]] = []
+        for op in operations:
+            op_type = op.get("type", "unknown")
+            # Row masks and row positions line up with the sample rows only, row ids and
+            # logged outlier settings work on the full data
+            is_masked = op.get("mask") is not None or op.get("positions") is not None
+            if op_type == "unknown":
+                continue
+            if op_type in cls.SAMPLE_ONLY_OPERATIONS or is_masked:
+                skipped.append(op)
+            else:
+                replayable.append(op)
+        return replayable, skipped
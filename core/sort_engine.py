@@ -0,0 +1,151 @@
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+SortKey = Tuple[Hashable, bool]
+
+
+class SortEngine:
+    """
+    Computes row permutations for sorting without reordering the data
+
+    The permutation is a stable multi-key argsort that follows DataFrame.sort_values:
+    missing values go last in both directions and ties keep their row order. Views
+    read rows through the permutation, so sorting a large table costs one integer
+    array instead of a reordered copy and a history snapshot. Permutations are
+    cached per data version and sort keys.
+    """
+
+    def __init__(self, max_cache_entries: int = 4) -> None:
+        self.max_cache_entries = max_cache_entries
+        # (frame id, rows, data version, keys) -> permutation
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _sort_key(series: pd.Series, ascending: bool) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """An integer or float array ordering like series, and a flag array for missing values (None if there are none)"""
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind == "f":
+            # numpy sorts NaN last and keeps NaN rows in order, negating keeps them last
+            values = series.to_numpy()
+            return (values if ascending else -values), None
+        if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+            values = series.to_numpy()
+            if dtype.kind == "b":
+                values = values.view(np.int8)
+            if not ascending:
+                if dtype.kind == "u":
+                    values = np.iinfo(dtype).max - values
+                else:
+                    # Bitwise not reverses signed integers without overflowing
+                    values = ~values
+            return SortEngine._compact(values), None
+        if isinstance(dtype, np.dtype) and dtype.kind in "mM":
+            missing = series.isna().to_numpy()
+            values = series.to_numpy().view(np.int64)
+            values = values if ascending else ~values
+            return values, missing if missing.any() else None
+
+        # Strings, categoricals, nullable and Arrow columns sort by their factorized codes
+        try:
+            codes, _ = pd.factorize(series, sort=True)
+        except TypeError:
+            # Mixed types cannot be compared, order them by their text
+            missing_values = series.isna()
+            codes, _ = pd.factorize(series.astype(str).where(~missing_values), sort=True)
+        codes = codes.astype(np.int64, copy=False)
+        missing = codes < 0
+        codes = codes if ascending else ~codes
+        return SortEngine._compact(codes), missing if missing.any() else None
+
+    @staticmethod
+    def _compact(values: np.ndarray) -> np.ndarray:
+        """Shift integers with a small range into uint16, which numpy sorts stably with a radix sort"""
+        if values.size == 0:
+            return values
+        low = values.min()
+        if int(values.max()) - int(low) < np.iinfo(np.uint16).max:
+            return (values - low).astype(np.uint16)
+        return values
+
+    @staticmethod
+    def _stable_argsort(values: np.ndarray) -> np.ndarray:
+        """Stable argsort, using the faster quicksort when the values have no ties"""
+        if values.dtype.kind != "f":
+            return np.argsort(values, kind="stable")
+        permutation = np.argsort(values, kind="quicksort")
+        ordered = values[permutation]
+        if (ordered[1:] == ordered[:-1]).any():
+            return np.argsort(values, kind="stable")
+        # NaN never compares equal, keep the trailing NaN rows in their original order
+        if ordered.size and np.isnan(ordered[-1]):
+            missing_count = int(np.count_nonzero(np.isnan(ordered)))
+            permutation[-missing_count:] = np.sort(permutation[-missing_count:])
+        return permutation
+
+    @classmethod
+    def argsort(cls, df: pd.DataFrame, keys: Sequence[SortKey]) -> np.ndarray:
+        """
+        Stable row permutation sorting df by keys\n
+        :param df (pd.DataFrame): The data
+        :param keys (Sequence[SortKey]): (column, ascending) pairs, most significant first
+        :return (np.ndarray): Row positions in sorted order
+        """
+        if not keys:
+            raise ValueError("At least one sort column is required")
+        # Most significant first, a missing flag orders before the values it belongs to
+        sort_arrays: List[np.ndarray] = []
+        for column, ascending in keys:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found")
+            series = df[column]
+            if isinstance(series, pd.DataFrame):
+                series = series.iloc[:, 0]
+            values, missing = cls._sort_key(series, ascending)
+            if missing is not None:
+                sort_arrays.append(missing)
+            sort_arrays.append(values)
+
+        if len(sort_arrays) == 1:
+            permutation = cls._stable_argsort(sort_arrays[0])
+        else:
+            # np.lexsort treats its last key as the primary one
+            permutation = np.lexsort(sort_arrays[::-1])
+        if len(permutation) < np.iinfo(np.int32).max:
+            permutation = permutation.astype(np.int32, copy=False)
+        return permutation
+
+    def permutation(self, df: pd.DataFrame, keys: Sequence[SortKey], version: Optional[Hashable] = None) -> np.ndarray:
+        """Cached argsort, results are reused while the data version and keys are unchanged"""
+        keys = tuple((column, bool(ascending)) for column, ascending in keys)
+        key = (id(df), len(df), version, keys)
+        if version is not None:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    return cached
+
+        permutation = self.argsort(df, keys)
+        if version is not None:
+            with self._lock:
+                for stale_key in [cached_key for cached_key in self._cache if cached_key[2] != version]:
+                    del self._cache[stale_key]
+                self._cache[key] = permutation
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+        return permutation
+
+    @staticmethod
+    def inverse(permutation: np.ndarray) -> np.ndarray:
+        """Maps row positions of the data to their position in the sorted order"""
+        inverse = np.empty_like(permutation)
+        inverse[permutation] = np.arange(len(permutation), dtype=permutation.dtype)
+        return inverse
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,194 @@
+import os
+import re
+import threading
+import weakref
+import pandas as pd
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+class SQLEngine:
+    """
+    Analytical SQL over the loaded frames with DuckDB
+
+    Frames are converted to Arrow tables once per data version and registered as
+    DuckDB views, which scan the Arrow buffers in place (numeric and Arrow backed
+    columns are not copied, object columns are converted once and cached). Queries
+    run multithreaded on one in-memory connection and results are streamed back
+    in record batches, so previews stop after the first rows and long queries can
+    be interrupted between batches.
+
+    The current data is registered as the view 'data'. Other frames (subsets,
+    saved aggregations) get view names derived from their display names.
+    """
+    DATA_VIEW: str = "data"
+    BATCH_ROWS: int = 1_000_000
+
+    def __init__(self, threads: Optional[int] = None) -> None:
+        self.threads = threads or os.cpu_count() or 1
+        self._connection: Optional["duckdb.DuckDBPyConnection"] = None
+        # view name -> (weak reference to the frame, data version, Arrow table)
+        self._views: Dict[str, tuple[weakref.ref, Any, "pa.Table"]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def is_available() -> bool:
+        return duckdb is not None and pa is not None
+
+    @staticmethod
+    def view_name(name: Hashable, prefix: str = "") -> str:
+        """A plain SQL identifier for a display name, e.g. 'Sales 2024' -> 'subset_sales_2024'"""
+        identifier = re.sub(r"\W+", "_", str(name).strip().lower()).strip("_") or "table"
+        if identifier[0].isdigit():
+            identifier = f"_{identifier}"
+        return f"{prefix}_{identifier}" if prefix else identifier
+
+    def _get_connection(self) -> "duckdb.DuckDBPyConnection":
+        if not self.is_available():
+            raise ImportError("DuckDB and pyarrow are required for SQL queries")
+        if self._connection is None:
+            self._connection = duckdb.connect(":memory:")
+            self._connection.execute(f"SET threads TO {int(self.threads)}")
+        return self._connection
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame) -> "pa.Table":
+        if not df.columns.is_unique:
+            raise ValueError("Column names must be unique to query the data with SQL")
+        # Non string column names become their string form, as in the table header
+        frame = df.rename(columns=str) if not all(isinstance(column, str) for column in df.columns) else df
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+    def register(self, name: str, df: pd.DataFrame, version: Any = None) -> None:
+        """
+        Register df as the view name, reusing the Arrow table of an earlier registration\n
+        :param name (str): View name used in queries
+        :param df (pd.DataFrame): The frame
+        :param version (Any): Data version of df, a new version converts it again. Without
+            a version the table is reused while the same frame object is registered
+        """
+        with self._lock:
+            connection = self._get_connection()
+            entry = self._views.get(name)
+            if entry is not None and (entry[1] == version if version is not None else entry[0]() is df):
+                return
+            table = self._to_arrow(df)
+            connection.register(name, table)
+            self._views[name] = (weakref.ref(df), version, table)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            if self._views.pop(name, None) is not None and self._connection is not None:
+                self._connection.unregister(name)
+
+    def sync_views(self, frames: Dict[str, tuple[pd.DataFrame, Any]]) -> None:
+        """Register {name: (df, version)} and drop every other view"""
+        with self._lock:
+            for name in [name for name in self._views if name not in frames]:
+                self.unregister(name)
+            for name, (df, version) in frames.items():
+                self.register(name, df, version)
+
+    def view_names(self) -> List[str]:
+        with self._lock:
+            return list(self._views)
+
+    def view_columns(self, name: str) -> List[tuple[str, str]]:
+        """(column, SQL type) pairs of a registered view"""
+        with self._lock:
+            table = self._views[name][2]
+            return [(field.name, str(field.type)) for field in table.schema]
+
+    def interrupt(self) -> None:
+        """Abort the running query, it raises in the thread that executes it"""
+        if self._connection is not None:
+            self._connection.interrupt()
+
+    @staticmethod
+    def _fetch(
+        result: "duckdb.DuckDBPyConnection",
+        limit: Optional[int],
+        arrow_backed: bool,
+        is_cancelled: Optional[Callable[[], bool]],
+        progress_callback: Optional[Callable[[int], None]],
+        batch_rows: int,
+    ) -> pd.DataFrame:
+        reader = result.fetch_record_batch(batch_rows)
+        batches = []
+        row_count = 0
+        for batch in reader:
+            if is_cancelled is not None and is_cancelled():
+                raise InterruptedError("The query was cancelled")
+            if limit is not None and row_count + len(batch) > limit:
+                batch = batch.slice(0, limit - row_count)
+            batches.append(batch)
+            row_count += len(batch)
+            if progress_callback is not None:
+                progress_callback(row_count)
+            if limit is not None and row_count >= limit:
+                break
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        if arrow_backed:
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+    def execute(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        arrow_backed: bool = False,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        batch_rows: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Run a query over the registered views\n
+        :param sql (str): A DuckDB SQL query
+        :param limit (Optional[int]): Stop streaming after this many rows
+        :param arrow_backed (bool): Return Arrow backed columns instead of numpy columns
+        :param is_cancelled (Optional[Callable]): Checked between record batches, raises InterruptedError
+        :param progress_callback (Optional[Callable]): Called with the rows fetched so far
+        :param batch_rows (Optional[int]): Rows per streamed record batch
+        :return (pd.DataFrame): The result with a fresh RangeIndex
+        """
+        if not str(sql).strip():
+            raise ValueError("Enter a SQL query to run")
+        with self._lock:
+            connection = self._get_connection()
+            try:
+                result = connection.execute(sql)
+                if result.description is None:
+                    raise ValueError("The statement returned no rows, only queries can be run")
+                return self._fetch(result, limit, arrow_backed, is_cancelled, progress_callback, batch_rows or self.BATCH_ROWS)
+            except duckdb.Error as QueryError:
+                raise ValueError(str(QueryError))
+
+    @classmethod
+    def query_frame(cls, df: pd.DataFrame, sql: str, threads: Optional[int] = None) -> pd.DataFrame:
+        """
+        Run sql with df as the only view 'data' on a private connection, used to replay
+        logged queries. Virtual columns must be materialized by the caller
+        """
+        engine = cls(threads=threads)
+        try:
+            engine.register(cls.DATA_VIEW, df)
+            arrow_backed = any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+            return engine.execute(sql, arrow_backed=arrow_backed)
+        finally:
+            engine.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._views.clear()
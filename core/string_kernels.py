@@ -0,0 +1,170 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+class StringKernels:
+    """
+    Text operations on Arrow string arrays
+
+    Case changes, whitespace trimming, regex replacement and splitting run as
+    pyarrow.compute kernels on the column's Arrow buffers instead of one Python
+    string object per cell. Arrow backed columns (ArrowDtype and pyarrow
+    StringDtype, e.g. frames imported through DuckDB) are processed without a
+    copy and stay Arrow backed. Object columns holding only strings are converted
+    once and returned as object columns. Missing values stay missing.
+
+    Every method returns None when the kernels cannot be used (pyarrow missing,
+    mixed object columns, regex syntax RE2 does not support), the caller then
+    falls back to the pandas .str methods. Arrow maps case and RE2 matches \\w, \\d
+    and \\b by ASCII rules only, so case changes and regex replacements of columns
+    holding non-ASCII text fall back as well.
+    """
+    _CASE_KERNELS = {
+        "lower": "utf8_lower",
+        "upper": "utf8_upper",
+        "title": "utf8_title",
+        "capitalize": "utf8_capitalize",
+    }
+    _TRIM_KERNELS = {
+        "strip": "utf8_trim",
+        "lstrip": "utf8_ltrim",
+        "rstrip": "utf8_rtrim",
+    }
+    # str.strip trims these, Arrow's own whitespace set differs (e.g. \x1c to \x1f)
+    _PYTHON_WHITESPACE = "".join(chr(code) for code in range(0x110000) if chr(code).isspace())
+    # Python replacement syntax without an RE2 equivalent
+    _UNSUPPORTED_REPLACEMENT = re.compile(r"\\g<|\\0")
+    # Pattern syntax that differs between re and RE2 even on ASCII text: \s also matches
+    # \v and \x1c to \x1f in re, and $ also matches before a final newline
+    _DIVERGENT_PATTERN = re.compile(r"\\[sS]|\$")
+
+    @staticmethod
+    def _is_arrow_backed(series: pd.Series) -> bool:
+        dtype = series.dtype
+        return isinstance(dtype, pd.ArrowDtype) or (isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow")
+
+    @classmethod
+    def to_arrow(cls, series: pd.Series) -> "Optional[pa.ChunkedArray]":
+        """The string values of series as an Arrow array, or None if the column does not hold strings"""
+        if pa is None:
+            return None
+        if cls._is_arrow_backed(series):
+            array = series.array._pa_array
+            if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+                return array
+            return None
+        if not (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)):
+            return None
+        try:
+            return pa.chunked_array([pa.array(series.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)])
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed object columns (numbers, bytes, ...) keep the pandas semantics
+            return None
+
+    @staticmethod
+    def _is_ascii(array: "pa.ChunkedArray") -> bool:
+        return pc.all(pc.string_is_ascii(array), min_count=0).as_py()
+
+    @classmethod
+    def to_python(cls, series: pd.Series) -> pd.Series:
+        """series as Python objects for the pandas fallback, whose .str methods run the same kernels on Arrow storage"""
+        if cls._is_arrow_backed(series):
+            return series.astype(object)
+        return series
+
+    @classmethod
+    def from_python(cls, result: pd.Series, like: pd.Series) -> pd.Series:
+        """Put a fallback result of a text column back into the Arrow storage of like"""
+        if cls._is_arrow_backed(like) and cls.to_arrow(like) is not None:
+            return result.astype(like.dtype)
+        return result
+
+    @classmethod
+    def to_series(cls, array: "pa.ChunkedArray", like: pd.Series, name=None) -> pd.Series:
+        """Wrap a kernel result in the storage family of the input column"""
+        name = like.name if name is None else name
+        if isinstance(like.dtype, pd.ArrowDtype):
+            return pd.Series(pd.arrays.ArrowExtensionArray(array), index=like.index, name=name)
+        if isinstance(like.dtype, pd.StringDtype):
+            if like.dtype.storage == "pyarrow":
+                return pd.Series(pd.arrays.ArrowStringArray(array), index=like.index, name=name)
+            return pd.Series(array.to_numpy(zero_copy_only=False), index=like.index, name=name).astype(like.dtype)
+        values = array.to_numpy(zero_copy_only=False)
+        if len(values) == len(like):
+            # Keep the missing value markers (None or NaN) of the input, like the pandas .str methods
+            missing = like.isna().to_numpy()
+            if missing.any():
+                values[missing] = like.to_numpy(dtype=object)[missing]
+        return pd.Series(values, index=like.index, name=name, dtype=object)
+
+    @classmethod
+    def transform(cls, series: pd.Series, operation: str) -> Optional[pd.Series]:
+        """Case change or whitespace trim of every value, operation is a pandas .str method name"""
+        if operation in cls._TRIM_KERNELS:
+            array = cls.to_arrow(series)
+            if array is None:
+                return None
+            return cls.to_series(getattr(pc, cls._TRIM_KERNELS[operation])(array, characters=cls._PYTHON_WHITESPACE), series)
+        if operation not in cls._CASE_KERNELS:
+            raise ValueError(f"Unsupported text operation: {operation}")
+        array = cls.to_arrow(series)
+        if array is None or not cls._is_ascii(array):
+            # Arrow maps non-ASCII case one character to one, 'straße'.upper() is 'STRASSE' in Python
+            return None
+        return cls.to_series(getattr(pc, cls._CASE_KERNELS[operation])(array), series)
+
+    @classmethod
+    def regex_replace(cls, series: pd.Series, pattern: str, replacement: str) -> Optional[pd.Series]:
+        """Replace every match of pattern, group references like \\1 are supported"""
+        array = cls.to_arrow(series)
+        if array is None or cls._UNSUPPORTED_REPLACEMENT.search(replacement) or cls._DIVERGENT_PATTERN.search(pattern):
+            return None
+        if not cls._is_ascii(array):
+            # RE2 classes like \w and \b only know ASCII letters and digits
+            return None
+        try:
+            result = pc.replace_substring_regex(array, pattern=pattern, replacement=replacement)
+        except pa.ArrowInvalid:
+            # Lookarounds and backreferences in the pattern are not available in RE2
+            return None
+        return cls.to_series(result, series)
+
+    @classmethod
+    def split(cls, series: pd.Series, delimiter: str, names: List[str]) -> Optional[List[pd.Series]]:
+        """
+        Split every value on delimiter into one column per name, missing where a value has fewer parts\n
+        :param series (pd.Series): The text column
+        :param delimiter (str): Treated like pandas .str.split, a literal for one character and a regex otherwise
+        :param names (List[str]): Names of the resulting columns
+        :return (Optional[List[pd.Series]]): One Series per name, or None to fall back to pandas
+        """
+        array = cls.to_arrow(series)
+        if array is None or not delimiter:
+            return None
+        try:
+            if len(delimiter) == 1 or re.escape(delimiter) == delimiter:
+                parts = pc.split_pattern(array, pattern=delimiter)
+            else:
+                parts = pc.split_pattern_regex(array, pattern=delimiter)
+        except pa.ArrowInvalid:
+            return None
+
+        parts = parts.combine_chunks() if isinstance(parts, pa.ChunkedArray) else parts
+        offsets = parts.offsets.to_numpy()[:-1]
+        lengths = pc.fill_null(pc.list_value_length(parts), 0).to_numpy()
+        flat = parts.values
+        columns: List[pd.Series] = []
+        for position, name in enumerate(names):
+            has_part = lengths > position
+            indices = pa.array(np.where(has_part, offsets + position, 0), mask=~has_part)
+            columns.append(cls.to_series(pa.chunked_array([flat.take(indices)]), series, name=name))
+        return columns
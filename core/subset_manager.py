@@ -9,6 +9,8 @@ import tempfile
 import atexit
 from pathlib import Path
 
+from core.filter_engine import FilterEngine
+
 @dataclass
 class Subset:
     """A Named subset of data with filtering criteria"""
@@ -46,8 +48,9 @@ class Subset:
 class SubsetManager:
     """Creates, stores and uses data subsets"""
 
-    def __init__(self):
+    def __init__(self, filter_engine: Optional[FilterEngine] = None):
         self.subsets: Dict[str, Subset] = {}
+        self.filter_engine = filter_engine or FilterEngine()
         self.cached_directory = Path(tempfile.mkdtemp(prefix="dps_subset_cache_"))
         atexit.register(self._cleanup_cache)
     
@@ -140,74 +143,13 @@ class SubsetManager:
         return filtered_df
     
     def _apply_filters(self, df: pd.DataFrame, filters: List[Dict[str, Any]], logic: str) -> pd.DataFrame:
-        """APpply all filters"""
-        if not filters:
-            return df.copy()
-        
-        if logic == "COMPLEX":
-            if not filters:
-                return df
-            
-            current_mask = self._get_filter_mask(df, filters[0])
-            for i in range(1, len(filters)):
-                filter = filters[i]
-                next_mask = self._get_filter_mask(df, filter)
-                operator = filter.get("operator", "AND")
-                
-                if operator == "AND":
-                    current_mask = current_mask & next_mask
-                elif operator == "OR":
-                    current_mask = current_mask | next_mask
-            return df[current_mask]
-        
-        if logic == "AND":
-            # apply filters in sequence
-            result = df.copy()
-            for f in filters:
-                result = self._apply_single_filter(result, f)
-            return result
-        
-        else: #hanlde or logic
-            mask = pd.Series([False] * len(df))
-            for f in filters:
-                filtered = self._apply_single_filter(df, f)
-                mask = mask | df.index.isin(filtered.index)
-            return df[mask]
+        """Apply all filters"""
+        return self.filter_engine.apply_filters(df, filters, logic, strict=False)
     
     def _get_filter_mask(self, df: pd.DataFrame, filter_def: Dict[str, Any]) -> pd.Series:
         """Setup a boolean mask for a single filter"""
-        column = filter_def["column"]
-        condition = filter_def["condition"]
-        value = filter_def["value"]
-        
-        if column not in df.columns:
-            return pd.Series([False] * len(df), index=df.index)
-        
-        if condition == "Is Null":
-            return df[column].isna()
-        if condition == "Is Not Null":
-            return df[column].notna()
-        
-        if value is not None:
-            col_dtype = df[column].dtype
-            try:
-                if pd.api.types.is_integer_dtype(col_dtype):
-                    value = int(value)
-                elif pd.api.types.is_float_dtype(col_dtype):
-                    value = float(value)
-            except:
-                pass
-        
-        if condition == ">": return df[column] > value
-        elif condition == "<": return df[column] < value
-        elif condition == "==": return df[column] == value
-        elif condition == "!=": return df[column] != value
-        elif condition == ">=": return df[column] >= value
-        elif condition == "<=": return df[column] <= value
-        elif condition == "contains": return df[column].astype(str).str.contains(str(value), na=False)
-        elif condition == "in": return df[column].isin(value if isinstance(value, list) else [value])
-        
-        return pd.Series([False] * len(df), index=df.index)
+        mask = self.filter_engine.condition_mask(df, filter_def["column"], filter_def["condition"], filter_def["value"], strict=False)
+        return pd.Series(mask, index=df.index)
     
     def _apply_single_filter(self, df: pd.DataFrame, filter_def: Dict[str, Any]) -> pd.DataFrame:
         """Apply a singulear filter to df"""
@@ -0,0 +1,270 @@
+import ast
+import keyword
+import re
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+class VirtualColumnEngine:
+    """
+    Evaluates virtual computed columns on demand
+
+    A virtual column stores only its validated expression. The definitions live in
+    df.attrs, so they travel with the frame through copies, history snapshots and
+    undo/redo without costing any memory for the values. Values are computed in
+    row chunks with numexpr (multithreaded, when installed) or DataFrame.eval, and
+    full column results are cached per data version within a memory budget.
+    """
+    ATTRS_KEY: str = "virtual_columns"
+    CHUNK_ROWS: int = 1_000_000
+    VALIDATION_ROWS: int = 100
+
+    def __init__(self, max_cache_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_cache_bytes = max_cache_bytes
+        # (name, expression, data version) -> evaluated column
+        self._cache: "OrderedDict[tuple, pd.Series]" = OrderedDict()
+        self._cache_bytes: int = 0
+        self._lock = threading.RLock()
+
+    # Definitions
+    @classmethod
+    def get_definitions(cls, df: Optional[pd.DataFrame]) -> Dict[str, str]:
+        """Return the {name: expression} virtual columns defined on df, in definition order"""
+        if df is None:
+            return {}
+        return dict(df.attrs.get(cls.ATTRS_KEY, {}))
+
+    @classmethod
+    def set_definitions(cls, df: pd.DataFrame, definitions: Dict[str, str]) -> pd.DataFrame:
+        if definitions:
+            df.attrs[cls.ATTRS_KEY] = dict(definitions)
+        else:
+            df.attrs.pop(cls.ATTRS_KEY, None)
+        return df
+
+    @classmethod
+    def clear_definitions(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Remove the virtual columns of a frame whose columns were replaced, e.g. by an
+        aggregation or a pivot, where pandas still carries the attrs of the input
+        """
+        if cls.ATTRS_KEY in df.attrs:
+            # A new dict, the attrs may be shared with the input frame
+            df.attrs = {key: value for key, value in df.attrs.items() if key != cls.ATTRS_KEY}
+        return df
+
+    @staticmethod
+    def _parse_expression(expression: str) -> tuple[ast.Expression, Dict[str, str]]:
+        """Parse a pandas eval expression, replacing `quoted names` with valid identifiers"""
+        placeholders: Dict[str, str] = {}
+
+        def replace_backticks(match: re.Match) -> str:
+            placeholder = f"__dps_column_{len(placeholders)}"
+            placeholders[placeholder] = match.group(1)
+            return placeholder
+
+        source = re.sub(r"`([^`]+)`", replace_backticks, str(expression).strip())
+        return ast.parse(source, mode="eval"), placeholders
+
+    def referenced_columns(self, expression: str, available: List[Any]) -> List[Any]:
+        """Columns (physical or virtual) that the expression reads, in order of appearance"""
+        tree, placeholders = self._parse_expression(expression)
+        available_names = {str(column): column for column in available}
+        referenced: List[Any] = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                name = placeholders.get(node.id, node.id)
+                if name in available_names and available_names[name] not in referenced:
+                    referenced.append(available_names[name])
+        return referenced
+
+    def dependents(self, definitions: Dict[str, str], columns: List[Any]) -> List[str]:
+        """Virtual columns reading any of columns, directly or through other virtual columns"""
+        targets = list(columns)
+        found: List[str] = []
+        changed = True
+        while changed:
+            changed = False
+            for name, expression in definitions.items():
+                if name not in targets and self.referenced_columns(expression, targets):
+                    targets.append(name)
+                    found.append(name)
+                    changed = True
+        return found
+
+    def rename_references(self, definitions: Dict[str, str], old_name: Any, new_name: Any) -> Dict[str, str]:
+        """definitions with every reference to the column old_name rewritten to new_name"""
+        renamed: Dict[str, str] = {}
+        for name, expression in definitions.items():
+            if not self.referenced_columns(expression, [old_name]):
+                renamed[name] = expression
+                continue
+            tree, placeholders = self._parse_expression(expression)
+            quoted: Dict[str, str] = {}
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Name):
+                    column = placeholders.get(node.id, node.id)
+                    column = str(new_name) if column == str(old_name) else column
+                    if column.isidentifier() and not keyword.iskeyword(column):
+                        node.id = column
+                    else:
+                        node.id = f"__dps_column_{len(quoted)}"
+                        quoted[node.id] = column
+            renamed[name] = re.sub(r"__dps_column_\d+", lambda match: f"`{quoted[match.group(0)]}`", ast.unparse(tree))
+        return renamed
+
+    def validate(self, df: pd.DataFrame, name: str, expression: str) -> None:
+        """Check the name and evaluate the expression on the first rows, raising ValueError when invalid"""
+        clean_name = str(name or "").strip()
+        if not clean_name:
+            raise ValueError("New column name cannot be empty")
+        if clean_name in df.columns or clean_name in self.get_definitions(df):
+            raise ValueError(f"Column '{clean_name}' already exists")
+        if keyword.iskeyword(clean_name):
+            raise ValueError(f"'{clean_name}' is a reserved Python keyword and cannot be used as a column name")
+        if "`" in clean_name:
+            raise ValueError("Column names cannot contain backticks (`)")
+        if not str(expression or "").strip():
+            raise ValueError("Expression cannot be empty")
+        try:
+            self._parse_expression(expression)
+        except SyntaxError as error:
+            raise ValueError(f"Invalid expression: {error}")
+
+        sample = self._evaluate_rows(df, expression, 0, min(len(df), self.VALIDATION_ROWS))
+        if isinstance(sample, pd.DataFrame) or (not isinstance(sample, pd.Series) and np.ndim(sample) != 0):
+            raise ValueError("Expression must produce a single value per row")
+
+    # Evaluation
+    def _build_local_frame(self, df: pd.DataFrame, expression: str, start: int, stop: int) -> pd.DataFrame:
+        """Slice the referenced columns, evaluating referenced virtual columns first"""
+        definitions = self.get_definitions(df)
+        referenced = self.referenced_columns(expression, list(df.columns) + list(definitions))
+        local = df.iloc[start:stop][[column for column in referenced if column in df.columns]]
+        virtual_references = [column for column in referenced if column not in df.columns]
+        if virtual_references:
+            local = local.copy(deep=False)
+            for column in virtual_references:
+                local[column] = self._evaluate_rows(df, definitions[column], start, stop).array
+        return local
+
+    def _evaluate_numexpr(self, local: pd.DataFrame, expression: str) -> Optional[np.ndarray]:
+        """Evaluate with numexpr when every referenced column is a plain numeric array"""
+        if numexpr is None or local.empty:
+            return None
+        tree, placeholders = self._parse_expression(expression)
+        local_dict: Dict[str, np.ndarray] = {}
+        for identifier in {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}:
+            column = placeholders.get(identifier, identifier)
+            if column not in local.columns:
+                continue
+            series = local[column]
+            if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                return None
+            if series.hasnans and pd.api.types.is_integer_dtype(series.dtype):
+                local_dict[identifier] = series.to_numpy(dtype="float64", na_value=np.nan)
+            else:
+                local_dict[identifier] = series.to_numpy()
+        try:
+            return numexpr.evaluate(ast.unparse(tree), local_dict=local_dict)
+        except Exception:
+            # Syntax numexpr does not understand (and/or, methods, ...), pandas handles it
+            return None
+
+    def _evaluate_rows(self, df: pd.DataFrame, expression: str, start: int, stop: int) -> Any:
+        local = self._build_local_frame(df, expression, start, stop)
+        values = self._evaluate_numexpr(local, expression)
+        if values is not None:
+            return pd.Series(values, index=local.index)
+        if local.columns.empty:
+            # Constant expressions, broadcast like a df.eval assignment would
+            result = pd.eval(expression)
+            return pd.Series(result, index=df.index[start:stop]) if np.ndim(result) == 0 else result
+        return local.eval(expression)
+
+    def evaluate_expression(self, df: pd.DataFrame, expression: str, start: Optional[int] = None, stop: Optional[int] = None) -> pd.Series:
+        """Evaluate an expression over the rows [start, stop) of df in chunks, it may reference virtual columns"""
+        row_count = len(df)
+        start = 0 if start is None else max(0, start)
+        stop = row_count if stop is None else min(row_count, stop)
+        chunks = [
+            self._evaluate_rows(df, expression, chunk_start, min(chunk_start + self.CHUNK_ROWS, stop))
+            for chunk_start in range(start, stop, self.CHUNK_ROWS)
+        ]
+        if not chunks:
+            return self._evaluate_rows(df, expression, start, start)
+        return pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+
+    def evaluate(self, df: pd.DataFrame, name: str, start: Optional[int] = None, stop: Optional[int] = None, version: Optional[Hashable] = None) -> pd.Series:
+        """
+        Evaluate a virtual column\n
+        :param df (pd.DataFrame): The frame defining the virtual column
+        :param name (str): Virtual column name
+        :param start, stop (Optional[int]): Row positions to evaluate, the whole column by default
+        :param version (Optional[Hashable]): Data version of df, full column results are cached per version
+        :return (pd.Series): The values, indexed like the rows of df
+        """
+        definitions = self.get_definitions(df)
+        if name not in definitions:
+            raise KeyError(f"Virtual column '{name}' not found")
+        expression = definitions[name]
+        row_count = len(df)
+        start = 0 if start is None else max(0, start)
+        stop = row_count if stop is None else min(row_count, stop)
+        key = (name, expression, version)
+
+        if version is not None:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    return cached if start == 0 and stop == row_count else cached.iloc[start:stop]
+
+        is_full_column = start == 0 and stop == row_count
+        result = self.evaluate_expression(df, expression, start, stop)
+        result = result.rename(name)
+
+        if is_full_column and version is not None:
+            self._store(key, result)
+        return result
+
+    def _store(self, key: tuple, result: pd.Series) -> None:
+        size_bytes = int(result.memory_usage(index=False, deep=False))
+        if size_bytes > self.max_cache_bytes:
+            return
+        with self._lock:
+            # Results of older data versions can never be requested again
+            for stale_key in [cached_key for cached_key in self._cache if cached_key[2] != key[2]]:
+                self._drop(stale_key)
+            self._cache[key] = result
+            self._cache_bytes += size_bytes
+            while self._cache_bytes > self.max_cache_bytes:
+                self._drop(next(iter(self._cache)))
+
+    def _drop(self, key: tuple) -> None:
+        evicted = self._cache.pop(key)
+        self._cache_bytes -= int(evicted.memory_usage(index=False, deep=False))
+
+    def materialize(self, df: pd.DataFrame, names: Optional[List[str]] = None, version: Optional[Hashable] = None) -> pd.DataFrame:
+        """Return a shallow copy of df with the requested (default: all) virtual columns added as real columns"""
+        definitions = self.get_definitions(df)
+        names = [name for name in (list(definitions) if names is None else names) if name in definitions]
+        if not names:
+            return df
+        result = df.copy(deep=False)
+        for name in names:
+            result[name] = self.evaluate(df, name, version=version).array
+        return self.set_definitions(result, {name: expression for name, expression in definitions.items() if name not in names})
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
@@ -0,0 +1,183 @@
+import re
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+from core.memory_estimator import MemoryEstimator
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@dataclass
+class WorkspaceDataset:
+    """
+    A named dataset of the workspace.
+    The active dataset lives in the DataHandler, its entry only keeps the name and
+    lineage while df, original_df and history_state are None.
+    """
+    name: str
+    df: Optional[pd.DataFrame] = None
+    original_df: Optional[pd.DataFrame] = None
+    history_state: Optional[Dict[str, Any]] = None
+    source_state: Dict[str, Any] = field(default_factory=dict)
+    # Name of the dataset this one was derived from, kept when the parent is renamed
+    parent: Optional[str] = None
+    description: str = ""
+
+
+@dataclass
+class DatasetMemory:
+    """Memory of one dataset, buffers used by several open datasets are counted in each"""
+    name: str
+    rows: int
+    columns: int
+    total_bytes: int
+    # Part of total_bytes held in buffers that another open dataset also references
+    shared_bytes: int
+    # Undo/redo snapshots of the dataset
+    history_bytes: int = 0
+
+    @property
+    def own_bytes(self) -> int:
+        return self.total_bytes - self.shared_bytes
+
+
+class Workspace:
+    """
+    Ordered collection of named datasets that are open at the same time
+
+    Datasets are plain DataFrames, so sharing memory between them is a matter of
+    referencing the same column buffers. Arrow arrays are immutable and a
+    DataFrame.copy() of an Arrow backed frame gives new column objects over the same
+    buffers, so a duplicate or a column selection of a dataset costs no column memory,
+    and editing a cell of one replaces its own column without touching the other.
+    NumPy columns are modified in place by cell edits and are copied instead.
+
+    memory_usage measures every dataset by its distinct buffers and reports the bytes
+    it shares with other datasets, so the sum of the own bytes plus the shared buffers
+    once is what the workspace holds.
+    """
+
+    def __init__(self, memory_estimator: Optional[MemoryEstimator] = None) -> None:
+        self._datasets: Dict[str, WorkspaceDataset] = {}
+        self._memory = memory_estimator if memory_estimator is not None else MemoryEstimator()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._datasets
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def names(self) -> List[str]:
+        return list(self._datasets)
+
+    def get(self, name: str) -> WorkspaceDataset:
+        if name not in self._datasets:
+            raise KeyError(f"No dataset named '{name}' in the workspace")
+        return self._datasets[name]
+
+    def unique_name(self, base: str, exclude: Optional[str] = None) -> str:
+        """base, or base (2), base (3), ... when the name is taken by a dataset other than exclude"""
+        base = str(base).strip() or "Dataset"
+        taken = {name for name in self._datasets if name != exclude}
+        if base not in taken:
+            return base
+        stem = re.sub(r" \(\d+\)$", "", base)
+        counter = 2
+        while f"{stem} ({counter})" in taken:
+            counter += 1
+        return f"{stem} ({counter})"
+
+    def add(self, dataset: WorkspaceDataset) -> WorkspaceDataset:
+        if dataset.name in self._datasets:
+            raise ValueError(f"A dataset named '{dataset.name}' is already open")
+        self._datasets[dataset.name] = dataset
+        return dataset
+
+    def remove(self, name: str) -> WorkspaceDataset:
+        dataset = self.get(name)
+        del self._datasets[name]
+        return dataset
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        """Rename a dataset in place, keeping its position and the lineage of its children"""
+        new_name = str(new_name).strip()
+        if not new_name:
+            raise ValueError("Dataset names cannot be empty")
+        self.get(old_name)
+        if new_name == old_name:
+            return
+        if new_name in self._datasets:
+            raise ValueError(f"A dataset named '{new_name}' is already open")
+        self._datasets = {
+            (new_name if name == old_name else name): dataset for name, dataset in self._datasets.items()
+        }
+        self._datasets[new_name].name = new_name
+        for dataset in self._datasets.values():
+            if dataset.parent == old_name:
+                dataset.parent = new_name
+
+    def clear(self) -> None:
+        self._datasets.clear()
+
+    def _column_regions(self, series: pd.Series) -> Dict[Hashable, int]:
+        """
+        The memory regions of a column, keyed so that the same buffer gives the same key
+        in every frame that references it
+        """
+        values = series.array
+        if pa is not None and isinstance(values, pd.arrays.ArrowExtensionArray):
+            regions: Dict[Hashable, int] = {}
+            for chunk in values._pa_array.chunks:
+                for buffer in chunk.buffers():
+                    if buffer is not None:
+                        regions[("arrow", buffer.address, buffer.size)] = buffer.size
+            return regions
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            array = values._ndarray
+            owner = array
+            while isinstance(owner.base, np.ndarray):
+                owner = owner.base
+            owner_address = owner.__array_interface__["data"][0]
+            if array.dtype != object:
+                # A consolidated block is one region for all of its columns
+                return {("numpy", owner_address, owner.nbytes): owner.nbytes}
+            key = ("object", owner_address, array.__array_interface__["data"][0], len(array))
+            return {key: self._memory.column_bytes(series)}
+        return {("column", id(values)): self._memory.column_bytes(series)}
+
+    def _frame_regions(self, df: pd.DataFrame) -> Dict[Hashable, int]:
+        regions: Dict[Hashable, int] = {("index", id(df.index)): int(df.index.memory_usage())}
+        for position in range(df.shape[1]):
+            regions.update(self._column_regions(df.iloc[:, position]))
+        return regions
+
+    def memory_usage(self, frames: Dict[str, Optional[pd.DataFrame]], history_bytes: Optional[Dict[str, int]] = None) -> Dict[str, DatasetMemory]:
+        """
+        Memory of each named frame, with the bytes it shares with the other frames\n
+        :param frames (Dict[str, DataFrame]): The frames by dataset name, None for an empty dataset
+        :param history_bytes (Dict[str, int]): Optional undo/redo snapshot bytes by dataset name
+        :return (Dict[str, DatasetMemory]): Usage in the order of frames
+        """
+        frame_regions = {name: self._frame_regions(df) if df is not None else {} for name, df in frames.items()}
+        references: Dict[Hashable, int] = {}
+        for regions in frame_regions.values():
+            for key in regions:
+                references[key] = references.get(key, 0) + 1
+
+        usage: Dict[str, DatasetMemory] = {}
+        for name, regions in frame_regions.items():
+            df = frames[name]
+            usage[name] = DatasetMemory(
+                name=name,
+                rows=len(df) if df is not None else 0,
+                columns=df.shape[1] if df is not None else 0,
+                total_bytes=int(sum(regions.values())),
+                shared_bytes=int(sum(size for key, size in regions.items() if references[key] > 1)),
+                history_bytes=int((history_bytes or {}).get(name, 0)),
+            )
+        return usage
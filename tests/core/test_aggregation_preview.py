@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.aggregation_preview import AggregationPreviewEngine
+from core.data_handler import DataHandler
+
+def _build_sales(rows: int, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Region": rng.choice(["east", "north", "south", "west"], rows),
+            "Units": rng.integers(1, 10, rows),
+            "Price": rng.random(rows),
+        }
+    )
+
+def test_small_frames_and_full_aggregations_are_exact(empty_data_handler: DataHandler) -> None:
+    """
+    Test that frames below the sample size and requests for every group give the exact
+    groupby result, not marked approximate, through the data handler.
+    """
+    # Arrange
+    empty_data_handler.df = _build_sales(1_000)
+    config = {"Units": "sum", "Price": "mean"}
+    expected = empty_data_handler.df.groupby(["Region"]).agg(config).reset_index()
+
+    # Act
+    empty_data_handler._preview_engine.max_rows = 10_000
+    small_preview = empty_data_handler.preview_aggregation(["Region"], config, limit=2)
+    empty_data_handler._preview_engine.max_rows = 100
+    full_result = empty_data_handler.preview_aggregation(["Region"], config, limit=None)
+
+    # Assert
+    assert not small_preview.is_approximate
+    pd.testing.assert_frame_equal(small_preview.df, expected.head(2))
+    assert not full_result.is_approximate
+    assert full_result.rows_used == full_result.total_rows == 1_000
+    pd.testing.assert_frame_equal(full_result.df, expected)
+
+def test_large_frames_are_previewed_from_a_scaled_sample_and_can_be_cancelled() -> None:
+    """
+    Test that a frame above the sample size is previewed from max_rows rows, marked
+    approximate, with sums and counts scaled close to the totals, and that a cancelled
+    preview raises InterruptedError.
+    """
+    # Arrange
+    df = _build_sales(200_000)
+    engine = AggregationPreviewEngine(max_rows=20_000)
+    config = {"Units": "sum", "Price": "count"}
+    expected = df.groupby(["Region"]).agg(config).reset_index()
+
+    # Act
+    preview = engine.preview(df, ["Region"], config, limit=5)
+
+    # Assert
+    assert preview.is_approximate
+    assert (preview.rows_used, preview.total_rows) == (20_000, 200_000)
+    assert list(preview.df["Region"]) == list(expected["Region"])
+    assert preview.df["Units"].dtype == expected["Units"].dtype
+    np.testing.assert_allclose(preview.df["Units"], expected["Units"], rtol=0.05)
+    np.testing.assert_allclose(preview.df["Price"], expected["Price"], rtol=0.05)
+    assert np.array_equal(engine.sample_positions(200_000), engine.sample_positions(200_000))
+    with pytest.raises(InterruptedError):
+        engine.preview(df, ["Region"], config, is_cancelled=lambda: True)
@@ -0,0 +1,31 @@
+import pandas as pd
+from core.code_exporter import CodeExporter
+
+def test_fused_macro_entries_export_every_step() -> None:
+    """
+    Test that a fused pipeline macro log entry is exported as its nested steps, so the
+    generated process_data applies them instead of only naming the macro.
+    """
+    # Arrange
+    df = pd.DataFrame({"Amount": [5, 20, 30], "Region": ["a", "b", "c"]})
+    operations = [
+        {"type": "drop_duplicates"},
+        {
+            "type": "pipeline_macro",
+            "operations": [
+                {"type": "filter", "column": "Amount", "condition": ">", "value": 10},
+                {"type": "pipeline_macro", "operations": [{"type": "rename_column", "old_name": "Region", "new_name": "Area"}]},
+            ],
+        },
+    ]
+
+    # Act
+    code = CodeExporter()._generate_data_ops(operations)
+    namespace = {"pd": pd}
+    exec(code, namespace)
+    result = namespace["process_data"](df)
+
+    # Assert
+    assert "pipeline_macro" not in code
+    assert "# Operation 3: rename_column" in code
+    assert result["Area"].tolist() == ["b", "c"]
@@ -0,0 +1,67 @@
+import threading
+import pytest
+import numpy as np
+import pandas as pd
+from core.column_executor import ColumnExecutor
+from core.data_mutator import DataMutator
+
+def _build_wide_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dataframe = pd.DataFrame(rng.normal(size=(200, 6)), columns=[f"Col{index}" for index in range(6)])
+    dataframe.iloc[::9, 1] = np.nan
+    dataframe.iloc[::4, 4] = np.nan
+    dataframe["Label"] = ["a", None, "b", "a"] * 50
+    return dataframe
+
+def test_parallel_column_transforms_match_serial_results() -> None:
+    """
+    Test that normalize, clip and fill missing give the same frame whether the columns
+    run on the thread pool or one after another.
+    """
+    # Arrange
+    parallel_mutator = DataMutator(column_executor=ColumnExecutor(max_workers=4, min_parallel_cells=0))
+    serial_mutator = DataMutator(column_executor=ColumnExecutor(max_workers=1))
+    numeric_cols = [f"Col{index}" for index in range(6)]
+    steps: list[tuple[str, dict]] = [
+        ("normalize", {"columns": numeric_cols, "method": "standard"}),
+        ("clip_outliers", {"method": "iqr", "columns": numeric_cols + ["Label"], "multiplier": 1.0}),
+        ("fill_missing", {"method": "mode"}),
+    ]
+
+    # Act
+    parallel_df, serial_df = _build_wide_frame(), _build_wide_frame()
+    for action, kwargs in steps:
+        parallel_df, _ = parallel_mutator.clean_data(parallel_df, action, None, **kwargs)
+        serial_df, _ = serial_mutator.clean_data(serial_df, action, None, **kwargs)
+
+    # Assert
+    pd.testing.assert_frame_equal(parallel_df, serial_df)
+    assert parallel_df.isna().sum().sum() == 0
+    assert list(parallel_df.columns) == numeric_cols + ["Label"]
+
+def test_executor_uses_worker_threads_and_reports_failures_in_column_order() -> None:
+    """
+    Test that large jobs leave the calling thread, small jobs stay on it, and that the
+    first failing column in column order is raised.
+    """
+    # Arrange
+    executor = ColumnExecutor(max_workers=3, min_parallel_cells=100)
+    dataframe = pd.DataFrame({"A": range(50), "B": range(50), "C": range(50)})
+    caller = threading.get_ident()
+
+    def fail_on_b_and_c(series: pd.Series) -> pd.Series:
+        if series.name != "A":
+            raise ValueError(f"bad column {series.name}")
+        return series
+
+    # Act
+    parallel_threads = executor.map_columns(dataframe, ["A", "B", "C"], lambda series: threading.get_ident())
+    serial_threads = executor.map_columns(dataframe, ["A"], lambda series: threading.get_ident())
+
+    # Assert
+    assert caller not in parallel_threads.values()
+    assert serial_threads == {"A": caller}
+    with pytest.raises(ValueError) as expected_error:
+        executor.apply(dataframe, ["A", "B", "C"], fail_on_b_and_c)
+    assert str(expected_error.value) == "bad column B"
+    executor.shutdown()
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from core.data_handler import DataHandler
+from core.concat_engine import ConcatEngine
+
+pa = pytest.importorskip("pyarrow")
+
+def _build_month() -> pd.DataFrame:
+    days = [
+        pd.DataFrame({"Day": [day] * 3, "Symbol": ["a", "b", "c"], "Price": [1.5, 2.5, 3.5], "Volume": [10, 20, 30]})
+        for day in range(1, 4)
+    ]
+    return pd.concat(days, ignore_index=True).convert_dtypes(dtype_backend="pyarrow")
+
+def test_append_reuses_the_current_chunks_and_unifies_types_by_name() -> None:
+    """
+    Test that appending keeps the Arrow buffers of the current columns, widens numeric
+    types, fills missing columns with nulls and keeps mismatched values as text instead
+    of object columns.
+    """
+    # Arrange
+    month = _build_month()
+    new_day = pd.DataFrame({"Symbol": ["a", "d"], "Day": [4, 4], "Price": [1, 5], "Volume": ["n/a", "40"], "Exchange": ["X", "Y"]})
+
+    # Act
+    result = ConcatEngine.concat(month, new_day)
+    changes = {change.column: change for change in ConcatEngine.schema_changes(month, new_day)}
+
+    # Assert
+    assert list(result.columns) == ["Day", "Symbol", "Price", "Volume", "Exchange"]
+    assert result.index.equals(pd.RangeIndex(11))
+    assert result["Price"].dtype == pd.ArrowDtype(pa.float64())
+    assert result["Volume"].dtype == pd.ArrowDtype(pa.large_string())
+    assert result["Volume"].tolist()[-3:] == ["30", "n/a", "40"]
+    assert result["Exchange"].isna().sum() == 9
+    current_chunk = month["Symbol"].array._pa_array.chunk(0)
+    appended_chunk = result["Symbol"].array._pa_array.chunk(0)
+    assert appended_chunk.buffers()[2].address == current_chunk.buffers()[2].address
+    assert changes["Price"].unified_type == "double" and not changes["Price"].copies_current
+    assert changes["Volume"].copies_current
+    assert ConcatEngine.promote(pa.uint8(), pa.int32()) == pa.int64()
+    assert ConcatEngine.promote(pa.timestamp("us"), pa.timestamp("ns")) == pa.timestamp("ns")
+
+def test_concatenate_data_appends_arrow_data_keeps_virtual_columns_and_undoes(empty_data_handler: DataHandler) -> None:
+    """
+    Test that concatenating onto Arrow backed data equals pd.concat for matching schemas,
+    keeps the virtual column definitions, and that one undo restores the previous rows.
+    """
+    # Arrange
+    month = _build_month()
+    new_day = _build_month().iloc[:3].assign(Day=4)
+    empty_data_handler.df = month
+    empty_data_handler.create_computed_column("Turnover", "Price * Volume", virtual=True)
+
+    # Act
+    empty_data_handler.concatenate_data(new_day)
+
+    # Assert
+    pd.testing.assert_frame_equal(empty_data_handler.df, pd.concat([month, new_day], ignore_index=True), check_flags=False)
+    assert "Turnover" in empty_data_handler.virtual_columns
+    assert empty_data_handler.undo()
+    assert len(empty_data_handler.df) == 9
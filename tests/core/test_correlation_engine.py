@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from core.correlation_engine import CorrelationEngine
+from core.data_handler import DataHandler
+
+def _build_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    dataframe = pd.DataFrame(rng.normal(size=(500, 8)), columns=[f"C{index}" for index in range(8)])
+    dataframe["C5"] = dataframe["C1"] * 3 + rng.normal(size=500) * 0.2
+    dataframe["C6"] = -dataframe["C2"] + rng.normal(size=500) * 0.5
+    dataframe.iloc[::7, 1] = np.nan
+    dataframe.iloc[::5, 6] = np.nan
+    dataframe["Constant"] = 1.0
+    dataframe["Label"] = "x"
+    return dataframe
+
+def test_matrix_matches_pandas_with_pairwise_missing_values() -> None:
+    """
+    Test that Pearson and Spearman matrices match DataFrame.corr, including pairwise
+    handling of missing values and NaN for constant columns.
+    """
+    # Arrange
+    dataframe = _build_frame()
+    numeric_df = dataframe.drop(columns=["Label"])
+    engine = CorrelationEngine()
+
+    # Act
+    pearson = engine.matrix(dataframe)
+    spearman = engine.matrix(dataframe, ["C0", "C3", "C4"], method="spearman")
+
+    # Assert
+    pd.testing.assert_frame_equal(pearson, numeric_df.corr(), atol=1e-5)
+    pd.testing.assert_frame_equal(spearman, dataframe[["C0", "C3", "C4"]].corr(method="spearman"), atol=1e-5)
+
+def test_top_pairs_and_cache_per_data_version(empty_data_handler: DataHandler) -> None:
+    """
+    Test that the strongest pairs come back in order regardless of the column block size,
+    and that matrices are cached until the data changes.
+    """
+    # Arrange
+    empty_data_handler.df = _build_frame()
+    empty_data_handler.correlation_engine.BLOCK_COLUMNS = 3
+
+    # Act
+    top_pairs = empty_data_handler.top_correlations(k=2)
+    first_matrix = empty_data_handler.correlation_matrix()
+    second_matrix = empty_data_handler.correlation_matrix()
+    empty_data_handler.update_cell(0, 0, 100.0)
+    edited_matrix = empty_data_handler.correlation_matrix()
+
+    # Assert
+    assert list(zip(top_pairs["column_a"], top_pairs["column_b"])) == [("C1", "C5"), ("C2", "C6")]
+    assert top_pairs["correlation"].iloc[0] > 0.99
+    assert top_pairs["correlation"].iloc[1] < -0.8
+    assert second_matrix is first_matrix
+    assert edited_matrix is not first_matrix
+    assert edited_matrix.loc["C0", "C0"] == 1.0
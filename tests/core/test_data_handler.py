@@ -2,6 +2,7 @@ import pytest
 import pandas as pd
 from core.data_handler import DataHandler, DataOperation
 
+
 def test_create_empty_dataframe(empty_data_handler: DataHandler) -> None:
     target_rows: int = 5
     target_columns: int = 3
@@ -21,6 +22,7 @@ def test_create_empty_dataframe(empty_data_handler: DataHandler) -> None:
     assert len(empty_data_handler.undo_stack) == 0
     assert len(empty_data_handler.redo_stack) == 0
 
+
 def test_sort_data_ascending(empty_data_handler: DataHandler) -> None:
     """
     Test that sorting a DataFrame by a specific column in ascending order works correctly
@@ -42,6 +44,7 @@ def test_sort_data_ascending(empty_data_handler: DataHandler) -> None:
     assert len(empty_data_handler.operation_log) == 1
     assert empty_data_handler.operation_log[0]["type"] == "sort"
 
+
 def test_sort_data_raises_error_on_missing_column(empty_data_handler: DataHandler) -> None:
     """
     Test that attempting to sort by a non-existent column raises the appropriate ValueError.
@@ -57,6 +60,7 @@ def test_sort_data_raises_error_on_missing_column(empty_data_handler: DataHandle
     assert "Error sorting data" in str(expected_error.value)
     assert invalid_column_name in str(expected_error.value)
 
+
 def test_split_column_success(empty_data_handler: DataHandler) -> None:
     """
     Test that a string column is correctly split into multiple columns using a delimiter.
@@ -79,6 +83,7 @@ def test_split_column_success(empty_data_handler: DataHandler) -> None:
     assert resulting_dataframe["FirstName"].tolist() == ["John", "Jane", "Alice"]
     assert resulting_dataframe["LastName"].tolist() == ["Doe", "Smith", "Jones"]
 
+
 def test_split_column_missing_column(empty_data_handler: DataHandler) -> None:
     """
     Test that splitting a non-existent column raises an error.
@@ -96,6 +101,7 @@ def test_split_column_missing_column(empty_data_handler: DataHandler) -> None:
         )
     assert "not found in the dataset" in str(expected_error.value)
 
+
 def test_regex_replace_success(empty_data_handler: DataHandler) -> None:
     """
     Test that regex replacement correctly substitutes matched patterns in a string column.
@@ -116,6 +122,7 @@ def test_regex_replace_success(empty_data_handler: DataHandler) -> None:
     expected_values: list[str] = ["PRD-000-X", "PRD-000-Y", "PRD-000-Z"]
     assert resulting_dataframe["ProductCode"].tolist() == expected_values
 
+
 def test_regex_replace_missing_pattern(empty_data_handler: DataHandler) -> None:
     """
     Test that regex replacement raises an error if the pattern is missing.
@@ -131,4 +138,208 @@ def test_regex_replace_missing_pattern(empty_data_handler: DataHandler) -> None:
             pattern="",
             replacement="X"
         )
-    assert "regex pattern are required" in str(expected_error.value)
\ No newline at end of file
+    assert "regex pattern are required" in str(expected_error.value)
+
+
+def test_paste_block_coerces_columns_and_records_one_history_entry(empty_data_handler: DataHandler) -> None:
+    """
+    Test that pasting a clipboard block coerces each column to its dtype and is
+    recorded as a single undoable operation.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({
+        "ID": [1, 2, 3, 4],
+        "Value": [1.0, 2.0, 3.0, 4.0],
+        "Name": ["a", "b", "c", "d"],
+    })
+    clipboard_text = "10\t1.5\tx\r\n20\t2.5\ty\r\n"
+
+    # Act
+    footprint = empty_data_handler.paste_block(start_row=1, start_column=0, block=clipboard_text)
+
+    # Assert
+    assert footprint == (2, 3)
+    assert empty_data_handler.df["ID"].tolist() == [1, 10, 20, 4]
+    assert empty_data_handler.df["Value"].tolist() == [1.0, 1.5, 2.5, 4.0]
+    assert empty_data_handler.df["Name"].tolist() == ["a", "x", "y", "d"]
+    assert empty_data_handler.df["ID"].dtype == "int64"
+    assert len(empty_data_handler.undo_stack) == 1
+    assert empty_data_handler.operation_log[-1]["type"] == "paste_block"
+
+    assert empty_data_handler.undo()
+    assert empty_data_handler.df["ID"].tolist() == [1, 2, 3, 4]
+
+
+def test_paste_block_clips_to_frame_and_rejects_invalid_values(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a block larger than the frame is clipped and that an invalid numeric
+    cell aborts the paste without touching the data or the history.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"ID": [1, 2], "Value": [1.0, 2.0]})
+
+    # Act
+    footprint = empty_data_handler.paste_block(1, 1, [["7.5", "extra"], ["8.5", "extra"]])
+
+    # Assert
+    assert footprint == (1, 1)
+    assert empty_data_handler.df["Value"].tolist() == [1.0, 7.5]
+
+    with pytest.raises(Exception) as expected_error:
+        empty_data_handler.paste_block(0, 0, "3\nnot-a-number")
+    assert "not a valid integer" in str(expected_error.value)
+    assert empty_data_handler.df["ID"].tolist() == [1, 2]
+    assert len(empty_data_handler.undo_stack) == 1
+    assert len(empty_data_handler.operation_log) == 1
+
+
+def test_fused_pipeline_macro_records_single_history_entry(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a fused macro replay creates one snapshot and one log entry, and that
+    undo restores the pre-macro data.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"ID": [3, 1, 2, 4], "Value": [30, 10, 20, 40]})
+    macro: list[dict] = [
+        {"type": "filter", "column": "Value", "condition": ">", "value": 10},
+        {"type": "computed_column", "new_column": "Double", "expression": "Value * 2"},
+        {"type": "sort", "column": "ID", "ascending": True},
+    ]
+
+    # Act
+    empty_data_handler.apply_pipeline_macro(macro)
+
+    # Assert
+    assert empty_data_handler.df["ID"].tolist() == [2, 3, 4]
+    assert empty_data_handler.df["Double"].tolist() == [40, 60, 80]
+    assert len(empty_data_handler.undo_stack) == 1
+    assert len(empty_data_handler.operation_log) == 1
+    assert empty_data_handler.operation_log[0]["type"] == "pipeline_macro"
+    assert empty_data_handler.sort_state == ("ID", True)
+
+    assert empty_data_handler.undo()
+    assert empty_data_handler.df["ID"].tolist() == [3, 1, 2, 4]
+    assert "Double" not in empty_data_handler.df.columns
+
+
+def test_fused_pipeline_macro_rolls_back_on_error(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a failing step leaves the data, history and log untouched.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"ID": [1, 2, 3]})
+    macro: list[dict] = [
+        {"type": "computed_column", "new_column": "Double", "expression": "ID * 2"},
+        {"type": "drop_column", "column": "Missing"},
+    ]
+
+    # Act & Assert
+    with pytest.raises(Exception) as expected_error:
+        empty_data_handler.apply_pipeline_macro(macro)
+    assert "rolled back" in str(expected_error.value)
+    assert list(empty_data_handler.df.columns) == ["ID"]
+    assert len(empty_data_handler.undo_stack) == 0
+    assert len(empty_data_handler.operation_log) == 0
+
+
+def test_fill_missing_grouped_mode_and_mean(empty_data_handler: DataHandler) -> None:
+    """
+    Test that grouped mode fills each group with its most frequent value (smallest on ties),
+    leaves rows without a group key untouched and that grouped means fill several columns at once.
+    """
+    # Arrange
+    test_data: dict[str, list] = {
+        "Store": ["A", "A", "A", "B", "B", "B", None],
+        "Product": ["tea", "tea", None, "cake", "bun", None, None],
+        "Price": [1.0, None, 3.0, 4.0, None, 8.0, None],
+        "Units": [2.0, 4.0, None, None, 1.0, 3.0, None],
+    }
+    empty_data_handler.df = pd.DataFrame(test_data)
+
+    # Act
+    empty_data_handler.clean_data(DataOperation.FILL_MISSING, method="mode", column="Product", group_by="Store")
+    resulting_dataframe: pd.DataFrame = empty_data_handler.clean_data(DataOperation.FILL_MISSING, method="mean", group_by="Store")
+
+    # Assert
+    assert resulting_dataframe["Product"].tolist()[:6] == ["tea", "tea", "tea", "cake", "bun", "bun"]
+    assert resulting_dataframe["Product"].isna().tolist()[6]
+    assert resulting_dataframe["Price"].tolist()[:6] == [1.0, 2.0, 3.0, 4.0, 6.0, 8.0]
+    assert resulting_dataframe["Units"].tolist()[:6] == [2.0, 4.0, 3.0, 2.0, 1.0, 3.0]
+    assert resulting_dataframe[["Price", "Units"]].iloc[6].isna().all()
+
+
+def test_detect_outliers_returns_row_mask_consumed_by_flag_and_remove(empty_data_handler: DataHandler) -> None:
+    """
+    Test that outlier detection returns a positional boolean mask across all selected columns,
+    that flagging and removal accept it and that a cancelled detection raises InterruptedError.
+    """
+    # Arrange
+    test_data: dict[str, list] = {
+        "Height": [10.0, 11.0, 12.0, 11.0, 10.0, 95.0, 12.0, None],
+        "Weight": [5.0, 5.0, -40.0, 6.0, 5.0, 6.0, 5.0, 6.0],
+        "Name": ["a", "b", "c", "d", "e", "f", "g", "h"],
+    }
+    empty_data_handler.df = pd.DataFrame(test_data, index=[7, 6, 5, 4, 3, 2, 1, 0])
+
+    # Act
+    iqr_mask = empty_data_handler.detect_outliers("iqr", ["Height", "Weight", "Name"], multiplier=1.5)
+    forest_mask = empty_data_handler.detect_outliers("isolation_forest", ["Height", "Weight"], contamination=0.25, sample_size=6, chunk_size=3)
+    empty_data_handler.clean_data(DataOperation.FLAG_OUTLIERS, mask=iqr_mask, new_column_name="is_outlier")
+    resulting_dataframe: pd.DataFrame = empty_data_handler.clean_data(DataOperation.REMOVE_ROWS, mask=iqr_mask)
+
+    # Assert
+    assert iqr_mask.dtype == bool
+    assert iqr_mask.tolist() == [False, False, True, False, False, True, False, False]
+    assert forest_mask.shape == (8,) and forest_mask.sum() >= 1
+    assert empty_data_handler.undo_stack[-1][0]["is_outlier"].tolist() == iqr_mask.tolist()
+    assert resulting_dataframe["Name"].tolist() == ["a", "b", "d", "e", "g", "h"]
+    with pytest.raises(InterruptedError):
+        empty_data_handler.detect_outliers("z_score", ["Height"], is_cancelled=lambda: True)
+
+
+def test_remove_rows_keeps_row_ids_for_later_removals(empty_data_handler: DataHandler) -> None:
+    """
+    Test that removing selected rows keeps the index labels as row ids, logs the removed ids
+    and that a replay of the log removes the same records.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Name": ["a", "b", "c", "d", "e", "f"]})
+    empty_data_handler.original_df = empty_data_handler.df.copy()
+
+    # Act
+    empty_data_handler.remove_rows([1, 4])
+    empty_data_handler.remove_rows([0, 2])
+    remaining = empty_data_handler.df.copy()
+    positions = empty_data_handler.row_positions([5, 4, 2])
+    recorded_log = list(empty_data_handler.operation_log)
+    empty_data_handler.reset_data()
+    empty_data_handler.apply_pipeline_macro(recorded_log)
+
+    # Assert
+    assert [entry["rows"] for entry in recorded_log] == [[1, 4], [0, 3]]
+    assert remaining["Name"].tolist() == ["c", "f"]
+    assert remaining.index.tolist() == [2, 5]
+    assert positions.tolist() == [1, -1, 0]
+    assert empty_data_handler.df["Name"].tolist() == ["c", "f"]
+
+
+def test_remove_rows_logs_positions_when_row_ids_repeat(empty_data_handler: DataHandler) -> None:
+    """
+    Test that removing rows from a frame with repeated index labels logs the removed row
+    positions, not a mask of every row, and that a replay of the log removes the same rows.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Name": ["a", "b", "c", "d"]}, index=[0, 0, 1, 1])
+    empty_data_handler.original_df = empty_data_handler.df.copy()
+
+    # Act
+    empty_data_handler.remove_rows([1, 2])
+    remaining = empty_data_handler.df.copy()
+    recorded_log = list(empty_data_handler.operation_log)
+    empty_data_handler.reset_data()
+    empty_data_handler.apply_pipeline_macro(recorded_log)
+
+    # Assert
+    assert recorded_log == [{"type": "remove_rows", "positions": [1, 2]}]
+    assert remaining["Name"].tolist() == ["a", "d"]
+    pd.testing.assert_frame_equal(empty_data_handler.df, remaining)
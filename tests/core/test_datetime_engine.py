@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from core.data_handler import DataHandler
+from core.datetime_engine import DatetimeEngine
+
+def test_extract_matches_pandas_datetime_accessors() -> None:
+    """
+    Test that every date part computed in one pass equals the matching .dt accessor,
+    including ISO weeks around new year, second resolution values and missing values.
+    """
+    # Arrange
+    rng = np.random.default_rng(5)
+    timestamps = pd.Series(pd.to_datetime("1850-01-01") + pd.to_timedelta(rng.integers(0, 9 * 10**9, size=2000), unit="s"))
+    timestamps = pd.concat([timestamps, pd.Series(pd.to_datetime(["2020-12-31 23:00", "2021-01-03 00:00", "2027-01-01 00:00", None]))], ignore_index=True)
+    expected = {
+        "Year": timestamps.dt.year,
+        "Month": timestamps.dt.month,
+        "Month Name": timestamps.dt.month_name(),
+        "Day": timestamps.dt.day,
+        "Day of Week": timestamps.dt.day_name(),
+        "Week": timestamps.dt.isocalendar().week,
+        "Quarter": timestamps.dt.quarter,
+        "Hour": timestamps.dt.hour,
+    }
+
+    # Act
+    nanosecond_parts = DatetimeEngine.extract(timestamps, DatetimeEngine.COMPONENTS)
+    second_parts = DatetimeEngine.extract(timestamps.astype("datetime64[s]"), DatetimeEngine.COMPONENTS)
+
+    # Assert
+    for component, expected_values in expected.items():
+        for parts in (nanosecond_parts, second_parts):
+            assert parts[component].isna().tolist() == expected_values.isna().tolist()
+            assert parts[component].dropna().tolist() == expected_values.dropna().tolist()
+
+def test_text_column_is_parsed_once_for_extraction_and_difference(empty_data_handler: DataHandler) -> None:
+    """
+    Test that extracting several components and computing a difference reuse one parse of
+    a text column, and that the source columns keep their values.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({
+        "Start": ["2024-01-01 08:00", "2024-03-15 12:30", "not a date"],
+        "End": ["2024-01-03 08:00", "2024-03-16 00:30", "2024-05-01"],
+    })
+    engine = empty_data_handler._mutator.datetime_engine
+    parse_calls: list[str] = []
+    original_parse = engine._parse_uncached
+    engine._parse_uncached = lambda series: parse_calls.append(series.name) or original_parse(series)
+
+    # Act
+    empty_data_handler.clean_data("extract_date_component", column="Start", components=["Year", "Day of Week", "Hour"])
+    empty_data_handler.clean_data("extract_date_component", column="Start", component="Quarter")
+    empty_data_handler.clean_data("calculate_date_difference", start_column="Start", end_column="End", unit="Hours")
+
+    # Assert
+    dataframe = empty_data_handler.df
+    assert parse_calls == ["Start", "End"]
+    assert dataframe["Start"].tolist()[2] == "not a date"
+    assert dataframe["Start_Year"].tolist()[:2] == [2024, 2024]
+    assert dataframe["Start_Day_of_Week"].tolist()[:2] == ["Monday", "Friday"]
+    assert dataframe["Start_Hour"].isna().tolist() == [False, False, True]
+    assert dataframe["Start_Quarter"].tolist()[:2] == [1, 1]
+    assert dataframe["Diff_Hours_End_vs_Start"].tolist()[:2] == [48.0, 12.0]
+    assert empty_data_handler.operation_log[0]["components"] == ["Year", "Day of Week", "Hour"]
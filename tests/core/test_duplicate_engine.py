@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.data_handler import DataHandler
+from core.duplicate_engine import DuplicateEngine
+
+def _build_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Customer": ["a", "b", "a", None, "b", None, "c", "a"],
+            "Amount": [1.0, 2.0, 1.0, np.nan, 3.0, np.nan, 4.0, 1.0],
+            "Note": ["x", "y", "z", "x", "y", "y", "z", "x"],
+        },
+        index=[10, 11, 12, 13, 14, 15, 16, 17],
+    )
+
+def test_duplicate_masks_equal_pandas_and_reuse_the_cached_groups() -> None:
+    """
+    Test that the hashed duplicate masks equal df.duplicated for every keep option, key subset
+    and missing keys, that switching keep reuses the cached groups, and that the summary counts
+    the largest groups first.
+    """
+    # Arrange
+    engine = DuplicateEngine()
+    df = _build_frame()
+
+    # Act
+    masks = {(tuple(subset or ()), keep): engine.duplicate_mask(df, subset, keep) for subset in (None, ["Customer", "Amount"]) for keep in ("first", "last", False)}
+    groups = engine.groups(df, ["Customer", "Amount"])
+    summary = engine.summary(df, ["Customer", "Amount"], keep="last", examples=2)
+
+    # Assert
+    for (subset, keep), mask in masks.items():
+        np.testing.assert_array_equal(mask, df.duplicated(list(subset) or None, keep=keep).to_numpy())
+    assert engine.groups(df, ["Customer", "Amount"]) is groups
+    assert summary["duplicate_rows"] == 3
+    assert summary["duplicate_groups"] == 2
+    assert summary["rows_in_duplicate_groups"] == 5
+    assert summary["examples"]["Customer"].tolist() == ["a", None]
+    assert summary["examples"]["Count"].tolist() == [3, 2]
+    with pytest.raises(ValueError):
+        engine.duplicate_mask(df, ["Missing"])
+
+def test_removing_duplicates_keeps_row_ids_and_undoes_to_the_original(empty_data_handler: DataHandler) -> None:
+    """
+    Test that removing duplicates by key columns keeps the index labels of the kept rows, is
+    logged with its keys and keep option, replays in a macro, and undoes to the original frame.
+    """
+    # Arrange
+    empty_data_handler.df = _build_frame()
+    original = empty_data_handler.df.copy()
+
+    # Act
+    empty_data_handler.remove_duplicates(["Customer"], keep="last")
+    operations = empty_data_handler.operation_log.copy()
+    replay = DataHandler()
+    replay.df = _build_frame()
+    replay.apply_pipeline_macro(operations)
+
+    # Assert
+    pd.testing.assert_frame_equal(empty_data_handler.df, original.drop_duplicates(["Customer"], keep="last"))
+    assert operations[-1] == {"type": "drop_duplicates", "subset": ["Customer"], "keep": "last"}
+    pd.testing.assert_frame_equal(replay.df, empty_data_handler.df)
+    assert empty_data_handler.undo()
+    pd.testing.assert_frame_equal(empty_data_handler.df, original)
+
+@pytest.mark.parametrize("dtype", ["string", "string[pyarrow]", "object"])
+def test_missing_nullable_keys_and_signed_zeros_match_pandas(empty_data_handler: DataHandler, dtype: str) -> None:
+    """
+    Test that nullable string keys with pd.NA and floats with 0.0 and -0.0 give the masks of
+    df.duplicated, and that Drop Duplicates works on such data.
+    """
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    # Arrange
+    engine = DuplicateEngine()
+    df = pd.DataFrame(
+        {
+            "Customer": pd.array(["a", pd.NA, "a", pd.NA, "b", "a"], dtype=dtype),
+            "Amount": [0.0, 1.0, -0.0, 1.0, -0.0, 0.0],
+        }
+    )
+    empty_data_handler.df = df
+
+    # Act
+    masks = {(tuple(subset or ()), keep): engine.duplicate_mask(df, subset, keep) for subset in (None, ["Customer"], ["Amount"]) for keep in ("first", "last", False)}
+    empty_data_handler.clean_data("drop_duplicates")
+
+    # Assert
+    for (subset, keep), mask in masks.items():
+        np.testing.assert_array_equal(mask, df.duplicated(list(subset) or None, keep=keep).to_numpy())
+    pd.testing.assert_frame_equal(empty_data_handler.df, df.drop_duplicates())
+
+def test_missing_object_keys_match_pandas() -> None:
+    """
+    Test that None, NaN and pd.NA in an object column are distinct keys on their own, as in
+    Series.duplicated, and one missing key next to other key columns, as in df.duplicated.
+    """
+    # Arrange
+    engine = DuplicateEngine()
+    df = pd.DataFrame(
+        {
+            "Code": pd.Series([None, np.nan, pd.NA, None, float("nan"), pd.NA, "a", "a"], dtype=object),
+            "Store": [1, 1, 1, 1, 1, 1, 1, 2],
+        }
+    )
+
+    # Act
+    masks = {(tuple(subset or ()), keep): engine.duplicate_mask(df, subset, keep) for subset in (None, ["Code"]) for keep in ("first", "last", False)}
+
+    # Assert
+    for (subset, keep), mask in masks.items():
+        np.testing.assert_array_equal(mask, df.duplicated(list(subset) or None, keep=keep).to_numpy())
+    assert masks[(("Code",), "first")].tolist() == [False, False, False, True, True, True, False, True]
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from core.filter_engine import FilterEngine
+from core.subset_manager import SubsetManager
+
+def _build_frame(arrow_backed: bool = False) -> pd.DataFrame:
+    dataframe = pd.DataFrame({
+        "Region": ["North", "South", None, "East", "South", "North"],
+        "Sales": [10.0, 25.0, 5.0, np.nan, 40.0, 15.0],
+        "Units": [1, 4, 2, 8, 3, 6],
+    })
+    if arrow_backed:
+        dataframe["Region"] = dataframe["Region"].astype(pd.ArrowDtype(pa.string()))
+        dataframe["Sales"] = dataframe["Sales"].astype(pd.ArrowDtype(pa.float64()))
+    return dataframe
+
+def test_filters_mask_matches_query_semantics_for_both_backends() -> None:
+    """
+    Test that combined filters follow boolean precedence, coerce typed text values and
+    give the same rows for numpy and Arrow backed columns.
+    """
+    # Arrange
+    filters: list[dict] = [
+        {"column": "Sales", "condition": ">", "value": "12", "operator": None},
+        {"column": "Units", "condition": "<=", "value": "4", "operator": "AND"},
+        {"column": "Region", "condition": "!=", "value": "North", "operator": "OR"},
+        {"column": "Region", "condition": "contains", "value": "ast", "operator": "AND"},
+    ]
+    engine = FilterEngine()
+
+    # Act
+    numpy_mask = engine.filters_mask(_build_frame(), filters)
+    arrow_mask = engine.filters_mask(_build_frame(arrow_backed=True), filters)
+    complex_mask = engine.filters_mask(_build_frame(), filters, logic="COMPLEX")
+
+    # Assert
+    assert numpy_mask.tolist() == [False, True, False, True, True, False]
+    assert arrow_mask.tolist() == numpy_mask.tolist()
+    # Left to right: ((Sales > 12 & Units <= 4) | Region != North) & contains 'ast'
+    assert complex_mask.tolist() == [False, False, False, True, False, False]
+
+def test_condition_masks_are_cached_until_the_column_changes() -> None:
+    """
+    Test that repeated conditions reuse the cached mask, and that an in place edit
+    followed by invalidate recomputes it.
+    """
+    # Arrange
+    engine = FilterEngine()
+    dataframe = _build_frame()
+
+    # Act
+    first_mask = engine.condition_mask(dataframe, "Units", ">", 3)
+    second_mask = engine.condition_mask(dataframe.copy(deep=False), "Units", ">", 3)
+    dataframe.iat[0, 2] = 100
+    engine.invalidate(dataframe["Units"])
+    edited_mask = engine.condition_mask(dataframe, "Units", ">", 3)
+
+    # Assert
+    assert second_mask is first_mask
+    assert first_mask.tolist() == [False, True, False, True, False, True]
+    assert edited_mask.tolist() == [True, True, False, True, False, True]
+
+def test_expression_mask_and_subsets_share_semantics() -> None:
+    """
+    Test that quick filter expressions, including ones that need pandas eval,
+    and subsets select the same rows as DataFrame.query.
+    """
+    # Arrange
+    dataframe = _build_frame()
+    engine = FilterEngine()
+    subset_manager = SubsetManager(filter_engine=engine)
+    subset_manager.create_subset(
+        name="Large",
+        description="",
+        filters=[
+            {"column": "Units", "condition": ">", "value": 2},
+            {"column": "Missing", "condition": "==", "value": 1},
+        ],
+        logic="OR",
+    )
+
+    # Act
+    compiled_mask = engine.expression_mask(dataframe, "`Units` > 2 and not (Region in ['East', 'South'])")
+    evaluated_mask = engine.expression_mask(dataframe, "Units > Sales / 10")
+    subset_df = subset_manager.apply_subset(dataframe, "Large", use_cache=False)
+
+    # Assert
+    assert dataframe[compiled_mask].equals(dataframe.query("`Units` > 2 and not (Region in ['East', 'South'])"))
+    assert dataframe[evaluated_mask].equals(dataframe.query("Units > Sales / 10"))
+    assert subset_df["Units"].tolist() == [4, 8, 3, 6]
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.aggregation_manager import AggregationManager
+from core.data_handler import DataHandler
+from core.incremental_aggregation import IncrementalAggregator
+
+def _build_trades(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Symbol": rng.choice(["a", "b", "c", None], rows),
+            "Venue": rng.choice([1.0, 2.0, np.nan], rows),
+            "Volume": rng.integers(0, 100, rows),
+            "Price": np.where(rng.random(rows) < 0.2, np.nan, rng.random(rows)),
+        }
+    )
+
+@pytest.mark.parametrize("arrow", [False, True])
+def test_appended_and_removed_rows_give_the_full_groupby_result(arrow: bool) -> None:
+    """
+    Test that partials updated with appended rows or with removed rows equal a groupby of
+    the resulting data for every supported function, with missing keys as their own group.
+    """
+    if arrow:
+        pytest.importorskip("pyarrow")
+    # Arrange
+    current, new_rows = _build_trades(500, 1), _build_trades(120, 2)
+    if arrow:
+        current = current.convert_dtypes(dtype_backend="pyarrow")
+        new_rows = new_rows.convert_dtypes(dtype_backend="pyarrow").astype(current.dtypes.to_dict())
+    aggregator = IncrementalAggregator()
+    group_by = ["Symbol", "Venue"]
+    configs = [{"Volume": "sum", "Price": "mean"}, {"Volume": "min", "Price": "max"}, {"Volume": "first", "Price": "last"}, {"Volume": "size", "Price": "count"}]
+    appended = pd.concat([current, new_rows], ignore_index=True)
+    kept = current[current["Volume"] > 30]
+
+    # Act
+    appended_results = [aggregator.finalize(aggregator.append(aggregator.build(current, group_by, config), new_rows)) for config in configs]
+    removed_result = aggregator.finalize(aggregator.remove(aggregator.build(current, group_by, configs[0]), current[current["Volume"] <= 30]))
+
+    # Assert
+    for config, result in zip(configs, appended_results):
+        pd.testing.assert_frame_equal(result, appended.groupby(group_by, dropna=False).agg(config).reset_index())
+    pd.testing.assert_frame_equal(removed_result, kept.groupby(group_by, dropna=False).agg(configs[0]).reset_index())
+    with pytest.raises(ValueError):
+        aggregator.remove(aggregator.build(current, group_by, configs[1]), current.head(5))
+
+def test_refresh_follows_the_operation_log_and_recomputes_otherwise(empty_data_handler: DataHandler) -> None:
+    """
+    Test that refreshing saved aggregations after an append or a filter updates them
+    incrementally, and that cell edits, min/max after a filter and undone history are
+    recomputed, always giving the groupby result of the current data.
+    """
+    # Arrange
+    manager = AggregationManager()
+    empty_data_handler.df = _build_trades(400, 3)
+    empty_data_handler.original_df = empty_data_handler.df.copy()
+    for name, config in (("Totals", {"Volume": "sum", "Price": "mean"}), ("Range", {"Volume": "min", "Price": "max"})):
+        manager.save_aggregation(name, "", ["Symbol"], config, pd.DataFrame())
+
+    mismatches = []
+
+    def refresh() -> dict:
+        outcome = manager.refresh_aggregations(empty_data_handler.df, empty_data_handler.operations_since, empty_data_handler.operation_marker())
+        for name in ("Totals", "Range"):
+            config = manager.get_aggregation(name).agg_config
+            expected = empty_data_handler.df.groupby(["Symbol"], dropna=False).agg(config).reset_index()
+            try:
+                pd.testing.assert_frame_equal(manager.get_aggregation_df(name), expected)
+            except AssertionError as error:
+                mismatches.append((name, outcome[name], str(error)))
+        return outcome
+
+    # Act
+    outcomes = [refresh()]
+    empty_data_handler.concatenate_data(_build_trades(50, 4))
+    outcomes.append(refresh())
+    empty_data_handler.filter_data("Volume", ">", 20)
+    outcomes.append(refresh())
+    outcomes.append(refresh())
+    empty_data_handler.update_cell(0, 2, 1000)
+    outcomes.append(refresh())
+    empty_data_handler.undo()
+    empty_data_handler.undo()
+    outcomes.append(refresh())
+
+    # Assert
+    assert [outcome["Totals"] for outcome in outcomes] == ["full", "incremental", "incremental", "unchanged", "full", "full"]
+    assert [outcome["Range"] for outcome in outcomes] == ["full", "incremental", "full", "unchanged", "full", "full"]
+    assert mismatches == []
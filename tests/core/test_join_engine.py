@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.data_handler import DataHandler
+from core.join_engine import JoinEngine
+
+def _build_frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(5)
+    left = pd.DataFrame(
+        {
+            "Key": rng.choice([1.0, 2.0, 3.0, np.nan, 5.0], 600),
+            "Region": rng.choice(["north", "south", None], 600),
+            "Sales": rng.integers(0, 100, 600),
+            "Note": rng.choice(["a", "b"], 600),
+        }
+    )
+    right = pd.DataFrame(
+        {
+            "Key": rng.choice([1.0, 2.0, 4.0, np.nan], 40),
+            "Region": rng.choice(["north", "east", None], 40),
+            "Target": rng.random(40),
+            "Note": rng.choice(["x", "y"], 40),
+        }
+    )
+    return left, right
+
+def test_plan_counts_equal_the_merge_sizes_and_flag_many_to_many_keys() -> None:
+    """
+    Test that the exact plan gives the pd.merge row count of every join type, including
+    missing keys that match each other, warns about the many-to-many blowup, and that the
+    hash sample estimate of a larger input stays close to the exact counts.
+    """
+    # Arrange
+    left, right = _build_frames()
+    engine = JoinEngine()
+    rng = np.random.default_rng(6)
+    large_left = pd.DataFrame({"Id": rng.integers(0, 50_000, 200_000)})
+    large_right = pd.DataFrame({"Id": rng.integers(0, 80_000, 100_000)})
+
+    # Act
+    plans = {keys: engine.plan(left, right, list(keys), list(keys)) for keys in (("Key",), ("Key", "Region"))}
+    exact = engine.plan(large_left, large_right, ["Id"], ["Id"])
+    estimate = JoinEngine(exact_max_rows=30_000).plan(large_left, large_right, ["Id"], ["Id"])
+
+    # Assert
+    for keys, plan in plans.items():
+        assert plan.is_exact
+        for how in ("inner", "left", "right", "outer"):
+            assert plan.result_rows(how) == len(pd.merge(left, right, how=how, on=list(keys)))
+    assert "repeat on both sides" in plans[("Key",)].warning("inner")
+    assert not estimate.is_exact
+    for field in ("matched", "left_only", "right_only"):
+        assert getattr(estimate, field) == pytest.approx(getattr(exact, field), rel=0.1)
+    with pytest.raises(ValueError):
+        engine.plan(left, right, ["Key"], ["Missing"])
+
+def test_duckdb_join_matches_pandas_merge(empty_data_handler: DataHandler) -> None:
+    """
+    Test that joins run on DuckDB give the pd.merge frame for every join type, with the same
+    suffixed columns, merged or separate key columns, row order and missing values.
+    """
+    pytest.importorskip("duckdb")
+    # Arrange
+    left, right = _build_frames()
+    engine = JoinEngine(duckdb_min_rows=0, threads=2)
+    right_frames = {"Key": right, "RightKey": right.rename(columns={"Key": "RightKey"})}
+
+    # Act
+    results = {
+        (how, right_on): engine.merge(left, right_frames[right_on], how, ["Key"], [right_on], ("_l", "_r"))
+        for how in ("inner", "left", "right", "outer")
+        for right_on in right_frames
+    }
+    empty_data_handler.df = left.copy()
+    empty_data_handler.merge_data(right, "left", ["Key", "Region"], ["Key", "Region"])
+
+    # Assert
+    for (how, right_on), result in results.items():
+        expected = pd.merge(left, right_frames[right_on], how=how, left_on=["Key"], right_on=[right_on], suffixes=("_l", "_r"))
+        pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(empty_data_handler.df, pd.merge(left, right, how="left", on=["Key", "Region"], suffixes=("_left", "_right")))
@@ -0,0 +1,150 @@
+import pytest
+import pandas as pd
+from core.data_handler import DataHandler
+from core.macro_sql_compiler import MacroSQLCompiler
+
+def _build_sales_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Region": ["North", "South", "North", None, "East", "South"],
+        "Sales": [5.0, 3.0, 8.0, 1.0, None, 7.5],
+        "Units": [1, 2, 3, 4, 5, 6],
+    })
+
+def test_duckdb_macro_matches_pandas_replay(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a macro compiled to DuckDB produces the same data and sort state as the pandas replay.
+    """
+    # Arrange
+    macro: list[dict] = [
+        {"type": "filter", "column": "Units", "condition": ">", "value": "1"},
+        {"type": "computed_column", "new_column": "Revenue", "expression": "Sales * Units + 1"},
+        {"type": "fill_missing", "method": "static_value", "column": "Sales", "value": 0},
+        {"type": "sort", "column": "Revenue", "ascending": False},
+        {"type": "filter", "column": "Region", "condition": "!=", "value": "East"},
+    ]
+    empty_data_handler.df = _build_sales_frame()
+    empty_data_handler.apply_pipeline_macro(list(macro))
+    expected_df = empty_data_handler.df
+    expected_sort_state = empty_data_handler.sort_state
+
+    # Act
+    sql_handler = DataHandler()
+    sql_handler.df = _build_sales_frame()
+    sql_handler.apply_pipeline_macro(list(macro), engine="duckdb")
+
+    # Assert
+    pd.testing.assert_frame_equal(sql_handler.df, expected_df)
+    assert sql_handler.sort_state == expected_sort_state
+    assert len(sql_handler.undo_stack) == 1
+    assert sql_handler.operation_log[0]["type"] == "pipeline_macro"
+
+@pytest.mark.parametrize(
+    "macro",
+    [
+        [
+            {"type": "filter", "column": "Units", "condition": ">", "value": "1"},
+            {"type": "sort", "column": "Units", "ascending": False},
+            {"type": "remove_rows", "rows": [40]},
+            {"type": "rename_column", "old_name": "Sales", "new_name": "Revenue"},
+        ],
+        [
+            {"type": "aggregate", "group_by": ["Region"], "agg_config": {"Units": "sum"}, "date_grouping": {}},
+            {"type": "filter", "column": "Units", "condition": ">", "value": "5"},
+        ],
+    ],
+)
+def test_duckdb_macro_keeps_the_row_ids_of_the_pandas_replay(empty_data_handler: DataHandler, macro: list[dict]) -> None:
+    """
+    Test that the DuckDB engine leaves the same index labels as the pandas engine, both
+    for rows kept from the source frame and for rows numbered afresh by an aggregate.
+    """
+    # Arrange
+    source_df = _build_sales_frame()
+    source_df.index = pd.Index([10, 20, 30, 40, 50, 60], name="row")
+    empty_data_handler.df = source_df.copy()
+    empty_data_handler.apply_pipeline_macro(list(macro))
+    expected_df = empty_data_handler.df
+
+    # Act
+    sql_handler = DataHandler()
+    sql_handler.df = source_df.copy()
+    sql_handler.apply_pipeline_macro(list(macro), engine="duckdb")
+
+    # Assert
+    pd.testing.assert_frame_equal(sql_handler.df, expected_df)
+
+@pytest.mark.parametrize(
+    "macro",
+    [
+        [{"type": "computed_column", "new_column": "Parity", "expression": "(Units - 4) % 4"}],
+        [{"type": "computed_column", "new_column": "Squared", "expression": "Units ** 2"}],
+        [{"type": "aggregate", "group_by": ["Region"], "agg_config": {"Sales": "sum"}, "date_grouping": {}}],
+    ],
+)
+def test_duckdb_macro_matches_pandas_arithmetic_and_empty_sums(empty_data_handler: DataHandler, macro: list[dict]) -> None:
+    """
+    Test that modulo of negative numbers, integer powers and the sum of a group holding
+    only missing values give the values and dtypes of the pandas replay.
+    """
+    # Arrange
+    source_df = _build_sales_frame()
+    empty_data_handler.df = source_df.copy()
+    empty_data_handler.apply_pipeline_macro(list(macro))
+    expected_df = empty_data_handler.df
+
+    # Act
+    sql_handler = DataHandler()
+    sql_handler.df = source_df.copy()
+    sql_handler.apply_pipeline_macro(list(macro), engine="duckdb")
+
+    # Assert
+    pd.testing.assert_frame_equal(sql_handler.df, expected_df)
+
+def test_unsupported_steps_fall_back_to_pandas() -> None:
+    """
+    Test that steps without an SQL translation run through the fallback and that
+    compilation resumes afterwards.
+    """
+    # Arrange
+    compiler = MacroSQLCompiler()
+    fallback_calls: list[str] = []
+
+    def fallback(df: pd.DataFrame, op_type: str, kwargs: dict, sort_state):
+        fallback_calls.append(op_type)
+        return df.drop_duplicates(), sort_state
+
+    macro: list[dict] = [
+        {"type": "drop_column", "column": "Sales"},
+        {"type": "drop_duplicates"},
+        {"type": "aggregate", "group_by": ["Region"], "agg_config": {"Units": "sum"}, "date_grouping": {}},
+    ]
+
+    # Act
+    result_df, sort_state = compiler.run(_build_sales_frame(), macro, fallback)
+
+    # Assert
+    assert fallback_calls == ["drop_duplicates"]
+    assert len(compiler.last_compiled_sql) == 2
+    assert result_df["Region"].tolist() == ["East", "North", "South"]
+    assert result_df["Units"].tolist() == [5, 4, 8]
+    assert result_df["Units"].dtype == "int64"
+    assert sort_state is None
+
+def test_duckdb_macro_rolls_back_on_error(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a failing step on the DuckDB engine leaves the data and history untouched.
+    """
+    # Arrange
+    empty_data_handler.df = _build_sales_frame()
+    macro: list[dict] = [
+        {"type": "computed_column", "new_column": "Double", "expression": "Units * 2"},
+        {"type": "drop_column", "column": "Missing"},
+    ]
+
+    # Act & Assert
+    with pytest.raises(Exception) as expected_error:
+        empty_data_handler.apply_pipeline_macro(macro, engine="duckdb")
+    assert "rolled back" in str(expected_error.value)
+    assert "drop_column" in str(expected_error.value)
+    assert "Double" not in empty_data_handler.df.columns
+    assert len(empty_data_handler.undo_stack) == 0
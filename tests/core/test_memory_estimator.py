@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from core.memory_estimator import MemoryEstimator
+from core.history_manager import HistoryManager
+
+def test_frame_usage_matches_deep_memory_usage() -> None:
+    """
+    Test that fixed width and Arrow columns are measured exactly and that object
+    columns are estimated close to pandas' deep memory usage.
+    """
+    # Arrange
+    row_count: int = 50_000
+    dataframe = pd.DataFrame({
+        "Text": [f"row number {i}" for i in range(row_count)],
+        "Value": np.arange(row_count, dtype="float64"),
+    })
+    dataframe["ArrowText"] = pd.Series(["abcdef"] * row_count, dtype=pd.ArrowDtype(pa.string()))
+    estimator = MemoryEstimator()
+
+    # Act
+    usage = estimator.frame_usage(dataframe)
+    deep_usage = dataframe.memory_usage(deep=True)
+
+    # Assert
+    assert usage["Value"] == deep_usage["Value"]
+    assert usage["ArrowText"] == deep_usage["ArrowText"]
+    assert abs(usage["Text"] - deep_usage["Text"]) / deep_usage["Text"] < 0.05
+
+def test_object_estimates_are_cached_per_column_version() -> None:
+    """
+    Test that a repeated measurement hits the cache and that invalidating a column
+    forces a new estimate.
+    """
+    # Arrange
+    dataframe = pd.DataFrame({"Text": ["a"] * 100, "Other": ["b"] * 100})
+    estimator = MemoryEstimator()
+
+    # Act
+    first_estimate = estimator.column_bytes(dataframe["Text"])
+    dataframe.iat[0, 0] = "x" * 10_000
+    cached_estimate = estimator.column_bytes(dataframe["Text"])
+    estimator.invalidate(dataframe["Text"])
+    fresh_estimate = estimator.column_bytes(dataframe["Text"])
+
+    # Assert
+    assert cached_estimate == first_estimate
+    assert fresh_estimate > first_estimate
+
+def test_history_limit_accounts_for_string_data() -> None:
+    """
+    Test that the history memory cap counts the string payload of object columns,
+    evicting old states that a shallow estimate would have kept.
+    """
+    # Arrange
+    history = HistoryManager()
+    dataframe = pd.DataFrame({"Text": ["some longer text value"] * 10_000})
+    shallow_bytes = int(dataframe.memory_usage(deep=False).sum())
+    history.max_history_memory_bytes = shallow_bytes * 3
+
+    # Act
+    for _ in range(3):
+        history.save_state(dataframe)
+
+    # Assert
+    assert len(history.undo_stack) < 3
+    assert history.current_memory_bytes <= history.max_history_memory_bytes
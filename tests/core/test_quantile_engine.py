@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from core.data_handler import DataHandler
+from core.quantile_engine import QuantileEngine
+
+def test_exact_quantile_bins_equal_pandas_qcut(empty_data_handler: DataHandler) -> None:
+    """
+    Test that quantile binning from the cached sorted column gives the same categories and
+    codes as pd.qcut, including repeated values, missing values and custom labels.
+    """
+    # Arrange
+    rng = np.random.default_rng(3)
+    values = np.concatenate([rng.lognormal(size=3000), np.repeat(1.0, 400), [np.nan] * 20])
+    empty_data_handler.df = pd.DataFrame({"Value": values})
+
+    # Act
+    empty_data_handler.bin_column("Value", "Deciles", "qcut", 10)
+    empty_data_handler.bin_column("Value", "Thirds", "qcut", [0, 0.2, 0.7, 1], labels=["low", "mid", "high"])
+
+    # Assert
+    dataframe = empty_data_handler.df
+    pd.testing.assert_series_equal(dataframe["Deciles"], pd.qcut(dataframe["Value"], 10, duplicates="drop"), check_names=False)
+    pd.testing.assert_series_equal(dataframe["Thirds"], pd.qcut(dataframe["Value"], [0, 0.2, 0.7, 1], labels=["low", "mid", "high"]), check_names=False)
+
+def test_approximate_edges_stay_within_rank_error_and_are_cached() -> None:
+    """
+    Test that approximate edges of a column larger than the sample are within the rank error
+    of the exact quantiles, cover the whole column, and that a new bin count reuses the sample.
+    """
+    # Arrange
+    engine = QuantileEngine()
+    rank_error = 0.01
+    series = pd.Series(np.random.default_rng(4).exponential(size=4 * QuantileEngine.sample_size(rank_error)))
+    sorted_values = np.sort(series.to_numpy())
+
+    # Act
+    edges = engine.edges(series, 10, rank_error)
+    summary = engine.sorted_summary(series, rank_error)
+    finer_edges = engine.edges(series, 20, rank_error)
+
+    # Assert
+    ranks = np.searchsorted(sorted_values, edges) / len(series)
+    assert np.all(np.abs(ranks - np.linspace(0, 1, 11)) <= rank_error)
+    assert edges[0] == sorted_values[0] and edges[-1] == sorted_values[-1]
+    assert len(summary) < len(series)
+    assert engine.sorted_summary(series, rank_error) is summary
+    assert len(finer_edges) == 21
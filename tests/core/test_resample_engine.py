@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+import pandas as pd
+from core.data_handler import DataHandler
+from core.resample_engine import ResampleEngine
+
+def _build_ticks() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    seconds = np.sort(rng.integers(0, 6 * 3600, size=3000))
+    dataframe = pd.DataFrame({
+        "Time": pd.Timestamp("2024-05-02 09:30:11") + pd.to_timedelta(seconds, unit="s"),
+        "Price": 100 + rng.normal(size=3000).cumsum(),
+        "Side": rng.choice(["buy", "sell"], size=3000),
+    })
+    dataframe.loc[::13, "Price"] = np.nan
+    return dataframe
+
+def test_sorted_fast_path_matches_pandas_resample() -> None:
+    """
+    Test that every aggregate of the one pass path for sorted timestamps equals pandas
+    resample, including empty bins, missing values and text columns.
+    """
+    # Arrange
+    dataframe = _build_ticks()
+    aggregations = {"Price": list(ResampleEngine.AGGREGATIONS), "Side": ["first", "last", "count"]}
+
+    for frequency in ("1min", "7min", "h"):
+        # Act
+        result = ResampleEngine.resample(dataframe, "Time", frequency, aggregations)
+
+        # Assert
+        resampler = dataframe.set_index("Time").resample(frequency)
+        expected = resampler["Price"].ohlc().add_prefix("Price_")
+        for aggregation in ("sum", "mean", "first", "last", "count", "min", "max"):
+            expected[f"Price_{aggregation}"] = getattr(resampler["Price"], aggregation)()
+        for aggregation in ("first", "last", "count"):
+            expected[f"Side_{aggregation}"] = getattr(resampler["Side"], aggregation)()
+        assert result["Time"].tolist() == expected.index.tolist()
+        for column in expected.columns:
+            if column.startswith("Price"):
+                np.testing.assert_allclose(result[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float), rtol=1e-12)
+            else:
+                assert result[column].fillna("-").tolist() == expected[column].fillna("-").tolist()
+
+@pytest.mark.parametrize("seconds", [[0, 30, 70, 100], [0, 30, 200, 230]])
+@pytest.mark.parametrize("dtype", ["int64", "int32", "bool"])
+def test_sorted_fast_path_keeps_integer_dtypes(seconds: list[int], dtype: str) -> None:
+    """
+    Test that integer and boolean columns give the values and dtypes of pandas resample on
+    the sorted path, with and without empty bins, and that large integer sums stay exact.
+    """
+    # Arrange
+    values = np.array([2**53 + 1, 2, 3, 5]) if dtype == "int64" else np.array([1, 0, 1, 1])
+    dataframe = pd.DataFrame({
+        "Time": pd.Timestamp("2024-01-01 10:00:00") + pd.to_timedelta(seconds, unit="s"),
+        "Value": values.astype(dtype),
+    })
+    aggregations = ["sum", "min", "max", "first", "last", "ohlc"]
+
+    # Act
+    result = ResampleEngine.resample(dataframe, "Time", "1min", {"Value": aggregations})
+
+    # Assert
+    resampler = dataframe.set_index("Time").resample("1min")["Value"]
+    expected = resampler.ohlc().add_prefix("Value_")
+    for aggregation in aggregations[:-1]:
+        expected[f"Value_{aggregation}"] = getattr(resampler, aggregation)()
+    for column in expected.columns:
+        pd.testing.assert_series_equal(result[column], expected[column].reset_index(drop=True))
+
+def test_resample_operation_fills_gaps_and_previews_a_sample(empty_data_handler: DataHandler) -> None:
+    """
+    Test that the resample operation replaces the rows with bins in one history entry, that
+    forward filled empty bars repeat the previous close and that the preview only reads a sample.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({
+        "Time": pd.to_datetime(["2024-01-01 10:00:05", "2024-01-01 10:00:40", "2024-01-01 10:03:10", "2024-01-01 10:03:50"]),
+        "Price": [10.0, 12.0, 11.0, 9.0],
+    })
+
+    # Act
+    preview = empty_data_handler.preview_resample("Time", "1min", {"Price": ["ohlc"]}, sample_rows=2)
+    empty_data_handler.clean_data("resample", on="Time", frequency="1min", aggregations={"Price": ["ohlc", "count"]}, fill="ffill")
+
+    # Assert
+    dataframe = empty_data_handler.df
+    assert len(preview) == 1
+    assert dataframe.columns.tolist() == ["Time", "Price_open", "Price_high", "Price_low", "Price_close", "Price_count"]
+    assert dataframe["Price_open"].tolist() == [10.0, 12.0, 12.0, 11.0]
+    assert dataframe["Price_low"].tolist() == [10.0, 12.0, 12.0, 9.0]
+    assert dataframe["Price_count"].tolist() == [2, 0, 0, 2]
+    assert len(empty_data_handler.undo_stack) == 1
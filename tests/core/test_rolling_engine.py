@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from core.data_handler import DataHandler
+from core.rolling_engine import RollingEngine
+
+def _build_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(9)
+    dataframe = pd.DataFrame({
+        "Entity": rng.choice(["a", "b", "c", None], size=400),
+        "Value": rng.normal(size=400) * 10 + 1000,
+        "Time": pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 60, size=400), unit="D"),
+    })
+    dataframe.loc[::9, "Value"] = np.nan
+    return dataframe
+
+def test_grouped_and_time_windows_match_per_group_pandas_rolling() -> None:
+    """
+    Test that every statistic of a grouped row window and a grouped '7D' window equals
+    pandas rolling run on each group separately, with results in the original row order.
+    """
+    # Arrange
+    dataframe = _build_frame()
+    statistics = list(RollingEngine.STATISTICS)
+
+    # Act
+    row_windows = RollingEngine.compute(dataframe, "Value", 5, statistics, group_by=["Entity"], min_periods=2)
+    time_windows = RollingEngine.compute(dataframe, "Value", "7D", statistics, group_by=["Entity"], on="Time")
+
+    # Assert
+    for statistic in statistics:
+        expected_rows = np.full(len(dataframe), np.nan)
+        expected_times = np.full(len(dataframe), np.nan)
+        for _, group in dataframe.groupby("Entity", dropna=False):
+            expected_rows[group.index] = getattr(group["Value"].rolling(5, min_periods=2), statistic)().to_numpy()
+            by_time = group.sort_values("Time", kind="stable")
+            expected_times[by_time.index] = getattr(by_time.set_index("Time")["Value"].rolling("7D"), statistic)().to_numpy()
+        np.testing.assert_allclose(row_windows[statistic], expected_rows, rtol=1e-9)
+        np.testing.assert_allclose(time_windows[statistic], expected_times, rtol=1e-9)
+
+def test_rolling_operation_writes_one_column_per_statistic(empty_data_handler: DataHandler) -> None:
+    """
+    Test that the rolling operation adds a column per statistic in one history entry, that
+    a single statistic keeps the given column name, and that grouped shifts stay in their group.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Entity": ["a", "b", "a", "b", "a"], "Value": [1.0, 10.0, 3.0, 20.0, 5.0]})
+
+    # Act
+    empty_data_handler.clean_data("rolling_window", column="Value", window=2, operations=["mean", "max"], group_by=["Entity"], min_periods=1)
+    empty_data_handler.clean_data("rolling_window", column="Value", window=2, operation="sum", new_column="Pair Sum")
+    empty_data_handler.clean_data("shift_data", column="Value", periods=1, group_by=["Entity"])
+
+    # Assert
+    dataframe = empty_data_handler.df
+    assert dataframe["Value_rolling_2_mean"].tolist() == [1.0, 10.0, 2.0, 15.0, 4.0]
+    assert dataframe["Value_rolling_2_max"].tolist() == [1.0, 10.0, 3.0, 20.0, 5.0]
+    assert dataframe["Pair Sum"].tolist()[1:] == [11.0, 13.0, 23.0, 25.0]
+    assert dataframe["Value_shifted_1"].tolist()[2:] == [1.0, 10.0, 3.0]
+    assert len(empty_data_handler.undo_stack) == 3
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from core.data_handler import DataHandler
+from core.sample_engine import SampleEngine
+
+def test_stratified_sample_is_reproducible_and_keeps_rare_groups() -> None:
+    """
+    Test that a stratified sample draws the rounded up share of every group, keeps a group
+    smaller than the quota, and returns the same sorted rows for the same seed.
+    """
+    # Arrange
+    dataframe = pd.DataFrame({"Group": ["a"] * 900 + ["b"] * 95 + ["rare"] * 5, "Value": np.arange(1000)})
+
+    # Act
+    positions = SampleEngine.sample_positions(dataframe, 0.1, stratify_by=["Group"], seed=3)
+    repeated = SampleEngine.sample_positions(dataframe, 0.1, stratify_by=["Group"], seed=3)
+    random_positions = SampleEngine.sample_positions(dataframe, 0.1, seed=3)
+
+    # Assert
+    assert positions.tolist() == repeated.tolist()
+    assert np.all(np.diff(positions) > 0)
+    assert dataframe["Group"].iloc[positions].value_counts().to_dict() == {"a": 90, "b": 10, "rare": 1}
+    assert len(np.unique(random_positions)) == 100
+
+def test_sample_operations_replay_on_full_data_as_one_history_entry(empty_data_handler: DataHandler) -> None:
+    """
+    Test that operations made in sample mode are replayed on the full data (row removals by
+    row id included), that cell edits are skipped, and that one undo returns to the full data.
+    """
+    # Arrange
+    dataframe = pd.DataFrame({"Value": np.arange(1000, dtype=float), "Group": ["a", "b"] * 500})
+    empty_data_handler.df = dataframe
+    empty_data_handler.original_df = dataframe.copy()
+    empty_data_handler.enable_sample_mode(0.05, seed=1)
+
+    # Act
+    empty_data_handler.filter_data("Group", "==", "a")
+    removed_id = empty_data_handler.df.index[0]
+    empty_data_handler.remove_rows([0])
+    empty_data_handler.update_cell(0, 0, -1.0)
+    sample_rows = len(empty_data_handler.df)
+    replay = empty_data_handler.apply_sample_to_full()
+
+    # Assert
+    result = empty_data_handler.df
+    assert sample_rows < 50
+    assert not empty_data_handler.is_sample_mode
+    assert len(result) == 499 and (result["Group"] == "a").all()
+    assert [op["type"] for op in replay.skipped_operations] == ["update_cell"]
+    assert removed_id not in result.index
+    assert result["Value"].min() >= 0
+    assert empty_data_handler.operation_log[-1]["type"] == "pipeline_macro"
+    assert empty_data_handler.undo()
+    assert len(empty_data_handler.df) == 1000
+
+def test_outlier_steps_are_detected_again_on_the_full_data(empty_data_handler: DataHandler) -> None:
+    """
+    Test that outliers removed or flagged on a sample are logged by their detection settings
+    and detected again on the full data when the sample is applied, while a step logged with
+    a row mask of the sample is skipped instead of failing the replay.
+    """
+    # Arrange
+    values = np.random.default_rng(4).normal(0.0, 1.0, 2000)
+    values[[10, 500, 1500]] = [40.0, -35.0, 50.0]
+    dataframe = pd.DataFrame({"Value": values})
+    empty_data_handler.df = dataframe
+    empty_data_handler.original_df = dataframe.copy()
+    empty_data_handler.enable_sample_mode(0.1, seed=2)
+
+    # Act
+    sample_mask = empty_data_handler.detect_outliers("z_score", ["Value"], threshold=3.0)
+    empty_data_handler.flag_outliers("is_outlier", "z_score", ["Value"], mask=sample_mask, threshold=3.0)
+    empty_data_handler.clean_data("remove_rows", mask=np.zeros(len(empty_data_handler.df), dtype=bool))
+    empty_data_handler.remove_outliers("iqr", ["Value"], multiplier=1.5)
+    logged = empty_data_handler.operation_log.copy()
+    replay = empty_data_handler.apply_sample_to_full()
+
+    # Assert
+    mutator = empty_data_handler._mutator
+    expected = dataframe.assign(is_outlier=mutator.detect_outliers(dataframe, "z_score", ["Value"], threshold=3.0))
+    expected = expected[~mutator.detect_outliers(expected, "iqr", ["Value"], multiplier=1.5)]
+    assert logged[0] == {"type": "flag_outliers", "new_column_name": "is_outlier", "outliers": {"method": "z_score", "columns": ["Value"], "threshold": 3.0}}
+    assert [op["type"] for op in replay.skipped_operations] == ["remove_rows"]
+    assert "mask" in replay.skipped_operations[0]
+    assert len(sample_mask) == 200
+    pd.testing.assert_frame_equal(empty_data_handler.df, expected)
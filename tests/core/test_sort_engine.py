@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+import pandas as pd
+from core.data_handler import DataHandler
+from core.sort_engine import SortEngine
+
+def _build_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    dataframe = pd.DataFrame({
+        "Score": rng.integers(0, 5, size=300).astype(float),
+        "Name": rng.choice(["b", "a", "c", None], size=300),
+        "Count": rng.integers(-3, 3, size=300),
+        "When": pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 4, size=300), unit="D"),
+    })
+    dataframe.loc[::13, "Score"] = np.nan
+    dataframe.loc[::17, "When"] = pd.NaT
+    return dataframe
+
+def test_argsort_matches_stable_sort_values_with_missing_values_last() -> None:
+    """
+    Test that single and multi-key permutations give the same rows as a stable
+    DataFrame.sort_values, for float, string, integer and datetime keys in both directions.
+    """
+    # Arrange
+    dataframe = _build_frame()
+    key_sets: list[list[tuple[str, bool]]] = [
+        [("Score", False)],
+        [("Name", True)],
+        [("When", False)],
+        [("Name", False), ("Score", True)],
+        [("Count", False), ("When", True), ("Score", False)],
+    ]
+
+    for keys in key_sets:
+        # Act
+        permutation = SortEngine.argsort(dataframe, keys)
+        expected = dataframe.sort_values(
+            by=[column for column, _ in keys],
+            ascending=[ascending for _, ascending in keys],
+            kind="stable",
+            na_position="last",
+        )
+
+        # Assert
+        assert permutation.dtype == np.int32
+        assert dataframe.index[permutation].tolist() == expected.index.tolist()
+
+@pytest.mark.parametrize("fused", [True, False])
+def test_view_sort_is_cached_and_committed_as_one_history_entry(empty_data_handler: DataHandler, fused: bool) -> None:
+    """
+    Test that a view permutation leaves the data alone and is reused until the data changes,
+    and that committing it reorders the data with one history entry that a macro, fused or
+    step by step, can replay together with a paste into the sorted view.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Group": ["b", "a", "b", "a"], "Value": [1, 2, 3, 4]})
+    keys = [("Group", True), ("Value", False)]
+
+    # Act
+    first_permutation = empty_data_handler.view_sort_permutation(keys)
+    second_permutation = empty_data_handler.view_sort_permutation(keys)
+    empty_data_handler.paste_block(0, 1, [[40], [50]], row_order=first_permutation)
+    edited_permutation = empty_data_handler.view_sort_permutation(keys)
+    empty_data_handler.commit_view_sort(keys, edited_permutation)
+    macro = list(empty_data_handler.operation_log)
+    committed_values = empty_data_handler.df["Value"].tolist()
+    empty_data_handler.undo()
+    empty_data_handler.undo()
+    empty_data_handler.apply_pipeline_macro(macro, fused=fused)
+
+    # Assert
+    assert first_permutation.tolist() == [3, 1, 2, 0]
+    assert second_permutation is first_permutation
+    assert edited_permutation is not first_permutation
+    assert macro[0]["rows"] == [3, 1]
+    assert macro[1] == {"type": "sort", "column": "Group", "ascending": True, "keys": [["Group", True], ["Value", False]]}
+    assert committed_values == [50, 40, 3, 1]
+    assert empty_data_handler.sort_state == ("Group", True)
+    assert empty_data_handler.df["Value"].tolist() == committed_values
+
+def test_multi_key_sort_replays_stepwise(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a committed multi-key view sort replays with all of its keys when the
+    macro is applied step by step, and is logged again with its keys.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Group": ["b", "a", "b", "a"], "Value": [1, 2, 3, 4]})
+    empty_data_handler.commit_view_sort([("Group", True), ("Value", False)])
+    macro = list(empty_data_handler.operation_log)
+    committed_df = empty_data_handler.df.copy()
+    empty_data_handler.undo()
+
+    # Act
+    empty_data_handler.apply_pipeline_macro(macro, fused=False)
+
+    # Assert
+    pd.testing.assert_frame_equal(empty_data_handler.df, committed_df)
+    assert empty_data_handler.operation_log == macro
+    assert empty_data_handler.sort_state == ("Group", True)
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+from core.data_handler import DataHandler
+from core.sql_engine import SQLEngine
+
+pytest.importorskip("duckdb")
+
+def _build_frame() -> pd.DataFrame:
+    return pd.DataFrame({"Region": ["north", "south", "north", "east", "south"], "Sales": [10.0, 20.0, 30.0, 40.0, 50.0]})
+
+def test_queries_join_the_data_with_extra_views_and_stream_a_limit(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a query sees the current data with its virtual columns as 'data', joins an
+    extra view, stops after limit rows, and reuses the registered Arrow table per data version.
+    """
+    # Arrange
+    empty_data_handler.df = _build_frame()
+    empty_data_handler.create_computed_column("Doubled", "Sales * 2", virtual=True)
+    targets = pd.DataFrame({"Region": ["north", "south"], "Target": [35.0, 80.0]})
+    sql = (
+        "SELECT d.Region, sum(d.Doubled) AS Doubled, any_value(t.Target) AS Target "
+        "FROM data d JOIN agg_targets t USING (Region) GROUP BY d.Region ORDER BY d.Region"
+    )
+
+    # Act
+    result = empty_data_handler.run_sql(sql, tables={"agg_targets": targets})
+    registered = empty_data_handler.sql_engine._views[SQLEngine.DATA_VIEW][2]
+    limited = empty_data_handler.run_sql("SELECT * FROM data", limit=2)
+
+    # Assert
+    assert result.to_dict("list") == {"Region": ["north", "south"], "Doubled": [80.0, 140.0], "Target": [35.0, 80.0]}
+    assert len(limited) == 2
+    assert empty_data_handler.sql_engine._views[SQLEngine.DATA_VIEW][2] is registered
+    assert SQLEngine.view_name("Sales 2024!", "subset") == "subset_sales_2024"
+    with pytest.raises(ValueError):
+        empty_data_handler.run_sql("SELECT missing_column FROM data")
+
+def test_loaded_query_result_is_logged_and_replayed_by_both_macro_engines(empty_data_handler: DataHandler) -> None:
+    """
+    Test that loading a query result replaces the data as one undoable history entry, and
+    that the logged query replays to the same frame through the pandas and DuckDB engines,
+    while a query reading another view, which could not be replayed, is refused.
+    """
+    # Arrange
+    empty_data_handler.df = _build_frame()
+    sql = "SELECT Region, sum(Sales) AS Total FROM data GROUP BY Region ORDER BY Total DESC"
+
+    # Act
+    empty_data_handler.filter_data("Sales", ">", 10)
+    empty_data_handler.apply_sql_query(sql)
+    operations = empty_data_handler.operation_log.copy()
+    replays = {}
+    for engine in ("pandas", "duckdb"):
+        handler = DataHandler()
+        handler.df = _build_frame()
+        handler.apply_pipeline_macro(operations, engine=engine)
+        replays[engine] = handler.df
+
+    # Assert
+    assert empty_data_handler.df.to_dict("list") == {"Region": ["south", "east", "north"], "Total": [70.0, 40.0, 30.0]}
+    assert operations[-1] == {"type": "sql_query", "sql": sql}
+    for replay in replays.values():
+        assert replay.to_dict("list") == empty_data_handler.df.to_dict("list")
+    assert empty_data_handler.undo()
+    assert len(empty_data_handler.df) == 4
+    with pytest.raises(ValueError):
+        empty_data_handler.apply_sql_query("SELECT * FROM data JOIN subset_a USING (Region)", {"subset_a": _build_frame()})
+    assert empty_data_handler.operation_log == operations[:-1]
+
+def test_query_results_are_committed_only_onto_the_data_they_were_run_on(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a result computed with run_sql (as the console worker does) is committed as one
+    history entry, and that a result of data that changed in the meantime is refused.
+    """
+    # Arrange
+    empty_data_handler.df = _build_frame()
+    sql = "SELECT Region FROM data"
+    version = empty_data_handler.data_version
+    result = empty_data_handler.run_sql(sql)
+
+    # Act
+    empty_data_handler.commit_sql_query(sql, result, data_version=version)
+    stale_version = empty_data_handler.data_version
+    stale_result = empty_data_handler.run_sql(sql)
+    empty_data_handler.filter_data("Region", "==", "north")
+
+    # Assert
+    assert list(empty_data_handler.df.columns) == ["Region"]
+    assert empty_data_handler.operation_log[-2] == {"type": "sql_query", "sql": sql}
+    with pytest.raises(ValueError):
+        empty_data_handler.commit_sql_query(sql, stale_result, data_version=stale_version)
+    assert empty_data_handler.operation_log[-1]["type"] == "filter"
@@ -0,0 +1,89 @@
+import pytest
+import pandas as pd
+import pyarrow as pa
+from core.data_handler import DataHandler
+from core.string_kernels import StringKernels
+
+def test_text_operations_match_pandas_and_keep_arrow_storage() -> None:
+    """
+    Test that the Arrow kernels give the same values as the pandas .str methods, keep
+    missing values and return Arrow backed columns for Arrow backed input.
+    """
+    # Arrange
+    object_series = pd.Series([" hELLO woRLD ", "they're", None, "x"], dtype=object)
+    arrow_series = object_series.astype(pd.ArrowDtype(pa.string()))
+
+    for operation in ("lower", "upper", "title", "capitalize", "strip", "lstrip", "rstrip"):
+        # Act
+        object_result = StringKernels.transform(object_series, operation)
+        arrow_result = StringKernels.transform(arrow_series, operation)
+
+        # Assert
+        pd.testing.assert_series_equal(object_result, getattr(object_series.str, operation)())
+        assert isinstance(arrow_result.dtype, pd.ArrowDtype)
+        assert arrow_result.tolist()[:2] == object_result.tolist()[:2]
+        assert arrow_result.isna().tolist() == [False, False, True, False]
+
+def test_split_and_regex_replace_run_on_arrow_columns(empty_data_handler: DataHandler) -> None:
+    """
+    Test that split and regex replace on an Arrow backed column produce Arrow columns with
+    missing parts as missing values, and that RE2-incompatible patterns fall back to pandas.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({
+        "Code": pd.Series(["ab-12", "cd-3-x", None, "ef"], dtype=pd.ArrowDtype(pa.string())),
+    })
+
+    # Act
+    empty_data_handler.clean_data("split_column", column="Code", delimiter="-", new_columns=["Letters", "Digits"])
+    empty_data_handler.clean_data("regex_replace", column="Code", pattern=r"(\w)(\d)", replacement=r"\2\1")
+    empty_data_handler.clean_data("regex_replace", column="Letters", pattern=r"(?<=a)b", replacement="B")
+
+    # Assert
+    dataframe = empty_data_handler.df
+    assert dataframe["Letters"].tolist()[:2] == ["aB", "cd"]
+    assert dataframe["Digits"].tolist()[:2] == ["12", "3"]
+    assert dataframe["Digits"].isna().tolist() == [False, False, True, True]
+    assert isinstance(dataframe["Digits"].dtype, pd.ArrowDtype)
+    assert dataframe["Code"].tolist()[:2] == ["ab-21", "cd-3-x"]
+    assert isinstance(dataframe["Code"].dtype, pd.ArrowDtype)
+    assert StringKernels.regex_replace(dataframe["Code"], r"(?<=a)1", "") is None
+
+@pytest.mark.parametrize("dtype", [object, pd.ArrowDtype(pa.string())])
+def test_non_ascii_text_matches_pandas(empty_data_handler: DataHandler, dtype) -> None:
+    """
+    Test that case changes, trims and regex replacements of non-ASCII text give the
+    results of the pandas .str methods on Python strings, for object and Arrow columns.
+    """
+    # Arrange
+    values = ["café au lait", "naïve", "straße", "ﬁne", None, "\x1cplain\x1f"]
+    expected_series = pd.Series(values, dtype=object)
+    operations = [
+        ("upper", lambda series: series.str.upper()),
+        ("title", lambda series: series.str.title()),
+        ("strip", lambda series: series.str.strip()),
+    ]
+
+    for operation, expected in operations:
+        empty_data_handler.df = pd.DataFrame({"Text": pd.Series(values, dtype=dtype)})
+
+        # Act
+        empty_data_handler.clean_data("text_manipulation", column="Text", operation=operation)
+
+        # Assert
+        assert empty_data_handler.df["Text"].dtype == dtype
+        assert empty_data_handler.df["Text"].tolist()[:4] == expected(expected_series).tolist()[:4]
+        assert empty_data_handler.df["Text"].tolist()[5] == expected(expected_series).tolist()[5]
+        assert empty_data_handler.df["Text"].isna().tolist() == [False, False, False, False, True, False]
+
+    for pattern in (r"\w+", r"\bna", r"\s+$"):
+        empty_data_handler.df = pd.DataFrame({"Text": pd.Series(values, dtype=dtype)})
+
+        # Act
+        empty_data_handler.clean_data("regex_replace", column="Text", pattern=pattern, replacement="X")
+
+        # Assert
+        expected = expected_series.str.replace(pattern, "X", regex=True)
+        assert empty_data_handler.df["Text"].dtype == dtype
+        assert empty_data_handler.df["Text"].tolist()[:4] == expected.tolist()[:4]
+        assert empty_data_handler.df["Text"].isna().tolist() == expected.isna().tolist()
@@ -0,0 +1,148 @@
+import pytest
+import numpy as np
+import pandas as pd
+from core.data_handler import DataHandler
+
+def test_virtual_column_stores_only_the_expression(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a virtual column adds no data, evaluates on demand (including row ranges and
+    references to other virtual columns) and follows undo.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Price": [1.0, 2.0, 3.0, np.nan], "Qty": [1, 2, 3, 4]})
+
+    # Act
+    empty_data_handler.create_computed_column("Total", "Price * Qty", virtual=True)
+    empty_data_handler.create_computed_column("Large", "Total > 3", virtual=True)
+
+    # Assert
+    assert list(empty_data_handler.df.columns) == ["Price", "Qty"]
+    assert empty_data_handler.virtual_columns == {"Total": "Price * Qty", "Large": "Total > 3"}
+    assert empty_data_handler.operation_log[-1]["virtual"] is True
+    assert empty_data_handler.evaluate_virtual_column("Total", 1, 3).tolist() == [4.0, 9.0]
+    assert empty_data_handler.evaluate_virtual_column("Large").tolist() == [False, True, True, False]
+
+    assert empty_data_handler.undo()
+    assert empty_data_handler.virtual_columns == {"Total": "Price * Qty"}
+
+def test_virtual_columns_are_cached_per_data_version(empty_data_handler: DataHandler) -> None:
+    """
+    Test that full column results are reused until the data changes.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Value": [1, 2, 3]})
+    empty_data_handler.create_computed_column("Double", "Value * 2", virtual=True)
+
+    # Act
+    first_result = empty_data_handler.evaluate_virtual_column("Double")
+    second_result = empty_data_handler.evaluate_virtual_column("Double")
+    empty_data_handler.update_cell(0, 0, 10)
+    edited_result = empty_data_handler.evaluate_virtual_column("Double")
+
+    # Assert
+    assert second_result is first_result
+    assert edited_result.tolist() == [20, 4, 6]
+
+def test_materialize_and_drop_virtual_columns(empty_data_handler: DataHandler) -> None:
+    """
+    Test that consumers can materialize virtual columns on derived frames, that real computed
+    columns may reference them and that invalid expressions are rejected.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"Price": [1.0, 2.0, 3.0], "Qty": [3, 2, 1]})
+    empty_data_handler.create_computed_column("Total", "Price * Qty", virtual=True)
+    subset_df = empty_data_handler.df[empty_data_handler.df["Qty"] > 1]
+    subset_df.attrs = {}
+
+    # Act
+    materialized_df = empty_data_handler.materialize_virtual_columns(subset_df, ["Total"])
+    empty_data_handler.create_computed_column("Half", "Total / 2")
+    empty_data_handler.clean_data("drop_column", column="Total")
+
+    # Assert
+    assert materialized_df["Total"].tolist() == [3.0, 4.0]
+    assert empty_data_handler.df["Half"].tolist() == [1.5, 2.0, 1.5]
+    assert empty_data_handler.virtual_columns == {}
+    with pytest.raises(Exception) as expected_error:
+        empty_data_handler.create_computed_column("Broken", "Missing + 1", virtual=True)
+    assert "Missing" in str(expected_error.value)
+
+def test_renaming_a_column_rewrites_the_virtual_columns_reading_it(empty_data_handler: DataHandler) -> None:
+    """
+    Test that renaming a column used by virtual columns rewrites their expressions, also to a
+    name that needs backticks, so they still evaluate and export.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"a": [2.0, 4.0], "b": [1.0, 2.0]})
+    empty_data_handler.create_computed_column("r", "a / b", virtual=True)
+    empty_data_handler.create_computed_column("s", "r + a", virtual=True)
+
+    # Act
+    empty_data_handler.clean_data("rename_column", old_name="a", new_name="unit price")
+
+    # Assert
+    assert empty_data_handler.virtual_columns == {"r": "`unit price` / b", "s": "r + `unit price`"}
+    assert empty_data_handler.evaluate_virtual_column("s").tolist() == [4.0, 6.0]
+    assert list(empty_data_handler.materialize_virtual_columns().columns) == ["unit price", "b", "r", "s"]
+    with pytest.raises(Exception):
+        empty_data_handler.clean_data("rename_column", old_name="b", new_name="r")
+
+def test_dropping_a_column_used_by_a_virtual_column_is_refused(empty_data_handler: DataHandler) -> None:
+    """
+    Test that dropping a column (or virtual column) that another virtual column reads is
+    refused and leaves the data unchanged, while dropping it together with its dependents works.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame({"a": [2.0, 4.0], "b": [1.0, 2.0]})
+    empty_data_handler.create_computed_column("r", "a / b", virtual=True)
+    empty_data_handler.create_computed_column("s", "r * 2", virtual=True)
+
+    # Act
+    errors = []
+    for columns in (["b"], ["r"], ["b", "r"]):
+        try:
+            empty_data_handler.clean_data("drop_column", columns=columns)
+        except Exception as error:
+            errors.append(str(error))
+    empty_data_handler.clean_data("drop_column", columns=["b", "r", "s"])
+
+    # Assert
+    assert len(errors) == 3
+    assert "'s'" in errors[2]
+    assert list(empty_data_handler.df.columns) == ["a"]
+    assert empty_data_handler.virtual_columns == {}
+
+@pytest.mark.parametrize("operation", ["aggregate", "melt", "pivot", "merge", "resample", "sql_query"])
+def test_shape_changing_operations_clear_the_virtual_columns(empty_data_handler: DataHandler, operation: str) -> None:
+    """
+    Test that operations replacing the columns drop the virtual column definitions, which
+    pandas would otherwise carry onto the result, so the result still exports.
+    """
+    # Arrange
+    empty_data_handler.df = pd.DataFrame(
+        {
+            "Time": pd.date_range("2024-01-01", periods=4, freq="h"),
+            "Key": ["x", "y", "x", "y"],
+            "a": [1.0, 2.0, 3.0, 4.0],
+            "b": [1.0, 1.0, 2.0, 2.0],
+        }
+    )
+    empty_data_handler.create_computed_column("r", "a / b", virtual=True)
+
+    # Act
+    if operation == "aggregate":
+        empty_data_handler.aggregate_data(["Key"], {"a": "sum"}, {})
+    elif operation == "melt":
+        empty_data_handler.melt_data(["Key"], ["a"], "variable", "value")
+    elif operation == "pivot":
+        empty_data_handler.pivot_data(["Time"], "Key", ["a"], "sum")
+    elif operation == "merge":
+        empty_data_handler.merge_data(pd.DataFrame({"Key": ["x"], "Label": ["ex"]}), "inner", ["Key"], ["Key"])
+    elif operation == "resample":
+        empty_data_handler.clean_data("resample", on="Time", frequency="2h", aggregations={"a": ["sum"]})
+    else:
+        empty_data_handler.apply_sql_query("SELECT Key, a FROM data")
+
+    # Assert
+    assert empty_data_handler.virtual_columns == {}
+    assert "r" not in empty_data_handler.materialize_virtual_columns().columns
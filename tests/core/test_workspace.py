@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from core.data_handler import DataHandler
+from core.workspace import Workspace
+
+pa = pytest.importorskip("pyarrow")
+
+def _build_prices(rows: int = 1_000) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame(
+        {
+            "Symbol": rng.choice(["a", "b", "c"], rows),
+            "Price": rng.random(rows),
+            "Volume": rng.integers(0, 100, rows),
+        }
+    ).convert_dtypes(dtype_backend="pyarrow")
+
+def test_datasets_keep_their_own_data_history_and_source_when_switching(empty_data_handler: DataHandler, tmp_path: Path) -> None:
+    """
+    Test that opening a second file keeps the first dataset with its undo history, that
+    switching back restores both, and that closing the active dataset activates the other one.
+    """
+    # Arrange
+    prices_path = tmp_path / "prices.csv"
+    _build_prices(50).to_csv(prices_path, index=False)
+    targets_path = tmp_path / "targets.csv"
+    pd.DataFrame({"Symbol": ["a", "b"], "Target": [1.0, 2.0]}).to_csv(targets_path, index=False)
+    empty_data_handler.import_file(str(prices_path))
+    empty_data_handler.sort_data("Price", ascending=False)
+    sorted_prices = empty_data_handler.df
+
+    # Act
+    empty_data_handler.open_dataset(str(targets_path))
+    opened_names = empty_data_handler.dataset_names()
+    targets_can_undo = empty_data_handler.can_undo()
+    empty_data_handler.switch_dataset("prices")
+
+    # Assert
+    assert opened_names == ["prices", "targets"]
+    assert not targets_can_undo
+    assert empty_data_handler.active_dataset == "prices"
+    assert empty_data_handler.df is sorted_prices
+    assert empty_data_handler.file_path == prices_path
+    assert list(empty_data_handler.dataset_frame("targets").columns) == ["Symbol", "Target"]
+    assert empty_data_handler.undo()
+    assert empty_data_handler.close_dataset("prices") == "targets"
+    assert empty_data_handler.file_path == targets_path
+    with pytest.raises(KeyError):
+        empty_data_handler.switch_dataset("prices")
+
+def test_derived_datasets_reference_the_arrow_buffers_of_their_parent(empty_data_handler: DataHandler) -> None:
+    """
+    Test that a duplicate and a column selection of an Arrow backed dataset share its buffers,
+    that the memory report counts them as shared, and that editing a cell of the copy leaves
+    the parent unchanged.
+    """
+    # Arrange
+    prices = _build_prices()
+    empty_data_handler.df = prices
+    parent_name = empty_data_handler.active_dataset
+
+    # Act
+    copy_name = empty_data_handler.duplicate_dataset(parent_name)
+    columns_name = empty_data_handler.duplicate_dataset(parent_name, "Symbols", columns=["Symbol"])
+    totals = pd.DataFrame({"Total": np.arange(10.0)})
+    totals_name = empty_data_handler.add_dataset("Totals", totals, parent=parent_name)
+    memory = empty_data_handler.dataset_memory()
+    empty_data_handler.switch_dataset(copy_name)
+    empty_data_handler.update_cell(0, 1, 99.0)
+
+    # Assert
+    parent_chunk = prices["Symbol"].array._pa_array.chunk(0)
+    selected_chunk = empty_data_handler.dataset_frame(columns_name)["Symbol"].array._pa_array.chunk(0)
+    assert selected_chunk.buffers()[2].address == parent_chunk.buffers()[2].address
+    assert memory[copy_name].shared_bytes == memory[parent_name].shared_bytes > 0
+    assert memory[copy_name].own_bytes == memory[copy_name].total_bytes - memory[copy_name].shared_bytes
+    assert memory[totals_name].shared_bytes == 0
+    assert memory[totals_name].total_bytes >= totals["Total"].nbytes
+    assert empty_data_handler.dataset_info(columns_name).parent == parent_name
+    assert empty_data_handler.df.iloc[0, 1] == 99.0
+    assert prices.iloc[0, 1] != 99.0
+    assert Workspace().unique_name("Symbols") == "Symbols"
@@ -82,7 +82,7 @@ class DataOperationsPanel(QWidget):
     def get_sort_parameters(self) -> tuple[str, str]:
         return self.transform_tab.get_sort_parameters()
     
-    def get_date_extraction_parameters(self) -> tuple[str, str]:
+    def get_date_extraction_parameters(self) -> tuple[str, list[str]]:
         return self.datetime_tab.get_date_extraction_parameters()
     
     def get_date_diff_parameters(self) -> tuple[str, str, str]:
@@ -2,7 +2,8 @@ from PyQt6.QtWidgets import QVBoxLayout, QLabel
 from typing import Optional, TYPE_CHECKING
 
 from ui.components.data_tabs.base_data_tab import BaseDataTab
-from ui.widgets import DataPlotStudioGroupBox, DataPlotStudioComboBox
+from core.datetime_engine import DatetimeEngine
+from ui.widgets import DataPlotStudioGroupBox, DataPlotStudioComboBox, DataPlotStudioListWidget
 from ui.icons import IconType
 
 if TYPE_CHECKING:
@@ -28,14 +29,17 @@ class DatetimeTab(BaseDataTab):
         self.dt_source_combo = DataPlotStudioComboBox()
         extract_layout.addWidget(self.dt_source_combo)
         
-        extract_layout.addWidget(QLabel("Date Component to Extract:"))
-        self.dt_component_combo = DataPlotStudioComboBox()
-        self.dt_component_combo.addItems(["Year", "Month", "Month Name", "Day", "Day of Week", "Quarter", "Hour"])
-        extract_layout.addWidget(self.dt_component_combo)
+        extract_layout.addWidget(QLabel("Date Components to Extract:"))
+        self.dt_component_list = DataPlotStudioListWidget()
+        self.dt_component_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
+        self.dt_component_list.addItems(list(DatetimeEngine.COMPONENTS))
+        self.dt_component_list.setMaximumHeight(120)
+        self.dt_component_list.item(0).setSelected(True)
+        extract_layout.addWidget(self.dt_component_list)
         
         extract_layout.addLayout(self._create_operation_row(
-            title="Extract Component",
-            tooltip="Create a new column containing the selected time component",
+            title="Extract Components",
+            tooltip="Create one new column for each selected time component, the source column is parsed once",
             callback=self.controller.extract_date_component,
             help_id="extract_date",
             icon_type=IconType.DataTransform
@@ -73,8 +77,14 @@ class DatetimeTab(BaseDataTab):
         layout.addWidget(duration_group)
         layout.addStretch()
         
-    def get_date_extraction_parameters(self) -> tuple[str, str]:
-        return (self.dt_source_combo.currentText(), self.dt_component_combo.currentText())
+    def get_date_extraction_parameters(self) -> tuple[str, list[str]]:
+        # Keep the listed order, not the click order
+        components = [
+            self.dt_component_list.item(row).text()
+            for row in range(self.dt_component_list.count())
+            if self.dt_component_list.item(row).isSelected()
+        ]
+        return (self.dt_source_combo.currentText(), components)
     
     def get_date_diff_parameters(self) -> tuple[str, str, str]:
         return (
@@ -99,6 +99,14 @@ class TransformTab(BaseDataTab):
             help_id="percentage_change",
             icon_type=IconType.DataTransform
         ))
+
+        sequential_layout.addLayout(self._create_operation_row(
+            title="Resample Time Series",
+            tooltip="Reduce rows to regular time bins with sum, mean, OHLC, first, last or count",
+            callback=self.controller.open_resample_dialog,
+            help_id="resample_data",
+            icon_type=IconType.DataTransform
+        ))
         sequential_group.setLayout(sequential_layout)
         layout.addWidget(sequential_group)
 
@@ -147,6 +155,15 @@ class TransformTab(BaseDataTab):
         saved_agg_buttons.addWidget(self.refresh_agg_list_btn)
         saved_agg_layout.addLayout(saved_agg_buttons)
 
+        self.update_aggs_btn = DataPlotStudioButton("Update From Current Data", parent=self)
+        self.update_aggs_btn.setIcon(IconBuilder.build(IconType.RefreshItem))
+        self.update_aggs_btn.setToolTip(
+            "Reapply every saved aggregation to the current data.\n"
+            "After appends or row filters only the changed rows are aggregated for sum, count, mean, size, min and max"
+        )
+        self.update_aggs_btn.clicked.connect(self.controller.update_saved_aggregations)
+        saved_agg_layout.addWidget(self.update_aggs_btn)
+
         self.delete_agg_btn = DataPlotStudioButton("Delete Selected Aggregation", parent=self)
         self.delete_agg_btn.setIcon(IconBuilder.build(IconType.DeleteItem))
         self.delete_agg_btn.setEnabled(False)
@@ -1,20 +1,29 @@
 import traceback
 import pandas as pd
 from pathlib import Path
+from typing import Hashable, Optional
+from core.correlation_engine import CorrelationEngine
 from core.resource_loader import get_resource_path
 
 class StatisticsGenerator:
     """
     Generates HTML statistics reports for DataFrames for the statistics tab
     """
+    # Wider selections show the strongest pairs instead of the full matrix
+    MAX_MATRIX_COLUMNS: int = 25
+    TOP_PAIR_COUNT: int = 20
     
-    def generate_html(self, df: pd.DataFrame, info: dict) -> str:
+    def __init__(self, correlation_engine: Optional[CorrelationEngine] = None) -> None:
+        self.correlation_engine = correlation_engine or CorrelationEngine()
+    
+    def generate_html(self, df: pd.DataFrame, info: dict, data_version: Optional[Hashable] = None) -> str:
         """
         Generates a complete HTML report based on the given dataframe and information
         
         Args:
             df (pd.DataFrame): The dataframe to analyze
             info (dict): Metadata and statistics about the dataframe
+            data_version (Optional[Hashable]): Version of df, lets the correlation engine reuse cached results
             
         Returns:
             str: The formatted HTML string
@@ -38,7 +47,7 @@ class StatisticsGenerator:
         body_html += self._generate_numeric_statistics(df)
         
         # Correlation matrix
-        body_html += self._generate_correlation_matrix(df)
+        body_html += self._generate_correlation_matrix(df, data_version)
         
         # Categorical statistics
         body_html += self._generate_categorical_statistics(df)
@@ -82,7 +91,7 @@ class StatisticsGenerator:
         
         # Memory usage information Card
         try:
-            total_memory_bytes = df.memory_usage(deep=True).sum()
+            total_memory_bytes = sum(info.get("memory_usage", {}).values())
             total_memory = total_memory_bytes / 1024
             if total_memory > 1024:
                 memory_str = f"{total_memory / 1024:.2f} MB"
@@ -202,16 +211,19 @@ class StatisticsGenerator:
         
         return html
     
-    def _generate_correlation_matrix(self, df: pd.DataFrame) -> str:
+    def _generate_correlation_matrix(self, df: pd.DataFrame, data_version: Optional[Hashable] = None) -> str:
         """Generates the correlation matrix table"""
         html = ""
         try:
-            numeric_df = df.select_dtypes(include=["int64", "int32", "float64", "float32"])
+            numeric_columns = df.select_dtypes(include=["int64", "int32", "float64", "float32"]).columns.tolist()
+
+            if len(numeric_columns) > self.MAX_MATRIX_COLUMNS:
+                return self._generate_top_correlations(df, numeric_columns, data_version)
 
-            if len(numeric_df.columns) > 1:
+            if len(numeric_columns) > 1:
                 html += "<h2>Correlation Matrix</h2>"
                 html += "<div class='table-container'>"
-                corr = numeric_df.corr()
+                corr = self.correlation_engine.matrix(df, numeric_columns, version=data_version)
 
                 html += "<table>"
                 html += "<tr><th></th>"
@@ -248,6 +260,27 @@ class StatisticsGenerator:
             
         return html
     
+    def _generate_top_correlations(self, df: pd.DataFrame, numeric_columns: list, data_version: Optional[Hashable] = None) -> str:
+        """Generates a table of the most strongly correlated column pairs for wide datasets"""
+        html = ""
+        top_pairs = self.correlation_engine.top_pairs(df, self.TOP_PAIR_COUNT, numeric_columns, version=data_version)
+        
+        html += "<h2>Strongest Correlations</h2>"
+        html += f"<p>Top {len(top_pairs)} of {len(numeric_columns) * (len(numeric_columns) - 1) // 2} column pairs by absolute Pearson correlation.</p>"
+        html += "<div class='table-container'>"
+        html += "<table>"
+        html += "<tr><th>Column</th><th>Column</th><th class='numeric-col'>Correlation</th></tr>"
+        for column_a, column_b, value in top_pairs.itertuples(index=False):
+            cell_style = ""
+            if abs(value) >= 0.8:
+                cell_style = "background-color: #bbf7d0; border-radius: 4px;"
+            elif abs(value) >= 0.5:
+                cell_style = "background-color: #fef08a; border-radius: 4px;"
+            html += f"<tr><td><strong>{column_a}</strong></td><td><strong>{column_b}</strong></td>"
+            html += f"<td class='numeric-col' style='{cell_style}'>{value:.3f}</td></tr>"
+        html += "</table></div>"
+        return html
+    
     def _generate_categorical_statistics(self, df: pd.DataFrame) -> str:
         """Generates statistics for categorical columns."""
         html = ""
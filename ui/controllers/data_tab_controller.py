@@ -13,9 +13,10 @@ from core.subset_manager import SubsetManager
 
 from ui.animations import AggregationAnimation, CalculationAnimation, DataFilterAnimation, DataTypeChangeAnimation, DropColumnAnimation, MeltDataAnimation, OutlierDetectionAnimation, RenameColumnAnimation, DropMissingValueAnimation, FillMissingValuesAnimation, RemoveRowAnimation, ResetToOriginalStateAnimation, FailedAnimation, NewDataFrameAnimation, FileImportAnimation, SubsetDataAnimation
 
-from ui.dialogs import RenameColumnDialog,FilterAdvancedDialog,AggregationDialog,FillMissingDialog,HelpDialog,MeltDialog,OutlierDetectionDialog,PivotDialog,MergeDialog,BinningDialog,ComputedColumnDialog,SubsetDataViewer,SubsetManagerDialog,ProgressDialog,SplitColumnDialog,RegexReplaceDialog,AppendDialog, MacroPreviewDialog, ColumnReorderDialog, RollingWindowDialog, ShiftDataDialog, PercentageChangeDialog, CreateDatasetDialog
+from ui.dialogs import RenameColumnDialog,FilterAdvancedDialog,AggregationDialog,FillMissingDialog,HelpDialog,MeltDialog,OutlierDetectionDialog,PivotDialog,MergeDialog,BinningDialog,ComputedColumnDialog,SubsetDataViewer,SubsetManagerDialog,ProgressDialog,SplitColumnDialog,RegexReplaceDialog,AppendDialog, MacroPreviewDialog, ColumnReorderDialog, RollingWindowDialog, ShiftDataDialog, PercentageChangeDialog, ResampleDialog, SampleModeDialog, CreateDatasetDialog, DuplicateAnalyzerDialog
 
-from ui.workers import GoogleSheetsImportWorker, AutoCreateSubsetsWorker
+from ui.data_table_model import DataTableModel
+from ui.workers import GoogleSheetsImportWorker, AutoCreateSubsetsWorker, SampleReplayWorker
 
 if TYPE_CHECKING:
     from ui.data_tab import DataTab
@@ -170,51 +171,41 @@ class DataTabController:
         )
         
     def remove_duplicates(self) -> None:
-        """Remove duplicate rows"""
+        """Find duplicate rows by key columns and remove them after a preview"""
         if self.data_handler.df is None: return
-        if getattr(self, "_preview_msg_box", None) is not None:
-            self._preview_msg_box.close()
+        if getattr(self, "_duplicate_dialog", None) is not None:
+            self._duplicate_dialog.raise_()
+            self._duplicate_dialog.activateWindow()
+            return
         try:
-            df = self.data_handler.df
-            
-            duplicate_indices = set(i for i, is_dup in enumerate(df.duplicated(keep="first")) if is_dup)
-            
-            if not duplicate_indices:
-                QMessageBox.information(self.view, "No Duplicates", "No duplicate rows found in the dataset.")
-                return
-            
-            if self.view.data_table.model() is not None:
-                self.view.data_table.model().set_highlighted_rows(duplicate_indices)
-            
-            self._preview_msg_box = QMessageBox(self.view)
-            self._preview_msg_box.setIcon(QMessageBox.Icon.Question)
-            self._preview_msg_box.setWindowTitle("Confirm Removal")
-            self._preview_msg_box.setText(f"Found {len(duplicate_indices)} duplicate row(s) (highlighted in red)\nReview the table, then choose whether to remove or keep them.")
-            self._preview_msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-            self._preview_msg_box.setWindowModality(Qt.WindowModality.NonModal)
-            
-            def handle_response(button):
+            def highlight_rows(mask) -> None:
+                if self.view.data_table.model() is not None:
+                    self.view.data_table.model().set_highlighted_rows(mask)
+
+            self._duplicate_dialog = DuplicateAnalyzerDialog(self.data_handler, highlight_callback=highlight_rows, parent=self.view)
+
+            def handle_finished(result: int) -> None:
                 if self.view.data_table.model() is not None:
                     self.view.data_table.model().set_highlighted_rows(set())
-                
-                if self._preview_msg_box.standardButton(button) == QMessageBox.StandardButton.Yes:
-                    self._execute_remove_duplicates()
+                config = self._duplicate_dialog.get_config()
+                self._duplicate_dialog.deleteLater()
+                self._duplicate_dialog = None
+                if result == QDialog.DialogCode.Accepted:
+                    self._execute_remove_duplicates(config["subset"], config["keep"])
                 else:
                     self.status_bar.log("Remove duplicates operation cancelled.", "INFO")
-                
-                self._preview_msg_box.deleteLater()
-                self._preview_msg_box = None
-            
-            self._preview_msg_box.buttonClicked.connect(handle_response)
-            self._preview_msg_box.show()
-            
+
+            self._duplicate_dialog.finished.connect(handle_finished)
+            self._duplicate_dialog.show()
+
         except Exception as RemoveDuplicatesError:
+            self._duplicate_dialog = None
             self.status_bar.log(f"Failed to prepare duplicate preview {str(RemoveDuplicatesError)}", "ERROR")
     
-    def _execute_remove_duplicates(self) -> None:
+    def _execute_remove_duplicates(self, subset=None, keep="first") -> None:
         try:
             before = len(self.data_handler.df)
-            self.data_handler.clean_data("drop_duplicates")
+            self.data_handler.remove_duplicates(subset, keep)
             after = len(self.data_handler.df)
             removed = before - after
 
@@ -230,6 +221,8 @@ class DataTabController:
                     "rows_after": after,
                     "rows_removed": removed,
                     "operation": "drop_duplicates",
+                    "key_columns": subset or "All Columns",
+                    "keep": keep,
                 },
                 level="SUCCESS",
             )
@@ -409,7 +402,7 @@ class DataTabController:
         if dialog.exec():
             self.outlier_animation = OutlierDetectionAnimation(method_name=method)
             self.outlier_animation.start(target_widget=self.view)
-            rows_removed = len(dialog.outlier_indices)
+            rows_removed = dialog.outlier_count
             self.view.refresh_data_view()
             self.status_bar.log_action(
                 f"Removed {rows_removed} outliers using {method}",
@@ -665,13 +658,13 @@ class DataTabController:
             QMessageBox.warning(self.view, "No Data", "Please load data first")
             return
 
-        columns = list(self.data_handler.df.columns)
+        columns = list(self.data_handler.df.columns) + list(self.data_handler.virtual_columns)
         dialog = ComputedColumnDialog(columns, self.view)
 
         if dialog.exec():
             new_column, expression = dialog.get_data()
             try:
-                self.data_handler.create_computed_column(new_column, expression)
+                self.data_handler.create_computed_column(new_column, expression, virtual=dialog.is_virtual())
                 self.view.refresh_data_view()
                 CalculationAnimation(self.view, "Calculate Column").start(self.view)
 
@@ -886,23 +879,25 @@ class DataTabController:
             QMessageBox.warning(self.view, "No Data", "Please load data first")
             return
         
-        source_col, component = self.view.operations_panel.get_date_extraction_parameters()
-        if not source_col or not component:
+        source_col, components = self.view.operations_panel.get_date_extraction_parameters()
+        if not source_col or not components:
             QMessageBox.warning(self.view, "Missing Input", "Please select both a column and a date component to extract")
             return
         
         try:
-            self.data_handler.clean_data("extract_date_component", column=source_col, component=component)
+            # All components in one operation, the source column is parsed once
+            self.data_handler.clean_data("extract_date_component", column=source_col, components=components)
             self.view.refresh_data_view()
+            component_text = ", ".join(components)
             self.status_bar.log_action(
-                f"Extracted '{component}' from '{source_col}'",
+                f"Extracted '{component_text}' from '{source_col}'",
                 details={
                     "source_column": source_col,
-                    "component": component,
+                    "components": components,
                     "operation": "extract_date_component"
                 }, level="SUCCESS"
             )
-            self.status_bar.log(f"Extracted {component} from {source_col}", "SUCCESS")
+            self.status_bar.log(f"Extracted {component_text} from {source_col}", "SUCCESS")
         except Exception as ExtractError:
             self.status_bar.log(f"Date extraction failed: {str(ExtractError)}", "ERROR")
             QMessageBox.critical(self.view, "Extraction Error", f"Failed to extract date component:\n{str(ExtractError)}")
@@ -963,11 +958,12 @@ class DataTabController:
                             bins=config["bins"],
                             labels=config["labels"],
                             right_inclusive=config.get("right_inclusive", True),
-                            drop_original=config.get("drop_original", False)
+                            drop_original=config.get("drop_original", False),
+                            rank_error=config.get("rank_error"),
                         )
                     self.view.refresh_data_view()
                     
-                    method_display = "Quantile" if config["method"] == "qcut" else "Uniform/Custom"
+                    method_display = {"qcut": "Quantile", "approx_qcut": "Approximate Quantile"}.get(config["method"], "Uniform/Custom")
                     bins_display = len(config["bins"]) - 1 if isinstance(config["bins"], list) else config["bins"]
                     
                     self.status_bar.log_action(
@@ -1072,6 +1068,35 @@ class DataTabController:
                 f"Warning: Could not refresh aggregation list: {str(RefreshAggregationListError)}"
             )
 
+    def update_saved_aggregations(self):
+        """Reapply the saved aggregations to the current data, incrementally where possible"""
+        if self.data_handler.df is None or not self.aggregation_manager.list_aggregations():
+            return
+        if getattr(self.data_handler, "pre_agg_view_df", None) is not None or getattr(self.data_handler, "pre_insert_df", None) is not None:
+            QMessageBox.warning(self.view, "Warning", "Restore the original data before updating the saved aggregations.")
+            return
+
+        outcomes = self.aggregation_manager.refresh_aggregations(
+            self.data_handler.df,
+            self.data_handler.operations_since,
+            self.data_handler.operation_marker(),
+        )
+        self.refresh_saved_agg_list()
+
+        errors = {name: outcome for name, outcome in outcomes.items() if outcome.startswith("error: ")}
+        counts = {mode: sum(1 for outcome in outcomes.values() if outcome == mode) for mode in ("incremental", "full", "unchanged")}
+        self.status_bar.log_action(
+            f"Updated saved aggregations: {counts['incremental']} incremental, {counts['full']} recomputed, {counts['unchanged']} unchanged",
+            details={"outcomes": outcomes, "operation": "update_saved_aggregations"},
+            level="WARNING" if errors else "SUCCESS",
+        )
+        if errors:
+            QMessageBox.warning(
+                self.view,
+                "Aggregation Update",
+                "Some aggregations could not be updated:\n\n" + "\n".join(f"{name}: {outcome[7:]}" for name, outcome in errors.items()),
+            )
+
     def on_saved_agg_selected(self, item):
         """Handle selection of saved aggs"""
         enabled = (item is not None and item.data(Qt.ItemDataRole.UserRole) is not None)
@@ -1334,17 +1359,22 @@ class DataTabController:
                     action="rolling_window",
                     column=config["column"],
                     window=config["window"],
-                    operation=config["operation"],
-                    new_column=config["new_column"]
+                    operations=config["operations"],
+                    new_column=config["new_column"],
+                    center=config["center"],
+                    min_periods=config["min_periods"],
+                    group_by=config["group_by"],
+                    on=config["on"],
                 )
                 self.view.refresh_data_view()
                 
                 self.status_bar.log_action(
-                    f"Applied {config['window']}-period rolling {config['operation']} on '{config['column']}'",
+                    f"Applied {config['window']}-period rolling {', '.join(config['operations'])} on '{config['column']}'",
                     details={
                         "column": config["column"],
                         "window": config["window"],
-                        "operation": config["operation"],
+                        "statistics": config["operations"],
+                        "group_by": config["group_by"],
                         "new_column": config["new_column"],
                         "operation": "rolling_window"
                     },
@@ -1369,6 +1399,7 @@ class DataTabController:
                     column=config["column"],
                     periods=config["periods"],
                     fill_value=config["fill_value"],
+                    group_by=config["group_by"],
                     new_column=config["new_column"]
                 )
                 self.view.refresh_data_view()
@@ -1408,6 +1439,7 @@ class DataTabController:
                     column=config["column"],
                     periods=config["periods"],
                     fill_method=config["fill_method"],
+                    group_by=config["group_by"],
                     new_column=config["new_column"]
                 )
                 self.view.refresh_data_view()
@@ -1427,6 +1459,45 @@ class DataTabController:
                 self.status_bar.log(f"Failed to calculate percentage change: {str(error)}", "ERROR")
                 QMessageBox.critical(self.view, "Error", f"Failed to calculate percentage change:\n{str(error)}")
     
+    def open_resample_dialog(self) -> None:
+        """Opens the dialog to resample the data into regular time bins"""
+        if self.data_handler.df is None:
+            QMessageBox.warning(self.view, "No Data", "Please load data first.")
+            return
+
+        if not any(pd.api.types.is_datetime64_any_dtype(dtype) for dtype in self.data_handler.df.dtypes):
+            QMessageBox.warning(self.view, "No Datetime Data", "This dataset contains no datetime column to resample on. Convert a column to datetime first.")
+            return
+
+        dialog = ResampleDialog(self.data_handler, self.view)
+        if dialog.exec():
+            config = dialog.get_config()
+            try:
+                rows_before = len(self.data_handler.df)
+                self.data_handler.clean_data(
+                    action="resample",
+                    on=config["on"],
+                    frequency=config["frequency"],
+                    aggregations=config["aggregations"],
+                    fill=config["fill"],
+                )
+                self.view.refresh_data_view()
+
+                self.status_bar.log_action(
+                    f"Resampled {rows_before:,} rows on '{config['on']}' to {len(self.data_handler.df):,} '{config['frequency']}' bins",
+                    details={
+                        "time_column": config["on"],
+                        "frequency": config["frequency"],
+                        "aggregations": config["aggregations"],
+                        "fill": config["fill"],
+                        "operation": "resample"
+                    },
+                    level="SUCCESS"
+                )
+            except Exception as error:
+                self.status_bar.log(f"Failed to resample: {str(error)}", "ERROR")
+                QMessageBox.critical(self.view, "Error", f"Failed to resample:\n{str(error)}")
+    
     def open_column_reorder_dialog(self) -> None:
         """Opens the dialog for reordering columns"""
         if self.data_handler.df is None or self.data_handler.df.empty:
@@ -1463,15 +1534,12 @@ class DataTabController:
         ascending = (order_text == "Ascending")
 
         try:
-            col_index = list(self.data_handler.df.columns).index(column)
-            order = (
-                Qt.SortOrder.AscendingOrder
-                if ascending
-                else Qt.SortOrder.DescendingOrder
-            )
-
-            self.view.data_table.sortByColumn(col_index, order)
-            self.view.refresh_data_view(reload_model=False)
+            # Header clicks only sort the view, this reorders the data itself
+            model = self.view.data_table.model()
+            if isinstance(model, DataTableModel):
+                model.clear_view_sort()
+            self.data_handler.sort_data(column, ascending)
+            self.view.refresh_data_view()
 
             direction = "ascending" if ascending else "descending"
             self.status_bar.log_action(
@@ -1786,6 +1854,120 @@ class DataTabController:
             )
             traceback.print_exc()
             
+    def toggle_sample_mode(self) -> None:
+        """Switches to a sample of the data, or back to the full data discarding the sample's operations"""
+        if self.data_handler.df is None:
+            QMessageBox.warning(self.view, "No Data", "Please load data first.")
+            self.view.update_sample_mode_ui()
+            return
+
+        if self.data_handler.is_sample_mode:
+            operation_count = len(self.data_handler.operation_log)
+            if operation_count:
+                reply = QMessageBox.question(
+                    self.view,
+                    "Leave Sample Mode",
+                    f"Leave sample mode and discard the {operation_count} operation(s) made on the sample?\n\n"
+                    "Use 'Apply to Full Dataset' to keep them.",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    QMessageBox.StandardButton.No,
+                )
+                if reply == QMessageBox.StandardButton.No:
+                    self.view.update_sample_mode_ui()
+                    return
+            self.data_handler.disable_sample_mode()
+            self.view.refresh_data_view()
+            self.status_bar.log(f"Left sample mode, back to {len(self.data_handler.df):,} rows", "INFO")
+            return
+
+        dialog = SampleModeDialog(self.data_handler.df, self.view)
+        if not dialog.exec():
+            self.view.update_sample_mode_ui()
+            return
+        config = dialog.get_config()
+        try:
+            rows_before = len(self.data_handler.df)
+            self.data_handler.enable_sample_mode(config["fraction"], config["stratify_by"], config["seed"])
+            self.view.refresh_data_view()
+            self.status_bar.log_action(
+                f"Sample mode: working on {len(self.data_handler.df):,} of {rows_before:,} rows",
+                details={
+                    "fraction": config["fraction"],
+                    "stratify_by": config["stratify_by"],
+                    "seed": config["seed"],
+                    "operation": "sample_mode"
+                },
+                level="SUCCESS"
+            )
+        except Exception as SampleModeError:
+            self.status_bar.log(f"Failed to start sample mode: {str(SampleModeError)}", "ERROR")
+            QMessageBox.critical(self.view, "Error", f"Failed to start sample mode:\n{str(SampleModeError)}")
+            self.view.update_sample_mode_ui()
+
+    def apply_sample_to_full(self) -> None:
+        """Replays the operations made on the sample against the full data in the background"""
+        if not self.data_handler.is_sample_mode:
+            return
+        full_rows = len(self.data_handler.sample_session.full_df)
+
+        self.progress_dialog = ProgressDialog(
+            title="Applying to Full Dataset",
+            message=f"Replaying {len(self.data_handler.operation_log)} operation(s) on {full_rows:,} rows",
+            parent=self.view
+        )
+        self.progress_dialog.setModal(True)
+
+        self.sample_replay_worker = SampleReplayWorker(self.data_handler)
+        self.sample_replay_worker.signals.progress.connect(self.progress_dialog.update_progress)
+        self.sample_replay_worker.signals.finished.connect(self.on_sample_replay_finished)
+        self.sample_replay_worker.signals.error.connect(self.on_sample_replay_error)
+        self.progress_dialog.rejected.connect(self.sample_replay_worker.cancel)
+        self.progress_dialog.rejected.connect(lambda: self.status_bar.log("Apply to full dataset cancelled, still in sample mode", "INFO"))
+        self.progress_dialog.show()
+
+        QThreadPool.globalInstance().start(self.sample_replay_worker)
+
+    def on_sample_replay_finished(self, replay) -> None:
+        if hasattr(self, "progress_dialog"):
+            self.progress_dialog.close()
+        try:
+            self.data_handler.commit_sample_replay(replay)
+        except Exception as CommitError:
+            self.on_sample_replay_error(CommitError)
+            return
+        self.view.refresh_data_view()
+
+        skipped_text = ""
+        if replay.skipped_operations:
+            skipped_types = sorted({str(op.get("type")) for op in replay.skipped_operations})
+            skipped_text = (
+                f"\n\n{len(replay.skipped_operations)} operation(s) only applied to the sample and were skipped: "
+                f"{', '.join(skipped_types)}"
+            )
+        self.status_bar.log_action(
+            f"Applied {len(replay.operations)} sample operation(s) to the full dataset ({len(self.data_handler.df):,} rows)",
+            details={
+                "operations": len(replay.operations),
+                "skipped_operations": len(replay.skipped_operations),
+                "rows": len(self.data_handler.df),
+                "operation": "apply_sample_to_full"
+            },
+            level="SUCCESS"
+        )
+        QMessageBox.information(
+            self.view,
+            "Applied to Full Dataset",
+            f"Replayed {len(replay.operations)} operation(s) on the full dataset.\n"
+            f"Rows: {len(self.data_handler.df):,}, one undo restores the data before sampling."
+            f"{skipped_text}"
+        )
+
+    def on_sample_replay_error(self, error: Exception) -> None:
+        if hasattr(self, "progress_dialog"):
+            self.progress_dialog.close()
+        self.status_bar.log(f"Failed to apply to full dataset: {str(error)}", "ERROR")
+        QMessageBox.critical(self.view, "Error", f"Failed to apply to the full dataset, still in sample mode:\n\n{str(error)}")
+
     def reset_data(self):
         """Reset data to original state"""
 
@@ -1935,7 +2117,7 @@ class DataTabController:
             if preview_dialog.exec() == QDialog.DialogCode.Accepted:
                 ops_to_execute = preview_dialog.get_selected_operations()
                 try:
-                    self.data_handler.apply_pipeline_macro(ops_to_execute)
+                    self.data_handler.apply_pipeline_macro(ops_to_execute, engine=preview_dialog.get_execution_engine())
                     self.view.refresh_data_view()
                     self.status_bar.log(f"Applied pipeline macro from {file_path}", "SUCCESS")
                 except Exception as err:
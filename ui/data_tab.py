@@ -64,6 +64,8 @@ class DataTab(QWidget):
     request_import_db = pyqtSignal()
     request_quit = pyqtSignal()
     request_python_console = pyqtSignal()
+    request_sql_console = pyqtSignal()
+    request_workspace = pyqtSignal()
     data_modified = pyqtSignal()
 
     def __init__(
@@ -78,7 +80,7 @@ class DataTab(QWidget):
         self.status_bar = status_bar
         self.subset_manager = subset_manager
         self.controller = DataTabController(data_handler=self.data_handler, status_bar=self.status_bar, view=self, subset_manager=self.subset_manager)
-        self.stats_generator = StatisticsGenerator()
+        self.stats_generator = StatisticsGenerator(correlation_engine=self.data_handler.correlation_engine)
         self.plot_tab = None
         self.data_table = None
         self.stats_text = None
@@ -173,6 +175,35 @@ class DataTab(QWidget):
         toolbar_layout.addWidget(self.data_source_refresh_button)
 
         toolbar_layout.addStretch()
+
+        # sample mode toggle
+        self.sample_mode_toggle_button = DataPlotStudioButton(
+            "Sample Mode: OFF",
+            parent=self,
+            base_color_hex="#95a5a6",
+            text_color_hex="white",
+        )
+        self.sample_mode_toggle_button.setIcon(IconBuilder.build(IconType.Filter))
+        self.sample_mode_toggle_button.setCheckable(True)
+        self.sample_mode_toggle_button.setToolTip(
+            "Toggle to design operations on a small reproducible sample of the rows"
+        )
+        self.sample_mode_toggle_button.clicked.connect(self.controller.toggle_sample_mode)
+        toolbar_layout.addWidget(self.sample_mode_toggle_button)
+
+        self.apply_sample_button = DataPlotStudioButton(
+            "Apply to Full Dataset",
+            parent=self,
+            base_color_hex=ThemeColors.MainColor,
+            text_color_hex="white",
+        )
+        self.apply_sample_button.setIcon(IconBuilder.build(IconType.Checkmark))
+        self.apply_sample_button.setToolTip(
+            "Replay the operations made on the sample against all rows in the background"
+        )
+        self.apply_sample_button.clicked.connect(self.controller.apply_sample_to_full)
+        self.apply_sample_button.setVisible(False)
+        toolbar_layout.addWidget(self.apply_sample_button)
         
         self.python_console_button = DataPlotStudioButton(
             "",
@@ -183,6 +214,24 @@ class DataTab(QWidget):
         self.python_console_button.clicked.connect(self.request_python_console.emit)
         toolbar_layout.addWidget(self.python_console_button)
 
+        self.sql_console_button = DataPlotStudioButton(
+            "SQL",
+            parent=self,
+        )
+        self.sql_console_button.setIcon(IconBuilder.build(IconType.ImportDatabase))
+        self.sql_console_button.setToolTip("Open the SQL Console to query the data, subsets and saved aggregations with DuckDB")
+        self.sql_console_button.clicked.connect(self.request_sql_console.emit)
+        toolbar_layout.addWidget(self.sql_console_button)
+
+        self.workspace_button = DataPlotStudioButton(
+            "Datasets",
+            parent=self,
+        )
+        self.workspace_button.setIcon(IconBuilder.build(IconType.DataExplorerIcon))
+        self.workspace_button.setToolTip("Open the Workspace to keep several datasets open, switch between them and see their memory use")
+        self.workspace_button.clicked.connect(self.request_workspace.emit)
+        toolbar_layout.addWidget(self.workspace_button)
+
         # edit current dataset toggle
         self.edit_dataset_toggle_button = DataPlotStudioButton(
             "Edit Mode: OFF",
@@ -289,6 +338,9 @@ class DataTab(QWidget):
         self.copy_shortcut = QShortcut(QKeySequence.StandardKey.Copy, self.data_table)
         self.copy_shortcut.activated.connect(self.copy_selection)
 
+        self.paste_shortcut = QShortcut(QKeySequence.StandardKey.Paste, self.data_table)
+        self.paste_shortcut.activated.connect(self.paste_selection)
+
         data_table_icon = IconBuilder.build(IconType.DataExplorerIcon)
         self.data_tabs.addTab(self.data_table, data_table_icon, "Data Table")
 
@@ -380,6 +432,25 @@ class DataTab(QWidget):
         else:
             self.refresh_data_view()
 
+    def update_sample_mode_ui(self) -> None:
+        """Syncs the sample mode toggle and the apply button with the data handler"""
+        if not hasattr(self, "sample_mode_toggle_button"):
+            return
+        is_sample_mode = self.data_handler.is_sample_mode
+        self.sample_mode_toggle_button.setChecked(is_sample_mode)
+        self.apply_sample_button.setVisible(is_sample_mode)
+        if is_sample_mode:
+            fraction = self.data_handler.sample_session.fraction
+            self.sample_mode_toggle_button.setText(f"Sample Mode: {fraction * 100:g}%")
+            self.sample_mode_toggle_button.updateColors(
+                base_color_hex="#E67E22", hover_color_hex="#D35400"
+            )
+        else:
+            self.sample_mode_toggle_button.setText("Sample Mode: OFF")
+            self.sample_mode_toggle_button.updateColors(
+                base_color_hex="#95A5A6", hover_color_hex="#7F8C8D"
+            )
+
     def open_search_bar(self) -> None:
         """Show the inline search bar and focus input"""
         if self.data_handler.df is None:
@@ -459,7 +530,11 @@ class DataTab(QWidget):
         if self.data_table.model() is None:
             return
 
-        index = self.data_table.model().index(row_index, column_index)
+        model = self.data_table.model()
+        if isinstance(model, DataTableModel):
+            # Search results are row positions of the data, the view may be sorted
+            row_index = model.view_row(row_index)
+        index = model.index(row_index, column_index)
         if index.isValid():
             from PyQt6.QtCore import QItemSelectionModel
             self.data_table.selectionModel().select(
@@ -489,6 +564,7 @@ class DataTab(QWidget):
         self._update_data_source_status()
         self._update_subsets_status()
         self._update_history_list()
+        self.update_sample_mode_ui()
         self.data_modified.emit()
     
     def _handle_empty_data_view(self) -> None:
@@ -507,6 +583,8 @@ class DataTab(QWidget):
             
         if hasattr(self, "data_source_refresh_button"):
             self.data_source_refresh_button.setVisible(False)
+
+        self.update_sample_mode_ui()
         
         self.status_bar.set_data_source("")
         self.status_bar.set_view_context("", "normal")
@@ -529,8 +607,10 @@ class DataTab(QWidget):
         header = self.data_table.horizontalHeader()
         header.blockSignals(True)
         
-        if self.data_handler.sort_state:
-            col_name, ascending = self.data_handler.sort_state
+        view_sort_keys = self.model.view_sort_keys
+        sort_state = view_sort_keys[0] if view_sort_keys else self.data_handler.sort_state
+        if sort_state:
+            col_name, ascending = sort_state
             try:
                 col_index = list(df.columns).index(col_name)
                 order = (Qt.SortOrder.AscendingOrder if ascending else Qt.SortOrder.DescendingOrder)
@@ -623,6 +703,9 @@ class DataTab(QWidget):
             self.status_bar.set_view_context(f"Viewing Aggregation: {agg_name}")
         elif inserted_name:
             self.status_bar.set_view_context(f"Viewing Subset: {inserted_name}")
+        elif self.data_handler.is_sample_mode:
+            full_rows = len(self.data_handler.sample_session.full_df)
+            self.status_bar.set_view_context(f"Sample: {len(self.data_handler.df):,} of {full_rows:,} rows")
         else:
             self.status_bar.set_view_context("", "normal")
     
@@ -715,7 +798,7 @@ class DataTab(QWidget):
                 return IconBuilder.build(IconType.DropMissingValues)
             case "drop_duplicates":
                 return IconBuilder.build(IconType.RemoveDuplicates)
-            case "aggregate" | "melt" | "pivot" | "merge" | "concatenate" | "bin_column" | "normalize":
+            case "aggregate" | "melt" | "pivot" | "merge" | "concatenate" | "bin_column" | "normalize" | "resample" | "sql_query":
                 return IconBuilder.build(IconType.DataTransform)
             case "sort":
                 return IconBuilder.build(IconType.Sort)
@@ -729,6 +812,10 @@ class DataTab(QWidget):
                 return IconBuilder.build(IconType.DatetimeTools)
             case "remove_rows" | "clip_outliers" | "flag_outliers":
                 return IconBuilder.build(IconType.DataCleaning)
+            case "update_cell" | "paste_block":
+                return IconBuilder.build(IconType.EditModeToggleOn)
+            case "pipeline_macro":
+                return IconBuilder.build(IconType.DataTransform)
             case _:
                 return IconBuilder.build(IconType.History)
 
@@ -760,7 +847,7 @@ class DataTab(QWidget):
             return
         
         # Generate HTML
-        final_html = self.stats_generator.generate_html(df, info)
+        final_html = self.stats_generator.generate_html(df, info, data_version=self.data_handler.data_version)
         self.stats_text.setHtml(final_html)
         
         self.stats_animation = QPropertyAnimation(self.stats_opacity_effect, b"opacity")
@@ -806,7 +893,8 @@ class DataTab(QWidget):
             case "drop_missing":
                 return "Drop missing Values"
             case "drop_duplicates":
-                return "Remove Duplicate Values"
+                subset = operation.get("subset")
+                return f"Remove Duplicates: {', '.join(map(str, subset))}" if subset else "Remove Duplicate Values"
             case "aggregate":
                 group_by = operation.get("group_by", [])
                 return f"Aggregate: Grouped by {len(group_by)} cols"
@@ -823,6 +911,8 @@ class DataTab(QWidget):
                 direction = "Asc" if operation.get("ascending") else "Desc"
                 return f"Sort: {operation.get('column')} ({direction})"
             case "computed_column":
+                if operation.get("virtual"):
+                    return f"Compute (virtual): {operation.get('new_column')}"
                 return f"Compute: {operation.get('new_column')}"
             case "bin_column":
                 return f"Bin: {operation.get('column')} -> {operation.get('new_column')}"
@@ -832,9 +922,20 @@ class DataTab(QWidget):
                 return f"Split: {operation.get('column')}"
             case "regex_replace":
                 return f"Regex Replace on {operation.get('column')}"
+            case "resample":
+                return f"Resample: {operation.get('on')} ({operation.get('frequency')})"
+            case "sql_query":
+                query = " ".join(str(operation.get("sql", "")).split())
+                return f"SQL: {query[:40]}{'...' if len(query) > 40 else ''}"
+            case "remove_rows" if operation.get("outliers"):
+                return f"Remove Outliers ({operation['outliers'].get('method')})"
             case "remove_rows":
-                rows = operation.get("rows", [])
-                return f"Remove Rows ({len(rows)} rows)"
+                mask = operation.get("mask")
+                if mask is not None:
+                    row_count = int(np.count_nonzero(mask))
+                else:
+                    row_count = len(operation.get("positions") or operation.get("rows") or [])
+                return f"Remove Rows ({row_count} rows)"
             case "clip_outliers":
                 return f"Clip Outliers ({operation.get('method')})"
             case "duplicate_column":
@@ -842,11 +943,18 @@ class DataTab(QWidget):
             case "normalize":
                 return f"Normalize ({operation.get('method')})"
             case "extract_date_component":
-                return f"Extract: {operation.get('component')} from {operation.get('column')}"
+                components = operation.get("components") or [operation.get("component")]
+                return f"Extract: {', '.join(str(component) for component in components)} from {operation.get('column')}"
             case "calculate_date_difference":
                 return f"Date Diff: {operation.get('end_column')} - {operation.get('start_column')}"
             case "flag_outliers":
                 return f"Flag Outliers: {operation.get('new_column_name')}"
+            case "pipeline_macro":
+                return f"Pipeline Macro ({len(operation.get('operations', []))} steps)"
+            case "paste_block":
+                values = operation.get("values", [])
+                column_count = len(values[0]) if values else 0
+                return f"Paste: {len(values)} x {column_count} cells at ({operation.get('row')}, {operation.get('col')})"
             case _:
                 return f"{operation_type.replace('_', ' ').title()}"
 
@@ -879,8 +987,21 @@ class DataTab(QWidget):
 
         menu.addSeparator()
         copy_action = menu.addAction("Copy Selection")
+        paste_action = menu.addAction("Paste")
+        paste_action.setEnabled(self.is_editing)
         settings_action = menu.addAction("Table Settings...")
         stats_test_action = menu.addAction("Run Statistical Test...")
+        selection_model = self.data_table.selectionModel()
+        delete_rows_action = menu.addAction("Delete Selected Rows")
+        delete_rows_action.setEnabled(selection_model is not None and selection_model.hasSelection())
+
+        menu.addSeparator()
+        model = self.data_table.model()
+        has_view_sort = isinstance(model, DataTableModel) and bool(model.view_sort_keys)
+        commit_sort_action = menu.addAction("Apply Sort to Data")
+        commit_sort_action.setEnabled(has_view_sort)
+        clear_sort_action = menu.addAction("Clear View Sort")
+        clear_sort_action.setEnabled(has_view_sort)
 
         action = menu.exec(self.data_table.viewport().mapToGlobal(position))
 
@@ -890,10 +1011,22 @@ class DataTab(QWidget):
             self.data_table.resizeRowsToContents()
         elif action == copy_action:
             self.copy_selection()
+        elif action == paste_action:
+            self.paste_selection()
         elif action == settings_action:
             self.open_table_customization()
         elif action == stats_test_action:
             self.controller.run_statistical_test_from_selection()
+        elif action == delete_rows_action:
+            self.delete_selected_rows()
+        elif action == commit_sort_action:
+            sort_keys = model.view_sort_keys
+            if model.commit_view_sort():
+                self.refresh_data_view()
+                self.status_bar.log(f"Sorted data by {', '.join(str(column) for column, _ in sort_keys)}", "SUCCESS")
+        elif action == clear_sort_action:
+            model.clear_view_sort()
+            self.refresh_data_view()
         
     def copy_selection(self) -> None:
         """
@@ -932,6 +1065,67 @@ class DataTab(QWidget):
         QApplication.clipboard().setText(copied_text)
         self.status_bar.log(f"Copied {len(selected_indexes)} cell(s) to clipboard", "SUCCESS")
 
+    def paste_selection(self) -> None:
+        """
+        Pastes a TSV block from the system clipboard starting at the current cell
+        The whole block is written as one operation and one history entry
+        """
+        if self.data_table is None or not isinstance(self.data_table.model(), DataTableModel):
+            return
+        if not self.is_editing:
+            self.status_bar.log("Enable Edit Mode to paste into the data table", "WARNING")
+            return
+
+        selection_model = self.data_table.selectionModel()
+        selected_indexes = selection_model.selectedIndexes() if selection_model is not None else []
+        if selected_indexes:
+            top_left = min(selected_indexes, key=lambda idx: (idx.row(), idx.column()))
+        else:
+            top_left = self.data_table.currentIndex()
+        if not top_left.isValid():
+            self.status_bar.log("Select a cell to paste into", "WARNING")
+            return
+
+        clipboard_text = QApplication.clipboard().text()
+        if not clipboard_text:
+            self.status_bar.log("Clipboard is empty", "WARNING")
+            return
+
+        try:
+            row_count, column_count = self.data_table.model().paste_block(top_left, clipboard_text)
+        except Exception as PasteError:
+            self.status_bar.log(f"Failed to paste: {str(PasteError)}", "ERROR")
+            return
+
+        if row_count and column_count:
+            self.refresh_data_view(reload_model=False)
+            self.status_bar.log(f"Pasted {row_count * column_count:,} cell(s) ({row_count} x {column_count})", "SUCCESS")
+
+    def delete_selected_rows(self) -> None:
+        """Removes every row that has a selected cell, as one operation and one history entry"""
+        selected_rows, _ = self.get_selection_state()
+        if not selected_rows:
+            self.status_bar.log("Select the rows to delete", "WARNING")
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Delete Rows",
+            f"Delete {len(selected_rows):,} selected row(s) from the dataset?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            self.data_handler.remove_rows(selected_rows)
+        except Exception as DeleteRowsError:
+            self.status_bar.log(f"Failed to delete rows: {str(DeleteRowsError)}", "ERROR")
+            return
+
+        self.refresh_data_view()
+        self.status_bar.log(f"Deleted {len(selected_rows):,} row(s)", "SUCCESS")
+
     def open_table_customization(self):
         """Opens the settings dialog for the table customzation"""
         if self.data_handler.df is None:
@@ -1019,13 +1213,21 @@ class DataTab(QWidget):
         if not indexes:
             return [], []
         
-        selected_rows = sorted(list(set(index.row() for index in indexes)))
+        view_rows = set(index.row() for index in indexes)
+        model = self.data_table.model()
+        if isinstance(model, DataTableModel):
+            # Selections are rows of the view, report their row positions in the data
+            view_rows = model.source_rows(view_rows)
+        selected_rows = sorted(list(set(view_rows)))
         if self.data_handler.df is not None:
             col_indices = sorted(list(set(index.column() for index in indexes)))
             selected_columns = []
+            virtual_columns = list(self.data_handler.virtual_columns)
             for i in col_indices:
                 if i < len(self.data_handler.df.columns):
                     selected_columns.append(self.data_handler.df.columns[i])
+                elif i - len(self.data_handler.df.columns) < len(virtual_columns):
+                    selected_columns.append(virtual_columns[i - len(self.data_handler.df.columns)])
         else:
             selected_columns = []
         
@@ -3,7 +3,9 @@ import numpy as np
 import operator
 from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, QVariant
 from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtWidgets import QApplication
 from typing import Any
+from core.sort_engine import SortEngine
 from ui.status_bar import StatusBar
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -12,12 +14,16 @@ if TYPE_CHECKING:
 class DataTableModel(QAbstractTableModel):
     """ table for the data Table"""
 
-    def __init__(self, data_handler: "DataHandler", editable: bool=False, parent: Any=None, highlighted_rows: list[int] | None=None, float_precision: int = 2, conditional_rules: list[dict[str, Any]] | None = None):
+    VirtualBlockRows: int = 2048
+
+    def __init__(self, data_handler: "DataHandler", editable: bool=False, parent: Any=None, highlighted_rows: "list[int] | np.ndarray | None"=None, float_precision: int = 2, conditional_rules: list[dict[str, Any]] | None = None):
         super().__init__(parent)
         self.data_handler = data_handler
         self._data = self.data_handler.df
         self.editable = editable
-        self.highlighted_rows = set(highlighted_rows) if highlighted_rows else set()
+        self.highlighted_rows: set = set()
+        self._highlight_mask: np.ndarray | None = None
+        self._set_highlight(highlighted_rows)
         self.float_precision = float_precision
         self.conditional_rules = conditional_rules if conditional_rules else []
         self.render_bools_as_checkboxes = True
@@ -32,6 +38,17 @@ class DataTableModel(QAbstractTableModel):
         self._col_alignments: list[Qt.AlignmentFlag] = []
         self._col_is_bool: list[bool] = []
         self._header_tooltips: list[str] = []
+        
+        # Virtual columns are shown after the real columns and evaluated one block of rows at a time.
+        # The blocks hold the values of one data version, edits and pastes change the data in place
+        self._virtual_columns: list[str] = list(self.data_handler.virtual_columns)
+        self._virtual_blocks: dict[tuple[str, int], Any] = {}
+        self._virtual_blocks_version: int = self.data_handler.data_version
+        
+        # View only sort: rows are read through a permutation of the data, the data is not reordered
+        self._view_sort_keys: list[tuple[str, bool]] = []
+        self._row_order: np.ndarray | None = None
+        self._inverse_row_order: np.ndarray | None = None
 
         if self._data is not None:
             self._is_numeric = [
@@ -73,10 +90,45 @@ class DataTableModel(QAbstractTableModel):
             if op_func:
                 self._compiled_rules.append((op_func, target, QColor(color_hex)))
     
-    def set_highlighted_rows(self, rows: set) -> None:
+    def set_highlighted_rows(self, rows: "set | np.ndarray") -> None:
         """Updates the highlighed rows and triggers a layout refresh on display changes"""
-        self.highlighted_rows = set(rows) if rows else set()
+        self._set_highlight(rows)
         self.layoutChanged.emit()
+    
+    def _set_highlight(self, rows: Any) -> None:
+        """Rows are either row positions or a boolean mask over all rows, a mask is kept as is"""
+        if isinstance(rows, np.ndarray) and rows.dtype == bool:
+            self._highlight_mask = rows
+            self.highlighted_rows = set()
+        else:
+            self._highlight_mask = None
+            self.highlighted_rows = set(rows) if rows is not None and len(rows) else set()
+    
+    @property
+    def view_sort_keys(self) -> list[tuple[str, bool]]:
+        return list(self._view_sort_keys)
+    
+    def source_row(self, row: int) -> int:
+        """Row position in the data for a row of the view"""
+        if self._row_order is None:
+            return row
+        return int(self._row_order[row])
+    
+    def source_rows(self, rows: list[int]) -> list[int]:
+        return [self.source_row(row) for row in rows]
+    
+    def view_row(self, source_row: int) -> int:
+        """Row of the view that shows a row position of the data"""
+        if self._row_order is None:
+            return source_row
+        if self._inverse_row_order is None:
+            self._inverse_row_order = SortEngine.inverse(self._row_order)
+        return int(self._inverse_row_order[source_row])
+    
+    def _is_highlighted(self, row: int) -> bool:
+        if self._highlight_mask is not None:
+            return row < len(self._highlight_mask) and bool(self._highlight_mask[row])
+        return row in self.highlighted_rows
         
     def _update_column_alignments(self) -> None:
         """Pre-computes and caches the Qt Alignment flags for each column based on its dtype"""
@@ -169,7 +221,11 @@ class DataTableModel(QAbstractTableModel):
     def update_data(self) -> None:
         self.beginResetModel()
         self._data = self.data_handler.df
+        self._virtual_columns = list(self.data_handler.virtual_columns)
+        self._virtual_blocks.clear()
         self.highlighted_rows.clear()
+        self._highlight_mask = None
+        self._refresh_view_sort()
         self._update_column_alignments()
         self.endResetModel()
 
@@ -183,7 +239,24 @@ class DataTableModel(QAbstractTableModel):
         """Returns the number of columns in the dataframe"""
         if parent.isValid() or self._data is None:
             return 0
-        return self._data.shape[1]
+        return self._data.shape[1] + len(self._virtual_columns)
+    
+    def _is_virtual_column(self, col: int) -> bool:
+        return self._data is not None and col >= self._data.shape[1]
+    
+    def _get_virtual_value(self, row: int, col: int) -> Any:
+        """Returns a virtual column value, evaluating and caching the block of rows around it"""
+        name = self._virtual_columns[col - self._data.shape[1]]
+        if self._virtual_blocks_version != self.data_handler.data_version:
+            self._virtual_blocks.clear()
+            self._virtual_blocks_version = self.data_handler.data_version
+        block = row // self.VirtualBlockRows
+        values = self._virtual_blocks.get((name, block))
+        if values is None:
+            start = block * self.VirtualBlockRows
+            values = self.data_handler.evaluate_virtual_column(name, start, start + self.VirtualBlockRows).to_numpy()
+            self._virtual_blocks[(name, block)] = values
+        return values[row % self.VirtualBlockRows]
     
     def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
         """Returns le data"""
@@ -206,8 +279,10 @@ class DataTableModel(QAbstractTableModel):
         row: int = index.row()
         col: int = index.column()
         
+        row = self.source_row(row)
+        
         if role == Qt.ItemDataRole.BackgroundRole:
-            if row in self.highlighted_rows:
+            if self._is_highlighted(row):
                 return self._highlight_color
             return None
         
@@ -217,9 +292,13 @@ class DataTableModel(QAbstractTableModel):
             return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
         
         try:
-            val: Any = self._data.iat[row, col]
+            if self._is_virtual_column(col):
+                val: Any = self._get_virtual_value(row, col)
+            else:
+                val: Any = self._data.iat[row, col]
         except Exception as error:
             print(error)
+            return None
             
         is_missing = pd.api.types.is_scalar(val) and pd.isna(val)
         # Skip retrieval if there are no conditional formatting set
@@ -336,6 +415,8 @@ class DataTableModel(QAbstractTableModel):
         """data ypdater"""
         if not index.isValid() or role != Qt.ItemDataRole.EditRole or not self.editable:
             return False
+        if self._is_virtual_column(index.column()):
+            return False
         
         if role == Qt.ItemDataRole.CheckStateRole:
             value = bool(value == Qt.CheckState.Checked.value)
@@ -343,18 +424,49 @@ class DataTableModel(QAbstractTableModel):
             return False
         
         try:
-            row = index.row()
+            row = self.source_row(index.row())
             column = index.column()
             
+            # The view keeps its row order after edits, until it is sorted again
             self.data_handler.update_cell(row, column, value)
 
             self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.CheckStateRole])
+            self._emit_virtual_changed(index.row(), index.row())
             return True
         
         except Exception as UpdateDataModelError:
             print(f"Error updating data: {str(UpdateDataModelError)}")
             return False
-    
+
+    def paste_block(self, top_left: QModelIndex, text: str) -> tuple[int, int]:
+        """
+        Pastes a tab separated clipboard block starting at top_left.
+        The block is written through the data handler in a single operation and
+        a single dataChanged range is emitted for the affected cells.
+        """
+        if not top_left.isValid() or not self.editable or self._data is None:
+            return 0, 0
+
+        row_count, column_count = self.data_handler.paste_block(top_left.row(), top_left.column(), text, row_order=self._row_order)
+        if row_count == 0 or column_count == 0:
+            return 0, 0
+
+        self._data = self.data_handler.df
+        bottom_right = self.index(top_left.row() + row_count - 1, top_left.column() + column_count - 1)
+        self.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.CheckStateRole])
+        self._emit_virtual_changed(top_left.row(), top_left.row() + row_count - 1)
+        return row_count, column_count
+
+    def _emit_virtual_changed(self, first_row: int, last_row: int) -> None:
+        """Repaints the virtual columns of edited rows, their expressions read the edited cells"""
+        if not self._virtual_columns or self._data is None:
+            return
+        self.dataChanged.emit(
+            self.index(first_row, self._data.shape[1]),
+            self.index(last_row, self.columnCount() - 1),
+            [Qt.ItemDataRole.DisplayRole],
+        )
+
     def flags(self, index: QModelIndex) -> Qt.ItemFlag:
         """Return item flags"""
         if not index.isValid():
@@ -367,7 +479,7 @@ class DataTableModel(QAbstractTableModel):
             if self._col_is_bool[col]:
                 default_flags |= Qt.ItemFlag.ItemIsUserCheckable
 
-        if self.editable:
+        if self.editable and not self._is_virtual_column(col):
             return default_flags | Qt.ItemFlag.ItemIsEditable
         
         return default_flags
@@ -387,6 +499,16 @@ class DataTableModel(QAbstractTableModel):
         is_alignment = (role == Qt.ItemDataRole.TextAlignmentRole or role == 7)
         
         if orientation == Qt.Orientation.Horizontal:
+            if self._is_virtual_column(section):
+                virtual_index = section - self._data.shape[1]
+                if not 0 <= virtual_index < len(self._virtual_columns):
+                    return None
+                name = self._virtual_columns[virtual_index]
+                if is_display:
+                    return name
+                if is_tooltip:
+                    return f"Virtual column: {name}\nExpression: {self.data_handler.virtual_columns.get(name, '')}"
+                return None
             try:
                 if is_display:
                     return str(self._data.columns[section])
@@ -407,35 +529,79 @@ class DataTableModel(QAbstractTableModel):
         elif orientation == Qt.Orientation.Vertical:
             if is_display:
                 try:
-                    return str(self._data.index[section])
+                    return str(self._data.index[self.source_row(section)])
                 except IndexError:
                     pass
         
         return None
     
     def sort(self, column: int, order: Qt.SortOrder) -> None:
-        """Sorts the dataframe based on the given column and the given order"""
+        """
+        Sorts the view based on the given column and the given order, Shift+click adds
+        the column as a further sort key. The data is only reordered by commit_view_sort
+        """
         if self._data is None:
             return
         
         # Validate column index to prevent error on empty dataframe
         # Suppresses sorting errors for index -1 is out of bounds when 
         # creating a new project with 0x0 row/cols
+        # Virtual columns have no stored values to sort the data by
         if column < 0 or column >= len(self._data.columns):
             return
         
+        col_name = self._data.columns[column]
+        ascending = (order == Qt.SortOrder.AscendingOrder)
+        if QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier and self._view_sort_keys:
+            keys = [key for key in self._view_sort_keys if key[0] != col_name] + [(col_name, ascending)]
+        else:
+            keys = [(col_name, ascending)]
+        self.set_view_sort(keys)
+    
+    def set_view_sort(self, keys: list[tuple[str, bool]]) -> None:
+        """Shows the rows ordered by keys, (column, ascending) pairs with the most significant first"""
         self.layoutAboutToBeChanged.emit()
 
         try:
-            col_name = self._data.columns[column]
-            ascending = (order == Qt.SortOrder.AscendingOrder)
-
-            self.data_handler.sort_data(col_name, ascending)
-            self._data = self.data_handler.df
-            self._update_column_alignments()
+            self._row_order = self.data_handler.view_sort_permutation(keys) if keys else None
+            self._view_sort_keys = list(keys) if keys else []
         except Exception as SortError:
             print(f"Error sorting data: {str(SortError)}")
             self.status_bar = StatusBar()
             self.status_bar.log(f"Error sorting data: {str(SortError)}")
+        self._inverse_row_order = None
         
-        self.layoutChanged.emit()
\ No newline at end of file
+        self.layoutChanged.emit()
+    
+    def clear_view_sort(self) -> None:
+        """Shows the rows in the order of the data again"""
+        self.set_view_sort([])
+    
+    def commit_view_sort(self) -> bool:
+        """Reorders the data like the view, as one history entry. Returns False without a view sort"""
+        if not self._view_sort_keys or self._row_order is None:
+            return False
+        self.data_handler.commit_view_sort(self._view_sort_keys, self._row_order)
+        
+        self.beginResetModel()
+        self._view_sort_keys = []
+        self._row_order = None
+        self._inverse_row_order = None
+        self._data = self.data_handler.df
+        self._virtual_blocks.clear()
+        self._update_column_alignments()
+        self.endResetModel()
+        return True
+    
+    def _refresh_view_sort(self) -> None:
+        """Recomputes the view sort for new data, dropping it when a sort column is gone"""
+        self._inverse_row_order = None
+        if not self._view_sort_keys or self._data is None or any(column not in self._data.columns for column, _ in self._view_sort_keys):
+            self._view_sort_keys = []
+            self._row_order = None
+            return
+        try:
+            self._row_order = self.data_handler.view_sort_permutation(self._view_sort_keys)
+        except Exception:
+            self._view_sort_keys = []
+            self._row_order = None
\ No newline at end of file
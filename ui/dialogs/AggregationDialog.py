@@ -5,7 +5,7 @@ from PyQt6.QtCore import Qt, QThreadPool, QTimer, QPoint
 from ui.theme import ThemeColors
 from ui.widgets import DataPlotStudioButton, DataPlotStudioGroupBox, DataPlotStudioLineEdit, DataPlotStudioComboBox, DataPlotStudioListWidget
 import pandas as pd
-from ui.workers import AggregationWorker
+from ui.workers import AggregationPreviewWorker, AggregationWorker
 
 DIALOG_WIDTH: int = 1200
 DIALOG_HEIGHT: int = 700
@@ -49,6 +49,8 @@ class AggregationDialog(QDialog):
         self.data_handler = data_handler
         self.thread_pool = QThreadPool.globalInstance()
         self.result_df = None
+        # Only the latest preview is shown, older runs are cancelled and their results ignored
+        self._preview_worker: AggregationPreviewWorker | None = None
         self.setWindowTitle("Aggregate Data")
         self.setModal(True)
         self.resize(DIALOG_WIDTH, DIALOG_HEIGHT)
@@ -235,9 +237,9 @@ class AggregationDialog(QDialog):
         bottom_layout = QVBoxLayout(bottom_widget)
         bottom_layout.setContentsMargins(0, 0, 0, 0)
         
-        preview_label = QLabel("Preview:")
-        preview_label.setFont(QFont("Consolas", 10, QFont.Weight.Bold))
-        bottom_layout.addWidget(preview_label)
+        self.preview_label = QLabel("Preview:")
+        self.preview_label.setFont(QFont("Consolas", 10, QFont.Weight.Bold))
+        bottom_layout.addWidget(self.preview_label)
 
         self.preview_table = QTableWidget()
         self.preview_table.horizontalHeader().setObjectName("MainDataHeader")
@@ -512,67 +514,79 @@ class AggregationDialog(QDialog):
         group_cols, agg_config, _ = self.get_current_config()
         self._evaluate_apply_button_state(group_cols, agg_config)
         
+        # The running preview is for options that just changed
+        self._cancel_preview()
+        self._show_preview_status("Status", "Updating preview...")
+        self.preview_timer.start()
+
+    def _show_preview_status(self, header: str, message: str) -> None:
+        self.preview_label.setText("Preview:")
         self.preview_table.clear()
         self.preview_table.setRowCount(1)
         self.preview_table.setColumnCount(1)
-        self.preview_table.setHorizontalHeaderLabels(["Status"])
-        self.preview_table.setItem(0, 0, QTableWidgetItem("Updating preview..."))
+        self.preview_table.setHorizontalHeaderLabels([header])
+        self.preview_table.setItem(0, 0, QTableWidgetItem(message))
         self.preview_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.preview_timer.start()
+
+    def _cancel_preview(self) -> None:
+        if self._preview_worker is not None:
+            self._preview_worker.cancel()
+            self._preview_worker = None
     
     def _execute_preview(self) -> None:
-        """Generate and display aggragation preview"""
+        """Start computing the aggregation preview in the background"""
         group_cols, agg_config, date_grouping = self.get_current_config()
 
         if not group_cols and not agg_config:
-            self.preview_table.clear()
-            self.preview_table.setRowCount(0)
-            self.preview_table.setColumnCount(1)
-            self.preview_table.setHorizontalHeaderLabels(["Status"])
-            self.preview_table.setItem(
-                0, 0, QTableWidgetItem("Select columns to see preview")
-            )
-            self.preview_table.horizontalHeader().setSectionResizeMode(
-                0, QHeaderView.ResizeMode.Stretch
-            )
+            self._show_preview_status("Status", "Select columns to see preview")
             return
 
-        try:
-            preview_df = self.data_handler.preview_aggregation(
-                group_by=group_cols,
-                agg_config=agg_config,
-                date_grouping=date_grouping,
-                limit=DEFAULT_PREVIEW_LIMIT,
-            )
+        self._cancel_preview()
+        worker = AggregationPreviewWorker(self.data_handler, group_cols, agg_config, date_grouping, DEFAULT_PREVIEW_LIMIT)
+        worker.signals.finished.connect(lambda preview, worker=worker: self.on_preview_finished(worker, preview))
+        worker.signals.error.connect(lambda error, worker=worker: self.on_preview_error(worker, error))
+        self._preview_worker = worker
+        self.thread_pool.start(worker)
 
-            self.preview_table.clear()
-            self.preview_table.setRowCount(len(preview_df))
-            self.preview_table.setColumnCount(len(preview_df.columns))
-            self.preview_table.setHorizontalHeaderLabels(
-                [str(column) for column in preview_df.columns]
-            )
+    def on_preview_finished(self, worker: AggregationPreviewWorker, preview) -> None:
+        """Display the preview of the latest worker"""
+        if worker is not self._preview_worker:
+            return
+        self._preview_worker = None
+        preview_df = preview.df
 
-            for row in range(len(preview_df)):
-                for col in range(len(preview_df.columns)):
-                    val = preview_df.iloc[row, col]
-                    item = QTableWidgetItem(str(val))
-                    self.preview_table.setItem(row, col, item)
+        self.preview_table.clear()
+        self.preview_table.setRowCount(len(preview_df))
+        self.preview_table.setColumnCount(len(preview_df.columns))
+        self.preview_table.setHorizontalHeaderLabels(
+            [str(column) for column in preview_df.columns]
+        )
 
-            self.preview_table.horizontalHeader().setSectionResizeMode(
-                QHeaderView.ResizeMode.Interactive
-            )
+        for row in range(len(preview_df)):
+            for col in range(len(preview_df.columns)):
+                val = preview_df.iloc[row, col]
+                item = QTableWidgetItem(str(val))
+                self.preview_table.setItem(row, col, item)
 
-        except Exception as PreviewTableError:
-            self.preview_table.clear()
-            self.preview_table.setRowCount(1)
-            self.preview_table.setColumnCount(1)
-            self.preview_table.setHorizontalHeaderLabels(["Error"])
-            self.preview_table.setItem(
-                0, 0, QTableWidgetItem(f"Cannot preview: {str(PreviewTableError)}")
-            )
-            self.preview_table.horizontalHeader().setSectionResizeMode(
-                0, QHeaderView.ResizeMode.Stretch
+        self.preview_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Interactive
+        )
+
+        if preview.is_approximate:
+            self.preview_label.setText(
+                f"Preview (approximate: sample of {preview.rows_used:,} of {preview.total_rows:,} rows, "
+                "sums and counts scaled up, small groups may be missing):"
             )
+            self.preview_label.setToolTip("Applying the aggregation uses every row.")
+        else:
+            self.preview_label.setText("Preview:")
+            self.preview_label.setToolTip("")
+
+    def on_preview_error(self, worker: AggregationPreviewWorker, PreviewTableError: Exception) -> None:
+        if worker is not self._preview_worker:
+            return
+        self._preview_worker = None
+        self._show_preview_status("Error", f"Cannot preview: {str(PreviewTableError)}")
 
     def validate_and_accept(self):
         """Validate selections before accepting"""
@@ -613,6 +627,8 @@ class AggregationDialog(QDialog):
             )
             return
         
+        self.preview_timer.stop()
+        self._cancel_preview()
         self.setEnabled(False)
         self.button_add.setEnabled(False)
         self.button_remove.setEnabled(False)
@@ -633,6 +649,11 @@ class AggregationDialog(QDialog):
         self.button_remove.setEnabled(True)
         QMessageBox.critical(self, "Aggregation Error", f"An error occurred:\n{str(error)}")
 
+    def done(self, result: int) -> None:
+        self.preview_timer.stop()
+        self._cancel_preview()
+        super().done(result)
+
     def get_aggregation_config(self):
         """Return the aggregation config"""
         group_cols, agg_config, date_grouping = self.get_current_config()
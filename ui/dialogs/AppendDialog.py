@@ -1,10 +1,11 @@
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFileDialog, QMessageBox
 from PyQt6.QtCore import Qt
+from core.concat_engine import ColumnPromotion, ConcatEngine
 from core.data_handler import DataHandler
 from ui.theme import ThemeColors
-from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioCheckBox
+from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioCheckBox, DataPlotStudioComboBox
 
 class AppendDialog(QDialog):
     """
@@ -25,8 +26,8 @@ class AppendDialog(QDialog):
         layout = QVBoxLayout(self)
         
         info_label = QLabel(
-            "Select a file to append to the current dataset. Rows from the selected "
-            "file will be added to the bottom of your current active dataframe"
+            "Select a file or an open dataset to append to the current dataset. Rows from the selected "
+            "data will be added to the bottom of your current active dataframe"
         )
         info_label.setWordWrap(True)
         info_label.setProperty("styleClass", "info_text")
@@ -45,6 +46,20 @@ class AppendDialog(QDialog):
         file_layout.addWidget(self.file_path_edit)
         file_layout.addWidget(browse_btn)
         layout.addLayout(file_layout)
+        
+        # Other open datasets of the workspace, appended without reading a file
+        other_datasets = [name for name in self.data_handler.dataset_names() if name != self.data_handler.active_dataset]
+        if other_datasets:
+            dataset_layout = QHBoxLayout()
+            self.dataset_combo = DataPlotStudioComboBox()
+            self.dataset_combo.addItems(other_datasets)
+            use_dataset_btn = DataPlotStudioButton("Use Dataset", parent=self)
+            use_dataset_btn.setToolTip("Append the rows of another open dataset")
+            use_dataset_btn.clicked.connect(self.use_dataset)
+            dataset_layout.addWidget(QLabel("Or an open dataset:"))
+            dataset_layout.addWidget(self.dataset_combo, 1)
+            dataset_layout.addWidget(use_dataset_btn)
+            layout.addLayout(dataset_layout)
 
         layout.addSpacing(10)
         
@@ -54,6 +69,12 @@ class AppendDialog(QDialog):
         self.ignore_index_checkbox.setToolTip("If checked, the resulting DataFrame will be re-indexed from 0 to n-1\nThis is default")
         layout.addWidget(self.ignore_index_checkbox)
         
+        self.type_changes_label = QLabel("")
+        self.type_changes_label.setWordWrap(True)
+        self.type_changes_label.setProperty("styleClass", "info_text")
+        self.type_changes_label.setVisible(False)
+        layout.addWidget(self.type_changes_label)
+        
         layout.addStretch()
         
         # Accept/reject buttons
@@ -80,35 +101,72 @@ class AppendDialog(QDialog):
         if file_path:
             try:
                 # Read without modifying the active datahandler state
-                self.other_df = self.data_handler.read_file(file_path)
-                self.file_path_edit.setText(file_path)
-                self.append_btn.setEnabled(True)
-                
-                # Schema validation and warning
-                current_cols = set(self.data_handler.df.columns)
-                other_cols = set(self.other_df.columns)
-                
-                missing_cols = current_cols - other_cols
-                extra_cols = other_cols - current_cols
-                if missing_cols or extra_cols:
-                    warning_msg = "Schema mismatch between the datasets.\n\n"
-                    if missing_cols:
-                        warning_msg += f"Missing in new file: {', '.join(list(missing_cols)[:3])}{'...' if len(missing_cols) > 3 else ''}\n"
-                    if extra_cols:
-                        warning_msg += f"Extra in new file: {', '.join(list(extra_cols)[:3])}{'...' if len(extra_cols) > 3 else ''}\n"
-                    
-                    warning_msg += "\nUnmatched columns will be populated with 'NaN'\nProceed?"
-                    reply = QMessageBox.warning(
-                        self, "Schema Mismatch", warning_msg,
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-                    )
-                    if reply == QMessageBox.StandardButton.No:
-                        self.other_df = None
-                        self.file_path_edit.clear()
-                        self.append_btn.setEnabled(False)
+                self._set_other_df(self.data_handler.read_file(file_path), file_path)
             except Exception as ReadError:
                 QMessageBox.critical(self, "Read Error", f"Failed to read file:\n{str(ReadError)}")
 
+    def use_dataset(self) -> None:
+        """Selects another open dataset as the rows to append"""
+        name = self.dataset_combo.currentText()
+        other_df = self.data_handler.dataset_frame(name)
+        if other_df is None:
+            QMessageBox.warning(self, "Empty Dataset", f"The dataset '{name}' has no data.")
+            return
+        try:
+            self._set_other_df(other_df, f"Dataset: {name}")
+        except Exception as ReadError:
+            QMessageBox.critical(self, "Dataset Error", f"Failed to use the dataset:\n{str(ReadError)}")
+
+    def _set_other_df(self, other_df: pd.DataFrame, source_label: str) -> None:
+        """Validates the schema of the rows to append against the current data"""
+        self.other_df = other_df
+        self.file_path_edit.setText(source_label)
+        self.append_btn.setEnabled(True)
+        
+        # Schema validation and warning
+        current_cols = set(self.data_handler.df.columns)
+        other_cols = set(self.other_df.columns)
+                
+        missing_cols = current_cols - other_cols
+        extra_cols = other_cols - current_cols
+        if ConcatEngine.is_available() and ConcatEngine.is_arrow_backed(self.data_handler.df):
+            try:
+                self._show_type_changes(ConcatEngine.schema_changes(self.data_handler.df, self.other_df))
+            except (ValueError, TypeError, NotImplementedError):
+                # Columns Arrow cannot hold, the append falls back to pandas
+                self.type_changes_label.setVisible(False)
+        if missing_cols or extra_cols:
+            warning_msg = "Schema mismatch between the datasets.\n\n"
+            if missing_cols:
+                warning_msg += f"Missing in new file: {', '.join(list(missing_cols)[:3])}{'...' if len(missing_cols) > 3 else ''}\n"
+            if extra_cols:
+                warning_msg += f"Extra in new file: {', '.join(list(extra_cols)[:3])}{'...' if len(extra_cols) > 3 else ''}\n"
+                    
+            warning_msg += "\nUnmatched columns will be populated with 'NaN'\nProceed?"
+            reply = QMessageBox.warning(
+                self, "Schema Mismatch", warning_msg,
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                self.other_df = None
+                self.file_path_edit.clear()
+                self.append_btn.setEnabled(False)
+
+    def _show_type_changes(self, changes: List[ColumnPromotion]) -> None:
+        """Lists the columns whose type changes to hold the appended rows"""
+        if not changes:
+            self.type_changes_label.setText("Column types match, the current data is appended without copying it.")
+        else:
+            lines = [
+                f"{change.column}: {change.current_type} + {change.new_type} -> {change.unified_type}"
+                + (" (existing rows are converted)" if change.copies_current else "")
+                for change in changes[:8]
+            ]
+            if len(changes) > 8:
+                lines.append(f"... and {len(changes) - 8} more")
+            self.type_changes_label.setText("Column types are unified:\n" + "\n".join(lines))
+        self.type_changes_label.setVisible(True)
+
     def accept_append(self) -> None:
         """Validates state before accepting the dialog."""
         if self.other_df is not None:
@@ -3,8 +3,9 @@ from tkinter import N
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QMessageBox, QWidget, QFormLayout
 from PyQt6.QtCore import Qt, QRegularExpression
 from PyQt6.QtGui import QRegularExpressionValidator
+from core.quantile_engine import QuantileEngine
 from ui.theme import ThemeColors
-from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioComboBox, DataPlotStudioSpinBox, DataPlotStudioGroupBox, DataPlotStudioCheckBox
+from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioComboBox, DataPlotStudioSpinBox, DataPlotStudioDoubleSpinBox, DataPlotStudioGroupBox, DataPlotStudioCheckBox
 
 import pandas as pd
 from typing import Any
@@ -14,6 +15,7 @@ class BinningMethod(Enum):
     """Enumeration of supported binning strategies."""
     FixedBins = "Fixed Number of Bins"
     Quantiles = "Quantiles"
+    ApproxQuantiles = "Approximate Quantiles (large data)"
     CustomEdges = "Custom Edges"
 
 class LabelStrategy(Enum):
@@ -75,6 +77,23 @@ class BinningDialog(QDialog):
         bin_count_layout.addWidget(self.bin_count_spin)
         self.settings_layout.addRow("Number of Bins:", self.bin_count_widget)
         
+        # Rank error of approximate quantiles
+        self.rank_error_widget = QWidget()
+        rank_error_layout = QVBoxLayout(self.rank_error_widget)
+        rank_error_layout.setContentsMargins(0, 0, 0, 0)
+        self.rank_error_spin = DataPlotStudioDoubleSpinBox()
+        self.rank_error_spin.setRange(0.05, 5.0)
+        self.rank_error_spin.setSingleStep(0.05)
+        self.rank_error_spin.setDecimals(2)
+        self.rank_error_spin.setSuffix(" %")
+        self.rank_error_spin.setValue(QuantileEngine.DEFAULT_RANK_ERROR * 100)
+        self.rank_error_spin.setToolTip(
+            "Edges are computed from a sorted random sample. Each edge is within this share of the rows of the exact quantile.\n"
+            "Smaller values use a larger sample, columns smaller than the sample use exact quantiles."
+        )
+        rank_error_layout.addWidget(self.rank_error_spin)
+        self.settings_layout.addRow("Quantile Rank Error:", self.rank_error_widget)
+        
         self.custom_edges_widget = QWidget()
         custom_edges_layout = QVBoxLayout(self.custom_edges_widget)
         custom_edges_layout.setContentsMargins(0, 0, 0, 0)
@@ -173,6 +192,7 @@ class BinningDialog(QDialog):
         
         self._set_row_visible(self.bin_count_widget, not is_custom)
         self._set_row_visible(self.custom_edges_widget, is_custom)
+        self._set_row_visible(self.rank_error_widget, selected_method_text == BinningMethod.ApproxQuantiles.value)
         
         selected_strategy_text = self.labels_strategy_combo.currentText()
         self._set_row_visible(self.custom_labels_widget, selected_strategy_text == LabelStrategy.Custom.value)
@@ -209,6 +229,9 @@ class BinningDialog(QDialog):
         elif selected_method_text == BinningMethod.Quantiles.value:
             self._parsed_bins = expected_bins
             self._pd_method = "qcut"
+        elif selected_method_text == BinningMethod.ApproxQuantiles.value:
+            self._parsed_bins = expected_bins
+            self._pd_method = "approx_qcut"
         elif selected_method_text == BinningMethod.CustomEdges.value:
             self._pd_method = "cut"
             edges_str = self.edges_input.text().strip()
@@ -295,7 +318,8 @@ class BinningDialog(QDialog):
             "bins": self._parsed_bins,
             "labels": self._parsed_labels,
             "right_inclusive": self.right_inclusive_checkbox.isChecked(),
-            "drop_original": self.drop_original_checkbox.isChecked()
+            "drop_original": self.drop_original_checkbox.isChecked(),
+            "rank_error": self.rank_error_spin.value() / 100 if self._pd_method == "approx_qcut" else None,
         }
         self.accept()
     
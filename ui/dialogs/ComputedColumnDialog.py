@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QMessageB
 from PyQt6.QtCore import Qt, QTimer, QSettings
 from PyQt6.QtGui import QTextCursor, QShortcut, QKeySequence, QCloseEvent, QFontDatabase
 from ui.theme import ThemeColors
-from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioGroupBox, DataPlotStudioListWidget
+from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioGroupBox, DataPlotStudioListWidget, DataPlotStudioCheckBox
 from ui.dialogs.CodeEditor import CodeEditor
 from ui.PythonHighlighter import PythonHighlighter
 
@@ -58,6 +58,13 @@ class ComputedColumnDialog(QDialog):
         self.name_input.setToolTip("Enter a valid, unique Python identifier (no spaces or special characters) as name")
         input_layout.addWidget(self.name_input)
 
+        self.virtual_check = DataPlotStudioCheckBox("Virtual column (evaluated on demand)")
+        self.virtual_check.setToolTip(
+            "Only store the expression. Values are calculated when the table, a plot or an export needs them,\n"
+            "so the column does not use memory or enlarge the undo history."
+        )
+        input_layout.addWidget(self.virtual_check)
+
         input_layout.addWidget(QLabel("Expression"))
         expression_layout = QHBoxLayout()
         equals_label = QLabel("=")
@@ -436,6 +443,9 @@ class ComputedColumnDialog(QDialog):
         else:
             QMessageBox.warning(self, "Validation Error", "Please resolve the highlighted errors before creating the column")
 
+    def is_virtual(self) -> bool:
+        return self.virtual_check.isChecked()
+
     def get_data(self) -> tuple[str, str]:
         return (
             self.name_input.text().strip(),
@@ -0,0 +1,175 @@
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView, QListWidgetItem
+
+from core.data_handler import DataHandler
+from ui.theme import ThemeColors
+from ui.widgets import DataPlotStudioButton, DataPlotStudioComboBox, DataPlotStudioGroupBox, DataPlotStudioListWidget
+from ui.icons import IconBuilder, IconType
+
+class DuplicateAnalyzerDialog(QDialog):
+    """
+    Dialog for finding duplicate rows by key columns, with group counts, the largest
+    duplicate groups and the rows to remove highlighted in the data table
+    """
+    KEEP_OPTIONS: List[tuple[str, Union[str, bool]]] = [
+        ("Keep the first copy", "first"),
+        ("Keep the last copy", "last"),
+        ("Remove every copy", False),
+    ]
+    EXAMPLE_GROUPS: int = 20
+
+    def __init__(self, data_handler: DataHandler, highlight_callback: Optional[Callable[[np.ndarray], None]] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Remove Duplicate Rows")
+        # Non modal so the highlighted rows can be reviewed in the data table
+        self.setModal(False)
+        self.resize(650, 600)
+
+        self.data_handler = data_handler
+        self.df: pd.DataFrame = data_handler.df
+        self.highlight_callback = highlight_callback
+        self.duplicate_rows: int = 0
+
+        self.init_ui()
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        info_label = QLabel("Rows are duplicates when all selected key columns are equal. The rows that would be removed are highlighted in red in the data table.")
+        info_label.setWordWrap(True)
+        info_label.setProperty("styleClass", "info_text")
+        layout.addWidget(info_label)
+        layout.addSpacing(10)
+
+        settings_group = DataPlotStudioGroupBox("Duplicate Keys")
+        settings_layout = QFormLayout()
+        settings_layout.setSpacing(10)
+
+        self.column_list = DataPlotStudioListWidget()
+        self.column_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
+        for column in self.df.columns:
+            item = QListWidgetItem(str(column))
+            item.setData(Qt.ItemDataRole.UserRole, column)
+            self.column_list.addItem(item)
+            item.setSelected(True)
+        self.column_list.setMaximumHeight(150)
+        self.column_list.setToolTip("Key columns compared between rows, all columns finds fully identical rows.")
+        self.column_list.itemSelectionChanged.connect(self._update_analysis)
+        settings_layout.addRow("Key Columns:", self.column_list)
+
+        self.keep_combo = DataPlotStudioComboBox()
+        for display_text, keep in self.KEEP_OPTIONS:
+            self.keep_combo.addItem(display_text, keep)
+        self.keep_combo.setToolTip("Which row of every duplicate group stays in the data.")
+        self.keep_combo.currentIndexChanged.connect(self._update_analysis)
+        settings_layout.addRow("Keep:", self.keep_combo)
+
+        settings_group.setLayout(settings_layout)
+        layout.addWidget(settings_group)
+
+        groups_group = DataPlotStudioGroupBox("Largest Duplicate Groups")
+        groups_layout = QVBoxLayout()
+        self.groups_table = QTableWidget()
+        self.groups_table.horizontalHeader().setObjectName("MainDataHeader")
+        self.groups_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.groups_table.verticalHeader().setObjectName("MainDataHeader")
+        self.groups_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        groups_layout.addWidget(self.groups_table)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setProperty("statusState", "success")
+        self.summary_label.setWordWrap(True)
+        groups_layout.addWidget(self.summary_label)
+        groups_group.setLayout(groups_layout)
+        layout.addWidget(groups_group)
+
+        button_layout = QHBoxLayout()
+        self.ok_button = DataPlotStudioButton("Remove Duplicates", parent=self, base_color_hex=ThemeColors.MainColor, text_color_hex="white")
+        self.ok_button.setIcon(IconBuilder.build(IconType.Checkmark))
+        self.ok_button.clicked.connect(self.validate_and_accept)
+        button_layout.addWidget(self.ok_button)
+
+        cancel_button = DataPlotStudioButton("Cancel", parent=self)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self._update_analysis()
+
+    def _selected_columns(self) -> List[Any]:
+        return [
+            self.column_list.item(row).data(Qt.ItemDataRole.UserRole)
+            for row in range(self.column_list.count())
+            if self.column_list.item(row).isSelected()
+        ]
+
+    def _set_status(self, message: str, state: str) -> None:
+        self.summary_label.setText(message)
+        self.summary_label.setProperty("statusState", state)
+        self.summary_label.style().unpolish(self.summary_label)
+        self.summary_label.style().polish(self.summary_label)
+
+    def _update_analysis(self, *args) -> None:
+        self.duplicate_rows = 0
+        self.groups_table.clear()
+        self.groups_table.setRowCount(0)
+        self.groups_table.setColumnCount(0)
+        columns = self._selected_columns()
+        if not columns:
+            self.ok_button.setEnabled(False)
+            self._highlight(np.zeros(len(self.df), dtype=bool))
+            self._set_status("Select at least one key column.", "error")
+            return
+        try:
+            # The rows are hashed on the first analysis of a key set, changing keep reuses the hashes
+            summary = self.data_handler.duplicate_summary(self.config_subset(columns), self.keep_combo.currentData(), examples=self.EXAMPLE_GROUPS)
+            mask = self.data_handler.duplicate_mask(self.config_subset(columns), self.keep_combo.currentData())
+        except Exception as AnalysisError:
+            self.ok_button.setEnabled(False)
+            self._set_status(f"Duplicate analysis failed: {str(AnalysisError)}", "error")
+            return
+
+        self.duplicate_rows = summary["duplicate_rows"]
+        self._highlight(mask)
+        self._fill_groups_table(summary["examples"])
+        self.ok_button.setEnabled(self.duplicate_rows > 0)
+        if self.duplicate_rows == 0:
+            self._set_status(f"No duplicate rows found in {summary['rows']:,} rows.", "success")
+            return
+        self._set_status(
+            f"{summary['duplicate_groups']:,} duplicate groups covering {summary['rows_in_duplicate_groups']:,} of {summary['rows']:,} rows. "
+            f"{self.duplicate_rows:,} rows will be removed.",
+            "success",
+        )
+
+    def _highlight(self, mask: np.ndarray) -> None:
+        if self.highlight_callback is not None:
+            self.highlight_callback(mask)
+
+    def _fill_groups_table(self, examples: pd.DataFrame) -> None:
+        self.groups_table.setColumnCount(len(examples.columns))
+        self.groups_table.setRowCount(len(examples))
+        self.groups_table.setHorizontalHeaderLabels([str(column) for column in examples.columns])
+        for row_idx, row in enumerate(examples.itertuples(index=False)):
+            for col_idx, value in enumerate(row):
+                text = str(value) if not pd.api.types.is_scalar(value) or pd.notna(value) else "NaN"
+                self.groups_table.setItem(row_idx, col_idx, QTableWidgetItem(text))
+
+    def config_subset(self, columns: Optional[List[Any]] = None) -> Optional[List[Any]]:
+        """The selected key columns, None when every column is selected"""
+        columns = self._selected_columns() if columns is None else columns
+        return None if len(columns) == len(self.df.columns) else columns
+
+    def validate_and_accept(self) -> None:
+        if not self._selected_columns() or self.duplicate_rows == 0:
+            return
+        self.accept()
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"subset": self.config_subset(), "keep": self.keep_combo.currentData()}
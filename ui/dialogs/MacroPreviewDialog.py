@@ -55,8 +55,16 @@ class MacroPreviewDialog(QDialog):
         self.toggle_all_btn.clicked.connect(self._toggle_all_checkboxes)
         self.toggle_all_btn.setProperty("styleClass", "secondary_button")
         
+        self.sql_engine_toggle = DataPlotStudioToggleSwitch()
+        self.sql_engine_toggle.setText("Run with DuckDB")
+        self.sql_engine_toggle.setToolTip(
+            "Compile supported steps into a single SQL query.\n"
+            "Steps without an SQL equivalent still run through pandas."
+        )
+        
         util_layout.addWidget(QLabel("<b>Execution Sequence</b>"))
         util_layout.addStretch()
+        util_layout.addWidget(self.sql_engine_toggle)
         util_layout.addWidget(self.toggle_all_btn)
         self.main_layout.addLayout(util_layout)
         
@@ -193,6 +201,10 @@ class MacroPreviewDialog(QDialog):
         """
         return [op_dict for cb, op_dict in self.step_trackers if cb.isChecked()]
     
+    def get_execution_engine(self) -> str:
+        """Returns the engine selected for running the macro"""
+        return "duckdb" if self.sql_engine_toggle.isChecked() else "pandas"
+    
     def _add_error_message(self, message: str) -> None:
         self.operations_list.clear()
         item = QListWidgetItem(message)
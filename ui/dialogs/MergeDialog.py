@@ -23,15 +23,19 @@ from ui.widgets import (
 )
 from ui.widgets.VennDiagramWidget import VennDiagramWidget
 from core.data_handler import DataHandler
+from core.join_engine import JoinPlan
 
 class MergeDialog(QDialog):
-    """Dialog for merging / joining the current dataset with another file"""
+    """Dialog for merging / joining the current dataset with another file or open dataset"""
     
     def __init__(self, data_handler: DataHandler, parent=None):
         super().__init__(parent)
         self.data_handler = data_handler
         self.right_df = None
         self.right_file_path = None
+        # The plan counts every join type, changing only the join type reuses it
+        self._plan: JoinPlan | None = None
+        self._plan_key: tuple | None = None
         
         self.setWindowTitle("Merge Datasets")
         self.resize(600, 500)
@@ -56,7 +60,23 @@ class MergeDialog(QDialog):
         
         file_layout.addWidget(self.file_label, 1)
         file_layout.addWidget(self.browse_button)
-        file_group.setLayout(file_layout)
+        file_group_layout = QVBoxLayout()
+        file_group_layout.addLayout(file_layout)
+        
+        # Other open datasets of the workspace, joined without reading a file
+        other_datasets = [name for name in self.data_handler.dataset_names() if name != self.data_handler.active_dataset]
+        if other_datasets:
+            dataset_layout = QHBoxLayout()
+            self.dataset_combo = DataPlotStudioComboBox()
+            self.dataset_combo.addItems(other_datasets)
+            use_dataset_button = DataPlotStudioButton("Use Dataset", parent=self)
+            use_dataset_button.setToolTip("Join with another open dataset")
+            use_dataset_button.clicked.connect(self.use_dataset)
+            dataset_layout.addWidget(QLabel("Or an open dataset:"))
+            dataset_layout.addWidget(self.dataset_combo, 1)
+            dataset_layout.addWidget(use_dataset_button)
+            file_group_layout.addLayout(dataset_layout)
+        file_group.setLayout(file_group_layout)
         layout.addWidget(file_group)
         
         # Join configs
@@ -106,6 +126,11 @@ class MergeDialog(QDialog):
         self.venn_widget.setObjectName("VennDiagramWidget")
         layout.addWidget(self.venn_widget)
         
+        self.plan_label = QLabel("")
+        self.plan_label.setWordWrap(True)
+        self.plan_label.setProperty("statusState", "success")
+        layout.addWidget(self.plan_label)
+        
         layout.addStretch()
         
         # Buttons
@@ -129,32 +154,68 @@ class MergeDialog(QDialog):
         
         if filepath:
             try:
-                self.right_df = self.data_handler.read_file(filepath)
+                self._set_right_df(self.data_handler.read_file(filepath), Path(filepath).name)
                 self.right_file_path = filepath
-                
-                self.file_label.setText(f"{Path(filepath).name} ({len(self.right_df)} rows)")
-                self.file_label.setProperty("status", "selected")
-                self.file_label.style().unpolish(self.file_label)
-                self.file_label.style().polish(self.file_label)
-                
-                self.right_on_combo.clear()
-                self.right_on_combo.addItems(list(self.right_df.columns))
-                
-                self.config_group.setEnabled(True)
-                self.merge_button.setEnabled(True)
-                current_cols = set(self.data_handler.df.columns)
-                for col in self.right_df.columns:
-                    if col in current_cols:
-                        self.right_on_combo.setCurrentText(col)
-                        self.left_on_combo.setCurrentText(col)
-                        break
-                self.update_preview()
             except Exception as Error:
                 QMessageBox.critical(self, "Load Error", f"Failed to load file:\n{str(Error)}")
-                self.right_df = None
-                self.config_group.setEnabled(False)
-                self.merge_button.setEnabled(False)
-                self.update_preview()
+                self._clear_right_df()
+    
+    def use_dataset(self):
+        name = self.dataset_combo.currentText()
+        right_df = self.data_handler.dataset_frame(name)
+        if right_df is None:
+            QMessageBox.warning(self, "Empty Dataset", f"The dataset '{name}' has no data.")
+            return
+        try:
+            self._set_right_df(right_df, f"Dataset: {name}")
+            self.right_file_path = None
+        except Exception as Error:
+            QMessageBox.critical(self, "Dataset Error", f"Failed to use the dataset:\n{str(Error)}")
+            self._clear_right_df()
+    
+    def _set_right_df(self, right_df: pd.DataFrame, source_label: str):
+        self.right_df = right_df
+        
+        self.file_label.setText(f"{source_label} ({len(self.right_df)} rows)")
+        self.file_label.setProperty("status", "selected")
+        self.file_label.style().unpolish(self.file_label)
+        self.file_label.style().polish(self.file_label)
+        
+        self.right_on_combo.clear()
+        self.right_on_combo.addItems(list(self.right_df.columns))
+        
+        self.config_group.setEnabled(True)
+        self.merge_button.setEnabled(True)
+        current_cols = set(self.data_handler.df.columns)
+        for col in self.right_df.columns:
+            if col in current_cols:
+                self.right_on_combo.setCurrentText(col)
+                self.left_on_combo.setCurrentText(col)
+                break
+        self.update_preview()
+    
+    def _clear_right_df(self):
+        self.right_df = None
+        self.config_group.setEnabled(False)
+        self.merge_button.setEnabled(False)
+        self.update_preview()
+    
+    def _set_plan_status(self, message: str, state: str) -> None:
+        self.plan_label.setText(message)
+        self.plan_label.setProperty("statusState", state)
+        self.plan_label.style().unpolish(self.plan_label)
+        self.plan_label.style().polish(self.plan_label)
+    
+    def _current_plan(self) -> JoinPlan | None:
+        if self.right_df is None or not self.left_on_combo.currentText() or not self.right_on_combo.currentText():
+            return None
+        plan_key = (id(self.right_df), self.data_handler.data_version, self.left_on_combo.currentText(), self.right_on_combo.currentText())
+        if plan_key != self._plan_key:
+            # Key value counts only, the join itself runs on Merge
+            self._plan, self._plan_key = None, None
+            self._plan = self.data_handler.plan_merge(self.right_df, [plan_key[2]], [plan_key[3]])
+            self._plan_key = plan_key
+        return self._plan
     
     def update_preview(self, *args):
         left_count = len(self.data_handler.df) if self.data_handler.df is not None else 0
@@ -162,24 +223,24 @@ class MergeDialog(QDialog):
         join_type = self.join_type_combo.currentText().lower()
         result_count = 0
         
-        if (self.right_df is not None and self.left_on_combo.currentText() and self.right_on_combo.currentText()):
-            left_col = self.left_on_combo.currentText()
-            right_col = self.right_on_combo.currentText()
-            
-            try:
-                l_subset = self.data_handler.df[[left_col]].copy()
-                r_subset = self.right_df[[right_col]].copy()
-                l_subset[left_col] = l_subset[left_col].astype(str)
-                r_subset[right_col] = r_subset[right_col].astype(str)
-                
-                l_subset.rename(columns={left_col: "key"}, inplace=True)
-                r_subset.rename(columns={right_col: "key"}, inplace=True)
-                
-                merged_preview = pd.merge(l_subset, r_subset, on="key", how=join_type)
-                result_count = len(merged_preview)
-            except Exception as error:
-                result_count = 0
-                print(f"Preview merge failed: {error}")
+        try:
+            plan = self._current_plan()
+        except Exception as error:
+            plan = None
+            self._set_plan_status(f"Could not compare the join keys: {str(error)}", "error")
+        
+        if plan is not None:
+            result_count = plan.result_rows(join_type)
+            prefix = "" if plan.is_exact else "~"
+            warning = plan.warning(join_type)
+            self._set_plan_status(
+                f"Current data only: {prefix}{plan.left_only:,} rows, matched: {prefix}{plan.matched:,} row pairs, "
+                f"new data only: {prefix}{plan.right_only:,} rows. Result: {prefix}{result_count:,} rows."
+                + (f"\nWarning: {warning}" if warning else ""),
+                "error" if warning else "success",
+            )
+        elif self.right_df is None:
+            self._set_plan_status("", "success")
         
         self.venn_widget.set_data(join_type, left_count, right_count, result_count)
     
@@ -196,7 +257,7 @@ class MergeDialog(QDialog):
         
         try:
             left_dtype = self.data_handler.df[left_col].dtype
-            right_dtype = self.data_handler.df[right_col].dtype
+            right_dtype = self.right_df[right_col].dtype
             
             is_left_num = pd.api.types.is_numeric_dtype(left_dtype)
             is_right_num = pd.api.types.is_numeric_dtype(right_dtype)
@@ -213,6 +274,19 @@ class MergeDialog(QDialog):
         except Exception:
             pass
         
+        join_type = self.join_type_combo.currentText().lower()
+        warning = self._plan.warning(join_type) if self._plan is not None else ""
+        if warning:
+            res = QMessageBox.warning(
+                self,
+                "Many-to-Many Join",
+                f"{warning[0].upper()}{warning[1:]}\n\nCheck the join keys. Merge anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            if res == QMessageBox.StandardButton.No:
+                return
+        
         self.accept()
         
     def get_config(self):
@@ -1,11 +1,13 @@
 # ui/dialogs/OutlierDetectionDialog.py
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QMessageBox, QInputDialog, QWidget, QSplitter, QHeaderView, QApplication
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QMessageBox, QInputDialog, QWidget, QSplitter, QHeaderView
+from PyQt6.QtCore import Qt, QTimer, QThreadPool
+import numpy as np
 
 from core.data_handler import DataHandler
 from ui.theme import ThemeColors
 from ui.widgets import DataPlotStudioComboBox, DataPlotStudioDoubleSpinBox, DataPlotStudioButton, DataPlotStudioGroupBox, DataPlotStudioSpinBox
 from ui.data_table_model import DataTableModel
+from ui.workers import OutlierDetectionWorker
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
@@ -20,7 +22,13 @@ class OutlierDetectionDialog(QDialog):
         super().__init__(parent)
         self.data_handler: DataHandler = data_handler
         self.method = method
-        self.outlier_indices = []
+        # Boolean mask over the rows of the current dataset
+        self.outlier_mask: np.ndarray = np.zeros(0, dtype=bool)
+        # Columns and settings outlier_mask was detected with, they are logged instead of the mask
+        self._detected_columns: list[str] = []
+        self._detected_settings: dict = {}
+        self.thread_pool = QThreadPool.globalInstance()
+        self._detection_worker: OutlierDetectionWorker | None = None
         
         self.debounce_timer = QTimer()
         self.debounce_timer.setSingleShot(True)
@@ -188,63 +196,96 @@ class OutlierDetectionDialog(QDialog):
 
         layout.addLayout(button_layout)
 
+    @property
+    def outlier_count(self) -> int:
+        return int(np.count_nonzero(self.outlier_mask))
+
     def apply_detection(self) -> None:
-        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-        try:
-            selected_col_text = self.column_combo.currentText()
-            columns = (
-                self.numeric_columns
-                if selected_col_text == "All Numeric Columns"
-                else [selected_col_text]
-            )
+        """Starts detection in the background, a run that is still in progress is cancelled"""
+        selected_col_text = self.column_combo.currentText()
+        columns = (
+            self.numeric_columns
+            if selected_col_text == "All Numeric Columns"
+            else [selected_col_text]
+        )
 
-            param = self.parameter_spin.value()
-            kwargs = {}
+        param = self.parameter_spin.value()
+        kwargs = {}
 
-            if self.method == "z_score":
-                kwargs["threshold"] = param
-            if self.method == "iqr":
-                kwargs["multiplier"] = param
-            if self.method == "isolation_forest":
-                kwargs["contamination"] = param
+        if self.method == "z_score":
+            kwargs["threshold"] = param
+        if self.method == "iqr":
+            kwargs["multiplier"] = param
+        if self.method == "isolation_forest":
+            kwargs["contamination"] = param
+
+        self._cancel_detection()
+        self.flag_button.setEnabled(False)
+        self.remove_button.setEnabled(False)
+        self.clip_button.setEnabled(False)
+        self.info_label.setText("Detecting outliers...")
+        self._set_info_state("normal")
+
+        worker = OutlierDetectionWorker(self.data_handler, self.method, columns, **kwargs)
+        worker.signals.finished.connect(
+            lambda outlier_mask, worker=worker: self.on_detection_finished(worker, outlier_mask, columns, param, kwargs)
+        )
+        worker.signals.error.connect(lambda error, worker=worker: self.on_detection_error(worker, error))
+        self._detection_worker = worker
+        self.thread_pool.start(worker)
+
+    def _cancel_detection(self) -> None:
+        if self._detection_worker is not None:
+            self._detection_worker.cancel()
+            self._detection_worker = None
+
+    def _set_info_state(self, state: str) -> None:
+        self.info_label.setProperty("state", state)
+        self.info_label.style().unpolish(self.info_label)
+        self.info_label.style().polish(self.info_label)
+
+    def on_detection_finished(self, worker: OutlierDetectionWorker, outlier_mask: np.ndarray, columns: list[str], param: float, settings: dict) -> None:
+        # Results of superseded runs are ignored
+        if worker is not self._detection_worker:
+            return
+        self._detection_worker = None
+        self.outlier_mask = outlier_mask
+        self._detected_columns = columns
+        self._detected_settings = settings
 
-            self.outlier_indices = self.data_handler.detect_outliers(
-                self.method, columns, **kwargs
-            )
+        self.model = DataTableModel(
+            self.data_handler, highlighted_rows=self.outlier_mask
+        )
+        self.table_view.setModel(self.model)
+        outlier_count = self.outlier_count
+        self.info_label.setText(f"Found {outlier_count} outliers.")
+        self._set_info_state("warning" if outlier_count > 0 else "success")
+        
+        has_outliers = outlier_count > 0
+        self.flag_button.setEnabled(has_outliers)
+        self.remove_button.setEnabled(has_outliers)
+        if self.method != "isolation_forest":
+            self.clip_button.setEnabled(has_outliers)
 
-            self.model = DataTableModel(
-                self.data_handler, highlighted_rows=self.outlier_indices
-            )
-            self.table_view.setModel(self.model)
-            outlier_count = len(self.outlier_indices)
-            self.info_label.setText(f"Found {outlier_count} outliers.")
-            
-            self.info_label.setProperty("state", "warning" if outlier_count > 0 else "success")
-            self.info_label.style().unpolish(self.info_label)
-            self.info_label.style().polish(self.info_label)
-            
-            has_outliers = outlier_count > 0
-            self.flag_button.setEnabled(has_outliers)
-            self.remove_button.setEnabled(has_outliers)
-            if self.method != "isolation_forest":
-                self.clip_button.setEnabled(has_outliers)
+        self.update_plot(columns, param)
 
-            self.update_plot(columns, param)
+    def on_detection_error(self, worker: OutlierDetectionWorker, ApplyOutlierDetectionError: Exception) -> None:
+        if worker is not self._detection_worker:
+            return
+        self._detection_worker = None
+        self.info_label.setText(
+            f"ApplyOutlierDetectionError: {str(ApplyOutlierDetectionError)}"
+        )
+        self._set_info_state("error")
+        
+        self.outlier_mask = np.zeros(0, dtype=bool)
+        self.flag_button.setEnabled(False)
+        self.remove_button.setEnabled(False)
+        self.clip_button.setEnabled(False)
 
-        except Exception as ApplyOutlierDetectionError:
-            self.info_label.setText(
-                f"ApplyOutlierDetectionError: {str(ApplyOutlierDetectionError)}"
-            )
-            self.info_label.setProperty("state", "error")
-            self.info_label.style().unpolish(self.info_label)
-            self.info_label.style().polish(self.info_label)
-            
-            self.outlier_indices = []
-            self.flag_button.setEnabled(False)
-            self.remove_button.setEnabled(False)
-            self.clip_button.setEnabled(False)
-        finally:
-            QApplication.restoreOverrideCursor()
+    def done(self, result: int) -> None:
+        self._cancel_detection()
+        super().done(result)
 
     def on_bins_changed(self) -> None:
         """Refreshes the plot when bin count is change"""
@@ -357,7 +398,7 @@ class OutlierDetectionDialog(QDialog):
 
     def clip_outliers(self) -> None:
         """Clip outliers to a calculated threshold instead of removing rows"""
-        if not self.outlier_indices and self.method != "isolation_forest":
+        if not self.outlier_count and self.method != "isolation_forest":
             return
 
         reply = QMessageBox.question(
@@ -385,29 +426,29 @@ class OutlierDetectionDialog(QDialog):
             self.accept()
 
     def remove_outliers(self) -> None:
-        if not self.outlier_indices:
+        if not self.outlier_count:
             return
 
         reply = QMessageBox.question(
             self,
             "Confirm Removal",
-            f"Are you sure you want to remove: {len(self.outlier_indices)} rows from the current dataset?",
+            f"Are you sure you want to remove: {self.outlier_count} rows from the current dataset?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.data_handler.clean_data("remove_rows", rows=self.outlier_indices)
+            self.data_handler.remove_outliers(self.method, self._detected_columns, mask=self.outlier_mask, **self._detected_settings)
             self.accept()
     
     def flag_outliers(self) -> None:
         """Flags detected outliers in a new column as True"""
-        if not self.outlier_indices:
+        if not self.outlier_count:
             return
         
         name, ok = QInputDialog.getText(self, "Flag Outliers", "Enter name for the new column:", text="is_outlier")
         if ok and name:
             try:
-                self.data_handler.clean_data("flag_outliers", rows=self.outlier_indices, new_column_name=name)
+                self.data_handler.flag_outliers(name, self.method, self._detected_columns, mask=self.outlier_mask, **self._detected_settings)
                 self.accept()
             except Exception as error:
                 QMessageBox.critical(self, "Error", f"Failed to flag outliers: {str(error)}")
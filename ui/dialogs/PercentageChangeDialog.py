@@ -62,6 +62,13 @@ class PercentageChangeDialog(QDialog):
         self.fill_method_combo.currentTextChanged.connect(self._on_parameters_changed)
         settings_layout.addRow("NA Fill Method:", self.fill_method_combo)
         
+        self.group_combo = DataPlotStudioComboBox()
+        self.group_combo.addItem("(None)", None)
+        for column in self.df.columns:
+            self.group_combo.addItem(str(column), column)
+        self.group_combo.setToolTip("Optional column identifying entities, values are only compared within the same group.")
+        settings_layout.addRow("Group By:", self.group_combo)
+        
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
         
@@ -219,5 +226,6 @@ class PercentageChangeDialog(QDialog):
             "column": self.column_combo.currentText(),
             "periods": self.periods_spin.value(),
             "fill_method": None if fill_raw == "none" else fill_raw,
+            "group_by": [self.group_combo.currentData()] if self.group_combo.currentData() is not None else None,
             "new_column": self.new_name_input.text().strip()
         }
\ No newline at end of file
@@ -0,0 +1,260 @@
+from typing import List, Dict, Any
+
+import pandas as pd
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView, QListWidgetItem
+
+from core.data_handler import DataHandler
+from core.resample_engine import ResampleEngine
+from ui.theme import ThemeColors
+from ui.widgets import DataPlotStudioButton, DataPlotStudioComboBox, DataPlotStudioSpinBox, DataPlotStudioGroupBox, DataPlotStudioListWidget
+from ui.icons import IconBuilder, IconType
+
+class ResampleDialog(QDialog):
+    """
+    Dialog for resampling a time series into regular time bins
+    """
+    FREQUENCIES: List[tuple[str, str]] = [
+        ("1 Second", "1s"),
+        ("1 Minute", "1min"),
+        ("5 Minutes", "5min"),
+        ("15 Minutes", "15min"),
+        ("1 Hour", "h"),
+        ("1 Day", "D"),
+        ("1 Week", "W"),
+        ("Month Start", "MS"),
+        ("Quarter Start", "QS"),
+        ("Year Start", "YS"),
+    ]
+    AGGREGATIONS: List[tuple[str, str]] = [
+        ("Open/High/Low/Close (OHLC)", "ohlc"),
+        ("Sum", "sum"),
+        ("Mean", "mean"),
+        ("First", "first"),
+        ("Last", "last"),
+        ("Count", "count"),
+        ("Minimum", "min"),
+        ("Maximum", "max"),
+    ]
+    FILL_OPTIONS: List[tuple[str, str]] = [
+        ("Keep empty bins (missing values)", "none"),
+        ("Drop empty bins", "drop"),
+        ("Forward fill", "ffill"),
+        ("Fill with zero", "zero"),
+        ("Interpolate linearly", "interpolate"),
+    ]
+
+    def __init__(self, data_handler: DataHandler, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Resample Time Series")
+        self.setModal(True)
+        self.resize(700, 650)
+
+        self.data_handler = data_handler
+        self.df: pd.DataFrame = data_handler.df
+        self.datetime_columns: List[str] = [column for column in self.df.columns if pd.api.types.is_datetime64_any_dtype(self.df[column])]
+        self.numeric_columns: List[str] = self.df.select_dtypes(include=["number"]).columns.tolist()
+
+        self.init_ui()
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        info_label = QLabel("Reduce the rows to one row per time bin, e.g. ticks to 1 minute OHLC bars. The result replaces the current data, undo restores the original rows.")
+        info_label.setWordWrap(True)
+        info_label.setProperty("styleClass", "info_text")
+        layout.addWidget(info_label)
+        layout.addSpacing(10)
+
+        settings_group = DataPlotStudioGroupBox("Resample Parameters")
+        settings_layout = QFormLayout()
+        settings_layout.setSpacing(10)
+
+        self.time_column_combo = DataPlotStudioComboBox()
+        self.time_column_combo.addItems([str(column) for column in self.datetime_columns])
+        self.time_column_combo.setToolTip("The datetime column defining the time bins.")
+        self.time_column_combo.currentIndexChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Time Column:", self.time_column_combo)
+
+        self.frequency_combo = DataPlotStudioComboBox()
+        self.frequency_combo.setEditable(True)
+        for display_text, alias in self.FREQUENCIES:
+            self.frequency_combo.addItem(display_text, alias)
+        self.frequency_combo.setCurrentIndex(1)
+        self.frequency_combo.setToolTip("Width of each bin. Type a pandas offset such as 30s, 10min or 4h for other widths.")
+        self.frequency_combo.currentTextChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Frequency:", self.frequency_combo)
+
+        self.column_list = DataPlotStudioListWidget()
+        self.column_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
+        for column in self.df.columns:
+            if column in self.datetime_columns:
+                continue
+            item = QListWidgetItem(str(column))
+            item.setData(Qt.ItemDataRole.UserRole, column)
+            self.column_list.addItem(item)
+            if column in self.numeric_columns and not self.column_list.selectedItems():
+                item.setSelected(True)
+        self.column_list.setMaximumHeight(110)
+        self.column_list.setToolTip("Columns to aggregate. Text columns only support first, last and count.")
+        self.column_list.itemSelectionChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Columns:", self.column_list)
+
+        self.aggregation_list = DataPlotStudioListWidget()
+        self.aggregation_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
+        for display_text, aggregation in self.AGGREGATIONS:
+            item = QListWidgetItem(display_text)
+            item.setData(Qt.ItemDataRole.UserRole, aggregation)
+            self.aggregation_list.addItem(item)
+        self.aggregation_list.item(0).setSelected(True)
+        self.aggregation_list.setMaximumHeight(130)
+        self.aggregation_list.setToolTip("Aggregates computed for every selected column in one pass over the rows.")
+        self.aggregation_list.itemSelectionChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Aggregations:", self.aggregation_list)
+
+        self.fill_combo = DataPlotStudioComboBox()
+        for display_text, fill in self.FILL_OPTIONS:
+            self.fill_combo.addItem(display_text, fill)
+        self.fill_combo.setToolTip("How bins without any rows are handled. Sums and counts of empty bins are always 0.")
+        self.fill_combo.currentIndexChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Gap Filling:", self.fill_combo)
+
+        settings_group.setLayout(settings_layout)
+        layout.addWidget(settings_group)
+
+        preview_group = DataPlotStudioGroupBox("Preview")
+        preview_layout = QVBoxLayout()
+        sample_layout = QHBoxLayout()
+        sample_layout.addWidget(QLabel("Preview on the first"))
+        self.sample_spin = DataPlotStudioSpinBox()
+        self.sample_spin.setRange(1000, 10_000_000)
+        self.sample_spin.setSingleStep(10_000)
+        self.sample_spin.setValue(min(100_000, max(1000, len(self.df))))
+        self.sample_spin.setToolTip("The preview resamples only this many leading rows, the full table is resampled on Apply.")
+        sample_layout.addWidget(self.sample_spin)
+        sample_layout.addWidget(QLabel("rows"))
+        sample_layout.addStretch()
+        self.preview_button = DataPlotStudioButton("Preview", parent=self)
+        self.preview_button.clicked.connect(self._update_preview)
+        sample_layout.addWidget(self.preview_button)
+        preview_layout.addLayout(sample_layout)
+
+        self.preview_table = QTableWidget()
+        self.preview_table.horizontalHeader().setObjectName("MainDataHeader")
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview_table.verticalHeader().setObjectName("MainDataHeader")
+        self.preview_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        preview_layout.addWidget(self.preview_table)
+
+        self.validation_label = QLabel("")
+        self.validation_label.setProperty("statusState", "success")
+        preview_layout.addWidget(self.validation_label)
+        preview_group.setLayout(preview_layout)
+        layout.addWidget(preview_group)
+
+        button_layout = QHBoxLayout()
+        self.ok_button = DataPlotStudioButton("Apply", parent=self, base_color_hex=ThemeColors.MainColor, text_color_hex="white")
+        self.ok_button.setIcon(IconBuilder.build(IconType.Checkmark))
+        self.ok_button.clicked.connect(self.validate_and_accept)
+        button_layout.addWidget(self.ok_button)
+
+        cancel_button = DataPlotStudioButton("Cancel", parent=self)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self._on_parameters_changed()
+
+    def _frequency(self) -> str:
+        alias = self.frequency_combo.currentData()
+        if alias is not None and self.frequency_combo.currentText() == self.frequency_combo.itemText(self.frequency_combo.currentIndex()):
+            return alias
+        return self.frequency_combo.currentText().strip()
+
+    def _aggregations(self) -> Dict[Any, List[str]]:
+        selected_aggregations = [
+            self.aggregation_list.item(row).data(Qt.ItemDataRole.UserRole)
+            for row in range(self.aggregation_list.count())
+            if self.aggregation_list.item(row).isSelected()
+        ]
+        aggregations: Dict[Any, List[str]] = {}
+        for row in range(self.column_list.count()):
+            item = self.column_list.item(row)
+            if not item.isSelected():
+                continue
+            column = item.data(Qt.ItemDataRole.UserRole)
+            if column in self.numeric_columns:
+                column_aggregations = selected_aggregations
+            else:
+                column_aggregations = [aggregation for aggregation in selected_aggregations if aggregation in ("first", "last", "count")]
+            if column_aggregations:
+                aggregations[column] = column_aggregations
+        return aggregations
+
+    def _validation_error(self) -> str:
+        if not self.datetime_columns:
+            return "The dataset has no datetime column to resample on."
+        if not self._aggregations():
+            return "Select at least one column and an aggregation it supports."
+        try:
+            ResampleEngine.parse_frequency(self._frequency())
+        except ValueError as FrequencyError:
+            return str(FrequencyError)
+        return ""
+
+    def _set_status(self, message: str, state: str) -> None:
+        self.validation_label.setText(message)
+        self.validation_label.setProperty("statusState", state)
+        self.validation_label.style().unpolish(self.validation_label)
+        self.validation_label.style().polish(self.validation_label)
+
+    def _on_parameters_changed(self, *args) -> None:
+        error = self._validation_error()
+        self.ok_button.setEnabled(not error)
+        self.preview_button.setEnabled(not error)
+        self.preview_table.clear()
+        self.preview_table.setRowCount(0)
+        self.preview_table.setColumnCount(0)
+        self._set_status(error or "Ready, press Preview to check the first bins.", "error" if error else "success")
+
+    def _update_preview(self) -> None:
+        if self._validation_error():
+            return
+        try:
+            preview_df = self.data_handler.preview_resample(
+                self.datetime_columns[self.time_column_combo.currentIndex()],
+                self._frequency(),
+                self._aggregations(),
+                self.fill_combo.currentData(),
+                sample_rows=self.sample_spin.value(),
+            )
+        except Exception as PreviewError:
+            self._set_status(f"Preview failed: {str(PreviewError)}", "error")
+            return
+
+        self.preview_table.setColumnCount(len(preview_df.columns))
+        self.preview_table.setRowCount(len(preview_df))
+        self.preview_table.setHorizontalHeaderLabels([str(column) for column in preview_df.columns])
+        for row_idx, row in enumerate(preview_df.itertuples(index=False)):
+            for col_idx, value in enumerate(row):
+                if isinstance(value, float):
+                    text = f"{value:.4f}" if pd.notna(value) else "NaN"
+                else:
+                    text = str(value) if pd.notna(value) else "NaN"
+                self.preview_table.setItem(row_idx, col_idx, QTableWidgetItem(text))
+        self._set_status(f"First {len(preview_df)} bins of the first {self.sample_spin.value():,} rows", "success")
+
+    def validate_and_accept(self) -> None:
+        if self._validation_error():
+            return
+        self.accept()
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            "on": self.datetime_columns[self.time_column_combo.currentIndex()],
+            "frequency": self._frequency(),
+            "aggregations": self._aggregations(),
+            "fill": self.fill_combo.currentData(),
+        }
@@ -2,10 +2,12 @@ from typing import List, Dict, Any
 import keyword
 import pandas as pd
 
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView, QListWidgetItem
 
 from ui.theme import ThemeColors
-from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioComboBox, DataPlotStudioSpinBox, DataPlotStudioGroupBox, DataPlotStudioCheckBox
+from core.rolling_engine import RollingEngine
+from ui.widgets import DataPlotStudioButton, DataPlotStudioLineEdit, DataPlotStudioComboBox, DataPlotStudioSpinBox, DataPlotStudioGroupBox, DataPlotStudioCheckBox, DataPlotStudioListWidget
 from ui.icons import IconBuilder, IconType
 
 class RollingWindowDialog(QDialog):
@@ -20,6 +22,7 @@ class RollingWindowDialog(QDialog):
         
         self.df: pd.DataFrame = df
         self.numeric_columns: List[str] = df.select_dtypes(include=["number"]).columns.tolist()
+        self.datetime_columns: List[str] = [column for column in df.columns if pd.api.types.is_datetime64_any_dtype(df[column])]
         self.existing_columns: List[str] = df.columns.tolist()
         
         self.init_ui()
@@ -27,7 +30,7 @@ class RollingWindowDialog(QDialog):
     def init_ui(self) -> None:
         layout = QVBoxLayout()
         
-        info_label = QLabel("Calculate moving averages and other rolling statistics. The window size determines how many previous rows are included in the calculation.")
+        info_label = QLabel("Calculate moving averages and other rolling statistics. The window size determines how many previous rows are included in the calculation, or with a time column how far back in time. Windows never cross group boundaries.")
         info_label.setWordWrap(True)
         info_label.setProperty("styleClass", "info_text")
         layout.addWidget(info_label)
@@ -51,6 +54,29 @@ class RollingWindowDialog(QDialog):
         self.window_spin.valueChanged.connect(self._on_parameters_changed)
         settings_layout.addRow("Window Size:", self.window_spin)
         
+        self.time_column_combo = DataPlotStudioComboBox()
+        self.time_column_combo.addItem("(Row order)", None)
+        for column in self.datetime_columns:
+            self.time_column_combo.addItem(str(column), column)
+        self.time_column_combo.setToolTip("Order rows by a datetime column and use a time based window instead of a row count.")
+        self.time_column_combo.currentIndexChanged.connect(self._on_time_column_changed)
+        settings_layout.addRow("Time Column:", self.time_column_combo)
+        
+        self.time_window_input = DataPlotStudioLineEdit()
+        self.time_window_input.setText("7D")
+        self.time_window_input.setToolTip("Time span of each window, e.g. 7D, 12h or 30min")
+        self.time_window_input.setEnabled(False)
+        self.time_window_input.textChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Time Window:", self.time_window_input)
+        
+        self.group_list = DataPlotStudioListWidget()
+        self.group_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
+        self.group_list.addItems([str(column) for column in self.existing_columns])
+        self.group_list.setMaximumHeight(90)
+        self.group_list.setToolTip("Optional columns identifying entities, each group gets its own windows.")
+        self.group_list.itemSelectionChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Group By:", self.group_list)
+        
         self.min_periods_spin = DataPlotStudioSpinBox()
         self.min_periods_spin.setRange(1, 100000)
         self.min_periods_spin.setValue(1)
@@ -65,7 +91,8 @@ class RollingWindowDialog(QDialog):
         self.center_checkbox.stateChanged.connect(self._on_parameters_changed)
         settings_layout.addRow("Alignment:", self.center_checkbox)
         
-        self.operation_combo = DataPlotStudioComboBox()
+        self.operation_list = DataPlotStudioListWidget()
+        self.operation_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
         operations = [
             ("Moving Average (Mean)", "mean"),
             ("Moving Sum", "sum"),
@@ -75,10 +102,14 @@ class RollingWindowDialog(QDialog):
             ("Rolling Std. Dev.", "std")
         ]
         for display_text, internal_val in operations:
-            self.operation_combo.addItem(display_text, internal_val)
-        self.operation_combo.setToolTip("The mathematical operation to apply across the moving window.")
-        self.operation_combo.currentTextChanged.connect(self._on_parameters_changed)
-        settings_layout.addRow("Operation:", self.operation_combo)
+            item = QListWidgetItem(display_text)
+            item.setData(Qt.ItemDataRole.UserRole, internal_val)
+            self.operation_list.addItem(item)
+        self.operation_list.item(0).setSelected(True)
+        self.operation_list.setMaximumHeight(120)
+        self.operation_list.setToolTip("The statistics to compute across the moving window, all selected statistics share one pass over the windows.")
+        self.operation_list.itemSelectionChanged.connect(self._on_parameters_changed)
+        settings_layout.addRow("Statistics:", self.operation_list)
         
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -89,7 +120,7 @@ class RollingWindowDialog(QDialog):
         
         form_layout = QFormLayout()
         self.new_name_input = DataPlotStudioLineEdit()
-        self.new_name_input.setToolTip("The name of the new column that will store the rolling results.")
+        self.new_name_input.setToolTip("The name of the new column that will store the rolling results, the prefix of the new columns with several statistics.")
         self.new_name_input.textChanged.connect(self._live_validate_name)
         form_layout.addRow("New Column Name:", self.new_name_input)
         
@@ -135,15 +166,43 @@ class RollingWindowDialog(QDialog):
     def _on_parameters_changed(self, *args) -> None:
         self._auto_generate_name()
     
+    def _on_time_column_changed(self, *args) -> None:
+        is_time_window = self.time_column_combo.currentData() is not None
+        self.time_window_input.setEnabled(is_time_window)
+        self.window_spin.setEnabled(not is_time_window)
+        self.center_checkbox.setEnabled(not is_time_window)
+        if is_time_window:
+            self.center_checkbox.setChecked(False)
+        self._auto_generate_name()
+    
+    def _window(self) -> "int | str":
+        if self.time_column_combo.currentData() is not None:
+            return self.time_window_input.text().strip()
+        return self.window_spin.value()
+    
+    def _selected_operations(self) -> List[str]:
+        return [
+            self.operation_list.item(row).data(Qt.ItemDataRole.UserRole)
+            for row in range(self.operation_list.count())
+            if self.operation_list.item(row).isSelected()
+        ]
+    
+    def _selected_groups(self) -> List[str]:
+        selected = {item.text() for item in self.group_list.selectedItems()}
+        return [column for column in self.existing_columns if str(column) in selected]
+    
+    def _output_names(self) -> List[str]:
+        return RollingEngine.output_names(self.column_combo.currentText(), self._window(), self._selected_operations(), self.new_name_input.text().strip())
+    
     def _auto_generate_name(self, *args) -> None:
-        if not self.column_combo or not self.window_spin or not self.operation_combo or not self.new_name_input:
+        if not self.column_combo or not self.window_spin or not self.operation_list or not self.new_name_input:
             return
         
         col = self.column_combo.currentText()
-        win = self.window_spin.value()
-        op = self.operation_combo.currentText()
+        win = self._window()
+        operations = self._selected_operations()
         
-        default_name = f"{col}_rolling_{win}_{op}"
+        default_name = f"{col}_rolling_{win}_{operations[0]}" if len(operations) == 1 else f"{col}_rolling_{win}"
         self.new_name_input.blockSignals(True)
         self.new_name_input.setText(default_name)
         self.new_name_input.blockSignals(False)
@@ -158,13 +217,19 @@ class RollingWindowDialog(QDialog):
         msg = "Valid column name"
         state = "success"
         
+        existing_outputs = [output for output in self._output_names() if output in self.existing_columns]
+        
         if not name:
             is_valid = False
             msg = "Column name cannot be empty."
             state = "error"
-        elif name in self.existing_columns:
+        elif not self._selected_operations():
+            is_valid = False
+            msg = "Select at least one statistic."
+            state = "error"
+        elif existing_outputs:
             is_valid = False
-            msg = f"Column '{name}' already exists."
+            msg = f"Column '{existing_outputs[0]}' already exists."
             state = "error"
         elif keyword.iskeyword(name):
             is_valid = False
@@ -189,47 +254,39 @@ class RollingWindowDialog(QDialog):
     
     def _update_preview(self) -> None:
         col = self.column_combo.currentText()
-        win = self.window_spin.value()
+        win = self._window()
         min_p = None if self.min_periods_spin.value() == self.min_periods_spin.minimum() else self.min_periods_spin.value()
         center = self.center_checkbox.isChecked()
-        op = self.operation_combo.currentData()
-        new_col_name = self.new_name_input.text().strip()
+        operations = self._selected_operations()
+        output_names = self._output_names()
         
-        if not col or col not in self.df.columns:
+        if not col or col not in self.df.columns or not operations:
             return
         
         try:
-            end_idx = min(len(self.df), win + 5)
-            preview_df = self.df[[col]].head(end_idx).copy()
+            # Preview on the first rows, enough to fill a few row count windows
+            end_idx = min(len(self.df), (win if isinstance(win, int) else 50) + 5)
+            preview_df = self.df.head(end_idx)
+            results = RollingEngine.compute(
+                preview_df, col, win, operations,
+                group_by=self._selected_groups(), on=self.time_column_combo.currentData(),
+                center=center, min_periods=min_p,
+            )
             
-            rolling_obj = preview_df[col].rolling(window=win, min_periods=min_p, center=center)
+            start_display = max(0, win - 3) if isinstance(win, int) else 0
+            display_rows = range(start_display, min(start_display + 6, end_idx))
             
-            if op == "mean":
-                preview_df[new_col_name] = rolling_obj.mean()
-            elif op == "sum":
-                preview_df[new_col_name] = rolling_obj.sum()
-            elif op == "min":
-                preview_df[new_col_name] = rolling_obj.min()
-            elif op == "max":
-                preview_df[new_col_name] = rolling_obj.max()
-            elif op == "std":
-                preview_df[new_col_name] = rolling_obj.std()
-            elif op == "median":
-                preview_df[new_col_name] = rolling_obj.median()
+            self.preview_table.setColumnCount(1 + len(operations))
+            self.preview_table.setRowCount(len(display_rows))
+            self.preview_table.setHorizontalHeaderLabels([col] + output_names)
+            self.preview_table.setVerticalHeaderLabels([str(preview_df.index[row]) for row in display_rows])
             
-            start_display = max(0, win - 3)
-            display_df = preview_df.iloc[start_display:start_display+6]
-            
-            self.preview_table.setRowCount(len(display_df))
-            self.preview_table.setHorizontalHeaderLabels([col, new_col_name])
-            self.preview_table.setVerticalHeaderLabels([str(i) for i in display_df.index])
-            
-            for row_idx, (_, row_data) in enumerate(display_df.iterrows()):
-                orig_val = str(row_data[col]) if pd.notna(row_data[col]) else "NaN"
-                roll_val = f"{row_data[new_col_name]:.4f}" if pd.notna(row_data[new_col_name]) else "NaN"
-                
-                self.preview_table.setItem(row_idx, 0, QTableWidgetItem(orig_val))
-                self.preview_table.setItem(row_idx, 1, QTableWidgetItem(roll_val))
+            for row_idx, row in enumerate(display_rows):
+                value = preview_df[col].iloc[row]
+                self.preview_table.setItem(row_idx, 0, QTableWidgetItem(str(value) if pd.notna(value) else "NaN"))
+                for col_idx, operation in enumerate(operations, start=1):
+                    rolled = results[operation][row]
+                    self.preview_table.setItem(row_idx, col_idx, QTableWidgetItem(f"{rolled:.4f}" if pd.notna(rolled) else "NaN"))
         except Exception:
             self.preview_table.clearContents()
             self.preview_table.setRowCount(0)
@@ -240,7 +297,9 @@ class RollingWindowDialog(QDialog):
             return
         
         new_name: str = self.new_name_input.text().strip()
-        if not new_name or new_name in self.existing_columns or keyword.iskeyword(new_name):
+        if not new_name or keyword.iskeyword(new_name) or not self._selected_operations():
+            return
+        if any(output in self.existing_columns for output in self._output_names()):
             return
         self.accept()
     
@@ -248,9 +307,11 @@ class RollingWindowDialog(QDialog):
         min_p = None if self.min_periods_spin.value() == self.min_periods_spin.minimum() else self.min_periods_spin.value()
         return {
             "column": self.column_combo.currentText(),
-            "window": self.window_spin.value(),
+            "window": self._window(),
             "min_periods": min_p,
             "center": self.center_checkbox.isChecked(),
-            "operation": self.operation_combo.currentText(),
+            "operations": self._selected_operations(),
+            "group_by": self._selected_groups(),
+            "on": self.time_column_combo.currentData(),
             "new_column": self.new_name_input.text().strip()
         }
\ No newline at end of file
@@ -0,0 +1,280 @@
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSplitter, QTableWidget, QTableWidgetItem, QHeaderView, QListWidgetItem, QMessageBox
+
+from core.data_handler import DataHandler
+from core.sql_engine import SQLEngine
+from ui.dialogs.CodeEditor import CodeEditor
+from ui.theme import ThemeColors
+from ui.widgets import DataPlotStudioButton, DataPlotStudioSpinBox, DataPlotStudioListWidget
+from ui.workers import SQLQueryWorker
+from ui.icons import IconBuilder, IconType
+
+class SQLConsoleDialog(QDialog):
+    """
+    A SQL console running DuckDB queries over the current data, subsets and saved aggregations
+    """
+    DEFAULT_QUERY: str = "SELECT *\nFROM data\nLIMIT 100"
+
+    def __init__(
+        self,
+        data_handler: DataHandler,
+        table_sources: Dict[str, Callable[[], Optional[pd.DataFrame]]],
+        sync_callback: Callable[[], None],
+        parent: Any = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("SQL Console")
+        self.resize(1000, 700)
+        self.setModal(False)
+
+        self.data_handler: DataHandler = data_handler
+        # view name -> loader, views are only built when a query references them
+        self.table_sources: Dict[str, Callable[[], Optional[pd.DataFrame]]] = table_sources
+        self.sync_callback: Callable[[], None] = sync_callback
+        self._loaded_tables: Dict[str, pd.DataFrame] = {}
+        self._loaded_version: int = data_handler.data_version
+        self._worker: Optional[SQLQueryWorker] = None
+        # data_version the running query reads, a loaded result is only committed onto it
+        self._worker_data_version: int = data_handler.data_version
+        self._started_at: float = 0.0
+
+        self._init_ui()
+
+    def _init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        info_label = QLabel(
+            "Query the current data as the view 'data' with DuckDB SQL. Subsets, saved aggregations and other open datasets "
+            "are available under the names listed on the left. Run shows the first rows, "
+            "'Load as Dataset' replaces the data with the full result (undoable)."
+        )
+        info_label.setWordWrap(True)
+        info_label.setProperty("styleClass", "info_text")
+        layout.addWidget(info_label)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.view_list = DataPlotStudioListWidget()
+        self.view_list.setToolTip("Double click a view to insert its name")
+        self.view_list.itemDoubleClicked.connect(self._insert_view_name)
+        self._populate_views()
+        splitter.addWidget(self.view_list)
+
+        editor_splitter = QSplitter(Qt.Orientation.Vertical)
+        self.sql_editor = CodeEditor()
+        self.sql_editor.setPlainText(self.DEFAULT_QUERY)
+        editor_splitter.addWidget(self.sql_editor)
+
+        self.result_table = QTableWidget()
+        self.result_table.horizontalHeader().setObjectName("MainDataHeader")
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.result_table.verticalHeader().setObjectName("MainDataHeader")
+        self.result_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        editor_splitter.addWidget(self.result_table)
+        editor_splitter.setSizes([250, 450])
+        splitter.addWidget(editor_splitter)
+        splitter.setSizes([220, 780])
+        layout.addWidget(splitter, 1)
+
+        self.status_label = QLabel("Ready (Ctrl+Enter runs the query)")
+        self.status_label.setProperty("statusState", "success")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(QLabel("Preview rows:"))
+        self.limit_spin = DataPlotStudioSpinBox()
+        self.limit_spin.setRange(10, 100_000)
+        self.limit_spin.setSingleStep(500)
+        self.limit_spin.setValue(1000)
+        self.limit_spin.setToolTip("Run streams at most this many rows of the result")
+        button_layout.addWidget(self.limit_spin)
+        button_layout.addStretch()
+
+        self.run_button = DataPlotStudioButton("Run", parent=self, base_color_hex=ThemeColors.MainColor, text_color_hex="white")
+        self.run_button.setIcon(IconBuilder.build(IconType.Search))
+        self.run_button.clicked.connect(self.run_query)
+        button_layout.addWidget(self.run_button)
+
+        self.cancel_button = DataPlotStudioButton("Cancel Query", parent=self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_query)
+        button_layout.addWidget(self.cancel_button)
+
+        self.load_button = DataPlotStudioButton("Load as Dataset", parent=self)
+        self.load_button.setIcon(IconBuilder.build(IconType.Checkmark))
+        self.load_button.setToolTip("Replace the current data with the full query result, one undo restores it")
+        self.load_button.clicked.connect(self.load_as_dataset)
+        button_layout.addWidget(self.load_button)
+
+        close_button = DataPlotStudioButton("Close", parent=self)
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+        run_shortcut = QShortcut(QKeySequence("Ctrl+Return"), self)
+        run_shortcut.activated.connect(self.run_query)
+
+    def _populate_views(self) -> None:
+        self.view_list.clear()
+        item = QListWidgetItem(SQLEngine.DATA_VIEW)
+        item.setToolTip("\n".join(f"{column}: {dtype}" for column, dtype in self.data_handler.df.dtypes.astype(str).items()))
+        self.view_list.addItem(item)
+        for name in self.table_sources:
+            self.view_list.addItem(QListWidgetItem(name))
+
+    def _insert_view_name(self, item: QListWidgetItem) -> None:
+        self.sql_editor.insertPlainText(item.text())
+        self.sql_editor.setFocus()
+
+    def _referenced_tables(self, sql: str) -> Dict[str, pd.DataFrame]:
+        """Builds the subset and aggregation views the query names, reused until the data changes"""
+        if self._loaded_version != self.data_handler.data_version:
+            self._loaded_tables.clear()
+            self._loaded_version = self.data_handler.data_version
+        words = set(re.findall(r"\w+", sql.lower()))
+        tables: Dict[str, pd.DataFrame] = {}
+        for name, loader in self.table_sources.items():
+            if name.lower() not in words:
+                continue
+            if name not in self._loaded_tables:
+                df = loader()
+                if df is None:
+                    continue
+                self._loaded_tables[name] = df
+            tables[name] = self._loaded_tables[name]
+        return tables
+
+    def _set_status(self, message: str, state: str) -> None:
+        self.status_label.setText(message)
+        self.status_label.setProperty("statusState", state)
+        self.status_label.style().unpolish(self.status_label)
+        self.status_label.style().polish(self.status_label)
+
+    def _set_running(self, is_running: bool) -> None:
+        self.run_button.setEnabled(not is_running)
+        self.load_button.setEnabled(not is_running)
+        self.cancel_button.setEnabled(is_running)
+
+    def _start_worker(self, apply_result: bool) -> None:
+        if self._worker is not None or self.data_handler.df is None:
+            return
+        sql = self.sql_editor.toPlainText().strip()
+        if not sql:
+            self._set_status("Enter a query to run", "error")
+            return
+        try:
+            tables = self._referenced_tables(sql)
+        except Exception as TableError:
+            self._set_status(f"Could not build the views: {str(TableError)}", "error")
+            return
+
+        if apply_result and tables:
+            self._set_status(
+                f"Only queries on 'data' can replace the data, {', '.join(tables)} would not exist when the history is replayed",
+                "error",
+            )
+            return
+
+        limit = self.limit_spin.value()
+        worker = SQLQueryWorker(self.data_handler, sql, tables, limit=None if apply_result else limit + 1)
+        worker.signals.progress.connect(lambda _, message, worker=worker: self._on_query_progress(worker, message))
+        if apply_result:
+            worker.signals.finished.connect(lambda result_df, worker=worker, sql=sql: self._on_load_finished(worker, sql, result_df))
+        else:
+            worker.signals.finished.connect(lambda result_df, worker=worker: self._on_query_finished(worker, result_df))
+        worker.signals.error.connect(lambda error, worker=worker: self._on_query_error(worker, error))
+        self._worker = worker
+        self._worker_data_version = self.data_handler.data_version
+        self._started_at = time.perf_counter()
+        self._set_running(True)
+        self._set_status("Loading the full result..." if apply_result else "Running query...", "success")
+        QThreadPool.globalInstance().start(worker)
+
+    def run_query(self) -> None:
+        self._start_worker(apply_result=False)
+
+    def load_as_dataset(self) -> None:
+        if self._worker is not None:
+            return
+        reply = QMessageBox.question(
+            self,
+            "Load as Dataset",
+            "Replace the current data with the full result of this query?\n\nThe step is added to the history and can be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self._start_worker(apply_result=True)
+
+    def cancel_query(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        self._worker = None
+        self._set_running(False)
+        self._set_status("Query cancelled", "error")
+
+    def _elapsed(self) -> str:
+        return f"{time.perf_counter() - self._started_at:.2f}s"
+
+    def _on_query_progress(self, worker: SQLQueryWorker, message: str) -> None:
+        if worker is self._worker:
+            self._set_status(message, "success")
+
+    def _on_query_finished(self, worker: SQLQueryWorker, result_df: pd.DataFrame) -> None:
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self._set_running(False)
+        limit = self.limit_spin.value()
+        is_truncated = len(result_df) > limit
+        result_df = result_df.head(limit)
+        self._fill_result_table(result_df)
+        row_text = f"first {len(result_df):,} rows" if is_truncated else f"{len(result_df):,} rows"
+        self._set_status(f"{row_text}, {len(result_df.columns)} columns in {self._elapsed()}", "success")
+
+    def _on_load_finished(self, worker: SQLQueryWorker, sql: str, result_df: pd.DataFrame) -> None:
+        if worker is not self._worker:
+            # Cancelled after the query finished, the data stays as it is
+            return
+        self._worker = None
+        self._set_running(False)
+        try:
+            result_df = self.data_handler.commit_sql_query(sql, result_df, data_version=self._worker_data_version)
+        except Exception as CommitError:
+            self._set_status(f"Could not load the result: {str(CommitError)}", "error")
+            return
+        self._loaded_tables.clear()
+        self._populate_views()
+        self._fill_result_table(result_df.head(self.limit_spin.value()))
+        self._set_status(f"Loaded {len(result_df):,} rows as the current data in {self._elapsed()}", "success")
+        self.sync_callback()
+
+    def _on_query_error(self, worker: SQLQueryWorker, error: Exception) -> None:
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self._set_running(False)
+        self._set_status(f"Query failed: {str(error)}", "error")
+
+    def _fill_result_table(self, result_df: pd.DataFrame) -> None:
+        self.result_table.clear()
+        self.result_table.setColumnCount(len(result_df.columns))
+        self.result_table.setRowCount(len(result_df))
+        self.result_table.setHorizontalHeaderLabels([str(column) for column in result_df.columns])
+        for row_idx, row in enumerate(result_df.itertuples(index=False)):
+            for col_idx, value in enumerate(row):
+                text = str(value) if not pd.api.types.is_scalar(value) or pd.notna(value) else "NaN"
+                self.result_table.setItem(row_idx, col_idx, QTableWidgetItem(text))
+
+    def closeEvent(self, event) -> None:
+        self.cancel_query()
+        super().closeEvent(event)
@@ -0,0 +1,119 @@
+from typing import Any, Dict, List
+
+import pandas as pd
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFormLayout, QListWidgetItem
+
+from ui.theme import ThemeColors
+from ui.widgets import DataPlotStudioButton, DataPlotStudioDoubleSpinBox, DataPlotStudioSpinBox, DataPlotStudioGroupBox, DataPlotStudioListWidget
+from ui.icons import IconBuilder, IconType
+
+class SampleModeDialog(QDialog):
+    """
+    Dialog for switching to a reproducible sample of the data
+    """
+    # Columns with more distinct values than this are not offered for stratifying
+    MAX_STRATA: int = 1000
+
+    def __init__(self, df: pd.DataFrame, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Sample Mode")
+        self.setModal(True)
+        self.resize(480, 460)
+
+        self.df = df
+        self.strata_columns: List[str] = [column for column in df.columns if df[column].nunique(dropna=False) <= self.MAX_STRATA]
+
+        self.init_ui()
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        info_label = QLabel(
+            "Work on a sample of the rows so every operation, preview and plot stays interactive. "
+            "Use 'Apply to Full Dataset' to replay the recorded operations on all rows, "
+            "or leave sample mode to discard them."
+        )
+        info_label.setWordWrap(True)
+        info_label.setProperty("styleClass", "info_text")
+        layout.addWidget(info_label)
+        layout.addSpacing(10)
+
+        settings_group = DataPlotStudioGroupBox("Sample Parameters")
+        settings_layout = QFormLayout()
+        settings_layout.setSpacing(10)
+
+        self.percent_spin = DataPlotStudioDoubleSpinBox()
+        self.percent_spin.setRange(0.01, 100.0)
+        self.percent_spin.setDecimals(2)
+        self.percent_spin.setSingleStep(0.5)
+        self.percent_spin.setSuffix(" %")
+        self.percent_spin.setValue(1.0)
+        self.percent_spin.setToolTip("Share of the rows in the sample.")
+        self.percent_spin.valueChanged.connect(self._update_summary)
+        settings_layout.addRow("Sample Size:", self.percent_spin)
+
+        self.seed_spin = DataPlotStudioSpinBox()
+        self.seed_spin.setRange(0, 2_147_483_647)
+        self.seed_spin.setValue(0)
+        self.seed_spin.setToolTip("The same seed selects the same rows again.")
+        settings_layout.addRow("Random Seed:", self.seed_spin)
+
+        self.strata_list = DataPlotStudioListWidget()
+        self.strata_list.setSelectionMode(DataPlotStudioListWidget.SelectionMode.MultiSelection)
+        for column in self.strata_columns:
+            item = QListWidgetItem(str(column))
+            item.setData(Qt.ItemDataRole.UserRole, column)
+            self.strata_list.addItem(item)
+        self.strata_list.setMaximumHeight(140)
+        self.strata_list.setToolTip(
+            "Optional. Each combination of the selected columns is sampled separately, "
+            "so rare categories keep at least one row."
+        )
+        self.strata_list.itemSelectionChanged.connect(self._update_summary)
+        settings_layout.addRow("Stratify By:", self.strata_list)
+
+        settings_group.setLayout(settings_layout)
+        layout.addWidget(settings_group)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setProperty("styleClass", "muted_text")
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        self.ok_button = DataPlotStudioButton("Start Sample Mode", parent=self, base_color_hex=ThemeColors.MainColor, text_color_hex="white")
+        self.ok_button.setIcon(IconBuilder.build(IconType.Checkmark))
+        self.ok_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.ok_button)
+
+        cancel_button = DataPlotStudioButton("Cancel", parent=self)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self._update_summary()
+
+    def _stratify_by(self) -> List[str]:
+        return [
+            self.strata_list.item(row).data(Qt.ItemDataRole.UserRole)
+            for row in range(self.strata_list.count())
+            if self.strata_list.item(row).isSelected()
+        ]
+
+    def _update_summary(self, *args) -> None:
+        row_count = len(self.df)
+        sample_rows = max(1, round(self.percent_spin.value() / 100 * row_count))
+        text = f"About {sample_rows:,} of {row_count:,} rows."
+        if self._stratify_by():
+            text += " Stratified samples can be slightly larger, every group is rounded up."
+        self.summary_label.setText(text)
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            "fraction": self.percent_spin.value() / 100,
+            "stratify_by": self._stratify_by(),
+            "seed": self.seed_spin.value(),
+        }
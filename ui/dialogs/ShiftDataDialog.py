@@ -55,6 +55,13 @@ class ShiftDataDialog(QDialog):
         self.fill_value_input.textChanged.connect(self._on_parameters_changed)
         settings_layout.addRow("Fill Value:", self.fill_value_input)
         
+        self.group_combo = DataPlotStudioComboBox()
+        self.group_combo.addItem("(None)", None)
+        for column in self.df.columns:
+            self.group_combo.addItem(str(column), column)
+        self.group_combo.setToolTip("Optional column identifying entities, values are only compared within the same group.")
+        settings_layout.addRow("Group By:", self.group_combo)
+        
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
         
@@ -226,5 +233,6 @@ class ShiftDataDialog(QDialog):
             "column": self.column_combo.currentText(),
             "periods": self.periods_spin.value(),
             "fill_value": self._parse_fill_value(),
+            "group_by": [self.group_combo.currentData()] if self.group_combo.currentData() is not None else None,
             "new_column": self.new_name_input.text().strip()
         }
\ No newline at end of file
@@ -0,0 +1,239 @@
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QInputDialog, QMessageBox
+
+from core.data_handler import DataHandler
+from ui.theme import ThemeColors
+from ui.widgets import DataPlotStudioButton, DataPlotStudioComboBox, DataPlotStudioGroupBox
+from ui.icons import IconBuilder, IconType
+
+class WorkspaceDialog(QDialog):
+    """
+    Dialog listing the open datasets with their memory, to open, switch, duplicate, rename and close them
+    """
+    HEADERS: tuple[str, ...] = ("Dataset", "Rows", "Columns", "Memory", "Shared", "Undo History", "Derived From")
+
+    def __init__(
+        self,
+        data_handler: DataHandler,
+        derive_sources: Dict[str, Callable[[], Optional[pd.DataFrame]]],
+        open_file_callback: Callable[[str], None],
+        sync_callback: Callable[[], None],
+        parent: Any = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Workspace")
+        self.resize(900, 500)
+        self.setModal(False)
+
+        self.data_handler: DataHandler = data_handler
+        # label -> loader of subsets and saved aggregations that can be opened as datasets
+        self.derive_sources: Dict[str, Callable[[], Optional[pd.DataFrame]]] = derive_sources
+        self.open_file_callback: Callable[[str], None] = open_file_callback
+        self.sync_callback: Callable[[], None] = sync_callback
+
+        self._init_ui()
+        self.refresh()
+
+    def _init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        info_label = QLabel(
+            "Datasets stay open side by side, each with its own undo history. Duplicates and datasets "
+            "derived from a dataset reference its Arrow columns instead of copying them. 'Shared' is the part "
+            "of a dataset's memory that other open datasets also use, so it is only held once."
+        )
+        info_label.setWordWrap(True)
+        info_label.setProperty("styleClass", "info_text")
+        layout.addWidget(info_label)
+
+        self.dataset_table = QTableWidget()
+        self.dataset_table.setColumnCount(len(self.HEADERS))
+        self.dataset_table.setHorizontalHeaderLabels(list(self.HEADERS))
+        self.dataset_table.horizontalHeader().setObjectName("MainDataHeader")
+        self.dataset_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.dataset_table.horizontalHeader().setStretchLastSection(True)
+        self.dataset_table.verticalHeader().setVisible(False)
+        self.dataset_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.dataset_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.dataset_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.dataset_table.itemDoubleClicked.connect(lambda item: self.switch_to_selected())
+        layout.addWidget(self.dataset_table, 1)
+
+        self.total_label = QLabel("")
+        self.total_label.setProperty("styleClass", "info_text")
+        layout.addWidget(self.total_label)
+
+        derive_group = DataPlotStudioGroupBox("Open a Subset or Saved Aggregation as a Dataset")
+        derive_layout = QHBoxLayout()
+        self.derive_combo = DataPlotStudioComboBox()
+        self.derive_combo.addItems(list(self.derive_sources))
+        derive_layout.addWidget(self.derive_combo, 1)
+        self.derive_button = DataPlotStudioButton("Open as Dataset", parent=self)
+        self.derive_button.setEnabled(bool(self.derive_sources))
+        self.derive_button.clicked.connect(self.open_derived)
+        derive_layout.addWidget(self.derive_button)
+        derive_group.setLayout(derive_layout)
+        layout.addWidget(derive_group)
+
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        self.status_label.setProperty("statusState", "success")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        open_button = DataPlotStudioButton("Open File...", parent=self)
+        open_button.setIcon(IconBuilder.build(IconType.ImportFile))
+        open_button.setToolTip("Import a file as another dataset, the open datasets are kept")
+        open_button.clicked.connect(self.open_file)
+        button_layout.addWidget(open_button)
+
+        self.switch_button = DataPlotStudioButton("Switch To", parent=self, base_color_hex=ThemeColors.MainColor, text_color_hex="white")
+        self.switch_button.setIcon(IconBuilder.build(IconType.Checkmark))
+        self.switch_button.clicked.connect(self.switch_to_selected)
+        button_layout.addWidget(self.switch_button)
+
+        duplicate_button = DataPlotStudioButton("Duplicate", parent=self)
+        duplicate_button.setIcon(IconBuilder.build(IconType.Copy))
+        duplicate_button.setToolTip("Open a copy that shares the Arrow columns of the selected dataset")
+        duplicate_button.clicked.connect(self.duplicate_selected)
+        button_layout.addWidget(duplicate_button)
+
+        rename_button = DataPlotStudioButton("Rename", parent=self)
+        rename_button.setIcon(IconBuilder.build(IconType.RenameColumn))
+        rename_button.clicked.connect(self.rename_selected)
+        button_layout.addWidget(rename_button)
+
+        close_dataset_button = DataPlotStudioButton("Close Dataset", parent=self)
+        close_dataset_button.setIcon(IconBuilder.build(IconType.DeleteItem))
+        close_dataset_button.clicked.connect(self.close_selected)
+        button_layout.addWidget(close_dataset_button)
+        button_layout.addStretch()
+
+        close_button = DataPlotStudioButton("Close", parent=self)
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    @staticmethod
+    def _format_bytes(size_bytes: int) -> str:
+        size = float(size_bytes)
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.2f} GB"
+
+    def _set_status(self, message: str, state: str) -> None:
+        self.status_label.setText(message)
+        self.status_label.setProperty("statusState", state)
+        self.status_label.style().unpolish(self.status_label)
+        self.status_label.style().polish(self.status_label)
+
+    def refresh(self) -> None:
+        """Rebuild the dataset table from the data handler"""
+        memory = self.data_handler.dataset_memory()
+        active = self.data_handler.active_dataset
+        self.dataset_table.setRowCount(len(memory))
+        bold_font = QFont()
+        bold_font.setBold(True)
+        for row_idx, usage in enumerate(memory.values()):
+            info = self.data_handler.dataset_info(usage.name)
+            cells = (
+                f"{usage.name} (active)" if usage.name == active else usage.name,
+                f"{usage.rows:,}",
+                f"{usage.columns:,}",
+                self._format_bytes(usage.total_bytes),
+                self._format_bytes(usage.shared_bytes),
+                self._format_bytes(usage.history_bytes),
+                info.parent or info.description,
+            )
+            for col_idx, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, usage.name)
+                if col_idx in (1, 2, 3, 4, 5):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if usage.name == active:
+                    item.setFont(bold_font)
+                self.dataset_table.setItem(row_idx, col_idx, item)
+        self.dataset_table.resizeColumnsToContents()
+
+        own_bytes = sum(usage.own_bytes for usage in memory.values())
+        self.total_label.setText(f"{len(memory)} open datasets, {self._format_bytes(own_bytes)} not shared with another dataset")
+        self.switch_button.setEnabled(not self.data_handler.is_sample_mode)
+
+    def _selected_name(self) -> Optional[str]:
+        items = self.dataset_table.selectedItems()
+        if not items:
+            self._set_status("Select a dataset first.", "error")
+            return None
+        return items[0].data(Qt.ItemDataRole.UserRole)
+
+    def _run(self, action: Callable[[], Any], message: str, sync: bool = True) -> None:
+        try:
+            action()
+        except Exception as WorkspaceError:
+            self._set_status(str(WorkspaceError), "error")
+            return
+        self.refresh()
+        if sync:
+            self.sync_callback()
+        self._set_status(message, "success")
+
+    def open_file(self) -> None:
+        filepath, _ = QFileDialog.getOpenFileName(self, "Open File as Dataset", "", "Data Files (*.csv *.xlsx *.xls *.txt *.json *.parquet);;All Files (*)")
+        if filepath:
+            self._set_status("Importing in the background, the dataset is listed when it is loaded.", "success")
+            self.open_file_callback(filepath)
+
+    def switch_to_selected(self) -> None:
+        name = self._selected_name()
+        if name is not None:
+            self._run(lambda: self.data_handler.switch_dataset(name), f"'{name}' is now the active dataset.")
+
+    def duplicate_selected(self) -> None:
+        name = self._selected_name()
+        if name is not None:
+            self._run(lambda: self.data_handler.duplicate_dataset(name), f"Duplicated '{name}'.", sync=False)
+
+    def rename_selected(self) -> None:
+        name = self._selected_name()
+        if name is None:
+            return
+        new_name, accepted = QInputDialog.getText(self, "Rename Dataset", "New name:", text=name)
+        if accepted and new_name.strip() and new_name.strip() != name:
+            self._run(lambda: self.data_handler.rename_dataset(name, new_name), f"Renamed '{name}' to '{new_name.strip()}'.")
+
+    def close_selected(self) -> None:
+        name = self._selected_name()
+        if name is None:
+            return
+        reply = QMessageBox.question(
+            self,
+            "Close Dataset",
+            f"Close '{name}'? Its data and undo history are discarded.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            is_active = name == self.data_handler.active_dataset
+            self._run(lambda: self.data_handler.close_dataset(name), f"Closed '{name}'.", sync=is_active)
+
+    def open_derived(self) -> None:
+        label = self.derive_combo.currentText()
+        loader = self.derive_sources.get(label)
+        if loader is None:
+            return
+
+        def derive() -> None:
+            derived_df = loader()
+            if derived_df is None:
+                raise ValueError(f"{label} has no data")
+            self.data_handler.add_dataset(label.split(": ", 1)[-1], derived_df, parent=self.data_handler.active_dataset, description=label)
+
+        self._run(derive, f"Opened {label} as a dataset.", sync=False)
@@ -35,12 +35,22 @@ from .HelpExplorerDialog import HelpExplorerDialog
 from .RollingWindowDialog import RollingWindowDialog
 from .ShiftDataDialog import ShiftDataDialog
 from .PercentageChangeDialog import PercentageChangeDialog
+from .ResampleDialog import ResampleDialog
+from .SampleModeDialog import SampleModeDialog
+from .SQLConsoleDialog import SQLConsoleDialog
+from .DuplicateAnalyzerDialog import DuplicateAnalyzerDialog
+from .WorkspaceDialog import WorkspaceDialog
 from .CreateDatasetDialog import CreateDatasetDialog
 
 __all__ = [
     "CreateDatasetDialog",
     "ShiftDataDialog",
     "PercentageChangeDialog",
+    "ResampleDialog",
+    "SampleModeDialog",
+    "SQLConsoleDialog",
+    "DuplicateAnalyzerDialog",
+    "WorkspaceDialog",
     "RollingWindowDialog",
     "HelpExplorerDialog",
     "ColumnReorderDialog",
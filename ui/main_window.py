@@ -8,6 +8,7 @@ import traceback
 
 from resources.version import APPLICATION_VERSION, SCRIPT_FILE_NAME, LOG_FILE_NAME
 from core.subset_manager import SubsetManager
+from core.sql_engine import SQLEngine
 from ui.workers import FileImportWorker, GoogleSheetsImportWorker
 from ui.data_tab import DataTab
 from ui.plot_tab import PlotTab
@@ -17,7 +18,7 @@ from core.project_manager import ProjectManager
 from core.code_exporter import CodeExporter
 from core.logger import Logger
 from ui.status_bar import StatusBar
-from ui.dialogs import (ProgressDialog, GoogleSheetsDialog, DatabaseConnectionDialog, ExportDialog, GoogleSheetsExportDialog, ConsoleDialog, HelpExplorerDialog)
+from ui.dialogs import (ProgressDialog, GoogleSheetsDialog, DatabaseConnectionDialog, ExportDialog, GoogleSheetsExportDialog, ConsoleDialog, SQLConsoleDialog, HelpExplorerDialog, WorkspaceDialog)
 from ui.animations import (FileImportAnimation, FailedAnimation, SavedProjectAnimation, GoogleSheetsImportAnimation, DatabaseImportAnimation, ProjectOpenAnimation, ScriptLogExportAnimation, ExportFileAnimation)
 from ui.icons import IconBuilder, IconType
 
@@ -35,7 +36,7 @@ class MainWindow(QWidget):
         self.logger = logger
         self.status_bar = status_bar
         
-        self.subset_manager = SubsetManager()
+        self.subset_manager = SubsetManager(filter_engine=self.data_handler.filter_engine)
 
         self.threadpool = QThreadPool()
         self.data_handler.memory_update_callback = self.status_bar.update_memory_usage
@@ -105,8 +106,10 @@ class MainWindow(QWidget):
                 self.tabs.setCurrentIndex(data_tab_index)
             
             if indices:
-                first_index = min(indices)
-                model_index = self.data_tab.data_table.model().index(first_index, 0)
+                model = self.data_tab.data_table.model()
+                # Brushed indices are row positions of the data, the table may show a sorted view
+                first_index = min(model.view_row(index) for index in indices) if hasattr(model, "view_row") else min(indices)
+                model_index = model.index(first_index, 0)
                 self.data_tab.data_table.scrollTo(model_index)
                 self.status_bar.log(f"Highlighted {len(indices)} selected rows in Data Explorer", "SUCCESS")
     
@@ -312,16 +315,75 @@ class MainWindow(QWidget):
         self.console_dialog = ConsoleDialog(self.data_handler, self._on_console_sync, self)
         self.console_dialog.show()
     
+    def open_sql_console(self) -> None:
+        if self.data_handler.df is None:
+            QMessageBox.warning(self, "Warning", "Please load data before opening the SQL console.")
+            return
+        if not SQLEngine.is_available():
+            QMessageBox.warning(self, "Warning", "The SQL console requires the duckdb and pyarrow packages.")
+            return
+
+        table_sources = {}
+        for subset_name in self.subset_manager.list_subsets():
+            table_sources[SQLEngine.view_name(subset_name, "subset")] = (
+                lambda name=subset_name: self.subset_manager.apply_subset(self.data_handler.df, name)
+            )
+        aggregation_manager = self.data_tab.controller.aggregation_manager
+        for aggregation_name in aggregation_manager.list_aggregations():
+            table_sources[SQLEngine.view_name(aggregation_name, "agg")] = (
+                lambda name=aggregation_name: aggregation_manager.get_aggregation_df(name)
+            )
+
+        for dataset_name in self.data_handler.dataset_names():
+            if dataset_name != self.data_handler.active_dataset:
+                table_sources[SQLEngine.view_name(dataset_name, "ds")] = (
+                    lambda name=dataset_name: self.data_handler.dataset_frame(name)
+                )
+
+        self.sql_console_dialog = SQLConsoleDialog(self.data_handler, table_sources, self._on_console_sync, self)
+        self.sql_console_dialog.show()
+
     def _on_console_sync(self) -> None:
         self.data_tab.refresh_data_view()
         self.plot_tab.update_column_combo()
         self.unsaved_changes = True
         self.status_bar.update_data_stats(self.data_handler.df)
     
+    def open_workspace(self) -> None:
+        if getattr(self.data_handler, "pre_insert_df", None) is not None or getattr(self.data_handler, "pre_agg_view_df", None) is not None:
+            QMessageBox.warning(self, "Warning", "Restore the original data before opening the workspace.")
+            return
+
+        derive_sources = {}
+        for subset_name in self.subset_manager.list_subsets():
+            derive_sources[f"Subset: {subset_name}"] = (
+                lambda name=subset_name: self.subset_manager.apply_subset(self.data_handler.df, name)
+            )
+        aggregation_manager = self.data_tab.controller.aggregation_manager
+        for aggregation_name in aggregation_manager.list_aggregations():
+            derive_sources[f"Aggregation: {aggregation_name}"] = (
+                lambda name=aggregation_name: aggregation_manager.get_aggregation_df(name)
+            )
+
+        self.workspace_dialog = WorkspaceDialog(
+            self.data_handler,
+            derive_sources,
+            lambda filepath: self.load_file_from_path(filepath, as_new_dataset=True),
+            self._on_workspace_sync,
+            self,
+        )
+        self.workspace_dialog.show()
+
+    def _on_workspace_sync(self) -> None:
+        # Subset results are cached per data, the active data changed
+        self.subset_manager.clear_cache()
+        self._on_console_sync()
+    
     def clear_all(self) -> None:
         """Clear all data"""
         self.data_handler.df = None
         self.data_handler.original_df = None
+        self.data_handler.clear_workspace()
         self.data_tab.clear()
         self.plot_tab.clear()
         self.subset_manager.subsets.clear()
@@ -377,8 +439,8 @@ class MainWindow(QWidget):
             filepath = urls[0].toLocalFile()
             self.load_file_from_path(filepath)
     
-    def load_file_from_path(self, filepath: str) -> None:
-        """Process and import file from a path string"""
+    def load_file_from_path(self, filepath: str, as_new_dataset: bool = False) -> None:
+        """Process and import file from a path string, next to the open datasets when as_new_dataset is set"""
         path = Path(filepath)
         file_size_kb = path.stat().st_size / 1024
         self._temp_import_filepath = filepath
@@ -397,7 +459,7 @@ class MainWindow(QWidget):
         else:
             self.status_bar.log(f"Importing. {filepath}...")
         
-        worker = FileImportWorker(self.data_handler, filepath)
+        worker = FileImportWorker(self.data_handler, filepath, as_new_dataset=as_new_dataset)
         worker.signals.finished.connect(self._on_import_finished)
         worker.signals.error.connect(self._on_import_error)
         worker.signals.progress.connect(self._on_import_progress)
@@ -433,6 +495,9 @@ class MainWindow(QWidget):
         self.plot_tab.update_column_combo()
         self._unsaved_changes = True
         self.status_bar.update_data_stats(loaded_dataframe)
+        if getattr(self, "workspace_dialog", None) is not None and self.workspace_dialog.isVisible():
+            self.subset_manager.clear_cache()
+            self.workspace_dialog.refresh()
         
         self.tabs.setCurrentWidget(self.data_tab)
 
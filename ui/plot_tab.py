@@ -60,7 +60,7 @@ class PlotTab(PlotTabUI):
         self.subset_manager = subset_manager
         if self.subset_manager:
             self.refresh_subset_list()
-        self.plot_engine = PlotEngine()
+        self.plot_engine = PlotEngine(correlation_engine=self.data_handler.correlation_engine)
         self.current_config = {}
         self.code_exporter = CodeExporter()
         self.script_editor = None
@@ -1767,6 +1767,7 @@ class PlotTab(PlotTabUI):
         
         columns = list(self.data_handler.df.columns)
         self.view.quick_filter_input.set_columns(columns)
+        columns = columns + list(self.data_handler.virtual_columns)
 
         # Preserve the current selection
         current_x = self.view.x_column.currentText()
@@ -1889,7 +1890,7 @@ class PlotTab(PlotTabUI):
                 case "Last 5 Rows":
                     data = target_df.tail(5)
                 case "Correlation Matrix":
-                    data = target_df.corr().round(2)
+                    data = self.data_handler.correlation_engine.matrix(target_df).round(2)
                 case _:
                     data = target_df.head()
             
@@ -2123,6 +2124,7 @@ class PlotTab(PlotTabUI):
         # Get data configuration
         current_subplot_index, frozen_config = self._get_subplot_config()
         active_df, x_col, y_cols, hue, subset_name, quick_filter = self._resolve_data_config(current_subplot_index, frozen_config)
+        active_df = self._materialize_virtual_columns(active_df, [x_col, *(y_cols or []), hue])
 
         if not self._validate_active_dataframe(active_df):
             return
@@ -2167,7 +2169,7 @@ class PlotTab(PlotTabUI):
         self._prep_progress_dialog.show()
         
         from ui.workers import PlotDataPrepWorker
-        worker = PlotDataPrepWorker(active_df, plot_type, x_col, y_cols, quick_filter)
+        worker = PlotDataPrepWorker(active_df, plot_type, x_col, y_cols, quick_filter, filter_engine=self.data_handler.filter_engine)
         worker.signals.progress.connect(self._prep_progress_dialog.update_progress)
         worker.signals.log.connect(lambda msg: self.status_bar.log(msg, "INFO"))
         worker.signals.error.connect(self._on_prep_error)
@@ -2198,7 +2200,7 @@ class PlotTab(PlotTabUI):
     def _apply_quick_filter(self, df: pd.DataFrame, query: str) -> Optional[pd.DataFrame]:
         """Apply a pandas query to the dataframe"""
         try:
-            filtered_df = df.query(query)
+            filtered_df = df[self.data_handler.filter_engine.expression_mask(df, query)]
             if filtered_df.empty:
                 QMessageBox.warning(self, "Empty Result", f"The filter {query} returned an empty dataset")
                 self.status_bar.log(f"Filter {query} returned 0 rows", "WARNING")
@@ -2251,6 +2253,18 @@ class PlotTab(PlotTabUI):
 
         return active_df, x_col, y_cols, hue, subset_name, quick_filter
 
+    def _materialize_virtual_columns(self, active_df, columns: list):
+        """Evaluate the virtual columns the plot uses, so the plotting code only sees real columns"""
+        virtual_columns = self.data_handler.virtual_columns
+        needed = [column for column in columns if column in virtual_columns]
+        if active_df is None or not needed:
+            return active_df
+        try:
+            return self.data_handler.materialize_virtual_columns(active_df, needed)
+        except Exception as VirtualColumnError:
+            self.status_bar.log(f"Could not evaluate virtual columns {needed}: {str(VirtualColumnError)}", "ERROR")
+            return active_df
+
     def _restore_frozen_data(self, subset_name):
         """Restore data from a frozen subset"""
         if subset_name:
@@ -1,11 +1,13 @@
 from PyQt6.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot, QThread
+import threading
 import pandas as pd
 import numpy as np
 
 
 from core.data_handler import DataHandler
+from core.filter_engine import FilterEngine
 from sqlalchemy import create_engine, text
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Optional
 if TYPE_CHECKING:
     from core.subset_manager import SubsetManager
 
@@ -26,6 +28,39 @@ class WorkerSignals(QObject):
     error = pyqtSignal(Exception)
     log = pyqtSignal(str)
     progress = pyqtSignal(int, str)
+
+class CancellableWorker(QRunnable):
+    """
+    Base of workers that can be cancelled while they run. execute() does the work and polls
+    is_cancelled, its result is emitted as finished. A cancelled run emits nothing, the
+    InterruptedError a cancelled task raises is swallowed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def execute(self) -> Any:
+        raise NotImplementedError
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.execute()
+            if not self.is_cancelled():
+                self.signals.finished.emit(result)
+        except InterruptedError:
+            pass
+        except Exception as Error:
+            if not self.is_cancelled():
+                self.signals.error.emit(Error)
     
 class AggregationWorker(QRunnable):
     """Worker for performing data aggregation"""
@@ -42,7 +77,7 @@ class AggregationWorker(QRunnable):
         try:
             self.signals.progress.emit(10, "Preparing Aggregation...")
             self.signals.log.emit(f"Starting background aggregation task with {len(self.group_by)} groups...")
-            result_df = self.data_handler.preview_aggregation(group_by=self.group_by, agg_config=self.agg_config, date_grouping=self.date_grouping, limit=None)
+            result_df = self.data_handler.preview_aggregation(group_by=self.group_by, agg_config=self.agg_config, date_grouping=self.date_grouping, limit=None).df
             
             self.signals.progress.emit(100, "Aggregation complete")
             self.signals.log.emit("Background aggregation task completed successfully.")
@@ -71,20 +106,107 @@ class FilterWorker(QRunnable):
         except Exception as Error:
             self.signals.error.emit(Error)
 
+class AggregationPreviewWorker(CancellableWorker):
+    """Computes the preview of an aggregation in the background"""
+
+    def __init__(self, data_handler: DataHandler, group_by: list[str], agg_config: dict[str, str], date_grouping: dict[str, str], limit: int) -> None:
+        super().__init__()
+        self.data_handler = data_handler
+        self.group_by = group_by
+        self.agg_config = agg_config
+        self.date_grouping = date_grouping
+        self.limit = limit
+
+    def execute(self):
+        return self.data_handler.preview_aggregation(
+            group_by=self.group_by,
+            agg_config=self.agg_config,
+            date_grouping=self.date_grouping,
+            limit=self.limit,
+            is_cancelled=self.is_cancelled,
+        )
+
+class OutlierDetectionWorker(CancellableWorker):
+    """Runs DataHandler.detect_outliers in the background"""
+
+    def __init__(self, data_handler: DataHandler, method: str, columns: list[str], **kwargs) -> None:
+        super().__init__()
+        self.data_handler = data_handler
+        self.method = method
+        self.columns = columns
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.signals.progress.emit(10, f"Detecting outliers ({self.method})...")
+        outlier_mask = self.data_handler.detect_outliers(
+            self.method, self.columns, is_cancelled=self.is_cancelled, **self.kwargs
+        )
+        if not self.is_cancelled():
+            self.signals.progress.emit(100, "Outlier detection complete")
+        return outlier_mask
+
+class SampleReplayWorker(CancellableWorker):
+    """Replays the operations of a sample session on the full data"""
+
+    def __init__(self, data_handler: DataHandler) -> None:
+        super().__init__()
+        self.data_handler = data_handler
+
+    def _report_progress(self, index: int, total: int, operation_type: str) -> None:
+        if total == 0 or index >= total:
+            self.signals.progress.emit(100, "Replay complete")
+            return
+        self.signals.progress.emit(int(index / total * 100), f"Operation {index + 1} of {total}: {operation_type}")
+
+    def execute(self):
+        return self.data_handler.replay_sample_on_full(progress_callback=self._report_progress, is_cancelled=self.is_cancelled)
+
+class SQLQueryWorker(CancellableWorker):
+    """
+    Runs a SQL console query in the background and emits its result, at most limit rows.
+    Nothing is changed here, loading a full result is committed on the UI thread with
+    DataHandler.commit_sql_query
+    """
+
+    def __init__(self, data_handler: DataHandler, sql: str, tables: dict, limit: Optional[int] = None) -> None:
+        super().__init__()
+        self.data_handler = data_handler
+        self.sql = sql
+        self.tables = tables
+        self.limit = limit
+
+    def cancel(self) -> None:
+        super().cancel()
+        self.data_handler.sql_engine.interrupt()
+
+    def execute(self):
+        return self.data_handler.run_sql(
+            self.sql,
+            self.tables,
+            limit=self.limit,
+            is_cancelled=self.is_cancelled,
+            progress_callback=lambda rows: self.signals.progress.emit(0, f"{rows:,} rows fetched"),
+        )
+
 class FileImportWorker(QRunnable):
     """The worker thread for importing files"""
 
-    def __init__(self, data_handler: DataHandler, filepath: str):
+    def __init__(self, data_handler: DataHandler, filepath: str, as_new_dataset: bool = False):
         super().__init__()
         self.data_handler = data_handler
         self.filepath = filepath
+        # Open the file next to the current data instead of replacing it
+        self.as_new_dataset = as_new_dataset
         self.signals = WorkerSignals()
 
     @pyqtSlot()
     def run(self):
         try:
             self.signals.progress.emit(10, "Reading file...")
-            self.data_handler.import_file(self.filepath)
+            if self.as_new_dataset:
+                self.data_handler.open_dataset(self.filepath)
+            else:
+                self.data_handler.import_file(self.filepath)
 
             self.signals.progress.emit(70, "Processing data...")
             self.signals.finished.emit(self.data_handler.df)
@@ -178,13 +300,14 @@ class AutoCreateSubsetsWorker(QRunnable):
             self.signals.error.emit(Error)
 
 class PlotDataPrepWorker(QRunnable):
-    def __init__(self, df: pd.DataFrame, plot_type: str, x_col: str, y_cols: list[str], quick_filter: str):
+    def __init__(self, df: pd.DataFrame, plot_type: str, x_col: str, y_cols: list[str], quick_filter: str, filter_engine: Optional[FilterEngine] = None):
         super().__init__()
         self.df = df
         self.plot_type = plot_type
         self.x_col = x_col
         self.y_cols = y_cols
         self.quick_filter = quick_filter
+        self.filter_engine = filter_engine or FilterEngine()
         self.signals = WorkerSignals()
         
     def _is_datetime_column(self, data: pd.Series) -> bool:
@@ -209,14 +332,15 @@ class PlotDataPrepWorker(QRunnable):
     @pyqtSlot()
     def run(self):
         try:
-            self.signals.progress.emit(10, "Copying data...")
-            processed_df = self.df.copy()
-            
             if self.quick_filter:
+                # Masks are computed on the shared frame so cached condition masks are reused
                 self.signals.progress.emit(20, f"Applying quick filter: {self.quick_filter}...")
-                processed_df = processed_df.query(self.quick_filter)
+                processed_df = self.df[self.filter_engine.expression_mask(self.df, self.quick_filter)]
                 if processed_df.empty:
                     raise ValueError(f"The filter '{self.quick_filter}' returned an empty dataset")
+            else:
+                self.signals.progress.emit(10, "Copying data...")
+                processed_df = self.df.copy()
             
             self.signals.progress.emit(50, "Sampling data...")
             MAX_PLOT_POINTS = 500_000